@@ -0,0 +1,325 @@
+"""
+Relevance-based context selection for AI-assisted Terraform generation.
+
+The context files are split into markdown sections (chunks) and indexed
+with BM25. For each prompt only the most relevant sections are sent, within
+a token budget, instead of prepending every context file to every request.
+The chunk index is cached on disk and rebuilt only when a context file
+changes. Everything runs locally; no network calls are made.
+"""
+
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / ".cache" / "context_index.json"
+INDEX_VERSION = 1
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Sections longer than this are split further at paragraph boundaries
+MAX_CHUNK_CHARS = 2000
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+WORD = re.compile(r"[a-z0-9_]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with", "create", "use", "using"
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (about four characters per token).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return len(text) // 4 + 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Snake-case identifiers are kept whole and also split into their parts,
+    so "okta_app_oauth" matches prompts mentioning "oauth app".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms
+    """
+    terms = []
+    for word in WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        terms.append(word)
+        if "_" in word:
+            terms.extend(part for part in word.split("_") if part and part not in STOPWORDS)
+    return terms
+
+
+def chunk_markdown(source: str, text: str) -> List[Dict]:
+    """
+    Split a markdown document into sections at headings.
+
+    Headings inside fenced code blocks are ignored. Each chunk keeps its
+    heading path (e.g. "User Examples > Basic User") for ranking and display.
+
+    Args:
+        source: Context key the document belongs to
+        text: Markdown content
+
+    Returns:
+        List of chunks with source, position, heading and text
+    """
+    chunks = []
+    headings: List[str] = []
+    lines: List[str] = []
+    in_fence = False
+
+    def close_section():
+        body = "\n".join(lines).strip()
+        if body:
+            heading = " > ".join(h for h in headings if h)
+            for part in _split_long(body):
+                chunks.append({
+                    "source": source,
+                    "position": len(chunks),
+                    "heading": heading,
+                    "text": part
+                })
+
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            close_section()
+            lines = []
+            level = len(match.group(1))
+            headings = headings[:level - 1] + [""] * (level - 1 - len(headings)) + [match.group(2).strip()]
+        lines.append(line)
+
+    close_section()
+    return chunks
+
+
+def _split_long(body: str) -> List[str]:
+    """Split an oversized section at blank lines outside code fences."""
+    if len(body) <= MAX_CHUNK_CHARS:
+        return [body]
+
+    parts, current, in_fence = [], [], False
+    for line in body.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+        current.append(line)
+        if not in_fence and not line.strip() and sum(len(l) + 1 for l in current) >= MAX_CHUNK_CHARS:
+            parts.append("\n".join(current).strip())
+            current = []
+    if current:
+        parts.append("\n".join(current).strip())
+    return [part for part in parts if part]
+
+
+def context_fingerprint(context: Dict[str, str]) -> str:
+    """Hash of the context files, used to invalidate the cached index."""
+    encoded = json.dumps(context, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ContextIndex:
+    """BM25 index over markdown sections of the context files."""
+
+    def __init__(self, chunks: List[Dict], fingerprint: str = "",
+                 term_freqs: Optional[List[Dict[str, int]]] = None):
+        self.chunks = chunks
+        self.fingerprint = fingerprint
+        if term_freqs is None:
+            term_freqs = [tokenize(f"{c['heading']}\n{c['text']}") for c in chunks]
+        self.term_freqs = [Counter(tf) for tf in term_freqs]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        self.doc_freqs = Counter(term for tf in self.term_freqs for term in tf)
+
+    @classmethod
+    def build(cls, context: Dict[str, str]) -> "ContextIndex":
+        """
+        Chunk and index a context dictionary.
+
+        Args:
+            context: Context dictionary (as returned by load_context_files)
+
+        Returns:
+            New index
+        """
+        chunks = []
+        for source, text in context.items():
+            chunks.extend(chunk_markdown(source, text))
+        return cls(chunks, context_fingerprint(context))
+
+    def score(self, prompt: str) -> List[float]:
+        """
+        BM25 score of every chunk for a prompt.
+
+        Args:
+            prompt: User's prompt
+
+        Returns:
+            Scores aligned with self.chunks
+        """
+        query = set(tokenize(prompt))
+        n = len(self.chunks)
+        scores = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            score = 0.0
+            for term in query:
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                df = self.doc_freqs[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self.avg_length or 1))
+                score += idf * freq * (BM25_K1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, prompt: str, budget_tokens: int) -> List[Dict]:
+        """
+        Pick the most relevant chunks that fit in a token budget.
+
+        Args:
+            prompt: User's prompt
+            budget_tokens: Maximum estimated tokens of selected context
+
+        Returns:
+            Selected chunks in their original document order
+        """
+        scores = self.score(prompt)
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: -scores[i]
+        )
+        if not ranked:
+            # Nothing matched: fall back to the documents in order
+            ranked = list(range(len(self.chunks)))
+
+        selected, used = [], 0
+        for i in ranked:
+            cost = estimate_tokens(self.chunks[i]["text"])
+            if used + cost > budget_tokens:
+                continue
+            selected.append(i)
+            used += cost
+
+        return [self.chunks[i] for i in sorted(selected)]
+
+    def select_context(self, prompt: str, budget_tokens: int) -> Dict[str, str]:
+        """
+        Build a reduced context dictionary for a prompt.
+
+        The result has the same keys as the full context, so it can be passed
+        straight to AIProvider.generate_terraform.
+
+        Args:
+            prompt: User's prompt
+            budget_tokens: Maximum estimated tokens of selected context
+
+        Returns:
+            Context dictionary containing only the relevant sections
+        """
+        context: Dict[str, List[str]] = {}
+        for chunk in self.select(prompt, budget_tokens):
+            context.setdefault(chunk["source"], []).append(chunk["text"])
+        return {source: "\n\n".join(texts) for source, texts in context.items()}
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "chunks": self.chunks,
+            "term_freqs": [dict(tf) for tf in self.term_freqs]
+        }
+
+
+def load_context_index(context: Dict[str, str], cache_path: Optional[Path] = None) -> ContextIndex:
+    """
+    Load the chunk index from the cache, rebuilding it if the context changed.
+
+    Args:
+        context: Full context dictionary
+        cache_path: Index cache file (default: ai-assisted/.cache/context_index.json)
+
+    Returns:
+        Index over the current context files
+    """
+    cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+    fingerprint = context_fingerprint(context)
+
+    try:
+        data = json.loads(cache_path.read_text())
+        if data.get("version") == INDEX_VERSION and data.get("fingerprint") == fingerprint:
+            return ContextIndex(data["chunks"], fingerprint, data["term_freqs"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = ContextIndex.build(context)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(index.to_dict()))
+    except OSError:
+        pass  # Caching is an optimization only
+    return index
+
+
+class ContextSelector:
+    """Selects per-prompt context from a cached index within a token budget."""
+
+    def __init__(self, context: Dict[str, str], budget_tokens: int,
+                 cache_path: Optional[Path] = None):
+        """
+        Initialize the selector, loading or building the chunk index.
+
+        Args:
+            context: Full context dictionary
+            budget_tokens: Token budget per prompt (0 or less sends the full context)
+            cache_path: Index cache file
+        """
+        self.context = context
+        self.budget_tokens = budget_tokens
+        self.index = load_context_index(context, cache_path) if budget_tokens > 0 else None
+
+    def __call__(self, prompt: str) -> Dict[str, str]:
+        """
+        Context to send for a prompt.
+
+        Args:
+            prompt: User's prompt
+
+        Returns:
+            Reduced context dictionary (or the full context without a budget)
+        """
+        if self.index is None:
+            return self.context
+        return self.index.select_context(prompt, self.budget_tokens)
+
+    def describe(self, selected: Dict[str, str]) -> str:
+        """One-line summary of how much context was selected."""
+        full = sum(estimate_tokens(text) for text in self.context.values())
+        used = sum(estimate_tokens(text) for text in selected.values())
+        return f"~{used} of ~{full} context tokens"
@@ -9,6 +9,10 @@ Usage:
     python generate.py --prompt "Create 5 users in marketing dept" --provider gemini
     python generate.py --interactive
     python generate.py --config config.yaml
+    python generate.py --prompt "Create 5 users in marketing dept" --cache-only
+    python generate.py --batch prompts/batch.json --output-dir generated --concurrency 4
+    python generate.py --prompt "Create demo environment" --stream --output demo.tf
+    python generate.py --prompt "Create 5 users in marketing dept" --context-budget 0
 
 Environment Variables:
     GEMINI_API_KEY, GOOGLE_API_KEY - For Gemini provider
@@ -17,16 +21,27 @@ Environment Variables:
 """
 
 import argparse
+import asyncio
+import json
 import os
+import re
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
-import subprocess
+from typing import Callable, Dict, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from providers import get_provider
+from context_index import ContextSelector
+from providers import GenerationCache, get_provider
+from providers.base import empty_usage
+from providers.hcl_validator import format_issue, has_errors, validate_hcl
+from providers.streaming import HCLBlockTracker
+
+# Context budget for providers without prompt caching (see configure_context)
+DEFAULT_CONTEXT_BUDGET = 2000
 
 
 def load_context_files() -> Dict[str, str]:
@@ -57,6 +72,42 @@ def load_context_files() -> Dict[str, str]:
     return context
 
 
+def configure_context(provider, context: Dict[str, str],
+                      context_budget: Optional[int] = None) -> ContextSelector:
+    """
+    Choose how context is sent to a provider and report the mode.
+
+    Providers with prompt caching get the full context as a cached prefix by
+    default; a per-prompt selection would change the prefix with almost every
+    prompt, so the cache would never hit. An explicit budget selects context
+    per prompt and sends it after the cache breakpoint instead. Providers
+    without prompt caching default to a DEFAULT_CONTEXT_BUDGET selection.
+
+    Args:
+        provider: Initialized AI provider
+        context: Full context dictionary
+        context_budget: --context-budget (None picks the provider's default)
+
+    Returns:
+        Context selector for the chosen budget
+    """
+    if context_budget is None:
+        context_budget = 0 if provider.supports_prompt_cache else DEFAULT_CONTEXT_BUDGET
+
+    provider.context_in_prefix = context_budget <= 0
+    if context_budget <= 0:
+        mode = "full context"
+        if provider.supports_prompt_cache:
+            mode += " in the cached prompt prefix"
+    else:
+        mode = f"per-prompt selection (~{context_budget} tokens)"
+        if provider.supports_prompt_cache:
+            mode += " after the prompt cache breakpoint"
+    print(f"📚 Context mode: {mode}")
+
+    return ContextSelector(context, context_budget)
+
+
 def get_api_key(provider: str) -> Optional[str]:
     """
     Get API key from environment variables.
@@ -78,46 +129,300 @@ def get_api_key(provider: str) -> Optional[str]:
 
 def validate_terraform(code: str) -> bool:
     """
-    Validate generated Terraform code using terraform validate.
+    Validate generated Terraform code in-process.
+
+    Parses the HCL and checks okta_* resource types and attributes against
+    the bundled provider schema snapshot; no terraform binary is needed.
 
     Args:
         code: Generated Terraform code
 
     Returns:
-        True if valid, False otherwise
+        True if no errors were found (warnings are printed but allowed)
+    """
+    issues = validate_hcl(code)
+    for issue in issues:
+        print(format_issue(issue))
+
+    if has_errors(issues):
+        return False
+
+    print("✅ Terraform validated")
+    return True
+
+
+def check_hcl_block(block: str) -> List[str]:
+    """
+    Validate one complete top-level HCL block.
+
+    Args:
+        block: Block text, possibly preceded by comment lines
+
+    Returns:
+        List of problems found (empty if the block is valid)
+    """
+    return [f"line {issue['line']}: {issue['message']}" for issue in validate_hcl(block)]
+
+
+def stream_generation(provider, prompt: str, context: Dict[str, str],
+                      output_path: Optional[Path] = None) -> str:
     """
-    # Create temporary file
-    import tempfile
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.tf', delete=False) as f:
-        f.write(code)
-        temp_file = f.name
+    Stream generated code to the terminal (and output file) as it arrives.
 
+    Each top-level block is checked as soon as its closing brace streams in.
+    If generation fails part-way, the partial output is moved to
+    <output>.partial so an incomplete .tf file is never left in place.
+
+    Args:
+        provider: Initialized AI provider
+        prompt: User's prompt
+        context: Context dictionary
+        output_path: Optional file to write progressively
+
+    Returns:
+        Complete generated code
+
+    Raises:
+        Exception: If generation fails
+    """
+    tracker = HCLBlockTracker()
+    parts = []
+    block_count = 0
+    warnings = []
+
+    def check(blocks: List[str]):
+        nonlocal block_count
+        for block in blocks:
+            block_count += 1
+            for problem in check_hcl_block(block):
+                warnings.append(f"block {block_count}: {problem}")
+                print(f"\n⚠️  Block {block_count}: {problem}", file=sys.stderr, flush=True)
+
+    output_file = open(output_path, "w") if output_path else None
     try:
-        # Run terraform fmt
-        result = subprocess.run(
-            ["terraform", "fmt", temp_file],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            print(f"Warning: terraform fmt failed: {result.stderr}")
-            return False
-
-        print("✅ Terraform formatting validated")
-        return True
-
-    except FileNotFoundError:
-        print("Warning: terraform command not found. Skipping validation.")
-        return True
-    except Exception as e:
-        print(f"Warning: Validation failed: {e}")
-        return True
-    finally:
-        # Clean up
-        os.unlink(temp_file)
+        for chunk in provider.stream_terraform(prompt, context):
+            parts.append(chunk)
+            print(chunk, end="", flush=True)
+            if output_file:
+                output_file.write(chunk)
+                output_file.flush()
+            check(tracker.feed(chunk))
+        check(tracker.flush())
+    except BaseException:
+        if output_file:
+            output_file.close()
+            os.replace(output_path, f"{output_path}.partial")
+            print(f"\n⚠️  Partial output kept in {output_path}.partial", file=sys.stderr)
+        raise
+    if output_file:
+        output_file.close()
+
+    print()
+    if tracker.depth != 0:
+        print("⚠️  Output ended inside an unterminated block", file=sys.stderr)
+    print(f"\n✅ Streamed {block_count} blocks" + (f" ({len(warnings)} warnings)" if warnings else ""))
+
+    return "".join(parts)
+
+
+def build_cache(args: argparse.Namespace) -> Optional[GenerationCache]:
+    """
+    Create the generation cache from CLI arguments.
 
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        GenerationCache, or None if caching is disabled
+    """
+    if args.no_cache:
+        return None
+    return GenerationCache(
+        cache_dir=args.cache_dir,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        offline=args.cache_only
+    )
+
+
+def report_usage(provider):
+    """Print token usage for the last generation (or note a cache hit)."""
+    if provider.last_cache_hit:
+        print("\n⚡ Served from generation cache (no tokens used)")
+        return
+
+    usage = provider.get_token_usage()
+    if usage["total"] > 0:
+        print(f"\n📊 Token Usage: {usage['input']} input, "
+              f"{usage['output']} output, {usage['total']} total")
+        print(f"   {describe_prompt_cache(usage)}")
+
+
+def describe_prompt_cache(usage: Dict[str, int]) -> str:
+    """One-line summary of the provider's prompt cache for a usage dictionary."""
+    hits = usage.get("prompt_cache_hits", 0)
+    misses = usage.get("prompt_cache_misses", 0)
+    if not hits and not misses:
+        return "Prompt cache: not reported by provider"
+    if hits + misses == 1:
+        result = "hit" if hits else "miss"
+    else:
+        result = f"{hits} hits, {misses} misses"
+    return (f"Prompt cache: {result} ({usage.get('cached_input', 0)} cached input tokens, "
+            f"{usage.get('cache_write', 0)} written)")
+
+
+def load_batch(batch_path: str) -> List[Dict[str, str]]:
+    """
+    Load batch generation jobs from a directory or JSON manifest.
+
+    A directory yields one job per *.md / *.txt file (the file content is the
+    prompt). A manifest is a JSON list (or {"prompts": [...]}) of objects with
+    "prompt" or "prompt_file" and optional "name" and "output"; relative
+    prompt files are resolved against the manifest's directory.
+
+    Args:
+        batch_path: Directory of prompt files or path to a JSON manifest
 
-def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = None):
+    Returns:
+        List of jobs with name, prompt and output filename
+    """
+    path = Path(batch_path)
+    jobs = []
+
+    if path.is_dir():
+        for prompt_file in sorted(list(path.glob("*.md")) + list(path.glob("*.txt"))):
+            jobs.append({
+                "name": prompt_file.stem,
+                "prompt": prompt_file.read_text(),
+                "output": f"{prompt_file.stem}.tf"
+            })
+        return jobs
+
+    manifest = json.loads(path.read_text())
+    entries = manifest.get("prompts", []) if isinstance(manifest, dict) else manifest
+
+    for index, entry in enumerate(entries, 1):
+        if "prompt_file" in entry:
+            prompt_file = path.parent / entry["prompt_file"]
+            prompt = prompt_file.read_text()
+            default_name = prompt_file.stem
+        elif "prompt" in entry:
+            prompt = entry["prompt"]
+            default_name = f"prompt_{index}"
+        else:
+            raise ValueError(f"Manifest entry {index} needs 'prompt' or 'prompt_file'")
+
+        name = entry.get("name", default_name)
+        jobs.append({
+            "name": name,
+            "prompt": prompt,
+            "output": entry.get("output", f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}.tf")
+        })
+
+    return jobs
+
+
+async def run_batch(provider, select_context: Callable[[str], Dict[str, str]], jobs: List[Dict[str, str]],
+                    output_dir: Path, concurrency: int = 4, max_retries: int = 3,
+                    validate: bool = False) -> List[Dict]:
+    """
+    Generate all batch jobs concurrently and write each to its own .tf file.
+
+    Args:
+        provider: Initialized AI provider
+        select_context: Returns the context to send for a prompt
+        jobs: Jobs from load_batch
+        output_dir: Directory for generated files
+        concurrency: Maximum number of in-flight provider calls
+        max_retries: Retries per job for transient provider errors
+        validate: Validate each generated file
+
+    Returns:
+        Per-job results with name, output, token_usage, cache_hit and error
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    async def run_job(job: Dict[str, str]) -> Dict:
+        output_path = output_dir / job["output"]
+        async with semaphore:
+            started = time.time()
+            try:
+                result = await provider.agenerate_terraform(
+                    job["prompt"], select_context(job["prompt"]), max_retries=max_retries
+                )
+            except Exception as e:
+                print(f"  ❌ {job['name']}: {e}")
+                return {"name": job["name"], "output": str(output_path), "error": str(e),
+                        "token_usage": empty_usage(), "cache_hit": False}
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(result["code"])
+        source = "cache" if result["cache_hit"] else f"{result['token_usage']['total']} tokens"
+        print(f"  ✅ {job['name']} -> {output_path} ({source}, {time.time() - started:.1f}s)")
+
+        if validate:
+            await asyncio.to_thread(validate_terraform, result["code"])
+
+        return {"name": job["name"], "output": str(output_path), "error": None,
+                "token_usage": result["token_usage"], "cache_hit": result["cache_hit"]}
+
+    return await asyncio.gather(*(run_job(job) for job in jobs))
+
+
+def batch_mode(provider, select_context: Callable[[str], Dict[str, str]],
+               args: argparse.Namespace) -> bool:
+    """
+    Run batch generation and print an aggregated summary.
+
+    Args:
+        provider: Initialized AI provider
+        select_context: Returns the context to send for a prompt
+        args: Parsed command-line arguments
+
+    Returns:
+        True if every job succeeded
+    """
+    jobs = load_batch(args.batch)
+    if not jobs:
+        print(f"❌ Error: No prompts found in {args.batch}")
+        return False
+
+    print(f"\n🔄 Generating {len(jobs)} prompts (concurrency {args.concurrency})...")
+    started = time.time()
+    results = asyncio.run(run_batch(
+        provider, select_context, jobs, Path(args.output_dir),
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        validate=args.validate
+    ))
+
+    failed = [r for r in results if r["error"]]
+    cache_hits = sum(1 for r in results if r["cache_hit"])
+    usage = {
+        key: sum(r["token_usage"].get(key, 0) for r in results)
+        for key in empty_usage()
+    }
+
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    print(f"  Prompts: {len(results)} ({len(results) - len(failed)} succeeded, {len(failed)} failed)")
+    print(f"  Cache hits: {cache_hits}")
+    print(f"  Token Usage: {usage['input']} input, {usage['output']} output, {usage['total']} total")
+    print(f"  {describe_prompt_cache(usage)}")
+    print(f"  Elapsed: {time.time() - started:.1f}s")
+    print(f"  Output directory: {args.output_dir}")
+    for result in failed:
+        print(f"  ❌ {result['name']}: {result['error']}")
+    print("=" * 60)
+
+    return not failed
+
+
+def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = None,
+                     cache: Optional[GenerationCache] = None, stream: bool = False,
+                     context_budget: Optional[int] = None):
     """
     Run in interactive mode with prompts.
 
@@ -125,6 +430,10 @@ def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = No
         provider_name: AI provider to use
         api_key: API key
         model: Optional model override
+        cache: Optional generation cache
+        stream: Render code as it is generated
+        context_budget: Token budget for per-prompt context selection
+            (0 = full context, None = the provider's default; see configure_context)
     """
     print(f"\n🤖 AI-Assisted Terraform Generator (Provider: {provider_name})")
     print("=" * 60)
@@ -134,8 +443,13 @@ def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = No
     print(f"✅ Loaded {len(context)} context files")
 
     print("\nInitializing AI provider...")
-    provider = get_provider(provider_name, api_key, model)
+    provider = get_provider(provider_name, api_key, model, cache=cache)
     print(f"✅ Using model: {provider.model}")
+    select_context = configure_context(provider, context, context_budget)
+
+    # Open the API connection while the user types the first prompt
+    if not (cache and cache.offline):
+        threading.Thread(target=provider.warm_up, daemon=True).start()
 
     print("\n" + "=" * 60)
     print("Enter your prompt (or 'quit' to exit):")
@@ -155,21 +469,22 @@ def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = No
 
             print("\n🔄 Generating Terraform code...")
             provider.reset_token_usage()
+            prompt_context = select_context(prompt)
+            print(f"📚 Context: {select_context.describe(prompt_context)}")
 
             try:
-                code = provider.generate_terraform(prompt, context)
-
                 print("\n" + "=" * 60)
                 print("GENERATED TERRAFORM CODE:")
                 print("=" * 60 + "\n")
-                print(code)
+                if stream:
+                    code = stream_generation(provider, prompt, prompt_context)
+                else:
+                    code = provider.generate_terraform(prompt, prompt_context)
+                    print(code)
                 print("\n" + "=" * 60)
 
                 # Show token usage
-                usage = provider.get_token_usage()
-                if usage["total"] > 0:
-                    print(f"\n📊 Token Usage: {usage['input']} input, "
-                          f"{usage['output']} output, {usage['total']} total")
+                report_usage(provider)
 
                 # Ask if user wants to save
                 save = input("\nSave to file? (y/N): ").strip().lower()
@@ -181,7 +496,7 @@ def interactive_mode(provider_name: str, api_key: str, model: Optional[str] = No
                         print(f"✅ Saved to {output_path}")
 
                         # Validate if requested
-                        validate = input("Run terraform fmt? (y/N): ").strip().lower()
+                        validate = input("Validate Terraform? (y/N): ").strip().lower()
                         if validate == 'y':
                             validate_terraform(code)
 
@@ -216,6 +531,19 @@ Examples:
                     --provider openai \\
                     --model gpt-4
 
+  # Replay a recorded generation offline (no API key needed)
+  python generate.py --prompt "Create 5 marketing users" --cache-only
+
+  # Stream code to the terminal and output file as it is generated
+  python generate.py --prompt "Create demo environment" \\
+                    --provider anthropic \\
+                    --stream --output demo.tf
+
+  # Batch mode: one .tf file per prompt, up to 4 concurrent provider calls
+  python generate.py --batch prompts/batch.json \\
+                    --output-dir generated \\
+                    --concurrency 4
+
 Environment Variables:
   GEMINI_API_KEY or GOOGLE_API_KEY - For Gemini
   OPENAI_API_KEY - For OpenAI
@@ -255,14 +583,82 @@ Environment Variables:
     parser.add_argument(
         "--validate",
         action="store_true",
-        help="Run terraform fmt validation on generated code"
+        help="Validate generated code (HCL syntax and Okta provider schema)"
+    )
+
+    parser.add_argument(
+        "--context-budget",
+        type=int,
+        default=None,
+        help="Token budget for context sections relevant to the prompt; 0 sends all context files "
+             "(default: 0 for providers with prompt caching (openai, anthropic), 2000 otherwise)"
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Render code as it is generated and write the output file progressively"
+    )
+
+    parser.add_argument(
+        "--batch",
+        help="Directory of prompt files (*.md, *.txt) or JSON manifest to generate concurrently"
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        default="generated",
+        help="Output directory for batch mode (default: generated)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent provider calls in batch mode (default: 4)"
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries with exponential backoff for rate-limited or failed calls (default: 3)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Generation cache directory (default: ai-assisted/.cache/generations)"
+    )
+
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=50,
+        help="Evict least recently used cache entries beyond this size (default: 50)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the provider, bypassing the generation cache"
+    )
+
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Only replay recorded generations from the cache (offline, no API key needed)"
     )
 
     args = parser.parse_args()
 
+    if args.no_cache and args.cache_only:
+        parser.error("--no-cache and --cache-only are mutually exclusive")
+
+    cache = build_cache(args)
+
     # Get API key
     api_key = get_api_key(args.provider)
-    if not api_key:
+    if not api_key and not args.cache_only:
         print(f"❌ Error: No API key found for {args.provider}")
         print(f"\nSet one of these environment variables:")
         if args.provider == "gemini":
@@ -277,12 +673,13 @@ Environment Variables:
 
     # Interactive mode
     if args.interactive:
-        interactive_mode(args.provider, api_key, args.model)
+        interactive_mode(args.provider, api_key, args.model, cache=cache, stream=args.stream,
+                         context_budget=args.context_budget)
         return
 
     # Prompt mode
-    if not args.prompt:
-        print("❌ Error: --prompt is required (or use --interactive)")
+    if not args.prompt and not args.batch:
+        print("❌ Error: --prompt is required (or use --interactive or --batch)")
         parser.print_help()
         sys.exit(1)
 
@@ -293,12 +690,45 @@ Environment Variables:
     print(f"✅ Loaded {len(context)} context files")
 
     # Initialize provider
-    provider = get_provider(args.provider, api_key, args.model)
+    provider = get_provider(args.provider, api_key, args.model, cache=cache)
     print(f"✅ Using model: {provider.model}")
+    select_context = configure_context(provider, context, args.context_budget)
+
+    # Batch mode
+    if args.batch:
+        try:
+            success = batch_mode(provider, select_context, args)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Could not load batch {args.batch}: {e}")
+            sys.exit(1)
+        sys.exit(0 if success else 1)
+
+    prompt_context = select_context(args.prompt)
+    print(f"📚 Context: {select_context.describe(prompt_context)}")
+
+    # Stream code
+    if args.stream:
+        try:
+            print("\n" + "=" * 60)
+            print("GENERATED TERRAFORM CODE:")
+            print("=" * 60 + "\n")
+            output_path = Path(args.output) if args.output else None
+            code = stream_generation(provider, args.prompt, prompt_context, output_path)
+            if output_path:
+                print(f"✅ Saved to {output_path}")
+
+            if args.validate:
+                validate_terraform(code)
+
+            report_usage(provider)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        return
 
     # Generate code
     try:
-        code = provider.generate_terraform(args.prompt, context)
+        code = provider.generate_terraform(args.prompt, prompt_context)
 
         # Validate if requested
         if args.validate:
@@ -316,10 +746,7 @@ Environment Variables:
             print(code)
 
         # Show token usage
-        usage = provider.get_token_usage()
-        if usage["total"] > 0:
-            print(f"\n📊 Token Usage: {usage['input']} input, "
-                  f"{usage['output']} output, {usage['total']} total")
+        report_usage(provider)
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -3,12 +3,14 @@ AI provider implementations for Terraform generation.
 """
 
 from .base import AIProvider
+from .cache import GenerationCache
 from .gemini import GeminiProvider
 from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
 
 __all__ = [
     "AIProvider",
+    "GenerationCache",
     "GeminiProvider",
     "OpenAIProvider",
     "AnthropicProvider",
@@ -23,7 +25,8 @@ PROVIDERS = {
 }
 
 
-def get_provider(provider_name: str, api_key: str, model: str = None) -> AIProvider:
+def get_provider(provider_name: str, api_key: str, model: str = None,
+                 cache: GenerationCache = None) -> AIProvider:
     """
     Get an AI provider instance.
 
@@ -31,6 +34,7 @@ def get_provider(provider_name: str, api_key: str, model: str = None) -> AIProvi
         provider_name: Name of the provider (gemini, openai, anthropic)
         api_key: API key for the provider
         model: Optional model override
+        cache: Optional generation cache
 
     Returns:
         Initialized provider instance
@@ -47,4 +51,4 @@ def get_provider(provider_name: str, api_key: str, model: str = None) -> AIProvi
         )
 
     provider_class = PROVIDERS[provider_name]
-    return provider_class(api_key=api_key, model=model)
+    return provider_class(api_key=api_key, model=model, cache=cache)
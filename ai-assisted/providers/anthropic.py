@@ -2,31 +2,41 @@
 Anthropic Claude provider for AI-assisted Terraform generation.
 """
 
-from typing import Dict
+from typing import Dict, Iterator
 from .base import AIProvider
 
 
+# System message with instructions
+SYSTEM_MESSAGE = """You are an expert Terraform developer specializing in Okta infrastructure.
+
+Generate clean, production-ready Terraform code following these rules:
+1. Use exact patterns from the provided examples
+2. Always escape template strings with $$ (e.g., "$${source.login}")
+3. Set status = "ACTIVE" for all resources
+4. Include descriptive comments
+5. Follow HCL formatting conventions
+6. Use proper resource naming (snake_case)
+7. Include depends_on where appropriate
+8. Generate only valid Terraform HCL code
+
+Output only the Terraform code, no explanations unless specifically requested."""
+
+
 class AnthropicProvider(AIProvider):
     """Anthropic Claude API provider."""
 
+    supports_prompt_cache = True
+
     def get_default_model(self) -> str:
         """Get default Claude model."""
         return "claude-3-5-sonnet-20241022"
 
-    def generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+    def _create_client(self):
         """
-        Generate Terraform code using Anthropic Claude.
-
-        Args:
-            prompt: User's prompt
-            context: Context dictionary
-
-        Returns:
-            Generated Terraform code
+        Create the Anthropic client (reused for every call; see AIProvider.client).
 
         Raises:
             ImportError: If anthropic is not installed
-            Exception: If generation fails
         """
         try:
             from anthropic import Anthropic
@@ -36,38 +46,77 @@ class AnthropicProvider(AIProvider):
                 "Install with: pip install anthropic"
             )
 
-        # Initialize Anthropic client
-        client = Anthropic(api_key=self.api_key)
+        return Anthropic(api_key=self.api_key)
 
-        # Build full prompt with context
-        full_prompt = self._build_full_prompt(prompt, context)
+    def _warm_connection(self):
+        """Open the API connection with a model lookup (no tokens are used)."""
+        self.client.models.retrieve(self.model)
 
-        # System message with instructions
-        system_message = """You are an expert Terraform developer specializing in Okta infrastructure.
+    def _build_request(self, prompt: str, context: Dict[str, str]) -> Dict:
+        """
+        Build messages API arguments with a cached system prefix.
 
-Generate clean, production-ready Terraform code following these rules:
-1. Use exact patterns from the provided examples
-2. Always escape template strings with $$ (e.g., "$${source.login}")
-3. Set status = "ACTIVE" for all resources
-4. Include descriptive comments
-5. Follow HCL formatting conventions
-6. Use proper resource naming (snake_case)
-7. Include depends_on where appropriate
-8. Generate only valid Terraform HCL code
+        The instructions (and, with context_in_prefix, the full context) go in
+        system blocks that end with a cache_control breakpoint, so every request
+        reads the prefix from Anthropic's prompt cache. A per-prompt context
+        selection goes in the user message, after the breakpoint.
 
-Output only the Terraform code, no explanations unless specifically requested."""
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Keyword arguments for messages.create / messages.stream
+        """
+        system = [{"type": "text", "text": SYSTEM_MESSAGE}]
+        context_prefix = self._build_cached_prefix(context)
+        if context_prefix:
+            system.append({"type": "text", "text": context_prefix})
+        system[-1]["cache_control"] = {"type": "ephemeral"}
+
+        return {
+            "model": self.model,
+            "max_tokens": 4096,
+            "system": system,
+            "messages": [
+                {"role": "user", "content": self._build_request_message(prompt, context)}
+            ],
+            "temperature": 0.2,
+        }
+
+    def _record_response_usage(self, usage):
+        """Record token usage, including prompt cache reads and writes."""
+        cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+        cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        # input_tokens excludes cached and cache-written tokens
+        self._record_usage(
+            usage.input_tokens + cache_read + cache_write,
+            usage.output_tokens,
+            cached_tokens=cache_read,
+            cache_write_tokens=cache_write
+        )
+
+    def _generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Generate Terraform code using Anthropic Claude.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Generated Terraform code
+
+        Raises:
+            ImportError: If anthropic is not installed
+            Exception: If generation fails
+        """
+        # Shared client; created on first use
+        client = self.client
 
         try:
             # Generate content
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                system=system_message,
-                messages=[
-                    {"role": "user", "content": full_prompt}
-                ],
-                temperature=0.2,
-            )
+            response = client.messages.create(**self._build_request(prompt, context))
 
             # Extract generated code
             generated_code = response.content[0].text
@@ -84,9 +133,7 @@ Output only the Terraform code, no explanations unless specifically requested.""
 
             # Track token usage
             if hasattr(response, 'usage'):
-                self.token_usage["input"] += response.usage.input_tokens
-                self.token_usage["output"] += response.usage.output_tokens
-                self.token_usage["total"] = self.token_usage["input"] + self.token_usage["output"]
+                self._record_response_usage(response.usage)
 
             # Validate generated code
             if not self.validate_terraform_code(generated_code):
@@ -99,3 +146,33 @@ Output only the Terraform code, no explanations unless specifically requested.""
 
         except Exception as e:
             raise Exception(f"Anthropic generation failed: {str(e)}")
+
+    def _stream_terraform(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
+        """
+        Stream Terraform code from Anthropic Claude.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Yields:
+            Chunks of completion text
+
+        Raises:
+            ImportError: If anthropic is not installed
+            Exception: If generation fails
+        """
+        # Shared client; created on first use
+        client = self.client
+
+        try:
+            with client.messages.stream(**self._build_request(prompt, context)) as stream:
+                for text in stream.text_stream:
+                    yield text
+
+                # Track token usage
+                final_message = stream.get_final_message()
+                self._record_response_usage(final_message.usage)
+
+        except Exception as e:
+            raise Exception(f"Anthropic streaming failed: {str(e)}")
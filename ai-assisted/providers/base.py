@@ -4,24 +4,91 @@ Base provider class for AI-assisted Terraform generation.
 All AI provider implementations must inherit from this base class.
 """
 
+import asyncio
+import random
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+from .cache import GenerationCache
+from .hcl_validator import has_errors, validate_hcl
+from .streaming import CodeFenceFilter
+
+
+# HTTP statuses worth retrying: rate limited, overloaded or transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+
+def empty_usage() -> Dict[str, int]:
+    """
+    Zeroed token usage counters.
+
+    "cached_input" and "cache_write" count input tokens read from and written
+    to the provider's prompt cache (both are included in "input");
+    "prompt_cache_hits" and "prompt_cache_misses" count API calls.
+    """
+    return {
+        "input": 0, "output": 0, "total": 0,
+        "cached_input": 0, "cache_write": 0,
+        "prompt_cache_hits": 0, "prompt_cache_misses": 0
+    }
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Check whether a generation error is transient (rate limit, overload, timeout).
+
+    Providers wrap SDK exceptions, so the whole exception chain is inspected.
+
+    Args:
+        error: Exception raised by generate_terraform
+
+    Returns:
+        True if retrying after a backoff may succeed
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status in RETRYABLE_STATUS_CODES:
+            return True
+        name = type(error).__name__
+        if any(marker in name for marker in ("RateLimit", "Overloaded", "Timeout", "APIConnection",
+                                            "ResourceExhausted", "ServiceUnavailable")):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
 
 
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    # Whether the provider caches repeated prompt prefixes (see context_in_prefix)
+    supports_prompt_cache = False
+
+    def __init__(self, api_key: str, model: Optional[str] = None,
+                 cache: Optional[GenerationCache] = None):
         """
         Initialize the AI provider.
 
         Args:
             api_key: API key for the provider
             model: Optional model name (provider-specific default if not specified)
+            cache: Optional generation cache shared across calls
         """
         self.api_key = api_key
         self.model = model or self.get_default_model()
-        self.token_usage = {"input": 0, "output": 0, "total": 0}
+        self.token_usage = empty_usage()
+        self.cache = cache
+        self._usage_lock = threading.Lock()
+        self._call = threading.local()  # per-thread state of the current generation
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        # Where prompt-caching providers put the context: in the cached prefix
+        # (full context, identical on every call) or in the user message after
+        # the cache breakpoint (per-prompt selections, which never repeat)
+        self.context_in_prefix = True
 
     @abstractmethod
     def get_default_model(self) -> str:
@@ -33,10 +100,99 @@ class AIProvider(ABC):
         """
         pass
 
-    @abstractmethod
+    def _create_client(self):
+        """
+        Create the provider's SDK client.
+
+        Called once per provider instance (see the client property); the
+        client keeps its HTTP connections alive between calls.
+
+        Returns:
+            SDK client object
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not use an SDK client")
+
+    @property
+    def client(self):
+        """Long-lived SDK client, created on first use and shared by all calls and threads."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _warm_connection(self):
+        """Make a cheap API request so the connection is open before the first generation."""
+        pass
+
+    def warm_up(self) -> bool:
+        """
+        Create the client and open its connection ahead of the first generation.
+
+        Safe to run in a background thread. Failures are ignored; the first
+        generation then reports the real error.
+
+        Returns:
+            True if the client is ready and the connection was opened
+        """
+        try:
+            self.client
+            self._warm_connection()
+            return True
+        except Exception:
+            return False
+
     def generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
         """
-        Generate Terraform code using the AI provider.
+        Generate Terraform code, serving repeated requests from the cache.
+
+        Identical concurrent requests are deduplicated: the first one calls the
+        provider and the others wait for its cached result.
+
+        Args:
+            prompt: User's prompt describing what to generate
+            context: Dictionary of context information (repository structure, examples, etc.)
+
+        Returns:
+            Generated Terraform code
+
+        Raises:
+            LookupError: If the cache is offline and has no recorded generation
+            Exception: If generation fails
+        """
+        self._call.usage = empty_usage()
+        self._call.cache_hit = False
+        if self.cache is None:
+            return self._generate_terraform(prompt, context)
+
+        provider_name = type(self).__name__
+        key = self.cache.make_key(provider_name, self.model, prompt, context)
+
+        with self.cache.inflight_lock(key):
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._call.cache_hit = True
+                return entry["code"]
+
+            if self.cache.offline:
+                raise LookupError(
+                    f"No recorded generation for this prompt with {provider_name}/{self.model} "
+                    f"in {self.cache.cache_dir} (offline cache mode)"
+                )
+
+            code = self._generate_terraform(prompt, context)
+
+            self.cache.put(key, code, self.last_call_usage, {
+                "provider": provider_name,
+                "model": self.model,
+                "prompt": prompt
+            })
+            return code
+
+    @abstractmethod
+    def _generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Generate Terraform code by calling the provider's API (uncached).
 
         Args:
             prompt: User's prompt describing what to generate
@@ -50,29 +206,195 @@ class AIProvider(ABC):
         """
         pass
 
+    def stream_terraform(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
+        """
+        Generate Terraform code, yielding it incrementally as the provider streams.
+
+        Markdown code fences are stripped from the stream. A cached generation
+        is yielded as a single chunk. The complete code is validated and cached
+        once the stream finishes.
+
+        Args:
+            prompt: User's prompt describing what to generate
+            context: Dictionary of context information
+
+        Yields:
+            Chunks of generated Terraform code
+
+        Raises:
+            LookupError: If the cache is offline and has no recorded generation
+            ValueError: If the complete code fails validation
+            Exception: If generation fails
+        """
+        self._call.usage = empty_usage()
+        self._call.cache_hit = False
+
+        provider_name = type(self).__name__
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(provider_name, self.model, prompt, context)
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._call.cache_hit = True
+                yield entry["code"]
+                return
+            if self.cache.offline:
+                raise LookupError(
+                    f"No recorded generation for this prompt with {provider_name}/{self.model} "
+                    f"in {self.cache.cache_dir} (offline cache mode)"
+                )
+
+        fence_filter = CodeFenceFilter()
+        parts = []
+        for chunk in self._stream_terraform(prompt, context):
+            code = fence_filter.feed(chunk)
+            if code:
+                parts.append(code)
+                yield code
+        code = fence_filter.flush()
+        if code:
+            parts.append(code)
+            yield code
+
+        generated_code = "".join(parts).strip()
+        if not self.validate_terraform_code(generated_code):
+            raise ValueError(
+                "Generated code failed validation. "
+                "Please check the output and try again with more specific instructions."
+            )
+
+        if key is not None:
+            self.cache.put(key, generated_code, self.last_call_usage, {
+                "provider": provider_name,
+                "model": self.model,
+                "prompt": prompt
+            })
+
+    def _stream_terraform(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
+        """
+        Stream raw completion text from the provider's API (uncached).
+
+        Providers override this with their SDK's streaming call; the default
+        yields the whole non-streaming result at once.
+
+        Args:
+            prompt: User's prompt describing what to generate
+            context: Dictionary of context information
+
+        Yields:
+            Chunks of completion text (may include markdown fences)
+        """
+        yield self._generate_terraform(prompt, context)
+
+    async def agenerate_terraform(self, prompt: str, context: Dict[str, str],
+                                  max_retries: int = 3, backoff: float = 2.0) -> Dict:
+        """
+        Generate Terraform code without blocking the event loop.
+
+        The blocking provider call runs in a worker thread. Transient errors
+        (rate limits, overload, timeouts) are retried with exponential backoff
+        and jitter.
+
+        Args:
+            prompt: User's prompt describing what to generate
+            context: Dictionary of context information
+            max_retries: Retries for transient errors
+            backoff: Base delay in seconds, doubled on every retry
+
+        Returns:
+            Dictionary with code, token_usage (for this call) and cache_hit
+
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        def call() -> Dict:
+            code = self.generate_terraform(prompt, context)
+            return {
+                "code": code,
+                "token_usage": self.last_call_usage,
+                "cache_hit": self.last_cache_hit
+            }
+
+        for attempt in range(max_retries + 1):
+            try:
+                return await asyncio.to_thread(call)
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable_error(e):
+                    raise
+                delay = backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+                await asyncio.sleep(delay)
+
+    @property
+    def last_cache_hit(self) -> bool:
+        """Whether the last generate_terraform call on this thread was served from the cache."""
+        return getattr(self._call, "cache_hit", False)
+
+    @property
+    def last_call_usage(self) -> Dict[str, int]:
+        """Token usage of the last generate_terraform call on this thread."""
+        return dict(getattr(self._call, "usage", None) or empty_usage())
+
+    def _record_usage(self, input_tokens: int, output_tokens: int,
+                      cached_tokens: Optional[int] = None, cache_write_tokens: int = 0):
+        """
+        Add a provider response's token counts to the running totals.
+
+        Thread-safe, so concurrent generations on one provider are counted
+        correctly; the current call's usage is tracked separately per thread.
+
+        Args:
+            input_tokens: Prompt tokens reported by the provider (including cached tokens)
+            output_tokens: Completion tokens reported by the provider
+            cached_tokens: Prompt tokens served from the provider's prompt cache
+                (None if the provider did not report prompt caching)
+            cache_write_tokens: Prompt tokens written to the provider's prompt cache
+        """
+        counts = empty_usage()
+        counts["input"] = input_tokens or 0
+        counts["output"] = output_tokens or 0
+        counts["total"] = counts["input"] + counts["output"]
+        if cached_tokens is not None:
+            counts["cached_input"] = cached_tokens
+            counts["cache_write"] = cache_write_tokens or 0
+            counts["prompt_cache_hits" if cached_tokens > 0 else "prompt_cache_misses"] = 1
+
+        with self._usage_lock:
+            for key, value in counts.items():
+                self.token_usage[key] = self.token_usage.get(key, 0) + value
+
+        usage = getattr(self._call, "usage", None)
+        if usage is None:
+            usage = self._call.usage = empty_usage()
+        for key, value in counts.items():
+            usage[key] += value
+
     def get_token_usage(self) -> Dict[str, int]:
         """
         Get token usage statistics.
 
         Returns:
-            Dictionary with input, output, and total token counts
+            Dictionary with input, output and total token counts, plus
+            prompt cache counters (see empty_usage)
         """
         return self.token_usage.copy()
 
     def reset_token_usage(self):
         """Reset token usage counters."""
-        self.token_usage = {"input": 0, "output": 0, "total": 0}
+        with self._usage_lock:
+            self.token_usage = empty_usage()
 
-    def _build_full_prompt(self, prompt: str, context: Dict[str, str]) -> str:
+    def _build_context_prefix(self, context: Dict[str, str]) -> str:
         """
-        Build the full prompt including context.
+        Build the static context section sent ahead of every request.
+
+        The text depends only on the context files, never on the prompt, so
+        providers can send it as a stable prefix that their prompt caches reuse.
 
         Args:
-            prompt: User's prompt
             context: Context dictionary
 
         Returns:
-            Complete prompt with context prepended
+            Context sections in a fixed order (empty if there is no context)
         """
         context_str = ""
 
@@ -85,11 +407,60 @@ class AIProvider(ABC):
         if "resource_guide" in context:
             context_str += f"# Resource Guide\n\n{context['resource_guide']}\n\n"
 
-        context_str += "---\n\n# USER REQUEST\n\n"
-        context_str += prompt
-
         return context_str
 
+    def _build_user_request(self, prompt: str) -> str:
+        """
+        Build the per-request part of the prompt.
+
+        Args:
+            prompt: User's prompt
+
+        Returns:
+            User request section
+        """
+        return f"# USER REQUEST\n\n{prompt}"
+
+    def _build_cached_prefix(self, context: Dict[str, str]) -> str:
+        """
+        Context to send in the cached prefix (empty when it goes in the request).
+
+        Args:
+            context: Context dictionary
+
+        Returns:
+            Context prefix, or "" if context_in_prefix is off
+        """
+        return self._build_context_prefix(context) if self.context_in_prefix else ""
+
+    def _build_request_message(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Build the user message sent after the cached prefix.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            User request, preceded by the context if it is not in the prefix
+        """
+        if self.context_in_prefix:
+            return self._build_user_request(prompt)
+        return self._build_full_prompt(prompt, context)
+
+    def _build_full_prompt(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Build the full prompt including context.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Complete prompt with context prepended
+        """
+        return f"{self._build_context_prefix(context)}---\n\n{self._build_user_request(prompt)}"
+
     def validate_terraform_code(self, code: str) -> bool:
         """
         Perform basic validation on generated Terraform code.
@@ -108,9 +479,6 @@ class AIProvider(ABC):
         if "resource" not in code and "data" not in code:
             return False
 
-        # Check for improperly escaped template strings (should be $$ not $)
-        # Allow ${var. and ${local. but flag ${source. without $$
-        if "${source." in code and "$${source." not in code:
-            return False
-
-        return True
+        # Parse the HCL and flag unescaped Okta expressions such as ${source.login}
+        # (should be $${source.login}). Schema warnings are reported by generate.py.
+        return not has_errors(validate_hcl(code, check_schema=False))
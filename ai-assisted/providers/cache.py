@@ -0,0 +1,184 @@
+"""
+On-disk generation cache for AI-assisted Terraform generation.
+
+Generations are content-addressed by (provider, model, prompt, context hash),
+so a repeated prompt returns the recorded output without calling the API.
+The cache directory is bounded in size; the least recently used entries are
+evicted first. Recorded entries can also be replayed offline.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "generations"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def context_hash(context: Dict[str, str]) -> str:
+    """
+    Stable hash of a context dictionary.
+
+    Args:
+        context: Context dictionary (as returned by load_context_files)
+
+    Returns:
+        Hex digest that changes whenever any context file changes
+    """
+    encoded = json.dumps(context, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """Size-bounded, content-addressed cache of generated Terraform code."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 offline: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache entries (created on first write)
+            max_bytes: Evict least recently used entries beyond this total size
+            offline: Only replay recorded generations; misses are errors
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+
+    def make_key(self, provider: str, model: str, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Build the cache key for a generation.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Hex digest identifying the generation
+        """
+        material = json.dumps(
+            [provider, model, prompt, context_hash(context)],
+            separators=(",", ":")
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached generation.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached entry with "code" and "token_usage", or None on a miss
+        """
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, code: str, token_usage: Dict[str, int], metadata: Optional[Dict] = None):
+        """
+        Record a generation and evict old entries if over the size bound.
+
+        Args:
+            key: Cache key from make_key
+            code: Generated Terraform code
+            token_usage: Tokens spent producing the code
+            metadata: Optional extra fields (provider, model, prompt)
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "code": code,
+            "token_usage": token_usage,
+            "created_at": time.time(),
+            **(metadata or {})
+        }
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, indent=2))
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+    def inflight_lock(self, key: str) -> threading.Lock:
+        """
+        Lock shared by concurrent generations of the same key.
+
+        Holding it while generating means identical in-flight requests wait
+        for the first one and then hit the cache instead of calling the API.
+        """
+        with self._lock:
+            return self._inflight.setdefault(key, threading.Lock())
+
+    def clear(self):
+        """Remove all cache entries."""
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, entries and size in bytes
+        """
+        paths = list(self.cache_dir.glob("*.json")) if self.cache_dir.exists() else []
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(paths),
+            "bytes": sum(p.stat().st_size for p in paths if p.exists())
+        }
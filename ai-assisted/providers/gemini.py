@@ -2,10 +2,26 @@
 Google Gemini provider for AI-assisted Terraform generation.
 """
 
-from typing import Dict
+from typing import Dict, Iterator
 from .base import AIProvider
 
 
+# Specific instructions for Terraform generation
+SYSTEM_INSTRUCTION = """You are an expert Terraform developer specializing in Okta infrastructure.
+
+Generate clean, production-ready Terraform code following these rules:
+1. Use exact patterns from the provided examples
+2. Always escape template strings with $$ (e.g., "$${source.login}")
+3. Set status = "ACTIVE" for all resources
+4. Include descriptive comments
+5. Follow HCL formatting conventions
+6. Use proper resource naming (snake_case)
+7. Include depends_on where appropriate
+8. Generate only valid Terraform HCL code
+
+Output only the Terraform code, no explanations unless specifically requested."""
+
+
 class GeminiProvider(AIProvider):
     """Google Gemini API provider."""
 
@@ -13,20 +29,12 @@ class GeminiProvider(AIProvider):
         """Get default Gemini model."""
         return "gemini-1.5-pro"
 
-    def generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+    def _configure(self):
         """
-        Generate Terraform code using Google Gemini.
-
-        Args:
-            prompt: User's prompt
-            context: Context dictionary
-
-        Returns:
-            Generated Terraform code
+        Import and configure the Gemini SDK.
 
         Raises:
             ImportError: If google-generativeai is not installed
-            Exception: If generation fails
         """
         try:
             import google.generativeai as genai
@@ -36,34 +44,52 @@ class GeminiProvider(AIProvider):
                 "Install with: pip install google-generativeai"
             )
 
-        # Configure Gemini
         genai.configure(api_key=self.api_key)
+        return genai
 
-        # Build full prompt with context
-        full_prompt = self._build_full_prompt(prompt, context)
+    def _create_client(self):
+        """
+        Configure the SDK once and create the model with the system instruction
+        (reused for every call; see AIProvider.client).
 
-        # Add specific instructions for Terraform generation
-        system_instruction = """You are an expert Terraform developer specializing in Okta infrastructure.
+        Raises:
+            ImportError: If google-generativeai is not installed
+        """
+        genai = self._configure()
+        return genai.GenerativeModel(
+            model_name=self.model,
+            system_instruction=SYSTEM_INSTRUCTION
+        )
 
-Generate clean, production-ready Terraform code following these rules:
-1. Use exact patterns from the provided examples
-2. Always escape template strings with $$ (e.g., "$${source.login}")
-3. Set status = "ACTIVE" for all resources
-4. Include descriptive comments
-5. Follow HCL formatting conventions
-6. Use proper resource naming (snake_case)
-7. Include depends_on where appropriate
-8. Generate only valid Terraform HCL code
+    def _warm_connection(self):
+        """Open the API connection with a model lookup (no tokens are used)."""
+        import google.generativeai as genai
 
-Output only the Terraform code, no explanations unless specifically requested."""
+        name = self.model if self.model.startswith("models/") else f"models/{self.model}"
+        genai.get_model(name)
 
-        try:
-            # Create model with system instruction
-            model = genai.GenerativeModel(
-                model_name=self.model,
-                system_instruction=system_instruction
-            )
+    def _generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Generate Terraform code using Google Gemini.
 
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Generated Terraform code
+
+        Raises:
+            ImportError: If google-generativeai is not installed
+            Exception: If generation fails
+        """
+        # Shared model; configured and created on first use
+        model = self.client
+
+        # Build full prompt with context
+        full_prompt = self._build_full_prompt(prompt, context)
+
+        try:
             # Generate content
             response = model.generate_content(full_prompt)
 
@@ -83,9 +109,10 @@ Output only the Terraform code, no explanations unless specifically requested.""
 
             # Track token usage if available
             if hasattr(response, 'usage_metadata'):
-                self.token_usage["input"] += response.usage_metadata.prompt_token_count
-                self.token_usage["output"] += response.usage_metadata.candidates_token_count
-                self.token_usage["total"] = self.token_usage["input"] + self.token_usage["output"]
+                self._record_usage(
+                    response.usage_metadata.prompt_token_count,
+                    response.usage_metadata.candidates_token_count
+                )
 
             # Validate generated code
             if not self.validate_terraform_code(generated_code):
@@ -99,41 +126,52 @@ Output only the Terraform code, no explanations unless specifically requested.""
         except Exception as e:
             raise Exception(f"Gemini generation failed: {str(e)}")
 
-    def generate_with_streaming(self, prompt: str, context: Dict[str, str]):
+    def _stream_terraform(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
         """
-        Generate Terraform code with streaming response.
+        Stream Terraform code from Google Gemini.
 
         Args:
             prompt: User's prompt
             context: Context dictionary
 
         Yields:
-            Chunks of generated text
+            Chunks of completion text
 
         Raises:
             ImportError: If google-generativeai is not installed
+            Exception: If generation fails
         """
+        model = self.client
+        full_prompt = self._build_full_prompt(prompt, context)
+
         try:
-            import google.generativeai as genai
-        except ImportError:
-            raise ImportError(
-                "google-generativeai package is required for Gemini provider.\n"
-                "Install with: pip install google-generativeai"
-            )
+            response = model.generate_content(full_prompt, stream=True)
 
-        genai.configure(api_key=self.api_key)
-        full_prompt = self._build_full_prompt(prompt, context)
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
 
-        system_instruction = """You are an expert Terraform developer specializing in Okta infrastructure.
-Generate clean, production-ready Terraform code following the provided examples and patterns."""
+            # Track token usage if available (complete once the stream is consumed)
+            if getattr(response, 'usage_metadata', None):
+                self._record_usage(
+                    response.usage_metadata.prompt_token_count,
+                    response.usage_metadata.candidates_token_count
+                )
 
-        model = genai.GenerativeModel(
-            model_name=self.model,
-            system_instruction=system_instruction
-        )
+        except Exception as e:
+            raise Exception(f"Gemini streaming failed: {str(e)}")
+
+    def generate_with_streaming(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
+        """
+        Generate Terraform code with streaming response.
 
-        response = model.generate_content(full_prompt, stream=True)
+        Kept for backwards compatibility; use stream_terraform.
 
-        for chunk in response:
-            if chunk.text:
-                yield chunk.text
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Yields:
+            Chunks of generated text
+        """
+        return self.stream_terraform(prompt, context)
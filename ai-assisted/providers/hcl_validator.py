@@ -0,0 +1,798 @@
+"""
+In-process HCL validator for generated Terraform code.
+
+Parses HCL (attributes, blocks, expressions, string templates and heredocs)
+without calling the terraform binary, and checks the result against a bundled
+snapshot of the Okta provider schema:
+
+- Syntax errors (unbalanced braces, bad expressions, unterminated strings)
+- Unknown okta_* resource and data source types, attributes and nested blocks
+  (warnings; the snapshot may lag the provider)
+- Missing required attributes
+- Duplicate attributes and duplicate resource addresses
+- Okta expression language references such as ${source.login} that must be
+  escaped as $${source.login}
+
+Usage:
+    python providers/hcl_validator.py generated/users.tf
+    python providers/hcl_validator.py --update-schema schema.json   # from `terraform providers schema -json`
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+SCHEMA_PATH = Path(__file__).parent.parent / "schema" / "okta_provider_schema.json"
+
+# Roots of the Okta expression language; in HCL these must be escaped as $${...}
+OKTA_EL_ROOTS = {"source", "user", "appuser", "idpuser"}
+
+META_ARGUMENTS = {"count", "for_each", "depends_on", "provider"}
+META_BLOCKS = {"lifecycle", "provisioner", "connection", "dynamic"}
+
+# Top-level block types and the number of labels each takes
+TOP_LEVEL_BLOCKS = {
+    "resource": 2, "data": 2, "variable": 1, "output": 1, "module": 1, "provider": 1,
+    "locals": 0, "terraform": 0, "import": 0, "moved": 0, "removed": 0, "check": 1
+}
+
+PUNCTUATION = ["...", "==", "!=", "<=", ">=", "&&", "||", "=>",
+               "{", "}", "[", "]", "(", ")", "=", ",", ".", ":", "?", "!", "<", ">",
+               "+", "-", "*", "/", "%"]
+
+BINARY_PRECEDENCE = {
+    "||": 1, "&&": 2, "==": 3, "!=": 3,
+    "<": 4, ">": 4, "<=": 4, ">=": 4,
+    "+": 5, "-": 5, "*": 6, "/": 6, "%": 6
+}
+
+IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+NUMBER = re.compile(r"[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+QUOTED_LITERAL = re.compile(r'[^"\\\n$%]+')
+HEREDOC_LITERAL = re.compile(r"[^$%]+")
+
+
+class HCLSyntaxError(Exception):
+    """Raised for malformed HCL."""
+
+    def __init__(self, message: str, line: int, column: int):
+        super().__init__(f"line {line}, column {column}: {message}")
+        self.message = message
+        self.line = line
+        self.column = column
+
+
+class Token:
+    __slots__ = ("kind", "value", "line", "column")
+
+    def __init__(self, kind: str, value, line: int, column: int):
+        self.kind = kind      # IDENT, NUMBER, STRING, HEREDOC, PUNCT, NEWLINE, EOF
+        self.value = value    # for STRING/HEREDOC: list of template parts
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.line}:{self.column})"
+
+
+# ==================== Lexer ====================
+
+class Lexer:
+    """Tokenizes HCL source. Template interpolations are lexed into nested token lists."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.pos = 0
+        self.line = 1
+        self.column = 1
+
+    def _advance(self, count: int = 1):
+        text = self.source[self.pos:self.pos + count]
+        newlines = text.count("\n")
+        if newlines:
+            self.line += newlines
+            self.column = len(text) - text.rfind("\n")
+        else:
+            self.column += len(text)
+        self.pos += count
+
+    def _error(self, message: str):
+        raise HCLSyntaxError(message, self.line, self.column)
+
+    def tokenize(self, limit: Optional[int] = None, closing: Optional[str] = None) -> List[Token]:
+        """
+        Tokenize until `limit` (end of source by default).
+
+        When `closing` is "}", stop at the brace that closes a template
+        interpolation and consume it.
+        """
+        limit = len(self.source) if limit is None else limit
+        tokens: List[Token] = []
+        depth = 0
+
+        while self.pos < limit:
+            char = self.source[self.pos]
+
+            if char in " \t\r" or (closing and char == "~"):
+                self._advance()  # "~" is a template strip marker
+            elif char == "\n":
+                if tokens and tokens[-1].kind != "NEWLINE":
+                    tokens.append(Token("NEWLINE", "\n", self.line, self.column))
+                self._advance()
+            elif char == "#" or self.source.startswith("//", self.pos):
+                while self.pos < limit and self.source[self.pos] != "\n":
+                    self._advance()
+            elif self.source.startswith("/*", self.pos):
+                end = self.source.find("*/", self.pos + 2)
+                if end == -1:
+                    self._error("unterminated block comment")
+                self._advance(end + 2 - self.pos)
+            elif char == '"':
+                tokens.append(self._string())
+            elif self.source.startswith("<<", self.pos) and re.match(r"<<-?[A-Za-z_]", self.source[self.pos:self.pos + 4]):
+                tokens.append(self._heredoc())
+            elif char.isdigit():
+                match = NUMBER.match(self.source, self.pos)
+                tokens.append(Token("NUMBER", match.group(0), self.line, self.column))
+                self._advance(len(match.group(0)))
+            elif char.isalpha() or char == "_":
+                match = IDENT.match(self.source, self.pos)
+                tokens.append(Token("IDENT", match.group(0), self.line, self.column))
+                self._advance(len(match.group(0)))
+            else:
+                for punct in PUNCTUATION:
+                    if self.source.startswith(punct, self.pos):
+                        break
+                else:
+                    self._error(f"unexpected character {char!r}")
+
+                if closing and punct == "}" and depth == 0:
+                    self._advance()
+                    return tokens
+                if punct == "{":
+                    depth += 1
+                elif punct == "}":
+                    depth -= 1
+                tokens.append(Token("PUNCT", punct, self.line, self.column))
+                self._advance(len(punct))
+
+        if closing:
+            self._error("unterminated template interpolation")
+        tokens.append(Token("EOF", None, self.line, self.column))
+        return tokens
+
+    def _template(self, limit: int, quoted: bool) -> List[Tuple]:
+        """
+        Scan template content up to the closing quote (quoted) or `limit` (heredoc).
+
+        Returns a list of parts: ("literal", text), ("interp", tokens, line, column)
+        and ("directive", tokens, line, column).
+        """
+        parts: List[Tuple] = []
+        literal = []
+
+        while True:
+            if self.pos >= limit:
+                if quoted:
+                    self._error("unterminated string")
+                break
+
+            char = self.source[self.pos]
+            if quoted and char == '"':
+                self._advance()
+                break
+            if quoted and char == "\n":
+                self._error("unterminated string (newline in quoted string)")
+
+            if quoted and char == "\\":
+                literal.append(self.source[self.pos:self.pos + 2])
+                self._advance(2)
+            elif self.source.startswith("$${", self.pos) or self.source.startswith("%%{", self.pos):
+                literal.append(self.source[self.pos + 1:self.pos + 3])
+                self._advance(3)
+            elif self.source.startswith("${", self.pos) or self.source.startswith("%{", self.pos):
+                kind = "interp" if char == "$" else "directive"
+                line, column = self.line, self.column
+                if literal:
+                    parts.append(("literal", "".join(literal)))
+                    literal = []
+                self._advance(2)
+                parts.append((kind, self.tokenize(limit, closing="}"), line, column))
+            else:
+                match = (QUOTED_LITERAL if quoted else HEREDOC_LITERAL).match(self.source, self.pos, limit)
+                text = match.group(0) if match else char
+                literal.append(text)
+                self._advance(len(text))
+
+        if literal:
+            parts.append(("literal", "".join(literal)))
+        return parts
+
+    def _string(self) -> Token:
+        line, column = self.line, self.column
+        self._advance()
+        return Token("STRING", self._template(len(self.source), quoted=True), line, column)
+
+    def _heredoc(self) -> Token:
+        line, column = self.line, self.column
+        match = re.match(r"<<-?([A-Za-z_][A-Za-z0-9_-]*)[ \t]*\r?\n", self.source[self.pos:])
+        if not match:
+            self._error("heredoc marker must be followed by a newline")
+        marker = match.group(1)
+        self._advance(len(match.group(0)))
+
+        end = re.compile(rf"^[ \t]*{re.escape(marker)}[ \t]*$", re.MULTILINE).search(self.source, self.pos)
+        if not end:
+            self._error(f"unterminated heredoc (missing closing {marker})")
+
+        parts = self._template(end.start(), quoted=False)
+        self._advance(end.end() - self.pos)
+        return Token("HEREDOC", parts, line, column)
+
+
+# ==================== Parser ====================
+
+class Node:
+    """Parsed block or attribute."""
+
+    __slots__ = ("kind", "name", "labels", "body", "expr", "line", "column")
+
+    def __init__(self, kind: str, name: str, line: int, column: int,
+                 labels: Optional[List[str]] = None, body: Optional[List["Node"]] = None,
+                 expr: Optional[Dict] = None):
+        self.kind = kind        # "block" or "attribute"
+        self.name = name
+        self.labels = labels or []
+        self.body = body or []
+        self.expr = expr        # for attributes: {"refs": [...]} collected references
+        self.line = line
+        self.column = column
+
+
+class Parser:
+    """Recursive-descent parser for HCL bodies and expressions."""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.index = 0
+        self.refs: List[Tuple[str, List[str], int, int]] = []
+        self.scopes: List[set] = []
+
+    # ----- token helpers -----
+
+    def peek(self, skip_newlines: bool = False) -> Token:
+        if skip_newlines:
+            while self.tokens[self.index].kind == "NEWLINE":
+                self.index += 1
+        return self.tokens[self.index]
+
+    def next(self, skip_newlines: bool = False) -> Token:
+        token = self.peek(skip_newlines)
+        if token.kind != "EOF":
+            self.index += 1
+        return token
+
+    def at(self, value: str, skip_newlines: bool = False) -> bool:
+        token = self.peek(skip_newlines)
+        return token.kind == "PUNCT" and token.value == value
+
+    def expect(self, value: str, skip_newlines: bool = False) -> Token:
+        token = self.next(skip_newlines)
+        if token.kind != "PUNCT" or token.value != value:
+            self.error(token, f"expected '{value}'")
+        return token
+
+    def error(self, token: Token, message: str):
+        found = "end of input" if token.kind == "EOF" else (
+            "newline" if token.kind == "NEWLINE" else repr(token.value if token.kind != "STRING" else '"..."')
+        )
+        raise HCLSyntaxError(f"{message}, found {found}", token.line, token.column)
+
+    # ----- bodies -----
+
+    def parse_body(self, closing: bool) -> List[Node]:
+        """Parse attributes and blocks until '}' (closing) or end of input."""
+        nodes: List[Node] = []
+        while True:
+            token = self.peek(skip_newlines=True)
+            if token.kind == "EOF":
+                if closing:
+                    self.error(token, "unclosed block")
+                return nodes
+            if closing and token.kind == "PUNCT" and token.value == "}":
+                self.next()
+                return nodes
+            if token.kind != "IDENT":
+                self.error(token, "expected attribute or block name")
+
+            self.next()
+            follower = self.peek()
+            if follower.kind == "PUNCT" and follower.value == "=":
+                self.next()
+                ref_start = len(self.refs)
+                self.parse_expression()
+                node = Node("attribute", token.value, token.line, token.column,
+                            expr={"refs": self.refs[ref_start:]})
+            else:
+                labels = []
+                while self.peek().kind in ("STRING", "IDENT"):
+                    label = self.next()
+                    if label.kind == "STRING":
+                        if any(part[0] != "literal" for part in label.value):
+                            self.error(label, "block labels cannot contain template interpolation")
+                        labels.append("".join(part[1] for part in label.value))
+                    else:
+                        labels.append(label.value)
+                self.expect("{")
+                node = Node("block", token.value, token.line, token.column,
+                            labels=labels, body=self.parse_body(closing=True))
+
+            nodes.append(node)
+            end = self.peek()
+            if end.kind == "NEWLINE" or end.kind == "EOF" or (end.kind == "PUNCT" and end.value == "}"):
+                continue
+            self.error(end, "expected newline after " + ("attribute" if node.kind == "attribute" else "block"))
+
+    # ----- expressions -----
+
+    def parse_expression(self, skip_newlines: bool = False):
+        self.parse_binary(0, skip_newlines)
+        if self.at("?", skip_newlines):
+            self.next()
+            self.parse_expression(skip_newlines=True)
+            self.expect(":", skip_newlines=True)
+            self.parse_expression(skip_newlines)
+
+    def parse_binary(self, min_precedence: int, skip_newlines: bool):
+        self.parse_unary(skip_newlines)
+        while True:
+            token = self.peek(skip_newlines)
+            precedence = BINARY_PRECEDENCE.get(token.value) if token.kind == "PUNCT" else None
+            if precedence is None or precedence <= min_precedence:
+                return
+            self.next()
+            self.parse_binary(precedence, skip_newlines)
+
+    def parse_unary(self, skip_newlines: bool):
+        if self.at("!", skip_newlines) or self.at("-", skip_newlines):
+            self.next(skip_newlines)
+            self.parse_unary(skip_newlines)
+            return
+        self.parse_postfix(skip_newlines)
+
+    def parse_postfix(self, skip_newlines: bool):
+        traversal = self.parse_primary(skip_newlines)
+        while True:
+            if self.at("."):
+                self.next()
+                token = self.next()
+                if token.kind == "IDENT" or token.kind == "NUMBER":
+                    if traversal is not None:
+                        traversal.append(token.value)
+                elif token.kind == "PUNCT" and token.value == "*":
+                    traversal = None
+                else:
+                    self.error(token, "expected attribute name after '.'")
+            elif self.at("["):
+                self.next()
+                if self.at("*", skip_newlines=True):
+                    self.next()
+                else:
+                    self.parse_expression(skip_newlines=True)
+                self.expect("]", skip_newlines=True)
+                traversal = None
+            else:
+                return
+
+    def parse_primary(self, skip_newlines: bool) -> Optional[List[str]]:
+        """Parse a primary expression; returns the traversal path list for variable references."""
+        token = self.next(skip_newlines)
+
+        if token.kind == "NUMBER":
+            return None
+        if token.kind in ("STRING", "HEREDOC"):
+            self.parse_template(token.value)
+            return None
+        if token.kind == "IDENT":
+            if token.value in ("true", "false", "null"):
+                return None
+            if self.at("("):
+                self.next()
+                self.parse_call_arguments()
+                return None
+            path = [token.value]
+            in_scope = any(token.value in scope for scope in self.scopes)
+            if not in_scope:
+                self.refs.append((token.value, path, token.line, token.column))
+            return path
+        if token.kind == "PUNCT":
+            if token.value == "(":
+                self.parse_expression(skip_newlines=True)
+                self.expect(")", skip_newlines=True)
+                return None
+            if token.value == "[":
+                self.parse_tuple()
+                return None
+            if token.value == "{":
+                self.parse_object()
+                return None
+
+        self.error(token, "expected expression")
+
+    def parse_call_arguments(self):
+        if self.at(")", skip_newlines=True):
+            self.next(skip_newlines=True)
+            return
+        while True:
+            self.parse_expression(skip_newlines=True)
+            if self.at("...", skip_newlines=True):
+                self.next(skip_newlines=True)
+            if self.at(",", skip_newlines=True):
+                self.next(skip_newlines=True)
+                if self.at(")", skip_newlines=True):
+                    self.next(skip_newlines=True)
+                    return
+                continue
+            self.expect(")", skip_newlines=True)
+            return
+
+    def parse_for_header(self) -> set:
+        """Parse 'for a, b in expr :' after the 'for' keyword; returns loop variable names."""
+        names = set()
+        token = self.next(skip_newlines=True)
+        if token.kind != "IDENT":
+            self.error(token, "expected loop variable")
+        names.add(token.value)
+        if self.at(",", skip_newlines=True):
+            self.next(skip_newlines=True)
+            token = self.next(skip_newlines=True)
+            if token.kind != "IDENT":
+                self.error(token, "expected loop variable")
+            names.add(token.value)
+        token = self.next(skip_newlines=True)
+        if token.kind != "IDENT" or token.value != "in":
+            self.error(token, "expected 'in'")
+        self.parse_expression(skip_newlines=True)
+        self.expect(":", skip_newlines=True)
+        return names
+
+    def _is_for(self) -> bool:
+        token = self.peek(skip_newlines=True)
+        return token.kind == "IDENT" and token.value == "for"
+
+    def parse_tuple(self):
+        if self._is_for():
+            self.next(skip_newlines=True)
+            self.scopes.append(self.parse_for_header())
+            self.parse_expression(skip_newlines=True)
+            self._parse_for_condition()
+            self.scopes.pop()
+            self.expect("]", skip_newlines=True)
+            return
+
+        while not self.at("]", skip_newlines=True):
+            self.parse_expression(skip_newlines=True)
+            if self.at(",", skip_newlines=True):
+                self.next(skip_newlines=True)
+            elif not self.at("]", skip_newlines=True):
+                self.error(self.peek(True), "expected ',' or ']' in list")
+        self.next(skip_newlines=True)
+
+    def parse_object(self):
+        if self._is_for():
+            self.next(skip_newlines=True)
+            self.scopes.append(self.parse_for_header())
+            self.parse_expression(skip_newlines=True)
+            self.expect("=>", skip_newlines=True)
+            self.parse_expression(skip_newlines=True)
+            if self.at("...", skip_newlines=True):
+                self.next(skip_newlines=True)
+            self._parse_for_condition()
+            self.scopes.pop()
+            self.expect("}", skip_newlines=True)
+            return
+
+        while not self.at("}", skip_newlines=True):
+            key = self.peek(skip_newlines=True)
+            if key.kind == "IDENT" and self.tokens[self.index + 1].kind == "PUNCT" \
+                    and self.tokens[self.index + 1].value in ("=", ":"):
+                self.next()  # Bare identifier key, not a variable reference
+            else:
+                self.parse_expression()
+            separator = self.next()
+            if separator.kind != "PUNCT" or separator.value not in ("=", ":"):
+                self.error(separator, "expected '=' or ':' in object")
+            # Newlines separate object items, so the value must not run past one
+            self.peek(skip_newlines=True)
+            self.parse_expression()
+            if self.at(","):
+                self.next()
+            elif self.peek().kind == "NEWLINE":
+                self.peek(skip_newlines=True)
+            elif not self.at("}"):
+                self.error(self.peek(), "expected newline, ',' or '}' in object")
+        self.next(skip_newlines=True)
+
+    def _parse_for_condition(self):
+        token = self.peek(skip_newlines=True)
+        if token.kind == "IDENT" and token.value == "if":
+            self.next(skip_newlines=True)
+            self.parse_expression(skip_newlines=True)
+
+    def parse_template(self, parts: List[Tuple]):
+        """Parse interpolations inside a string or heredoc."""
+        for part in parts:
+            if part[0] == "interp":
+                tokens = [t for t in part[1] if t.kind != "NEWLINE"]
+                tokens.append(Token("EOF", None, part[2], part[3]))
+                sub = Parser(tokens)
+                sub.scopes = list(self.scopes)
+                sub.parse_expression(skip_newlines=True)
+                if sub.peek(True).kind != "EOF":
+                    sub.error(sub.peek(True), "unexpected token in template interpolation")
+                self.refs.extend(ref[:4] + (True,) for ref in sub.refs)
+            elif part[0] == "directive":
+                # %{ if ... } / %{ for ... } / %{ endif } - checked loosely
+                pass
+
+
+def parse_hcl(source: str) -> List[Node]:
+    """
+    Parse HCL source into a list of top-level nodes.
+
+    Args:
+        source: HCL text
+
+    Returns:
+        Top-level blocks and attributes
+
+    Raises:
+        HCLSyntaxError: If the source is not valid HCL
+    """
+    tokens = Lexer(source).tokenize()
+    parser = Parser(tokens)
+    nodes = parser.parse_body(closing=False)
+    return nodes
+
+
+# ==================== Validation ====================
+
+_schema_cache: Dict[str, Dict] = {}
+
+
+def load_schema(path: Optional[Path] = None) -> Dict:
+    """
+    Load the bundled Okta provider schema snapshot (cached per path).
+
+    Args:
+        path: Schema file (default: ai-assisted/schema/okta_provider_schema.json)
+
+    Returns:
+        Schema dictionary with "resources" and "data_sources"
+    """
+    path = Path(path) if path else SCHEMA_PATH
+    key = str(path)
+    if key not in _schema_cache:
+        try:
+            _schema_cache[key] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            _schema_cache[key] = {"resources": {}, "data_sources": {}}
+    return _schema_cache[key]
+
+
+def _issue(severity: str, line: int, column: int, message: str) -> Dict:
+    return {"severity": severity, "line": line, "column": column, "message": message}
+
+
+def _collect_refs(nodes: List[Node], dynamic_iterators: Optional[set] = None):
+    """Yield (attribute, ref) for every reference in a body, honoring dynamic block iterators."""
+    dynamic_iterators = dynamic_iterators or set()
+    for node in nodes:
+        if node.kind == "attribute":
+            for ref in node.expr["refs"]:
+                if ref[0] not in dynamic_iterators:
+                    yield node, ref
+        else:
+            iterators = set(dynamic_iterators)
+            if node.name == "dynamic" and node.labels:
+                iterators.add(node.labels[0])
+                for child in node.body:
+                    if child.kind == "attribute" and child.name == "iterator":
+                        iterators.update(ref[0] for ref in child.expr["refs"])
+            yield from _collect_refs(node.body, iterators)
+
+
+def _check_body(nodes: List[Node], schema: Optional[Dict], address: str, issues: List[Dict], line: int = 0):
+    """Check duplicates and, when the schema describes this body, attribute and block names."""
+    seen = {}
+    for node in nodes:
+        if node.kind == "attribute":
+            if node.name in seen:
+                issues.append(_issue("error", node.line, node.column,
+                                     f"{address}: duplicate attribute '{node.name}' "
+                                     f"(first set on line {seen[node.name]})"))
+            seen[node.name] = node.line
+
+    if not schema or "attributes" not in schema:
+        return
+
+    attributes = set(schema.get("attributes", []))
+    blocks = schema.get("blocks", {})
+
+    for node in nodes:
+        if node.kind == "attribute":
+            if node.name not in attributes and node.name not in META_ARGUMENTS:
+                hint = " (it is a nested block, not an attribute)" if node.name in blocks else ""
+                issues.append(_issue("warning", node.line, node.column,
+                                     f"{address}: unknown attribute '{node.name}'{hint}"))
+        else:
+            if node.name == "dynamic":
+                block_name = node.labels[0] if node.labels else ""
+                content = next((c for c in node.body if c.kind == "block" and c.name == "content"), None)
+                if block_name not in blocks:
+                    issues.append(_issue("warning", node.line, node.column,
+                                         f"{address}: unknown nested block '{block_name}'"))
+                elif content is not None:
+                    _check_body(content.body, blocks[block_name], f"{address}.{block_name}", issues, node.line)
+            elif node.name in blocks:
+                _check_body(node.body, blocks[node.name], f"{address}.{node.name}", issues, node.line)
+            elif node.name not in META_BLOCKS:
+                hint = " (it is an attribute; use name = ...)" if node.name in attributes else ""
+                issues.append(_issue("warning", node.line, node.column,
+                                     f"{address}: unknown nested block '{node.name}'{hint}"))
+
+    present = {node.name for node in nodes}
+    for required in schema.get("required", []):
+        if required not in present and "for_each" not in present:
+            issues.append(_issue("error", line, 0,
+                                 f"{address}: missing required attribute '{required}'"))
+
+
+def validate_hcl(code: str, check_schema: bool = True, schema: Optional[Dict] = None) -> List[Dict]:
+    """
+    Validate Terraform HCL code.
+
+    Args:
+        code: HCL source
+        check_schema: Check okta_* types and attributes against the schema snapshot
+        schema: Schema override (default: bundled snapshot)
+
+    Returns:
+        List of issues (dicts with severity "error" or "warning", line, column, message)
+    """
+    try:
+        nodes = parse_hcl(code)
+    except HCLSyntaxError as e:
+        return [_issue("error", e.line, e.column, f"syntax error: {e.message}")]
+
+    issues: List[Dict] = []
+    schema = schema or (load_schema() if check_schema else None)
+    addresses = {}
+
+    for node in nodes:
+        if node.kind == "attribute":
+            issues.append(_issue("error", node.line, node.column,
+                                 f"unexpected top-level attribute '{node.name}' (wrap it in locals {{}})"))
+            continue
+
+        expected_labels = TOP_LEVEL_BLOCKS.get(node.name)
+        if expected_labels is None:
+            issues.append(_issue("error", node.line, node.column, f"unknown top-level block '{node.name}'"))
+            continue
+        if len(node.labels) != expected_labels:
+            issues.append(_issue("error", node.line, node.column,
+                                 f"'{node.name}' block needs {expected_labels} label(s), got {len(node.labels)}"))
+            continue
+
+        address = ".".join([node.name] + node.labels) if node.name != "resource" else ".".join(node.labels)
+        if node.name in ("resource", "data", "module", "variable", "output"):
+            if address in addresses:
+                issues.append(_issue("error", node.line, node.column,
+                                     f"duplicate {node.name} '{address}' (first declared on line {addresses[address]})"))
+            addresses[address] = node.line
+
+        type_schema = None
+        if check_schema and node.name in ("resource", "data") and node.labels[0].startswith("okta_"):
+            collection = schema.get("resources" if node.name == "resource" else "data_sources", {})
+            type_schema = collection.get(node.labels[0])
+            if type_schema is None:
+                kind = "resource" if node.name == "resource" else "data source"
+                issues.append(_issue("warning", node.line, node.column,
+                                     f"unknown Okta {kind} type '{node.labels[0]}' (not in the schema snapshot)"))
+
+        _check_body(node.body, type_schema, address, issues, node.line)
+
+    for attribute, ref in _collect_refs(nodes):
+        root, path, line, column = ref[:4]
+        if root in OKTA_EL_ROOTS:
+            expression = ".".join(path)
+            where = "template" if len(ref) > 4 else "expression"
+            issues.append(_issue("error", line, column,
+                                 f"'{attribute.name}' references Okta expression '{expression}' in a Terraform "
+                                 f"{where}; escape it as \"$${{{expression}}}\""))
+
+    return sorted(issues, key=lambda issue: (issue["line"], issue["column"]))
+
+
+def has_errors(issues: List[Dict]) -> bool:
+    return any(issue["severity"] == "error" for issue in issues)
+
+
+def format_issue(issue: Dict) -> str:
+    icon = "❌" if issue["severity"] == "error" else "⚠️ "
+    return f"{icon} line {issue['line']}: {issue['message']}"
+
+
+# ==================== Schema snapshot ====================
+
+def _compact_block(block: Dict) -> Dict:
+    """Reduce a `terraform providers schema -json` block to names and required attributes."""
+    attributes = block.get("attributes", {})
+    return {
+        "attributes": sorted(attributes),
+        "required": sorted(name for name, attr in attributes.items() if attr.get("required")),
+        "blocks": {
+            name: _compact_block(nested.get("block", {}))
+            for name, nested in sorted(block.get("block_types", {}).items())
+        }
+    }
+
+
+def compact_provider_schema(provider_schemas: Dict, provider: str = "registry.terraform.io/okta/okta") -> Dict:
+    """
+    Build the bundled snapshot format from `terraform providers schema -json` output.
+
+    Args:
+        provider_schemas: Parsed JSON from `terraform providers schema -json`
+        provider: Provider source address
+
+    Returns:
+        Compact schema with "resources" and "data_sources"
+    """
+    okta = provider_schemas["provider_schemas"][provider]
+    return {
+        "provider": provider,
+        "resources": {
+            name: _compact_block(schema["block"]) for name, schema in sorted(okta.get("resource_schemas", {}).items())
+        },
+        "data_sources": {
+            name: _compact_block(schema["block"]) for name, schema in sorted(okta.get("data_source_schemas", {}).items())
+        }
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate Terraform HCL without the terraform binary")
+    parser.add_argument("files", nargs="*", help="Terraform files to validate")
+    parser.add_argument("--no-schema", action="store_true", help="Only check syntax and template escaping")
+    parser.add_argument("--update-schema", metavar="SCHEMA_JSON",
+                        help="Regenerate the bundled snapshot from `terraform providers schema -json` output")
+    args = parser.parse_args()
+
+    if args.update_schema:
+        compact = compact_provider_schema(json.loads(Path(args.update_schema).read_text()))
+        SCHEMA_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SCHEMA_PATH.write_text(json.dumps(compact, indent=1, sort_keys=True) + "\n")
+        print(f"✅ Wrote {len(compact['resources'])} resources and "
+              f"{len(compact['data_sources'])} data sources to {SCHEMA_PATH}")
+        return
+
+    failed = False
+    for file_name in args.files:
+        issues = validate_hcl(Path(file_name).read_text(), check_schema=not args.no_schema)
+        for issue in issues:
+            print(f"{file_name}: {format_issue(issue)}")
+        failed = failed or has_errors(issues)
+        if not issues:
+            print(f"✅ {file_name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
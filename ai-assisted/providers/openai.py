@@ -2,31 +2,41 @@
 OpenAI provider for AI-assisted Terraform generation.
 """
 
-from typing import Dict
+from typing import Dict, Iterator, List
 from .base import AIProvider
 
 
+# System message with instructions
+SYSTEM_MESSAGE = """You are an expert Terraform developer specializing in Okta infrastructure.
+
+Generate clean, production-ready Terraform code following these rules:
+1. Use exact patterns from the provided examples
+2. Always escape template strings with $$ (e.g., "$${source.login}")
+3. Set status = "ACTIVE" for all resources
+4. Include descriptive comments
+5. Follow HCL formatting conventions
+6. Use proper resource naming (snake_case)
+7. Include depends_on where appropriate
+8. Generate only valid Terraform HCL code
+
+Output only the Terraform code, no explanations unless specifically requested."""
+
+
 class OpenAIProvider(AIProvider):
     """OpenAI API provider (GPT-4, GPT-3.5, etc.)."""
 
+    supports_prompt_cache = True
+
     def get_default_model(self) -> str:
         """Get default OpenAI model."""
         return "gpt-4-turbo-preview"
 
-    def generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+    def _create_client(self):
         """
-        Generate Terraform code using OpenAI.
-
-        Args:
-            prompt: User's prompt
-            context: Context dictionary
-
-        Returns:
-            Generated Terraform code
+        Create the OpenAI client (reused for every call; see AIProvider.client).
 
         Raises:
             ImportError: If openai is not installed
-            Exception: If generation fails
         """
         try:
             from openai import OpenAI
@@ -36,35 +46,64 @@ class OpenAIProvider(AIProvider):
                 "Install with: pip install openai"
             )
 
-        # Initialize OpenAI client
-        client = OpenAI(api_key=self.api_key)
+        return OpenAI(api_key=self.api_key)
 
-        # Build full prompt with context
-        full_prompt = self._build_full_prompt(prompt, context)
+    def _warm_connection(self):
+        """Open the API connection with a model lookup (no tokens are used)."""
+        self.client.models.retrieve(self.model)
 
-        # System message with instructions
-        system_message = """You are an expert Terraform developer specializing in Okta infrastructure.
+    def _build_messages(self, prompt: str, context: Dict[str, str]) -> List[Dict[str, str]]:
+        """
+        Build chat messages with a stable prefix for OpenAI's prompt caching.
 
-Generate clean, production-ready Terraform code following these rules:
-1. Use exact patterns from the provided examples
-2. Always escape template strings with $$ (e.g., "$${source.login}")
-3. Set status = "ACTIVE" for all resources
-4. Include descriptive comments
-5. Follow HCL formatting conventions
-6. Use proper resource naming (snake_case)
-7. Include depends_on where appropriate
-8. Generate only valid Terraform HCL code
+        OpenAI caches the longest previously seen prompt prefix automatically,
+        so the instructions (and, with context_in_prefix, the full context) are
+        sent first, unchanged between requests. The user request, preceded by a
+        per-prompt context selection if there is one, comes last.
 
-Output only the Terraform code, no explanations unless specifically requested."""
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Messages for chat.completions.create
+        """
+        messages = [{"role": "system", "content": SYSTEM_MESSAGE}]
+        context_prefix = self._build_cached_prefix(context)
+        if context_prefix:
+            messages.append({"role": "system", "content": context_prefix})
+        messages.append({"role": "user", "content": self._build_request_message(prompt, context)})
+        return messages
+
+    def _record_response_usage(self, usage):
+        """Record token usage, including prompt tokens served from the prompt cache."""
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) if details is not None else None
+        self._record_usage(usage.prompt_tokens, usage.completion_tokens, cached_tokens=cached_tokens)
+
+    def _generate_terraform(self, prompt: str, context: Dict[str, str]) -> str:
+        """
+        Generate Terraform code using OpenAI.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Returns:
+            Generated Terraform code
+
+        Raises:
+            ImportError: If openai is not installed
+            Exception: If generation fails
+        """
+        # Shared client; created on first use
+        client = self.client
 
         try:
             # Generate content
             response = client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": full_prompt}
-                ],
+                messages=self._build_messages(prompt, context),
                 temperature=0.2,  # Lower temperature for more deterministic code generation
             )
 
@@ -83,9 +122,7 @@ Output only the Terraform code, no explanations unless specifically requested.""
 
             # Track token usage
             if hasattr(response, 'usage'):
-                self.token_usage["input"] += response.usage.prompt_tokens
-                self.token_usage["output"] += response.usage.completion_tokens
-                self.token_usage["total"] = response.usage.total_tokens
+                self._record_response_usage(response.usage)
 
             # Validate generated code
             if not self.validate_terraform_code(generated_code):
@@ -98,3 +135,41 @@ Output only the Terraform code, no explanations unless specifically requested.""
 
         except Exception as e:
             raise Exception(f"OpenAI generation failed: {str(e)}")
+
+    def _stream_terraform(self, prompt: str, context: Dict[str, str]) -> Iterator[str]:
+        """
+        Stream Terraform code from OpenAI.
+
+        Args:
+            prompt: User's prompt
+            context: Context dictionary
+
+        Yields:
+            Chunks of completion text
+
+        Raises:
+            ImportError: If openai is not installed
+            Exception: If generation fails
+        """
+        # Shared client; created on first use
+        client = self.client
+
+        try:
+            stream = client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, context),
+                temperature=0.2,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+                # The final chunk carries usage for the whole completion
+                if getattr(chunk, 'usage', None):
+                    self._record_response_usage(chunk.usage)
+
+        except Exception as e:
+            raise Exception(f"OpenAI streaming failed: {str(e)}")
@@ -0,0 +1,167 @@
+"""
+Helpers for streaming Terraform generation.
+
+CodeFenceFilter strips markdown code fences from a token stream so only the
+Terraform code is rendered and written. HCLBlockTracker splits streamed code
+into top-level HCL blocks as soon as each one is complete, so they can be
+checked before the rest of the completion arrives.
+"""
+
+import re
+from typing import List
+
+
+# Lines that can open Terraform code when the model skips the code fence
+HCL_START = re.compile(r"^(resource|data|variable|output|locals|module|provider|terraform|import|moved)\b|^(#|//|/\*)")
+
+
+class CodeFenceFilter:
+    """Incrementally removes markdown code fences (```hcl ... ```) from streamed text."""
+
+    def __init__(self):
+        self._pending = ""
+        self._held: List[str] = []
+        self._started = False
+        self._in_fence = False
+        self._fenced = False
+
+    def _line(self, line: str) -> str:
+        stripped = line.strip()
+
+        if stripped.startswith("```"):
+            self._fenced = True
+            self._in_fence = not self._in_fence
+            self._started = True
+            self._held = []  # Prose before the code block
+            return ""
+
+        if not self._started:
+            if not HCL_START.match(stripped):
+                # Hold until we know whether this is prose or unfenced code
+                if stripped:
+                    self._held.append(line)
+                return ""
+            self._started = True
+            self._held = []
+
+        if self._fenced and not self._in_fence:
+            return ""  # Prose after a closed code block
+
+        return line
+
+    def feed(self, text: str) -> str:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next chunk from the provider
+
+        Returns:
+            Code from the chunk's completed lines (may be empty)
+        """
+        self._pending += text
+        lines = self._pending.split("\n")
+        self._pending = lines.pop()
+        return "".join(self._line(line + "\n") for line in lines)
+
+    def flush(self) -> str:
+        """
+        Finish the stream.
+
+        Returns:
+            Code from the final, unterminated line
+        """
+        line, self._pending = self._pending, ""
+        code = self._line(line) if line else ""
+        if not self._started:
+            # Never saw a fence or recognizable code: return everything for validation
+            code = "".join(self._held) + code
+            self._held = []
+        return code
+
+
+class HCLBlockTracker:
+    """Splits streamed HCL into complete top-level blocks by tracking brace depth."""
+
+    def __init__(self):
+        self._pending = ""
+        self._block: List[str] = []
+        self._depth = 0
+        self._heredoc = None
+
+    def _scan(self, line: str):
+        """Update brace depth for one line, ignoring strings, comments and heredocs."""
+        if self._heredoc:
+            if line.strip() == self._heredoc:
+                self._heredoc = None
+            return
+
+        in_string = False
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if in_string:
+                if char == "\\":
+                    i += 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "#" or line.startswith("//", i):
+                break
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+            elif line.startswith("<<", i):
+                match = re.match(r"<<-?([A-Za-z_][A-Za-z0-9_]*)", line[i:])
+                if match:
+                    self._heredoc = match.group(1)
+                    break
+            i += 1
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed code.
+
+        Args:
+            text: Next chunk of code (fences already removed)
+
+        Returns:
+            Top-level blocks completed by this chunk
+        """
+        self._pending += text
+        lines = self._pending.split("\n")
+        self._pending = lines.pop()
+
+        completed = []
+        for line in lines:
+            if self._depth == 0 and not self._block and not line.strip():
+                continue
+            self._block.append(line)
+            was_open = self._depth > 0
+            self._scan(line)
+
+            if self._depth <= 0 and (was_open or "{" in line) and not self._heredoc:
+                completed.append("\n".join(self._block))
+                self._block = []
+                self._depth = 0
+        return completed
+
+    def flush(self) -> List[str]:
+        """
+        Finish the stream.
+
+        Returns:
+            Remaining blocks, including an unterminated one if the stream was cut off
+        """
+        completed = self.feed(self._pending + "\n") if self._pending else []
+        if self._block and any(line.strip() for line in self._block):
+            completed.append("\n".join(self._block))
+        self._block = []
+        return completed
+
+    @property
+    def depth(self) -> int:
+        """Current brace depth (non-zero while a block is open)."""
+        return self._depth
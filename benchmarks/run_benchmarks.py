@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py
+
+Benchmark suite for the governance tooling hot paths.
+
+Every benchmark builds synthetic data of a given size (resources, rules,
+bundles, users...) and times one code path at each size, so the output is a
+scaling curve rather than a single number. Code paths that talk to Okta run
+against the offline simulator (scripts/okta_simulator.py), which answers
+requests in-process; the timings are the client-side cost of the scripts,
+not network latency (use --latency to add some).
+
+Results can be saved as a baseline and later runs compared against it, to
+catch performance regressions before they reach a large org. Timings depend on
+the machine, so the baseline is local (benchmarks/baselines.local.json, not
+committed): record it with --save-baseline before comparing.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py
+    python3 benchmarks/run_benchmarks.py --sizes 10,100,1000 --only build_mappings
+    python3 benchmarks/run_benchmarks.py --save-baseline
+    python3 benchmarks/run_benchmarks.py --fail-on-regression --tolerance 0.5
+    python3 benchmarks/run_benchmarks.py --list
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.apply_labels_from_config import LabelApplier
+from scripts.apply_risk_rules import RiskRuleApplier
+from scripts.cleanup_terraform import TerraformCleaner
+from scripts.find_admin_resources import AdminResourceFinder
+from scripts.import_oig_resources import OIGImporter
+from scripts.okta_simulator import (
+    OktaSimulator, SyntheticOrg,
+    SIMULATED_API_TOKEN, SIMULATED_BASE_URL, SIMULATED_ORG_NAME,
+)
+from scripts.protect_admin_users import OktaAdminProtector
+from scripts.sync_label_mappings import LabelMappingSync
+from scripts.sync_owner_mappings import OwnerMappingSync
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+# Machine-specific timings; recorded locally and never committed
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.local.json")
+
+# Differences below this many seconds are treated as timer noise when comparing
+NOISE_FLOOR = 0.005
+
+
+class Benchmark:
+    """
+    One timed code path.
+
+    `setup(size, workdir, options)` builds the inputs for a size and returns
+    the callable to time. Setup cost is not included in the timings.
+    Benchmarks that change simulator state (the end-to-end apply runs) are
+    not repeatable and are timed once per size.
+    """
+
+    def __init__(self, name: str, unit: str, description: str,
+                 setup: Callable[[int, str, argparse.Namespace], Callable[[], object]],
+                 repeatable: bool = True):
+        self.name = name
+        self.unit = unit
+        self.description = description
+        self.setup = setup
+        self.repeatable = repeatable
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the scripts' progress output while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def simulator_for(org: SyntheticOrg, options: argparse.Namespace) -> OktaSimulator:
+    """Simulator that never throttles, so timings measure the client"""
+    return OktaSimulator(org, latency=options.latency, rate_limit=10 ** 9, seed=0)
+
+
+def resource_org(size: int, **kwargs) -> SyntheticOrg:
+    """Org with `size` labelable resources, half apps and half groups"""
+    apps = max(1, size // 2)
+    settings = dict(users=max(10, size // 10), groups=max(1, size - apps), apps=apps,
+                    entitlements_per_app=0, bundles=0, labels=10, values_per_label=3,
+                    group_size=2, groups_per_app=1, risk_rules=0, super_admins=0, seed=0)
+    settings.update(kwargs)
+    return SyntheticOrg.generate(**settings)
+
+
+def write_file(workdir: str, name: str, content: str) -> str:
+    path = os.path.join(workdir, name)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+# ==================== Synthetic inputs ====================
+
+def terraformer_groups_tf(size: int) -> str:
+    """Terraformer-style okta_group and okta_app_group_assignment resources"""
+    blocks = []
+    for number in range(size):
+        group_id = f"00g{number:017d}"
+        blocks.append(
+            f'resource "okta_group" "tfer--group_{group_id}" {{\n'
+            f'  name        = "Group {number:05d}"\n'
+            f'  description = null\n'
+            f'  id          = "{group_id}"\n'
+            f'  skip_users  = null\n'
+            f'}}\n'
+        )
+        blocks.append(
+            f'resource "okta_app_group_assignment" "tfer--assignment_{group_id}" {{\n'
+            f'  app_id   = "0oa{number // 10:017d}"\n'
+            f'  group_id = okta_group.tfer--group_{group_id}.id\n'
+            f'  priority = 0\n'
+            f'}}\n'
+        )
+    return "\n".join(blocks)
+
+
+def environment_tree(workdir: str, size: int, environments: int = 4, per_file: int = 250) -> str:
+    """
+    environments/<env>/terraform tree with `size` okta_group resources split
+    over files and environments; every 50th group is an admin group
+    """
+    root = os.path.join(workdir, "environments")
+    for number in range(0, size, per_file):
+        env_dir = os.path.join(root, f"env{(number // per_file) % environments}", "terraform")
+        os.makedirs(env_dir, exist_ok=True)
+        blocks = []
+        imports = []
+        for group in range(number, min(size, number + per_file)):
+            group_id = f"00g{group:017d}"
+            name = f"Group {group:05d} Admins" if group % 50 == 0 else f"Group {group:05d}"
+            blocks.append(
+                f'resource "okta_group" "group_{group_id}" {{\n'
+                f'  name        = "{name}"\n'
+                f'  description = "Synthetic group {group}"\n'
+                f'}}\n'
+            )
+            imports.append(f"terraform import okta_group.group_{group_id} {group_id}")
+        write_file(env_dir, f"groups_{number // per_file:05d}.tf", "\n".join(blocks))
+        write_file(env_dir, f"import_{number // per_file:05d}.sh", "\n".join(imports) + "\n")
+    return root
+
+
+def terraformer_users_tf(size: int) -> str:
+    """Terraformer-style okta_user resources"""
+    blocks = []
+    for number in range(size):
+        login = f"user{number}@example.com"
+        blocks.append(
+            f'resource "okta_user" "tfer--user_00u{number:017d}" {{\n'
+            f'  email      = "{login}"\n'
+            f'  first_name = "User"\n'
+            f'  last_name  = "{number}"\n'
+            f'  login      = "{login}"\n'
+            f'  status     = "ACTIVE"\n'
+            f'\n'
+            f'  custom_profile_attributes = jsonencode({{\n'
+            f'    department = "Engineering"\n'
+            f'  }})\n'
+            f'}}\n'
+        )
+    return "\n".join(blocks)
+
+
+def risk_rule_inputs(size: int):
+    """
+    Config rules and existing rules for plan_changes: most config rules match
+    an existing rule by name, some are new, some are renames carrying
+    _metadata.id, and some existing rules are no longer in the config.
+    """
+    config_rules = []
+    existing_rules = {}
+    for number in range(size):
+        rule = {
+            "name": f"SoD Rule {number:06d}",
+            "type": "SEPARATION_OF_DUTIES",
+            "resources": [{"resourceOrn": f"orn:okta:idp:simulated:apps:app:0oa{number:017d}"}],
+            "conflictCriteria": {"and": []}
+        }
+        bucket = number % 10
+        if bucket < 7:
+            existing_rules[rule["name"]] = dict(rule, id=f"rr{number:018d}")
+        elif bucket == 7:
+            rule["_metadata"] = {"id": f"rr{number:018d}"}
+            existing_rules[f"Old {rule['name']}"] = dict(rule, id=f"rr{number:018d}")
+        elif bucket == 8:
+            existing_rules[f"Removed Rule {number:06d}"] = dict(rule, id=f"rx{number:018d}")
+            continue
+        config_rules.append(rule)
+    return config_rules, existing_rules
+
+
+# ==================== Component benchmarks ====================
+
+def setup_build_mappings(size: int, workdir: str, options: argparse.Namespace):
+    simulator = simulator_for(resource_org(size, labeled_fraction=1.0), options)
+    with simulator.installed(), quiet():
+        sync = LabelMappingSync(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+        labels = sync.get_all_labels()
+        assignments = sync.get_all_resource_labels()
+    return lambda: sync.build_mappings(labels, assignments)
+
+
+def setup_clean_terraform_file(size: int, workdir: str, options: argparse.Namespace):
+    tf_file = Path(write_file(workdir, "okta_group.tf", terraformer_groups_tf(size)))
+
+    def run():
+        cleaner = TerraformCleaner(workdir, os.path.join(workdir, "cleaned"))
+        return cleaner.clean_terraform_file(tf_file)
+    return run
+
+
+def setup_update_references(size: int, workdir: str, options: argparse.Namespace):
+    tf_file = Path(write_file(workdir, "okta_group.tf", terraformer_groups_tf(size)))
+    cleaner = TerraformCleaner(workdir, os.path.join(workdir, "cleaned"))
+    with quiet():
+        content = cleaner.clean_terraform_file(tf_file)
+    return lambda: cleaner.update_references(content)
+
+
+def setup_parse_terraform_users(size: int, workdir: str, options: argparse.Namespace):
+    tf_file = write_file(workdir, "okta_user.tf", terraformer_users_tf(size))
+    protector = OktaAdminProtector(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+    return lambda: protector.parse_terraform_users(tf_file)
+
+
+def setup_scan_admin_resources(size: int, workdir: str, options: argparse.Namespace):
+    finder = AdminResourceFinder(environment_tree(workdir, size))
+    return finder.scan_terraform_files
+
+
+def setup_generate_entitlement_tf(size: int, workdir: str, options: argparse.Namespace):
+    org = resource_org(0, users=10, groups=1, apps=max(1, size // 10), entitlements_per_app=1,
+                       values_per_entitlement=3, bundles=size, labels=0)
+    simulator = simulator_for(org, options)
+    bundles = list(org.bundles.values())
+
+    def run():
+        with simulator.installed():
+            importer = OIGImporter(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+            return importer.generate_entitlement_tf(bundles)
+    return run
+
+
+def setup_plan_changes(size: int, workdir: str, options: argparse.Namespace):
+    config_rules, existing_rules = risk_rule_inputs(size)
+    applier = RiskRuleApplier(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN, dry_run=True)
+    return lambda: applier.plan_changes(config_rules, existing_rules, delete_removed=True)
+
+
+# ==================== End-to-end benchmarks ====================
+
+def setup_sync_labels(size: int, workdir: str, options: argparse.Namespace):
+    simulator = simulator_for(resource_org(size, labeled_fraction=1.0), options)
+    output_file = os.path.join(workdir, "label_mappings.json")
+
+    def run():
+        with simulator.installed():
+            sync = LabelMappingSync(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+            return sync.sync(output_file)
+    return run
+
+
+def setup_sync_owners(size: int, workdir: str, options: argparse.Namespace):
+    simulator = simulator_for(resource_org(size, owned_fraction=1.0), options)
+    output_file = os.path.join(workdir, "owner_mappings.json")
+
+    def run():
+        with simulator.installed():
+            sync = OwnerMappingSync(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+            return sync.sync(output_file)
+    return run
+
+
+def setup_apply_labels(size: int, workdir: str, options: argparse.Namespace):
+    """Apply a synced label_mappings.json to a fresh copy of the same org"""
+    simulator = simulator_for(resource_org(size, labeled_fraction=1.0), options)
+    config_file = os.path.join(workdir, "label_mappings.json")
+    with simulator.installed(), quiet():
+        LabelMappingSync(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN).sync(config_file)
+    with open(config_file) as f:
+        config = json.load(f)
+
+    target = simulator_for(resource_org(size, labels=0), options)
+
+    def run():
+        applier = LabelApplier(target.manager(), dry_run=False)
+        return applier.apply_all_labels(config)
+    return run
+
+
+def setup_apply_risk_rules(size: int, workdir: str, options: argparse.Namespace):
+    """Half the configured rules update existing rules, half are created"""
+    org = resource_org(0, users=10, groups=1, apps=max(1, size // 10), entitlements_per_app=2,
+                       values_per_entitlement=4, labels=0, risk_rules=size)
+    rules = []
+    for number, rule in enumerate(copy.deepcopy(list(org.risk_rules.values()))):
+        for key in ("id", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_links"):
+            rule.pop(key, None)
+        if number % 2:
+            rule["name"] = f"New {rule['name']}"
+        rules.append(rule)
+    config_file = write_file(workdir, "risk_rules.json", json.dumps({"rules": rules}))
+    simulator = simulator_for(org, options)
+
+    def run():
+        with simulator.installed():
+            applier = RiskRuleApplier(SIMULATED_ORG_NAME, SIMULATED_BASE_URL, SIMULATED_API_TOKEN)
+            return applier.run(config_file)
+    return run
+
+
+BENCHMARKS = [
+    Benchmark("build_mappings", "labeled resources",
+              "LabelMappingSync.build_mappings over simulator label assignments",
+              setup_build_mappings),
+    Benchmark("clean_terraform_file", "groups",
+              "TerraformCleaner.clean_terraform_file on a Terraformer okta_group.tf",
+              setup_clean_terraform_file),
+    Benchmark("update_references", "groups",
+              "TerraformCleaner.update_references after cleaning okta_group.tf",
+              setup_update_references),
+    Benchmark("parse_terraform_users", "users",
+              "OktaAdminProtector.parse_terraform_users on a Terraformer okta_user.tf",
+              setup_parse_terraform_users),
+    Benchmark("scan_admin_resources", "resources",
+              "AdminResourceFinder.scan_terraform_files over an environments/ tree with import scripts",
+              setup_scan_admin_resources),
+    Benchmark("generate_entitlement_tf", "bundles",
+              "OIGImporter.generate_entitlement_tf, one bundle GET each against the simulator",
+              setup_generate_entitlement_tf),
+    Benchmark("plan_changes", "rules",
+              "RiskRuleApplier.plan_changes with updates, creates, renames and deletes",
+              setup_plan_changes),
+    Benchmark("e2e.sync_labels", "resources",
+              "sync_label_mappings.py end to end against the simulator",
+              setup_sync_labels),
+    Benchmark("e2e.sync_owners", "resources",
+              "sync_owner_mappings.py end to end against the simulator",
+              setup_sync_owners),
+    Benchmark("e2e.apply_labels", "resources",
+              "apply_labels_from_config.py applying a synced config to an unlabeled org",
+              setup_apply_labels, repeatable=False),
+    Benchmark("e2e.apply_risk_rules", "rules",
+              "apply_risk_rules.py updating and creating rules against the simulator",
+              setup_apply_risk_rules, repeatable=False),
+]
+
+
+# ==================== Runner ====================
+
+def time_benchmark(benchmark: Benchmark, size: int, options: argparse.Namespace) -> Dict:
+    """Time one benchmark at one size"""
+    timings = []
+    runs = options.repeat if benchmark.repeatable else 1
+
+    with tempfile.TemporaryDirectory(prefix="okta-bench-") as workdir:
+        with quiet():
+            run = benchmark.setup(size, workdir, options)
+        for _ in range(runs):
+            if not benchmark.repeatable and timings:
+                with quiet():
+                    run = benchmark.setup(size, workdir, options)
+            with quiet():
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            # A size that already takes most of the budget is not worth repeating
+            if sum(timings) > options.max_seconds:
+                break
+
+    seconds = statistics.median(timings)
+    return {
+        "size": size,
+        "seconds": round(seconds, 6),
+        "min_seconds": round(min(timings), 6),
+        "runs": len(timings),
+        "per_item_us": round(seconds / size * 1e6, 3) if size else None,
+    }
+
+
+def scaling_exponent(previous: Dict, current: Dict) -> Optional[float]:
+    """
+    Growth exponent between two sizes: ~1.0 is linear, ~2.0 quadratic.
+    Not reported when the smaller size is too fast to time reliably.
+    """
+    if previous["seconds"] < 0.001 or current["size"] <= previous["size"]:
+        return None
+    return round(math.log(current["seconds"] / previous["seconds"])
+                 / math.log(current["size"] / previous["size"]), 2)
+
+
+def run_benchmark(benchmark: Benchmark, sizes: List[int], options: argparse.Namespace) -> Dict:
+    """Run a benchmark at increasing sizes until the time budget runs out"""
+    points = []
+    skipped = []
+    print(f"\n⏱️  {benchmark.name} ({benchmark.unit})")
+
+    for size in sizes:
+        if points:
+            last = points[-1]
+            # Extrapolate with the growth seen so far (at least linear), so a
+            # quadratic path stops before it runs for many minutes
+            exponent = max(1.0, last.get("exponent") or 1.0)
+            estimate = last["seconds"] * (size / last["size"]) ** exponent
+            if estimate > options.max_seconds:
+                skipped.append(size)
+                print(f"  ⏭️  {size:>8,}  skipped (estimated {estimate:.1f}s > {options.max_seconds:g}s budget)")
+                continue
+
+        point = time_benchmark(benchmark, size, options)
+        if points:
+            point["exponent"] = scaling_exponent(points[-1], point)
+        points.append(point)
+
+        exponent = f"  n^{point['exponent']}" if point.get("exponent") is not None else ""
+        print(f"  ✅ {size:>8,}  {format_seconds(point['seconds']):>10}  "
+              f"{point['per_item_us']:>10.2f} µs/item  x{point['runs']}{exponent}")
+
+    return {
+        "unit": benchmark.unit,
+        "description": benchmark.description,
+        "points": points,
+        "skipped": skipped,
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Compare each (benchmark, size) present in both runs.
+
+    A point regresses when it is more than `tolerance` slower (0.5 = 50%)
+    and the difference is above timer noise.
+    """
+    comparisons = []
+    for name, result in results["benchmarks"].items():
+        base_points = {point["size"]: point for point in
+                       baseline.get("benchmarks", {}).get(name, {}).get("points", [])}
+        for point in result["points"]:
+            base = base_points.get(point["size"])
+            if not base or not base["seconds"]:
+                continue
+            ratio = point["seconds"] / base["seconds"]
+            regressed = ratio > 1 + tolerance and point["seconds"] - base["seconds"] > NOISE_FLOOR
+            comparisons.append({
+                "benchmark": name,
+                "size": point["size"],
+                "baseline_seconds": base["seconds"],
+                "seconds": point["seconds"],
+                "ratio": round(ratio, 3),
+                "regressed": regressed,
+            })
+    return comparisons
+
+
+def print_comparison(comparisons: List[Dict], baseline_file: str, tolerance: float):
+    print("\n" + "="*80)
+    print(f"COMPARISON WITH BASELINE ({baseline_file}, tolerance {tolerance:.0%})")
+    print("="*80)
+
+    if not comparisons:
+        print("  ℹ️  No benchmark sizes in common with the baseline")
+        return
+
+    print(f"  {'benchmark':<26} {'size':>8} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for item in comparisons:
+        status = "❌ slower" if item["regressed"] else ""
+        print(f"  {item['benchmark']:<26} {item['size']:>8,} {format_seconds(item['baseline_seconds']):>10} "
+              f"{format_seconds(item['seconds']):>10} {item['ratio']:>6.2f}x {status}")
+
+    regressions = [item for item in comparisons if item["regressed"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {tolerance:.0%}")
+    else:
+        print("\n✅ No regressions")
+
+
+def select_benchmarks(only: Optional[List[str]]) -> List[Benchmark]:
+    """Benchmarks matching --only names or prefixes (e.g. 'e2e')"""
+    if not only:
+        return BENCHMARKS
+    return [benchmark for benchmark in BENCHMARKS
+            if any(benchmark.name == name or benchmark.name.startswith(name.rstrip(".") + ".")
+                   for name in only)]
+
+
+def parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = sorted({int(size.replace("_", "")) for size in value.split(",") if size.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"sizes must be comma-separated integers: {value}")
+    if not sizes or sizes[0] < 1:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the governance tooling hot paths at increasing data sizes"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma-separated data sizes (default: 10,100,1000,10000,100000)"
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Only run this benchmark, or a group prefix like 'e2e' (repeatable)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per size; the median is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=30.0,
+        help="Skip larger sizes once a benchmark is expected to exceed this (default: 30)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds of latency per API request (default: 0)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write results to this JSON file"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON to compare against (default: benchmarks/baselines.local.json)"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write results to the baseline file instead of comparing"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed slowdown before a point counts as a regression (default: 0.5 = 50%%)"
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit non-zero if any benchmark regressed against the baseline"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List benchmarks and exit"
+    )
+
+    args = parser.parse_args()
+
+    if args.list:
+        for benchmark in BENCHMARKS:
+            print(f"{benchmark.name:<26} {benchmark.unit:<18} {benchmark.description}")
+        return
+
+    benchmarks = select_benchmarks(args.only)
+    if not benchmarks:
+        print(f"❌ No benchmarks match: {', '.join(args.only)}")
+        sys.exit(1)
+
+    output_file = os.path.abspath(args.output) if args.output else None
+    baseline_file = os.path.abspath(args.baseline)
+
+    print("="*80)
+    print("GOVERNANCE TOOLING BENCHMARKS")
+    print("="*80)
+    print(f"Sizes: {', '.join(f'{size:,}' for size in args.sizes)}")
+    print(f"Budget: {args.max_seconds:g}s per size, {args.repeat} run(s) per size")
+
+    results = {
+        "environment": environment(),
+        "sizes": args.sizes,
+        "benchmarks": {},
+    }
+
+    # The scripts write caches (ORN tables, results) relative to the working
+    # directory; keep them out of the checkout
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="okta-bench-cwd-") as scratch:
+        os.chdir(scratch)
+        try:
+            for benchmark in benchmarks:
+                results["benchmarks"][benchmark.name] = run_benchmark(benchmark, args.sizes, args)
+        finally:
+            os.chdir(original_cwd)
+
+    if output_file:
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {output_file}")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file) as f:
+                baseline = json.load(f)
+        # Keep baseline entries for benchmarks that were not part of this run
+        baseline.setdefault("benchmarks", {}).update(results["benchmarks"])
+        baseline["environment"] = results["environment"]
+        baseline["sizes"] = sorted(set(baseline.get("sizes", [])) | set(args.sizes))
+        with open(baseline_file, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline written to {baseline_file}")
+        return
+
+    if not os.path.exists(baseline_file):
+        print(f"\nℹ️  No baseline at {baseline_file}; nothing to compare with")
+        print("   Record one on this machine first: make bench-baseline (or --save-baseline)")
+        return
+
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    comparisons = compare_with_baseline(results, baseline, args.tolerance)
+    print_comparison(comparisons, baseline_file, args.tolerance)
+
+    if args.fail_on_regression and any(item["regressed"] for item in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+api_metrics.py
+
+Request metrics and phase timings for the Okta API scripts.
+
+Sessions passed to instrument_session() (OktaAPIManager and every script's own
+session) record, per endpoint: request counts by status, a latency histogram,
+bytes sent and received, retries and 429s. OktaAPIManager also records time
+spent sleeping on rate limits and retry backoff. Scripts mark their phases
+with span() (nested spans are recorded as "outer/inner").
+
+Scripts write the metrics when they exit if --metrics-file (JSON) and/or
+--openmetrics-file (OpenMetrics text) are given, or OKTA_METRICS_FILE /
+OKTA_OPENMETRICS_FILE are set, so nightly jobs can collect them without
+changing their command lines.
+
+Usage:
+    python3 scripts/sync_owner_mappings.py --metrics-file metrics/sync_owners.json
+
+    # Summarize a metrics file (slowest endpoints and phases)
+    python3 scripts/api_metrics.py metrics/sync_owners.json
+
+    # Convert a metrics file to OpenMetrics text
+    python3 scripts/api_metrics.py metrics/sync_owners.json --openmetrics metrics/sync_owners.prom
+"""
+
+import argparse
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments that are IDs (00u1ab2..., ent12pve...) or ORNs/logins are collapsed to {id}
+ID_SEGMENT = re.compile(r"^(?=[^/]*\d)[A-Za-z0-9]{15,}$")
+
+
+def endpoint_path(url: str) -> str:
+    """URL path with IDs replaced by {id}, so requests group by endpoint"""
+    segments = urlsplit(url).path.split("/")
+    return "/".join(
+        "{id}" if ID_SEGMENT.match(segment) or any(c in segment for c in ":@%") else segment
+        for segment in segments
+    )
+
+
+class APIMetrics:
+    """Thread-safe collector for request metrics and spans"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.endpoints: Dict[str, Dict] = {}
+            self.sleeps: Dict[str, Dict] = {}
+            self.spans: Dict[str, Dict] = {}
+
+    def _endpoint(self, method: str, url: str) -> Dict:
+        """Entry for an endpoint (caller holds the lock)"""
+        path = endpoint_path(url)
+        key = f"{method} {path}"
+        entry = self.endpoints.get(key)
+        if entry is None:
+            entry = self.endpoints[key] = {
+                "method": method, "path": path, "requests": 0, "statuses": {},
+                "rate_limited": 0, "retries": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "bytes_sent": 0, "bytes_received": 0,
+                "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1)
+            }
+        return entry
+
+    def record_response(self, response: requests.Response, streamed: bool = False):
+        request = response.request
+        seconds = response.elapsed.total_seconds()
+        body = request.body or b""
+        sent = len(body.encode("utf-8") if isinstance(body, str) else body)
+        # Compressed responses count their size on the wire, not decompressed
+        encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+        received = int(response.headers.get("Content-Length", 0) or 0) if streamed or encoded else 0
+        if not received and not streamed:
+            received = len(response.content or b"")
+
+        bucket = len(LATENCY_BUCKETS)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                bucket = index
+                break
+
+        with self._lock:
+            entry = self._endpoint(request.method, request.url)
+            entry["requests"] += 1
+            status = str(response.status_code)
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if response.status_code == 429:
+                entry["rate_limited"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["bytes_sent"] += sent
+            entry["bytes_received"] += received
+            entry["latency_buckets"][bucket] += 1
+
+    def record_retry(self, method: str, url: str):
+        with self._lock:
+            self._endpoint(method, url)["retries"] += 1
+
+    def record_sleep(self, reason: str, seconds: float):
+        """Time spent waiting instead of sending requests (rate limits, backoff)"""
+        with self._lock:
+            entry = self.sleeps.setdefault(reason, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+
+    def sleep(self, reason: str, seconds: float):
+        """time.sleep that is recorded under reason"""
+        self.record_sleep(reason, seconds)
+        time.sleep(seconds)
+
+    def _span_entry(self, path: str, started: float) -> Dict:
+        """Entry for a span (caller holds the lock)"""
+        entry = self.spans.get(path)
+        if entry is None:
+            entry = self.spans[path] = {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                        "first_started": round(started - self.started, 3)}
+        return entry
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Time a phase; spans opened inside it (on the same thread) are recorded
+        as name/inner. Also usable as a decorator: @span("fetch_labels").
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        path = "/".join(stack)
+        started = time.time()
+        # Created on entry so spans are listed in the order they first started
+        with self._lock:
+            self._span_entry(path, started)
+        try:
+            yield
+        finally:
+            stack.pop()
+            seconds = time.time() - started
+            with self._lock:
+                entry = self._span_entry(path, started)
+                entry["count"] += 1
+                entry["seconds"] += seconds
+                entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def snapshot(self) -> Dict:
+        """All metrics as a JSON-serializable dictionary"""
+        with self._lock:
+            endpoints = []
+            for entry in self.endpoints.values():
+                entry = dict(entry, statuses=dict(entry["statuses"]))
+                buckets = entry.pop("latency_buckets")
+                entry["latency_buckets"] = {
+                    **{str(bound): count for bound, count in zip(LATENCY_BUCKETS, buckets)},
+                    "+Inf": buckets[-1]
+                }
+                entry["mean_seconds"] = entry["seconds"] / entry["requests"] if entry["requests"] else 0.0
+                endpoints.append(entry)
+            sleeps = {reason: dict(entry) for reason, entry in self.sleeps.items()}
+            spans = {path: dict(entry) for path, entry in self.spans.items()}
+
+        endpoints.sort(key=lambda e: e["seconds"], reverse=True)
+        return {
+            "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "duration_seconds": time.time() - self.started,
+            "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+            "totals": {
+                "requests": sum(e["requests"] for e in endpoints),
+                "rate_limited": sum(e["rate_limited"] for e in endpoints),
+                "retries": sum(e["retries"] for e in endpoints),
+                "request_seconds": sum(e["seconds"] for e in endpoints),
+                "sleep_seconds": sum(s["seconds"] for s in sleeps.values()),
+                "bytes_sent": sum(e["bytes_sent"] for e in endpoints),
+                "bytes_received": sum(e["bytes_received"] for e in endpoints)
+            },
+            "endpoints": endpoints,
+            "sleeps": sleeps,
+            "spans": spans
+        }
+
+    def write(self, metrics_file: Optional[str] = None, openmetrics_file: Optional[str] = None):
+        snapshot = self.snapshot()
+        for path, content in ((metrics_file, lambda: json.dumps(snapshot, indent=2)),
+                              (openmetrics_file, lambda: to_openmetrics(snapshot))):
+            if not path:
+                continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content())
+            print(f"📈 API metrics written to: {path}")
+
+
+# Default collector shared by every instrumented session in the process
+METRICS = APIMetrics()
+
+
+def span(name: str):
+    """Time a phase in the default collector (see APIMetrics.span)"""
+    return METRICS.span(name)
+
+
+def instrument_session(session: requests.Session, metrics: Optional[APIMetrics] = None) -> requests.Session:
+    """Record every response the session receives (idempotent)"""
+    metrics = metrics or METRICS
+    if getattr(session, "_api_metrics", None) is metrics:
+        return session
+
+    def record(response, *args, **kwargs):
+        metrics.record_response(response, streamed=kwargs.get("stream", False))
+
+    session.hooks["response"].append(record)
+    session._api_metrics = metrics
+    return session
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--metrics-file",
+        default=os.environ.get("OKTA_METRICS_FILE"),
+        help="Write API request metrics and phase timings to this JSON file on exit"
+    )
+    parser.add_argument(
+        "--openmetrics-file",
+        default=os.environ.get("OKTA_OPENMETRICS_FILE"),
+        help="Also write the metrics in OpenMetrics text format"
+    )
+
+
+def write_metrics_on_exit(metrics_file: Optional[str], openmetrics_file: Optional[str] = None,
+                          metrics: Optional[APIMetrics] = None):
+    """Write metrics when the process exits, including via sys.exit()"""
+    if metrics_file or openmetrics_file:
+        atexit.register((metrics or METRICS).write, metrics_file, openmetrics_file)
+
+
+# ==================== Output ====================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def to_openmetrics(snapshot: Dict) -> str:
+    """OpenMetrics text exposition of a snapshot"""
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: List[str]):
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.extend(samples)
+
+    endpoints = snapshot["endpoints"]
+    family("okta_api_requests", "counter", "API responses by endpoint and status", [
+        f"okta_api_requests_total{_labels(method=e['method'], endpoint=e['path'], status=status)} {count}"
+        for e in endpoints for status, count in sorted(e["statuses"].items())
+    ])
+
+    histogram = []
+    for e in endpoints:
+        labels = {"method": e["method"], "endpoint": e["path"]}
+        cumulative = 0
+        for bound, count in e["latency_buckets"].items():
+            cumulative += count
+            histogram.append(f"okta_api_request_duration_seconds_bucket{_labels(**labels, le=bound)} {cumulative}")
+        histogram.append(f"okta_api_request_duration_seconds_sum{_labels(**labels)} {e['seconds']:.6f}")
+        histogram.append(f"okta_api_request_duration_seconds_count{_labels(**labels)} {e['requests']}")
+    family("okta_api_request_duration_seconds", "histogram", "Time until the response headers arrived", histogram)
+
+    for name, field, help_text in (
+        ("okta_api_rate_limited", "rate_limited", "429 responses"),
+        ("okta_api_retries", "retries", "Requests retried after a 429 or error"),
+        ("okta_api_sent_bytes", "bytes_sent", "Request body bytes sent"),
+        ("okta_api_received_bytes", "bytes_received", "Response body bytes received")
+    ):
+        family(name, "counter", help_text, [
+            f"{name}_total{_labels(method=e['method'], endpoint=e['path'])} {e[field]}" for e in endpoints
+        ])
+
+    family("okta_api_sleep_seconds", "counter", "Time spent waiting on rate limits and retry backoff", [
+        f"okta_api_sleep_seconds_total{_labels(reason=reason)} {entry['seconds']:.6f}"
+        for reason, entry in sorted(snapshot["sleeps"].items())
+    ])
+    family("okta_span_seconds", "counter", "Time spent in each script phase", [
+        f"okta_span_seconds_total{_labels(span=path)} {entry['seconds']:.6f}"
+        for path, entry in sorted(snapshot["spans"].items())
+    ])
+    family("okta_span_runs", "counter", "Times each script phase ran", [
+        f"okta_span_runs_total{_labels(span=path)} {entry['count']}"
+        for path, entry in sorted(snapshot["spans"].items())
+    ])
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def print_metrics_report(snapshot: Dict, top: int = 15):
+    totals = snapshot["totals"]
+    print("=" * 80)
+    print(f"API METRICS{' - ' + snapshot['script'] if snapshot.get('script') else ''}")
+    print("=" * 80)
+    print(f"Duration: {snapshot['duration_seconds']:.1f}s")
+    print(f"Requests: {totals['requests']:,} ({totals['request_seconds']:.1f}s waiting on responses, "
+          f"{totals['bytes_received'] / 1_000_000:.1f} MB received)")
+    print(f"429s: {totals['rate_limited']:,}  Retries: {totals['retries']:,}  "
+          f"Sleeping on rate limits/backoff: {totals['sleep_seconds']:.1f}s (summed over threads)")
+
+    if snapshot["endpoints"]:
+        print(f"\n{'Endpoint':<58} {'Requests':>8} {'Total':>8} {'Mean':>7}")
+        print("-" * 80)
+        for e in snapshot["endpoints"][:top]:
+            endpoint = f"{e['method']} {e['path']}"
+            print(f"{endpoint[:58]:<58} {e['requests']:>8} {e['seconds']:>7.1f}s {e['mean_seconds'] * 1000:>5.0f}ms")
+
+    if snapshot["sleeps"]:
+        print(f"\n{'Sleep reason':<58} {'Count':>8} {'Total':>8}")
+        print("-" * 80)
+        for reason, entry in sorted(snapshot["sleeps"].items(), key=lambda item: -item[1]["seconds"]):
+            print(f"{reason:<58} {entry['count']:>8} {entry['seconds']:>7.1f}s")
+
+    if snapshot["spans"]:
+        print(f"\n{'Phase':<58} {'Runs':>8} {'Total':>8}")
+        print("-" * 80)
+        for path, entry in snapshot["spans"].items():
+            print(f"{path[-58:]:<58} {entry['count']:>8} {entry['seconds']:>7.1f}s")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarize an API metrics file or convert it to OpenMetrics text"
+    )
+    parser.add_argument("metrics_file", help="JSON metrics file written with --metrics-file")
+    parser.add_argument("--openmetrics", help="Write the metrics in OpenMetrics text format to this file")
+    parser.add_argument("--top", type=int, default=15, help="Endpoints to show (default: 15)")
+
+    args = parser.parse_args()
+
+    with open(args.metrics_file, "r") as f:
+        snapshot = json.load(f)
+
+    if args.openmetrics:
+        with open(args.openmetrics, "w") as f:
+            f.write(to_openmetrics(snapshot))
+        print(f"📈 OpenMetrics written to: {args.openmetrics}")
+    else:
+        print_metrics_report(snapshot, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
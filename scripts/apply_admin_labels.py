@@ -19,11 +19,15 @@ Usage:
 import os
 import sys
 import json
-import requests
 import argparse
 from typing import List, Dict
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session
+
 
 class AdminLabelApplier:
     """Applies Privileged label to admin entitlements"""
@@ -37,7 +41,7 @@ class AdminLabelApplier:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
         self.dry_run = dry_run
         self.admin_pattern = re.compile(r"admin", re.IGNORECASE)
@@ -211,6 +215,7 @@ class AdminLabelApplier:
             print(f"❌ Error applying labels: {e}")
             return {"applied": 0, "failed": len(resource_orns), "skipped": 0}
 
+    @span("apply_admin_labels")
     def run(self) -> Dict:
         """Run the complete admin labeling process"""
         print("\n" + "="*80)
@@ -301,8 +306,10 @@ def main():
         action="store_true",
         help="Show what would be labeled without applying"
     )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
@@ -41,6 +41,7 @@ from collections import defaultdict
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
 from scripts.okta_api_manager import OktaAPIManager
 
 
@@ -173,6 +174,7 @@ class LabelApplier:
             self.stats["errors"].append(f"Failed to create label '{label_name}': {e}")
             return False
 
+    @span("assign")
     def apply_assignments(self, assignment_key: str, resource_orns: List[str]) -> int:
         """
         Apply a label value to a list of resources.
@@ -248,6 +250,7 @@ class LabelApplier:
             self.stats["errors"].append(f"Failed to assign '{display_name}': {e}")
             return 0
 
+    @span("apply_labels")
     def apply_all_labels(self, config: Dict) -> bool:
         """Process all labels and their assignments from config"""
         print("\n" + "="*80)
@@ -352,8 +355,10 @@ def main():
         default=os.environ.get("OKTA_API_TOKEN"),
         help="Okta API token (default: from OKTA_API_TOKEN env)"
     )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     # Validate required arguments
     if not args.org_name or not args.api_token:
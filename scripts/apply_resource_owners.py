@@ -23,6 +23,11 @@ import requests
 import argparse
 from typing import List, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session
+
 
 class ResourceOwnerApplier:
     """Applies resource owner assignments to Okta"""
@@ -36,7 +41,7 @@ class ResourceOwnerApplier:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
         self.dry_run = dry_run
 
@@ -109,6 +114,7 @@ class ResourceOwnerApplier:
                 "error": str(e)
             }
 
+    @span("apply")
     def apply_all_owners(self, assignments: Dict) -> Dict:
         """Apply all owner assignments from config"""
         print("\n" + "="*80)
@@ -228,6 +234,7 @@ class ResourceOwnerApplier:
 
         return results
 
+    @span("apply_resource_owners")
     def run(self, config_file: str):
         """Main execution"""
         print("="*80)
@@ -288,8 +295,10 @@ def main():
         action="store_true",
         help="Preview changes without applying them"
     )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
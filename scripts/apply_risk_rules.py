@@ -16,6 +16,7 @@ Usage:
     python3 scripts/apply_risk_rules.py --dry-run
     python3 scripts/apply_risk_rules.py --config config/risk_rules.json
     python3 scripts/apply_risk_rules.py --delete-removed  # Delete rules not in config
+    python3 scripts/apply_risk_rules.py --dry-run --grants grants.jsonl  # Predict violations
 """
 
 import os
@@ -25,6 +26,11 @@ import requests
 import argparse
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session
+
 
 class RiskRuleApplier:
     """Applies risk rule configuration to Okta"""
@@ -38,7 +44,7 @@ class RiskRuleApplier:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
         self.dry_run = dry_run
 
@@ -64,6 +70,7 @@ class RiskRuleApplier:
             print(f"❌ Error loading config: {e}")
             return None
 
+    @span("fetch_existing")
     def get_existing_rules(self) -> Dict[str, Dict]:
         """Fetch existing risk rules from Okta, indexed by name"""
         print("\n" + "="*80)
@@ -231,6 +238,7 @@ class RiskRuleApplier:
                 "error": str(e)
             }
 
+    @span("plan")
     def plan_changes(self, config_rules: List[Dict], existing_rules: Dict[str, Dict], delete_removed: bool) -> Dict:
         """
         Determine what changes need to be made
@@ -314,6 +322,7 @@ class RiskRuleApplier:
 
         return changes
 
+    @span("apply")
     def apply_changes(self, changes: Dict) -> Dict:
         """Execute the planned changes"""
         print("\n" + "="*80)
@@ -407,7 +416,24 @@ class RiskRuleApplier:
 
         return results
 
-    def run(self, config_file: str, delete_removed: bool = False):
+    @span("predict_violations")
+    def predict_violations(self, changes: Dict, grants_file: str) -> Dict:
+        """
+        Evaluate created and updated rules against a grants snapshot (see sod_engine.py)
+
+        Returns:
+            Evaluation result from SodEngine.evaluate
+        """
+        from scripts.sod_engine import SodEngine, load_grants, print_evaluation
+
+        rules = [item["config"] for item in changes["create"] + changes["update"]]
+        print(f"\nPredicting violations for {len(rules)} new/updated rules using {grants_file}...")
+        result = SodEngine(load_grants(grants_file)).evaluate(rules)
+        print_evaluation(result)
+        return result
+
+    @span("apply_risk_rules")
+    def run(self, config_file: str, delete_removed: bool = False, grants_file: str = None):
         """Main execution"""
         print("="*80)
         if self.dry_run:
@@ -438,6 +464,9 @@ class RiskRuleApplier:
             print("\n✅ No changes needed - config matches Okta")
             return True
 
+        if grants_file:
+            self.predict_violations(changes, grants_file)
+
         # Apply changes
         results = self.apply_changes(changes)
 
@@ -492,8 +521,14 @@ def main():
         action="store_true",
         help="Delete risk rules that exist in Okta but not in config (default: false)"
     )
+    parser.add_argument(
+        "--grants",
+        help="Grants snapshot (.jsonl, .json or .csv) to predict who new/updated rules will flag"
+    )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
@@ -506,7 +541,7 @@ def main():
         dry_run=args.dry_run
     )
 
-    success = applier.run(args.config, delete_removed=args.delete_removed)
+    success = applier.run(args.config, delete_removed=args.delete_removed, grants_file=args.grants)
     sys.exit(0 if success else 1)
 
 
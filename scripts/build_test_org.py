@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+build_test_org.py
+
+Builds (or cleans up) the demo test org as a dependency graph of steps that
+run in one process.
+
+All steps share one OktaAPIManager (HTTP session, rate-limit tracking and
+ORN resolver) and one inventory of existing users, groups, apps and zones,
+fetched once up front. Steps whose dependencies are done run concurrently,
+and the time taken by each step is reported at the end.
+
+Build graph:
+
+    inventory ─┬─ users ──────────┬─ group_memberships
+               ├─ groups ─────────┤
+               │                  └─ app_assignments ─┬─ labels      (--labels-config)
+               ├─ apps ───────────────┘               └─ owners      (--owners-config)
+               ├─ network_zone
+               └─ risk_rules (--risk-rules-config)
+
+Creation is idempotent: resources that already exist (matched by login, name
+or label) are reused instead of created again.
+
+Usage:
+    python3 scripts/build_test_org.py
+    python3 scripts/build_test_org.py --labels-config environments/lowerdecklabs/config/label_mappings.json \\
+        --owners-config environments/lowerdecklabs/config/owner_mappings.json \\
+        --risk-rules-config environments/lowerdecklabs/config/risk_rules.json
+    python3 scripts/build_test_org.py --cleanup
+    python3 scripts/build_test_org.py --dry-run
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_http import size_pool
+
+
+# ==================== Test Org Definition ====================
+
+TEST_USERS = [
+    {"firstName": "John", "lastName": "Doe", "email": "john.doe@example.com", "login": "john.doe@example.com",
+     "mobilePhone": "+14155551234", "department": "Engineering", "title": "Senior Software Engineer",
+     "city": "San Francisco", "state": "CA", "countryCode": "US"},
+    {"firstName": "Jane", "lastName": "Smith", "email": "jane.smith@example.com", "login": "jane.smith@example.com",
+     "mobilePhone": "+15125559876", "department": "Sales", "title": "Account Executive",
+     "city": "Austin", "state": "TX", "countryCode": "US"},
+    {"firstName": "Bob", "lastName": "Johnson", "email": "bob.johnson@example.com", "login": "bob.johnson@example.com",
+     "mobilePhone": "+16175554321", "department": "Security", "title": "Security Engineer",
+     "city": "Boston", "state": "MA", "countryCode": "US"},
+]
+
+TEST_GROUPS = [
+    {"name": "Engineering Team", "description": "Engineering team members with access to development resources"},
+    {"name": "Sales Team", "description": "Sales team members"},
+    {"name": "Security Team", "description": "Security team with access to security tools"},
+    {"name": "All Employees", "description": "All company employees"},
+]
+
+TEST_APPS = [
+    {"label": "Internal CRM System", "uri": "https://internalcrm.example.com"},
+    {"label": "Project Management Tool", "uri": "https://projectmanagement.example.com"},
+]
+
+TEST_ZONE = {
+    "type": "IP",
+    "name": "Corporate Network",
+    "gateways": [
+        {"type": "CIDR", "value": "192.168.1.0/24"},
+        {"type": "CIDR", "value": "10.0.0.0/8"}
+    ],
+    "proxies": None
+}
+
+# Group name -> user logins
+GROUP_MEMBERSHIPS = {
+    "Engineering Team": ["john.doe@example.com"],
+    "Sales Team": ["jane.smith@example.com"],
+    "Security Team": ["bob.johnson@example.com"],
+    "All Employees": ["john.doe@example.com", "jane.smith@example.com", "bob.johnson@example.com"],
+}
+
+# App label -> group names
+APP_ASSIGNMENTS = {
+    "Internal CRM System": ["Engineering Team", "Sales Team"],
+    "Project Management Tool": ["All Employees"],
+}
+
+TEST_PASSWORD = "TempPass123!"
+
+# Cleanup matches the same resources the build creates
+CLEANUP_APP_LABELS = re.compile(r"Internal CRM System|Project Management Tool")
+CLEANUP_USER_EMAILS = re.compile(r"@example\.com")
+CLEANUP_GROUP_NAMES = re.compile(r"Engineering Team|Sales Team|Security Team|All Employees")
+CLEANUP_ZONE_NAMES = re.compile(r"Corporate Network")
+
+
+def oidc_app_payload(label: str, uri: str) -> Dict:
+    """Create-app request body for a web OIDC app (as in the original build script)"""
+    return {
+        "name": "oidc_client",
+        "label": label,
+        "signOnMode": "OPENID_CONNECT",
+        "credentials": {
+            "oauthClient": {
+                "autoKeyRotation": True,
+                "token_endpoint_auth_method": "client_secret_basic"
+            }
+        },
+        "settings": {
+            "oauthClient": {
+                "client_uri": uri,
+                "redirect_uris": [f"{uri}/callback"],
+                "post_logout_redirect_uris": [f"{uri}/logout"],
+                "response_types": ["code"],
+                "grant_types": ["authorization_code", "refresh_token"],
+                "application_type": "web",
+                "consent_method": "REQUIRED",
+                "issuer_mode": "ORG_URL"
+            }
+        }
+    }
+
+
+# ==================== Step Graph ====================
+
+class Step:
+    """One unit of work in the build graph"""
+
+    def __init__(self, name: str, func: Callable[[], Optional[str]], depends_on: Optional[List[str]] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = depends_on or []
+
+
+def run_steps(steps: List[Step], max_workers: int = 4) -> Dict[str, Dict]:
+    """
+    Run steps in dependency order, running independent steps concurrently.
+
+    A step starts as soon as all of its dependencies have succeeded. If a step
+    fails, every step that depends on it (directly or not) is skipped.
+
+    Args:
+        steps: Steps to run (dependencies must refer to steps in the list)
+        max_workers: Maximum steps running at once
+
+    Returns:
+        Results by step name: status ("ok", "failed", "skipped"), seconds,
+        started/finished offsets from the start of the run, and detail
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        missing = [dep for dep in step.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(missing)}")
+
+    results: Dict[str, Dict] = {}
+    pending = {step.name for step in steps}
+    running = {}
+    run_started = time.time()
+
+    def timed(step: Step) -> Dict:
+        started = time.time()
+        try:
+            with span(step.name):
+                detail = step.func()
+            status = "ok"
+        except Exception as e:
+            detail = str(e)
+            status = "failed"
+        finished = time.time()
+        return {
+            "status": status,
+            "seconds": finished - started,
+            "started": started - run_started,
+            "finished": finished - run_started,
+            "detail": detail or ""
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # Skip steps whose dependencies failed (repeat so skips propagate down chains)
+            skipped = True
+            while skipped:
+                skipped = False
+                for name in sorted(pending):
+                    failed = [dep for dep in by_name[name].depends_on
+                              if results.get(dep, {}).get("status") in ("failed", "skipped")]
+                    if failed:
+                        pending.discard(name)
+                        results[name] = {"status": "skipped", "seconds": 0.0, "started": None, "finished": None,
+                                         "detail": f"dependency failed: {', '.join(failed)}"}
+                        skipped = True
+
+            # Start steps whose dependencies all succeeded
+            for name in sorted(pending):
+                if all(results.get(dep, {}).get("status") == "ok" for dep in by_name[name].depends_on):
+                    pending.discard(name)
+                    running[executor.submit(timed, by_name[name])] = name
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(pending))}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                icon = "✅" if results[name]["status"] == "ok" else "❌"
+                print(f"{icon} [{name}] {results[name]['status']} in {results[name]['seconds']:.2f}s"
+                      + (f" - {results[name]['detail']}" if results[name]["detail"] else ""))
+
+    return results
+
+
+def print_timing_report(steps: List[Step], results: Dict[str, Dict], elapsed: float):
+    """Print per-step timing and how much time concurrency saved"""
+    print("\n" + "=" * 80)
+    print("STEP TIMING")
+    print("=" * 80)
+    print(f"{'Step':<22} {'Status':<9} {'Start':>8} {'Duration':>10}  Depends on")
+    print("-" * 80)
+    for step in sorted(steps, key=lambda s: (results[s.name]["started"] is None, results[s.name]["started"] or 0)):
+        result = results[step.name]
+        start = f"{result['started']:.2f}s" if result["started"] is not None else "-"
+        print(f"{step.name:<22} {result['status']:<9} {start:>8} {result['seconds']:>9.2f}s  "
+              f"{', '.join(step.depends_on) or '-'}")
+    print("-" * 80)
+    serial = sum(result["seconds"] for result in results.values())
+    print(f"Wall time: {elapsed:.2f}s (steps took {serial:.2f}s in total; "
+          f"{max(serial - elapsed, 0):.2f}s saved by running independent steps concurrently)")
+    print("=" * 80)
+
+
+# ==================== Builder ====================
+
+class TestOrgBuilder:
+    """Creates and removes the demo test org resources using one shared API manager"""
+
+    def __init__(self, manager: OktaAPIManager, dry_run: bool = False):
+        self.manager = manager
+        self.base_url = manager.base_url
+        self.dry_run = dry_run
+
+        # Shared lookups, loaded once by the inventory step and updated as steps create resources
+        self.users: Dict[str, Dict] = {}    # login -> user
+        self.groups: Dict[str, Dict] = {}   # name -> group
+        self.apps: Dict[str, Dict] = {}     # label -> app
+        self.zones: Dict[str, Dict] = {}    # name -> zone
+        self._lock = threading.Lock()
+
+    def _request(self, method: str, path: str, **kwargs):
+        return self.manager._make_request(method, f"{self.base_url}{path}", **kwargs)
+
+    def _create(self, kind: str, key: str, path: str, payload: Dict, lookup: Dict[str, Dict]) -> Dict:
+        """Create a resource unless the inventory already has it"""
+        if key in lookup:
+            print(f"  ↺ {kind} exists: {key} ({lookup[key].get('id')})")
+            return lookup[key]
+        if self.dry_run:
+            print(f"  [DRY RUN] Would create {kind}: {key}")
+            resource = {"id": f"dry-run-{kind}-{key}"}
+        else:
+            resource = self._request("POST", path, json=payload).json()
+            print(f"  ✓ Created {kind}: {key} ({resource.get('id')})")
+        with self._lock:
+            lookup[key] = resource
+        return resource
+
+    # ----- build steps -----
+
+    def load_inventory(self) -> str:
+        """Fetch existing users, groups, apps and zones once for all later steps"""
+        users = self.manager._paginate(f"{self.base_url}/api/v1/users", {"limit": 200})
+        groups = self.manager._paginate(f"{self.base_url}/api/v1/groups", {"limit": 200})
+        apps = self.manager._paginate(f"{self.base_url}/api/v1/apps", {"limit": 200})
+        zones = self.manager._paginate(f"{self.base_url}/api/v1/zones", {"limit": 200})
+
+        self.users = {u["profile"]["login"]: u for u in users if u.get("profile", {}).get("login")}
+        self.groups = {g["profile"]["name"]: g for g in groups if g.get("profile", {}).get("name")}
+        self.apps = {a["label"]: a for a in apps if a.get("label") and a.get("status") != "DELETED"}
+        self.zones = {z["name"]: z for z in zones if z.get("name")}
+
+        # Later steps resolve app ORNs from this table without another bulk load
+        self.manager.orn_resolver.register_apps(apps)
+
+        return f"{len(users)} users, {len(groups)} groups, {len(apps)} apps, {len(zones)} zones"
+
+    def create_users(self) -> str:
+        for profile in TEST_USERS:
+            self._create("user", profile["login"], "/api/v1/users?activate=true", {
+                "profile": profile,
+                "credentials": {"password": {"value": TEST_PASSWORD}}
+            }, self.users)
+        return f"{len(TEST_USERS)} users"
+
+    def create_groups(self) -> str:
+        for group in TEST_GROUPS:
+            self._create("group", group["name"], "/api/v1/groups", {"profile": group}, self.groups)
+        return f"{len(TEST_GROUPS)} groups"
+
+    def create_apps(self) -> str:
+        for app in TEST_APPS:
+            created = self._create("app", app["label"], "/api/v1/apps",
+                                   oidc_app_payload(app["label"], app["uri"]), self.apps)
+            if not self.dry_run:
+                self.manager.orn_resolver.register_apps([created])
+        return f"{len(TEST_APPS)} apps"
+
+    def create_network_zone(self) -> str:
+        self._create("network zone", TEST_ZONE["name"], "/api/v1/zones", TEST_ZONE, self.zones)
+        return TEST_ZONE["name"]
+
+    def add_group_memberships(self) -> str:
+        count = 0
+        for group_name, logins in GROUP_MEMBERSHIPS.items():
+            group_id = self.groups[group_name]["id"]
+            for login in logins:
+                user_id = self.users[login]["id"]
+                if self.dry_run:
+                    print(f"  [DRY RUN] Would add {login} to {group_name}")
+                else:
+                    self._request("PUT", f"/api/v1/groups/{group_id}/users/{user_id}")
+                    print(f"  ✓ Added {login} to {group_name}")
+                count += 1
+        return f"{count} memberships"
+
+    def assign_groups_to_apps(self) -> str:
+        count = 0
+        for app_label, group_names in APP_ASSIGNMENTS.items():
+            app_id = self.apps[app_label]["id"]
+            for group_name in group_names:
+                group_id = self.groups[group_name]["id"]
+                if self.dry_run:
+                    print(f"  [DRY RUN] Would assign {group_name} to {app_label}")
+                else:
+                    self._request("PUT", f"/api/v1/apps/{app_id}/groups/{group_id}", json={})
+                    print(f"  ✓ Assigned {group_name} to {app_label}")
+                count += 1
+        return f"{count} assignments"
+
+    def apply_labels(self, config_file: str) -> str:
+        from scripts.apply_labels_from_config import LabelApplier
+
+        applier = LabelApplier(self.manager, dry_run=self.dry_run)
+        success = applier.apply_all_labels(applier.load_config(config_file))
+        if not success or applier.stats["errors"]:
+            raise RuntimeError(f"{len(applier.stats['errors'])} label error(s)")
+        return f"{applier.stats['assignments_applied']} label assignments"
+
+    def apply_owners(self, config_file: str) -> str:
+        from scripts.apply_resource_owners import ResourceOwnerApplier
+
+        applier = self._share_session(ResourceOwnerApplier)
+        if not applier.run(config_file):
+            raise RuntimeError("resource owner assignment reported errors")
+        return config_file
+
+    def apply_risk_rules(self, config_file: str) -> str:
+        from scripts.apply_risk_rules import RiskRuleApplier
+
+        applier = self._share_session(RiskRuleApplier)
+        if not applier.run(config_file):
+            raise RuntimeError("risk rule application reported errors")
+        return config_file
+
+    def _share_session(self, applier_class):
+        """Build an applier that reuses the manager's authenticated session and connection pool"""
+        org_name = self.manager.org_name
+        domain = self.base_url.split(f"://{org_name}.", 1)[1]
+        api_token = self.manager.headers["Authorization"].split(" ", 1)[1]
+
+        applier = applier_class(org_name, domain, api_token, dry_run=self.dry_run)
+        applier.session.close()
+        applier.session = self.manager.session
+        return applier
+
+    # ----- cleanup steps -----
+
+    def _delete_matching(self, kind: str, path: str, items: List[Dict], name_of: Callable[[Dict], str],
+                         pattern, deactivate: bool) -> str:
+        matches = [item for item in items if pattern.search(name_of(item) or "")]
+        for item in matches:
+            if self.dry_run:
+                print(f"  [DRY RUN] Would delete {kind}: {name_of(item)} ({item['id']})")
+                continue
+            if deactivate:
+                try:
+                    self._request("POST", f"{path}/{item['id']}/lifecycle/deactivate")
+                except Exception:
+                    pass  # Already inactive
+            self._request("DELETE", f"{path}/{item['id']}")
+            print(f"  ✓ Deleted {kind}: {name_of(item)} ({item['id']})")
+        return f"{len(matches)} {kind}(s)"
+
+    def delete_apps(self) -> str:
+        return self._delete_matching("app", "/api/v1/apps", list(self.apps.values()),
+                                     lambda a: a.get("label"), CLEANUP_APP_LABELS, deactivate=True)
+
+    def delete_users(self) -> str:
+        return self._delete_matching("user", "/api/v1/users", list(self.users.values()),
+                                     lambda u: u.get("profile", {}).get("email"), CLEANUP_USER_EMAILS,
+                                     deactivate=True)
+
+    def delete_groups(self) -> str:
+        return self._delete_matching("group", "/api/v1/groups", list(self.groups.values()),
+                                     lambda g: g.get("profile", {}).get("name"), CLEANUP_GROUP_NAMES,
+                                     deactivate=False)
+
+    def delete_network_zones(self) -> str:
+        return self._delete_matching("network zone", "/api/v1/zones", list(self.zones.values()),
+                                     lambda z: z.get("name"), CLEANUP_ZONE_NAMES, deactivate=True)
+
+    # ----- graphs -----
+
+    def build_steps(self, labels_config: Optional[str] = None, owners_config: Optional[str] = None,
+                    risk_rules_config: Optional[str] = None) -> List[Step]:
+        steps = [
+            Step("inventory", self.load_inventory),
+            Step("users", self.create_users, ["inventory"]),
+            Step("groups", self.create_groups, ["inventory"]),
+            Step("apps", self.create_apps, ["inventory"]),
+            Step("network_zone", self.create_network_zone, ["inventory"]),
+            Step("group_memberships", self.add_group_memberships, ["users", "groups"]),
+            Step("app_assignments", self.assign_groups_to_apps, ["apps", "groups"]),
+        ]
+        if labels_config:
+            steps.append(Step("labels", lambda: self.apply_labels(labels_config), ["app_assignments"]))
+        if owners_config:
+            steps.append(Step("owners", lambda: self.apply_owners(owners_config),
+                              ["app_assignments", "group_memberships"]))
+        if risk_rules_config:
+            # Risk rules don't wait for the test resources, labels or owners
+            steps.append(Step("risk_rules", lambda: self.apply_risk_rules(risk_rules_config), ["inventory"]))
+        return steps
+
+    def cleanup_steps(self) -> List[Step]:
+        return [
+            Step("inventory", self.load_inventory),
+            Step("delete_apps", self.delete_apps, ["inventory"]),
+            Step("delete_users", self.delete_users, ["inventory"]),
+            Step("delete_groups", self.delete_groups, ["inventory"]),
+            Step("delete_network_zones", self.delete_network_zones, ["inventory"]),
+        ]
+
+    def print_resources(self):
+        print("\n📊 Test Resources:")
+        for title, lookup, keys in (
+            ("Users", self.users, [u["login"] for u in TEST_USERS]),
+            ("Groups", self.groups, [g["name"] for g in TEST_GROUPS]),
+            ("Applications", self.apps, [a["label"] for a in TEST_APPS]),
+            ("Network Zones", self.zones, [TEST_ZONE["name"]]),
+        ):
+            print(f"\n{title}:")
+            for key in keys:
+                print(f"  - {key} ({lookup.get(key, {}).get('id', 'not created')})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or clean up the demo test org as a concurrent step graph"
+    )
+    parser.add_argument("--org-name", default=os.environ.get("OKTA_ORG_NAME"), help="Okta organization name")
+    parser.add_argument("--base-url", default=os.environ.get("OKTA_BASE_URL", "okta.com"), help="Okta base URL")
+    parser.add_argument("--api-token", default=os.environ.get("OKTA_API_TOKEN"), help="Okta API token")
+    parser.add_argument("--labels-config", help="Apply labels from this label_mappings.json after the build")
+    parser.add_argument("--owners-config", help="Apply resource owners from this owner_mappings.json after the build")
+    parser.add_argument("--risk-rules-config", help="Apply risk rules from this risk_rules.json after the build")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the test resources instead of creating them")
+    parser.add_argument("--yes", action="store_true", help="Skip the cleanup confirmation prompt")
+    parser.add_argument("--max-workers", type=int, default=4, help="Maximum steps running at once (default: 4)")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be done without making changes")
+    add_metrics_arguments(parser)
+
+    args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
+
+    if not args.org_name or not args.api_token:
+        print("❌ Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+        print("   Either set environment variables or use --org-name and --api-token")
+        sys.exit(1)
+
+    for config_file in (args.labels_config, args.owners_config, args.risk_rules_config):
+        if config_file and not os.path.exists(config_file):
+            print(f"❌ Error: Config file not found: {config_file}")
+            sys.exit(1)
+
+    manager = OktaAPIManager(args.org_name, args.base_url, args.api_token)
+    size_pool(manager.session, args.max_workers)
+    builder = TestOrgBuilder(manager, dry_run=args.dry_run)
+
+    print("=" * 80)
+    print(f"{'CLEANUP' if args.cleanup else 'BUILD'} TEST OKTA ORG{' (DRY RUN MODE)' if args.dry_run else ''}")
+    print("=" * 80)
+    print(f"Org: {manager.base_url}\n")
+
+    if args.cleanup:
+        if not args.yes and not args.dry_run:
+            print(f"⚠️  WARNING: This will DELETE test resources from: {manager.base_url}")
+            if input("Are you sure you want to continue? (yes/no): ").strip() != "yes":
+                print("Cancelled.")
+                return
+        steps = builder.cleanup_steps()
+    else:
+        steps = builder.build_steps(args.labels_config, args.owners_config, args.risk_rules_config)
+
+    started = time.time()
+    results = run_steps(steps, max_workers=args.max_workers)
+    print_timing_report(steps, results, time.time() - started)
+
+    if not args.cleanup:
+        builder.print_resources()
+
+    failed = [name for name, result in results.items() if result["status"] != "ok"]
+    if failed:
+        print(f"\n❌ {len(failed)} step(s) did not complete: {', '.join(failed)}")
+        sys.exit(1)
+
+    print(f"\n✅ Test org {'cleanup' if args.cleanup else 'build'} complete!")
+    if not args.cleanup:
+        print("\n🧪 Now you can test Terraformer import:")
+        print("  terraformer import okta --resources=okta_user,okta_group,okta_app_oauth,okta_network_zone")
+
+
+if __name__ == "__main__":
+    main()
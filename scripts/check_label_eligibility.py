@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Check if apps are eligible for label assignment by querying the governance API.
+
+Set OKTA_SNAPSHOT_DB to read from a local snapshot (see okta_snapshot.py)
+instead of the live API.
 """
 
 import os
@@ -10,22 +13,26 @@ import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_snapshot import open_snapshot
 
 def main():
-    # Get credentials from environment
-    org_name = os.environ.get("OKTA_ORG_NAME")
-    base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
-    api_token = os.environ.get("OKTA_API_TOKEN")
+    snapshot = open_snapshot(os.environ.get("OKTA_SNAPSHOT_DB"))
+
+    if not snapshot:
+        # Get credentials from environment
+        org_name = os.environ.get("OKTA_ORG_NAME")
+        base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
+        api_token = os.environ.get("OKTA_API_TOKEN")
 
-    if not org_name or not api_token:
-        print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
-        sys.exit(1)
+        if not org_name or not api_token:
+            print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+            sys.exit(1)
 
-    manager = OktaAPIManager(
-        org_name=org_name,
-        base_url=base_url,
-        api_token=api_token
-    )
+        manager = OktaAPIManager(
+            org_name=org_name,
+            base_url=base_url,
+            api_token=api_token
+        )
 
     app_ids = [
         ('0oamxiwg4zsrWaeJF1d7', 'Salesforce.com'),
@@ -41,11 +48,17 @@ def main():
         print(f"\n{app_name} ({app_id}):")
 
         # Check app details
-        app_url = f"{manager.base_url}/api/v1/apps/{app_id}"
         try:
-            app_response = manager.session.get(app_url)
-            app_response.raise_for_status()
-            app_data = app_response.json()
+            if snapshot:
+                app_data = snapshot.get_app(app_id)
+                if not app_data:
+                    raise ValueError("not found in snapshot")
+            else:
+                app_url = f"{manager.base_url}/api/v1/apps/{app_id}"
+                app_response = manager.session.get(app_url)
+                app_response.raise_for_status()
+                app_data = app_response.json()
+                manager.orn_resolver.register_apps([app_data])
 
             print(f"  ✅ App exists")
             print(f"  Sign-on mode: {app_data.get('signOnMode')}")
@@ -64,27 +77,20 @@ def main():
 
         # Try to get existing labels for this app
         # The ORN format for querying
-        org_url = f"{manager.base_url}/api/v1/org"
-        org_response = manager.session.get(org_url)
-        org_data = org_response.json()
-        org_id = org_data.get('id')
-
-        app_type_map = {
-            'saml_2_0': 'saml',
-            'saml2': 'saml',
-            'openid_connect': 'oidc',
-            'oidc': 'oidc',
-            'browser_plugin': 'browser_plugin',
-            'ws_federation': 'ws-federation',
-            'auto': 'auto'
-        }
-
-        sign_on_mode = app_data.get('signOnMode', '').lower()
-        app_type = app_type_map.get(sign_on_mode, sign_on_mode)
-        orn = f"orn:okta:idp:{org_id}:apps:{app_type}:{app_id}"
+        if snapshot:
+            orn = snapshot.get_app_orn(app_id)
+        else:
+            orn = manager.orn_resolver.app_orn(app_id)
 
         print(f"  ORN: {orn}")
 
+        if snapshot:
+            current_labels = snapshot.labels_for_resource(orn)
+            print(f"  Current labels (snapshot): {len(current_labels)} labels assigned")
+            for label in current_labels:
+                print(f"    - {label.get('label', {}).get('name')}: {label.get('value', {}).get('name')}")
+            continue
+
         # Try to query labels for this resource
         labels_url = f"{manager.base_url}/governance/api/v1/resource-labels"
         params = {"resourceOrn": orn}
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Check a specific app by ID.
+
+Set OKTA_SNAPSHOT_DB to read from a local snapshot (see okta_snapshot.py)
+instead of the live API.
 """
 
 import os
@@ -10,8 +13,25 @@ import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_snapshot import open_snapshot
 
 def main():
+    app_id = "0oaq4iodcifSLp30Q1d7"  # Workday
+
+    snapshot = open_snapshot(os.environ.get("OKTA_SNAPSHOT_DB"))
+    if snapshot:
+        print(f"Reading app {app_id} from snapshot: {snapshot.db_path}")
+        print()
+        app_data = snapshot.get_app(app_id)
+        if not app_data:
+            print(f"Error fetching app: {app_id} not found in snapshot")
+            sys.exit(1)
+
+        print("App found!")
+        print("=" * 80)
+        print(json.dumps(app_data, indent=2))
+        return
+
     # Get credentials from environment
     org_name = os.environ.get("OKTA_ORG_NAME")
     base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
@@ -27,8 +47,6 @@ def main():
         api_token=api_token
     )
 
-    app_id = "0oaq4iodcifSLp30Q1d7"  # Workday
-
     # Get app details
     url = f"{manager.base_url}/api/v1/apps/{app_id}"
     print(f"Fetching app details for {app_id}...")
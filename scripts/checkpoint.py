@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+checkpoint.py
+
+Append-only checkpoint journal for long-running syncs and imports.
+
+Large-org crawls (owner sync, entitlement import, OIG import) make one or more
+API calls per resource and can run for hours. If the process dies halfway
+(token expiry, runner timeout), the journal lets the next run pick up where
+the last one stopped instead of starting from zero:
+
+- every completed unit of work (a resource, an app, a bundle) is appended as
+  a `done` record with its result
+- every fetched list page is appended as a `page` record with its items and
+  the cursor of the next page
+
+With --resume, finished work is replayed from the journal and listing
+continues from the last recorded cursor. Without --resume, or if the journaled
+run already completed, the journal is started over; replaying a completed run
+(no API calls, the org as it was then) needs --replay-completed as well.
+
+The journal is a JSON-lines file, one record per line, flushed after every
+write; a line cut short by a crash is ignored on resume.
+
+Journal records:
+    {"event": "start", "job": "...", "params": {...}, "at": "..."}
+    {"event": "done", "key": "...", "value": ...}
+    {"event": "page", "stream": "...", "items": [...], "cursor": "..." | null}
+    {"event": "complete", "at": "..."}
+
+Usage:
+    python3 scripts/sync_owner_mappings.py --resume
+    python3 scripts/checkpoint.py .okta_cache/checkpoints/sync_owner_mappings-myorg.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(".okta_cache", "checkpoints")
+
+
+class CheckpointMismatch(Exception):
+    """Raised when resuming a journal that was written for a different run"""
+
+
+def default_checkpoint_path(job: str, org_name: str, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> str:
+    return os.path.join(checkpoint_dir, f"{job}-{org_name}.jsonl")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class CheckpointJournal:
+    """
+    Journal of completed work for one job.
+
+    Args:
+        path: Journal file. None keeps the journal in memory only, so callers
+            can use the same code path with checkpointing turned off.
+        job: Name of the job writing the journal (e.g. "sync_owner_mappings")
+        params: Run parameters that must match when resuming (org, filters...)
+        resume: Replay an existing journal of an interrupted run instead of
+            starting over
+        replay_completed: Also replay the journal if its run completed. By
+            default a completed journal is started over, since replaying it
+            would present the org as it was then without any API calls.
+    """
+
+    def __init__(self, path: Optional[str], job: str, params: Optional[Dict] = None, resume: bool = False,
+                 replay_completed: bool = False):
+        self.path = path
+        self.job = job
+        self.params = params or {}
+        self.resumed = False
+        self.completed = False
+        self.restarted_completed = None
+        self.replayed = 0
+
+        self._done: Dict[str, object] = {}
+        self._pages: Dict[str, List] = {}
+        self._cursors: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._completed_at = None
+
+        if path is None:
+            return
+
+        if resume and os.path.exists(path):
+            self._load()
+            if self.completed and not replay_completed:
+                # Start over; keep when the previous run finished for the log
+                self.restarted_completed = self._completed_at or "unknown time"
+                self.completed = False
+                self._done, self._pages, self._cursors = {}, {}, {}
+            else:
+                self.resumed = True
+                self._file = open(path, "a")
+
+        if self._file is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "w")
+            self._write({"event": "start", "job": job, "params": self.params, "at": _now()})
+
+    def _load(self):
+        with open(self.path) as f:
+            lines = f.read().split("\n")
+
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if number < len(lines):
+                    raise
+                # A last line without a newline was cut short by a crash;
+                # drop it so the next record starts on a line of its own
+                with open(self.path, "w") as f:
+                    f.write("\n".join(lines[:-1]) + "\n")
+                break
+
+            event = record.get("event")
+            if event == "start":
+                if record.get("job") != self.job or record.get("params") != self.params:
+                    raise CheckpointMismatch(
+                        f"{self.path} was written by {record.get('job')} with {record.get('params')}, "
+                        f"not {self.job} with {self.params}"
+                    )
+            elif event == "done":
+                self._done[record["key"]] = record.get("value")
+            elif event == "page":
+                self._pages.setdefault(record["stream"], []).extend(record.get("items", []))
+                self._cursors[record["stream"]] = record.get("cursor")
+            elif event == "complete":
+                self.completed = True
+                self._completed_at = record.get("at")
+
+    def _write(self, record: Dict):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    # ==================== Completed work ====================
+
+    def done(self, key: str) -> bool:
+        """Whether `key` was completed by this or a previous run"""
+        return key in self._done
+
+    def get(self, key: str, default=None):
+        """Recorded result of a completed key"""
+        if key in self._done:
+            with self._lock:
+                self.replayed += 1
+            return self._done[key]
+        return default
+
+    def record(self, key: str, value=None):
+        """Mark `key` as completed, with the result to replay on resume"""
+        with self._lock:
+            self._done[key] = value
+            self._write({"event": "done", "key": key, "value": value})
+
+    def run(self, key: str, func: Callable[[], object]):
+        """Result of `key` from the journal, or run `func` and record it"""
+        if self.done(key):
+            return self.get(key)
+        value = func()
+        self.record(key, value)
+        return value
+
+    # ==================== Pagination ====================
+
+    def pages(self, stream: str) -> Tuple[List, Optional[str], bool]:
+        """Items recorded for a stream by a previous run, the cursor to continue from and whether it finished"""
+        started = stream in self._cursors
+        cursor = self._cursors.get(stream)
+        return list(self._pages.get(stream, [])), cursor, started and cursor is None
+
+    def record_page(self, stream: str, items: List, cursor: Optional[str]):
+        """
+        Record a fetched page and the cursor of the next page (None on the last page).
+
+        The items are only written to the journal file; paginate() hands
+        them to the caller, so the journal does not hold a second copy.
+        """
+        with self._lock:
+            self._pages.setdefault(stream, [])
+            self._cursors[stream] = cursor
+            self._write({"event": "page", "stream": stream, "items": items, "cursor": cursor})
+
+    def paginate(self, stream: str, fetch_page: Callable[[Optional[str]], Tuple[List, Optional[str]]],
+                 parse: Optional[Callable[[List], List]] = None) -> List:
+        """
+        Fetch every page of a list, continuing after the last recorded page.
+
+        `fetch_page(cursor)` returns one page of items and the cursor of the
+        next page, or None after the last page; it is called with None for
+        the first page. If it raises, the pages fetched so far stay recorded
+        and a resumed run retries from the failed page.
+
+        `parse(items)` converts each page (fetched or replayed) before it is
+        collected, e.g. into okta_models records; the journal keeps the
+        decoded JSON.
+        """
+        parse = parse or (lambda page: page)
+        recorded, cursor, finished = self.pages(stream)
+        self._pages[stream] = []
+        items = parse(recorded)
+        del recorded
+
+        if finished:
+            self.replayed += len(items)
+            return items
+        if items:
+            self.replayed += len(items)
+            print(f"  ↪️  Resuming {stream} after {len(items)} recorded item(s)")
+
+        while True:
+            page, cursor = fetch_page(cursor)
+            if not page:
+                cursor = None
+            self.record_page(stream, page, cursor)
+            items.extend(parse(page))
+            if cursor is None:
+                return items
+
+    # ==================== Lifecycle ====================
+
+    def complete(self):
+        """Mark the job as finished"""
+        with self._lock:
+            self.completed = True
+            self._write({"event": "complete", "at": _now()})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def describe(self) -> str:
+        if self.path is None:
+            return "Checkpointing disabled"
+        if not self.resumed:
+            return f"Checkpoint journal: {self.path}"
+        if self.completed:
+            return (f"Replaying completed run from {self.path} (finished {self._completed_at}): "
+                    f"{len(self._done)} item(s) and {len(self._pages)} list(s) from the journal, no API calls")
+        return (f"Resuming interrupted run from {self.path}: "
+                f"{len(self._done)} completed item(s), {len(self._pages)} list(s) recorded")
+
+
+def add_checkpoint_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip work recorded in the checkpoint journal by an interrupted run"
+    )
+    parser.add_argument(
+        "--replay-completed",
+        action="store_true",
+        help="With --resume, replay a journal whose run already completed instead of starting over "
+             "(output reflects the org when that run finished)"
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        help=f"Checkpoint journal path (default: {DEFAULT_CHECKPOINT_DIR}/<script>-<org>.jsonl)"
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not write a checkpoint journal"
+    )
+
+
+def open_checkpoint(args: argparse.Namespace, job: str, org_name: str,
+                    params: Optional[Dict] = None) -> CheckpointJournal:
+    """Journal for a script run from the add_checkpoint_arguments() flags"""
+    if args.no_checkpoint:
+        return CheckpointJournal(None, job)
+
+    path = args.checkpoint_file or default_checkpoint_path(job, org_name)
+    try:
+        journal = CheckpointJournal(path, job, dict(params or {}, org=org_name), resume=args.resume,
+                                    replay_completed=getattr(args, "replay_completed", False))
+    except CheckpointMismatch as e:
+        print(f"❌ Cannot resume: {e}")
+        print("   Run without --resume to start over")
+        sys.exit(1)
+
+    if journal.restarted_completed:
+        print(f"ℹ️  The run in {path} already completed ({journal.restarted_completed}); starting over")
+        print("   Pass --replay-completed to replay its results instead")
+    elif args.resume and not journal.resumed:
+        print(f"ℹ️  No checkpoint journal at {path}; starting from the beginning")
+    print(f"📒 {journal.describe()}")
+    if journal.resumed and journal.completed:
+        print("⚠️  Results are replayed from the journal and may not match the org today")
+    return journal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the state of a checkpoint journal")
+    parser.add_argument("journal", help="Checkpoint journal file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.journal):
+        print(f"❌ Journal not found: {args.journal}")
+        sys.exit(1)
+
+    start = None
+    done = 0
+    streams: Dict[str, Dict] = {}
+    finished_at = None
+
+    with open(args.journal) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event = record.get("event")
+            if event == "start":
+                start = record
+            elif event == "done":
+                done += 1
+            elif event == "page":
+                stream = streams.setdefault(record["stream"], {"pages": 0, "items": 0})
+                stream["pages"] += 1
+                stream["items"] += len(record.get("items", []))
+                stream["cursor"] = record.get("cursor")
+            elif event == "complete":
+                finished_at = record.get("at")
+
+    print("="*80)
+    print(f"CHECKPOINT JOURNAL: {args.journal}")
+    print("="*80)
+    if start:
+        print(f"Job: {start.get('job')}")
+        print(f"Parameters: {json.dumps(start.get('params', {}))}")
+        print(f"Started: {start.get('at')}")
+    print(f"Completed items: {done}")
+    for name, stream in streams.items():
+        state = "finished" if stream.get("cursor") is None else "in progress"
+        print(f"  📄 {name}: {stream['items']} item(s) in {stream['pages']} page(s), {state}")
+    if finished_at:
+        print(f"\n✅ Run completed at {finished_at}")
+    else:
+        print("\n⏸️  Run did not complete; continue it with --resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -305,48 +305,43 @@ module "policies" {
         os.chmod(import_file, 0o755)
         print(f"Created: {import_file}")
     
-    def run(self):
-        """Execute the cleaning process"""
-        print("=" * 50)
-        print("Terraform Cleaner - Refactoring Generated Code")
-        print("=" * 50)
-        
-        # Create output directory
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # First pass: clean all files and build resource mapping
-        print("\nCleaning Terraform files...")
-        for resource_dir in self.input_dir.iterdir():
-            if not resource_dir.is_dir():
+    def clean_resource_dir(self, resource_dir: Path) -> int:
+        """
+        First pass for one resource type directory: clean its files and record
+        the renamed resources and extracted variables. Returns the file count.
+        """
+        count = 0
+        for tf_file in resource_dir.glob('*.tf'):
+            if tf_file.name == 'provider.tf':
                 continue
-            
-            for tf_file in resource_dir.glob('*.tf'):
-                if tf_file.name == 'provider.tf':
-                    continue
-                self.clean_terraform_file(tf_file)
-        
-        # Second pass: update references with cleaned names
-        print("\nUpdating resource references...")
-        for resource_dir in self.input_dir.iterdir():
-            if not resource_dir.is_dir():
+            self.clean_terraform_file(tf_file)
+            count += 1
+        return count
+    
+    def write_resource_dir(self, resource_dir: Path):
+        """
+        Second pass for one resource type directory: update references with
+        cleaned names and write the files to the output directory. Needs the
+        first pass to have run for every directory the files may refer to.
+        """
+        for tf_file in resource_dir.glob('*.tf'):
+            if tf_file.name == 'provider.tf':
                 continue
             
-            for tf_file in resource_dir.glob('*.tf'):
-                if tf_file.name == 'provider.tf':
-                    continue
-                
-                with open(tf_file, 'r') as f:
-                    content = f.read()
-                
-                content = self.update_references(content)
-                
-                # Write to output directory
-                output_subdir = self.output_dir / resource_dir.name
-                output_subdir.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_subdir / tf_file.name, 'w') as f:
-                    f.write(content)
-        
+            with open(tf_file, 'r') as f:
+                content = f.read()
+            
+            content = self.update_references(content)
+            
+            # Write to output directory
+            output_subdir = self.output_dir / resource_dir.name
+            output_subdir.mkdir(parents=True, exist_ok=True)
+            
+            with open(output_subdir / tf_file.name, 'w') as f:
+                f.write(content)
+    
+    def finish(self):
+        """Write the combined outputs once every resource type has been cleaned"""
         # Organize by resource type
         self.organize_by_resource_type()
         
@@ -365,6 +360,28 @@ module "policies" {
         
         # Generate summary
         self.generate_summary()
+    
+    def run(self):
+        """Execute the cleaning process"""
+        print("=" * 50)
+        print("Terraform Cleaner - Refactoring Generated Code")
+        print("=" * 50)
+        
+        # Create output directory
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        resource_dirs = [d for d in self.input_dir.iterdir() if d.is_dir()]
+        
+        # First pass: clean all files and build resource mapping
+        print("\nCleaning Terraform files...")
+        for resource_dir in resource_dirs:
+            self.clean_resource_dir(resource_dir)
+        
+        # Second pass: update references with cleaned names
+        print("\nUpdating resource references...")
+        for resource_dir in resource_dirs:
+            self.write_resource_dir(resource_dir)
+        
+        self.finish()
         
         print("\n" + "=" * 50)
         print("✓ Cleaning completed successfully!")
@@ -50,15 +50,7 @@ def create_compliance_label_with_values(manager: OktaAPIManager) -> Optional[Dic
 
     try:
         print("Creating Compliance label with values: SOX, GDPR, PII...")
-        response = requests.post(
-            url,
-            headers={
-                "Authorization": f"SSWS {manager.api_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        response = manager.session.post(url, json=payload)
         response.raise_for_status()
         result = response.json()
         print(f"✅ Created Compliance label!")
@@ -116,15 +108,7 @@ def apply_sox_label_to_apps(manager: OktaAPIManager, label_value_id: str, app_id
 
     try:
         print(f"\nApplying SOX label to {len(app_ids)} applications...")
-        response = requests.put(
-            url,
-            headers={
-                "Authorization": f"SSWS {manager.api_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        response = manager.session.put(url, json=payload)
         response.raise_for_status()
         print("✅ Successfully applied SOX label to applications:")
         for app_id in app_ids:
@@ -163,15 +147,7 @@ def apply_label_to_group(manager: OktaAPIManager, label_value_id: str, group_id:
 
     try:
         print(f"\nApplying {value_name} label to group {group_id}...")
-        response = requests.put(
-            url,
-            headers={
-                "Authorization": f"SSWS {manager.api_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        response = manager.session.put(url, json=payload)
         response.raise_for_status()
         print(f"✅ Successfully applied {value_name} label to group")
         return response.json()
@@ -208,15 +184,7 @@ def apply_label_to_entitlement_bundle(manager: OktaAPIManager, label_value_id: s
 
     try:
         print(f"\nApplying {value_name} label to entitlement bundle {bundle_id}...")
-        response = requests.put(
-            url,
-            headers={
-                "Authorization": f"SSWS {manager.api_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        response = manager.session.put(url, json=payload)
         response.raise_for_status()
         print(f"✅ Successfully applied {value_name} label to entitlement bundle")
         return response.json()
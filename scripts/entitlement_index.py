@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+entitlement_index.py
+
+Searchable local index of entitlement values for an application.
+
+Apps such as ServiceNow expose tens of thousands of role values. Instead of
+downloading every entitlement and scanning all values on every lookup, the
+values are fetched once, stored in a per-app index file and searched through a
+trigram inverted index. Results are ranked:
+
+    exact match  >  prefix match  >  substring match  >  fuzzy (trigram) match
+
+The index is refreshed incrementally: only entitlements whose values changed
+since the last build are re-indexed.
+
+Usage (normally via find_entitlement_value.py):
+    python3 scripts/entitlement_index.py --app-id 0oar0edy8iuBrRn6t1d7 --search itil
+    python3 scripts/entitlement_index.py --app-id 0oar0edy8iuBrRn6t1d7 --refresh
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_api_manager import OktaAPIManager
+
+
+DEFAULT_INDEX_DIR = os.path.join(".okta_cache", "entitlement_index")
+
+# Fields of an entitlement value that are searchable
+SEARCH_FIELDS = ("value_name", "value_external", "value_id")
+
+# Minimum trigram similarity for a fuzzy (non-substring) match
+FUZZY_THRESHOLD = 0.3
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigrams of a lowercased string, padded so short strings still index"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _fingerprint(entitlement: Dict) -> str:
+    """Hash of an entitlement's values, used to detect changes on refresh"""
+    encoded = json.dumps(entitlement.get("values", []), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def fetch_entitlements_for_app(manager: OktaAPIManager, app_id: str) -> List[Dict]:
+    """Fetch all entitlements (with values) for an app, following pagination"""
+    url = f"{manager.base_url}/governance/api/v1/entitlements"
+    params = {
+        "filter": f'parent.externalId eq "{app_id}" AND parent.type eq "APPLICATION"',
+        "limit": 200
+    }
+    return manager._paginate(url, params)
+
+
+class EntitlementValueIndex:
+    """Trigram inverted index over the entitlement values of one application"""
+
+    def __init__(self, app_id: str):
+        self.app_id = app_id
+        self.built_at = None
+        self.records: Dict[int, Dict] = {}
+        self.fingerprints: Dict[str, str] = {}   # entitlement id -> values hash
+        self.by_entitlement: Dict[str, List[int]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.exact: Dict[str, Set[int]] = {}      # lowercased field value -> record ids
+        self._next_id = 0
+
+    # ==================== Building ====================
+
+    def _add_record(self, record: Dict) -> int:
+        record_id = self._next_id
+        self._next_id += 1
+        self.records[record_id] = record
+
+        for field in SEARCH_FIELDS:
+            text = (record.get(field) or "").lower()
+            if not text:
+                continue
+            self.exact.setdefault(text, set()).add(record_id)
+            for gram in _trigrams(text):
+                self.postings.setdefault(gram, set()).add(record_id)
+        return record_id
+
+    def _remove_record(self, record_id: int):
+        record = self.records.pop(record_id)
+        for field in SEARCH_FIELDS:
+            text = (record.get(field) or "").lower()
+            if not text:
+                continue
+            self.exact.get(text, set()).discard(record_id)
+            for gram in _trigrams(text):
+                self.postings.get(gram, set()).discard(record_id)
+
+    def _index_entitlement(self, entitlement: Dict):
+        ent_id = entitlement.get("id", "")
+        record_ids = []
+        for value in entitlement.get("values", []):
+            record_ids.append(self._add_record({
+                "entitlement_name": entitlement.get("name", ""),
+                "entitlement_id": ent_id,
+                "value_name": value.get("name", ""),
+                "value_id": value.get("id", ""),
+                "value_external": value.get("externalValue", ""),
+                "value_orn": value.get("orn", "")
+            }))
+        self.by_entitlement[ent_id] = record_ids
+        self.fingerprints[ent_id] = _fingerprint(entitlement)
+
+    def _drop_entitlement(self, ent_id: str):
+        for record_id in self.by_entitlement.pop(ent_id, []):
+            self._remove_record(record_id)
+        self.fingerprints.pop(ent_id, None)
+
+    def refresh(self, entitlements: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Bring the index in line with a fresh entitlement listing.
+
+        Unchanged entitlements keep their postings; only added, changed and
+        removed entitlements are touched. Returns counts of each.
+        """
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+
+        for entitlement in entitlements:
+            ent_id = entitlement.get("id", "")
+            seen.add(ent_id)
+            previous = self.fingerprints.get(ent_id)
+
+            if previous is None:
+                stats["added"] += 1
+            elif previous != _fingerprint(entitlement):
+                stats["changed"] += 1
+                self._drop_entitlement(ent_id)
+            else:
+                stats["unchanged"] += 1
+                continue
+            self._index_entitlement(entitlement)
+
+        for ent_id in list(self.fingerprints):
+            if ent_id not in seen:
+                self._drop_entitlement(ent_id)
+                stats["removed"] += 1
+
+        self.built_at = time.time()
+        return stats
+
+    # ==================== Searching ====================
+
+    def search(self, term: str, limit: int = 10) -> List[Dict]:
+        """Return up to `limit` records ranked by match quality (best first)"""
+        term = term.strip().lower()
+        if not term:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        for record_id in self.exact.get(term, ()):
+            scores[record_id] = 3.0
+
+        term_grams = _trigrams(term)
+        shared = Counter()
+        if len(term) < 3:
+            # Too short for trigram candidates: scan the distinct field values instead
+            for text, record_ids in self.exact.items():
+                if term in text:
+                    for record_id in record_ids:
+                        shared[record_id] = 1
+        else:
+            for gram in term_grams:
+                for record_id in self.postings.get(gram, ()):
+                    shared[record_id] += 1
+
+        # Candidates sharing too few trigrams can be neither substring nor fuzzy matches
+        min_common = min(FUZZY_THRESHOLD * len(term_grams), len(term) - 2)
+
+        for record_id, common in shared.items():
+            if record_id in scores or common < min_common:
+                continue
+            record = self.records[record_id]
+            fields = [(record.get(f) or "").lower() for f in SEARCH_FIELDS]
+
+            if any(field.startswith(term) for field in fields):
+                scores[record_id] = 2.0
+            elif any(term in field for field in fields):
+                scores[record_id] = 1.0 + 0.9 * common / len(term_grams)
+            else:
+                best = 0.0
+                for field in fields:
+                    if field:
+                        field_grams = _trigrams(field)
+                        best = max(best, len(term_grams & field_grams) / len(term_grams | field_grams))
+                if best >= FUZZY_THRESHOLD:
+                    scores[record_id] = best
+
+        ranked = sorted(scores, key=lambda rid: (-scores[rid], self.records[rid]["value_name"]))
+        return [dict(self.records[rid], score=round(scores[rid], 3)) for rid in ranked[:limit]]
+
+    # ==================== Persistence ====================
+
+    def save(self, path: str):
+        """Persist records and fingerprints; postings are rebuilt on load"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "app_id": self.app_id,
+            "built_at": self.built_at,
+            "fingerprints": self.fingerprints,
+            "entitlements": {
+                ent_id: [self.records[rid] for rid in record_ids]
+                for ent_id, record_ids in self.by_entitlement.items()
+            }
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EntitlementValueIndex":
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        index = cls(data["app_id"])
+        index.built_at = data.get("built_at")
+        for ent_id, records in data.get("entitlements", {}).items():
+            index.by_entitlement[ent_id] = [index._add_record(record) for record in records]
+        index.fingerprints = data.get("fingerprints", {})
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def index_path(index_dir: str, app_id: str) -> str:
+    return os.path.join(index_dir, f"{app_id}.json")
+
+
+def load_or_build_index(app_id: str, fetch_entitlements, index_dir: str = DEFAULT_INDEX_DIR,
+                        max_age: float = 86400, refresh: bool = False) -> EntitlementValueIndex:
+    """
+    Load the app's index from disk, refreshing it when stale.
+
+    fetch_entitlements is a zero-argument callable returning the app's current
+    entitlements; it is only called when the index is missing, older than
+    max_age seconds, or refresh is requested.
+    """
+    path = index_path(index_dir, app_id)
+    index = None
+
+    if os.path.exists(path):
+        try:
+            index = EntitlementValueIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️  Could not load index {path}: {e} - rebuilding")
+
+    is_stale = index is None or not index.built_at or (time.time() - index.built_at) > max_age
+    if refresh or is_stale:
+        if index is None:
+            index = EntitlementValueIndex(app_id)
+        stats = index.refresh(fetch_entitlements())
+        index.save(path)
+        print(f"  Index refreshed: {stats['added']} added, {stats['changed']} changed, "
+              f"{stats['removed']} removed, {stats['unchanged']} unchanged entitlements")
+    else:
+        age_minutes = (time.time() - index.built_at) / 60
+        print(f"  Using cached index ({len(index)} values, {age_minutes:.0f} min old)")
+
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and search the local entitlement value index for an app"
+    )
+    parser.add_argument("--app-id", required=True, help="Application ID")
+    parser.add_argument("--search", help="Search term (value name, external value or ID)")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum results (default: 10)")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR, help="Index directory")
+    parser.add_argument("--max-age", type=float, default=86400,
+                        help="Refresh the index when older than this many seconds (default: 86400)")
+    parser.add_argument("--refresh", action="store_true", help="Force an index refresh")
+    parser.add_argument("--org-name", default=os.environ.get("OKTA_ORG_NAME"), help="Okta organization name")
+    parser.add_argument("--base-url", default=os.environ.get("OKTA_BASE_URL", "okta.com"), help="Okta base URL")
+    parser.add_argument("--api-token", default=os.environ.get("OKTA_API_TOKEN"), help="Okta API token")
+
+    args = parser.parse_args()
+
+    def fetch():
+        if not args.org_name or not args.api_token:
+            print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set to build the index")
+            sys.exit(1)
+        manager = OktaAPIManager(args.org_name, args.base_url, args.api_token)
+        return fetch_entitlements_for_app(manager, args.app_id)
+
+    index = load_or_build_index(args.app_id, fetch, args.index_dir, args.max_age, args.refresh)
+
+    if args.search:
+        print(json.dumps(index.search(args.search, args.limit), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,68 +2,64 @@
 """
 find_admin_resources.py
 
-Scans Terraform configurations to find resources with "admin" in their name
-and generates label assignment recommendations.
+Scans Terraform configurations to find admin resources (by Terraform name or
+by their name/label attributes) and generates label assignment
+recommendations. Whole environment trees are scanned in parallel with the
+rule engine in terraform_scanner.py; --rules replaces the built-in admin
+rules with a rule file.
 
 Usage:
     python3 scripts/find_admin_resources.py --config-dir production-ready
     python3 scripts/find_admin_resources.py --config-dir production-ready --apply-labels
+
+    # Scan every environment and write label_mappings.json-style recommendations
+    python3 scripts/find_admin_resources.py --config-dir environments --rules admin_rules.json \\
+        --label-config-dir label_recommendations --resolve-orns
 """
 
 import os
-import re
+import sys
 import json
 import argparse
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.terraform_scanner import (SEVERITIES, ScanResult, build_label_mappings, load_rules,
+                                       resolve_orns, scan_tree)
+
 
 class AdminResourceFinder:
     """Find and categorize admin-related resources in Terraform configs"""
 
-    def __init__(self, config_dir: str):
-        self.config_dir = Path(config_dir)
-        self.admin_pattern = re.compile(r'.*admin.*', re.IGNORECASE)
-        self.super_admin_pattern = re.compile(r'.*super.*admin.*', re.IGNORECASE)
+    def __init__(self, config_dir, rules: Optional[List[Dict]] = None, workers: Optional[int] = None):
+        self.config_dirs = [config_dir] if isinstance(config_dir, str) else list(config_dir)
+        self.config_dir = Path(self.config_dirs[0])
+        self.rules = rules
+        self.workers = workers
+        self.result: Optional[ScanResult] = None
 
     def scan_terraform_files(self) -> List[Dict]:
-        """Scan all .tf files for resources with 'admin' in name"""
-        admin_resources = []
-
-        for tf_file in self.config_dir.glob('*.tf'):
-            with open(tf_file, 'r') as f:
-                content = f.read()
-
-            # Find resource blocks
-            resource_pattern = re.compile(
-                r'resource\s+"([^"]+)"\s+"([^"]+)"\s*{',
-                re.MULTILINE
-            )
-
-            for match in resource_pattern.finditer(content):
-                resource_type = match.group(1)
-                resource_name = match.group(2)
-
-                # Check if name contains "admin"
-                if self.admin_pattern.match(resource_name):
-                    # Determine severity
-                    if self.super_admin_pattern.match(resource_name):
-                        labels = ["Privileged", "Compliance-Required"]
-                        severity = "CRITICAL"
-                    else:
-                        labels = ["Privileged"]
-                        severity = "HIGH"
-
-                    admin_resources.append({
-                        "file": tf_file.name,
-                        "resource_type": resource_type,
-                        "resource_name": resource_name,
-                        "recommended_labels": labels,
-                        "severity": severity,
-                        "terraform_address": f"{resource_type}.{resource_name}"
-                    })
-
-        return admin_resources
+        """Scan every .tf file under the config directories for resources matching the rules"""
+        self.result = scan_tree(self.config_dirs, self.rules, self.workers)
+        return self.result.findings
+
+    def write_label_configs(self, output_dir: str, org_id: Optional[str] = None,
+                            partition: str = "okta", resolver=None) -> List[str]:
+        """Write one label_mappings.json-style recommendation file per scanned environment"""
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for environment in self.result.environments():
+            orns, unresolved = resolve_orns(self.result, environment, org_id, partition, resolver)
+            config = build_label_mappings(self.result, environment, orns, unresolved)
+
+            output_file = os.path.join(output_dir, f"{environment}_label_mappings.json")
+            with open(output_file, 'w') as f:
+                json.dump(config, f, indent=2)
+            print(f"  ✅ {output_file}: {len(orns)} resource(s) labeled, {len(unresolved)} unresolved")
+            written.append(output_file)
+        return written
 
     def generate_label_config(self, admin_resources: List[Dict]) -> Dict:
         """Generate label configuration for admin resources"""
@@ -98,10 +94,13 @@ class AdminResourceFinder:
         print("=" * 80)
         print("ADMIN RESOURCE SCAN RESULTS")
         print("=" * 80)
-        print(f"\nTotal admin resources found: {len(admin_resources)}\n")
+        print(f"\nTotal admin resources found: {len(admin_resources)}")
+        if self.result:
+            print(f"Files scanned: {self.result.files_scanned} in {self.result.elapsed:.2f}s")
+        print()
 
         if not admin_resources:
-            print("No resources with 'admin' in the name were found.")
+            print("No resources matching the admin rules were found.")
             return
 
         # Group by severity
@@ -112,7 +111,7 @@ class AdminResourceFinder:
                 by_severity[severity] = []
             by_severity[severity].append(resource)
 
-        for severity in ["CRITICAL", "HIGH"]:
+        for severity in SEVERITIES:
             if severity not in by_severity:
                 continue
 
@@ -121,7 +120,9 @@ class AdminResourceFinder:
 
             for resource in by_severity[severity]:
                 print(f"  📋 {resource['terraform_address']}")
-                print(f"     File: {resource['file']}")
+                print(f"     File: {resource['file']}:{resource['line']} ({resource['environment']})")
+                for match in resource["matches"]:
+                    print(f"     Matched: {match['rule']} on {match['field']} = \"{match['value']}\"")
                 print(f"     Recommended Labels: {', '.join(resource['recommended_labels'])}")
                 print()
 
@@ -178,8 +179,19 @@ def main():
     )
     parser.add_argument(
         "--config-dir",
-        default="production-ready",
-        help="Directory containing Terraform configurations"
+        nargs="+",
+        default=["production-ready"],
+        help="Directories containing Terraform configurations (scanned recursively)"
+    )
+    parser.add_argument(
+        "--rules",
+        help="Rule file replacing the built-in admin rules (see scripts/terraform_scanner.py)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for scanning (default: one per CPU)"
     )
     parser.add_argument(
         "--api-config",
@@ -191,6 +203,39 @@ def main():
         action="store_true",
         help="Update api_config.json with recommended labels"
     )
+    parser.add_argument(
+        "--label-config-dir",
+        help="Write label_mappings.json-style recommendations, one file per environment, to this directory"
+    )
+    parser.add_argument(
+        "--org-id",
+        help="Okta org ID for building ORNs offline"
+    )
+    parser.add_argument(
+        "--partition",
+        default="okta",
+        help="ORN partition for --org-id (okta, oktapreview, okta-emea...)"
+    )
+    parser.add_argument(
+        "--resolve-orns",
+        action="store_true",
+        help="Resolve the org ID and app names through the Okta API (uses --org-name/--api-token)"
+    )
+    parser.add_argument(
+        "--org-name",
+        default=os.environ.get("OKTA_ORG_NAME"),
+        help="Okta organization name"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("OKTA_BASE_URL", "okta.com"),
+        help="Okta base URL"
+    )
+    parser.add_argument(
+        "--api-token",
+        default=os.environ.get("OKTA_API_TOKEN"),
+        help="Okta API token"
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -200,7 +245,8 @@ def main():
     args = parser.parse_args()
 
     # Find admin resources
-    finder = AdminResourceFinder(args.config_dir)
+    rules = load_rules(args.rules) if args.rules else None
+    finder = AdminResourceFinder(args.config_dir, rules=rules, workers=args.workers)
     admin_resources = finder.scan_terraform_files()
 
     if args.json:
@@ -208,6 +254,19 @@ def main():
     else:
         finder.print_summary(admin_resources)
 
+    # Optionally write label_mappings.json-style recommendations
+    if args.label_config_dir:
+        resolver = None
+        if args.resolve_orns:
+            if not args.org_name or not args.api_token:
+                print("Error: --resolve-orns needs OKTA_ORG_NAME and OKTA_API_TOKEN")
+                sys.exit(1)
+            from scripts.okta_api_manager import OktaAPIManager
+            resolver = OktaAPIManager(args.org_name, args.base_url, args.api_token).orn_resolver
+
+        print(f"\nWriting label recommendations to {args.label_config_dir}/...")
+        finder.write_label_configs(args.label_config_dir, args.org_id, args.partition, resolver)
+
     # Optionally update api_config.json
     if args.apply_labels:
         finder.update_api_config(admin_resources, args.api_config)
@@ -2,18 +2,30 @@
 """
 Find an entitlement value by name or ID and display its ORN.
 
+Values are looked up through a local per-app index (see entitlement_index.py),
+built once from a bulk fetch and refreshed incrementally when older than
+--max-age. Matches are ranked: exact, prefix, substring, then fuzzy.
+
 Usage:
     python3 scripts/find_entitlement_value.py --app-id 0oar0edy8iuBrRn6t1d7 --search certification_admin
+    python3 scripts/find_entitlement_value.py --app-id 0oar0edy8iuBrRn6t1d7 --search certification_admin \
+        --snapshot snapshots/lowerdecklabs.db
+    python3 scripts/find_entitlement_value.py --app-id 0oar0edy8iuBrRn6t1d7 --search certifcation --refresh
 """
 
 import os
 import sys
 import argparse
 import requests
-from urllib.parse import quote
 
-def find_entitlement_value(app_id, search_term):
-    """Find an entitlement value by searching app entitlements."""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_snapshot import open_snapshot
+from scripts.entitlement_index import DEFAULT_INDEX_DIR, fetch_entitlements_for_app, load_or_build_index
+
+def fetch_app_entitlements(app_id):
+    """Fetch all entitlements (with values) for an app from the live API."""
 
     org_name = os.getenv('OKTA_ORG_NAME')
     base_url = os.getenv('OKTA_BASE_URL')
@@ -24,65 +36,43 @@ def find_entitlement_value(app_id, search_term):
         print("  OKTA_ORG_NAME, OKTA_BASE_URL, OKTA_API_TOKEN")
         return None
 
-    # Build the filter query
-    filter_query = f'parent.externalId eq "{app_id}" AND parent.type eq "APPLICATION"'
-    encoded_filter = quote(filter_query)
+    manager = OktaAPIManager(org_name, base_url, token)
 
-    url = f'https://{org_name}.{base_url}/governance/api/v1/entitlements?filter={encoded_filter}&limit=200'
+    try:
+        return fetch_entitlements_for_app(manager, app_id)
+    except requests.exceptions.HTTPError as e:
+        print(f"Error: {e.response.status_code}")
+        print(e.response.text)
+        return None
 
-    headers = {
-        'Authorization': f'SSWS {token}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
+def find_entitlement_value(app_id, search_term, snapshot_db=None, index_dir=DEFAULT_INDEX_DIR,
+                           max_age=86400, refresh=False, limit=10):
+    """Find an entitlement value by searching the app's entitlement value index."""
 
     print(f"Searching entitlements for app: {app_id}")
     print(f"Search term: {search_term}\n")
 
-    response = requests.get(url, headers=headers)
-
-    if response.status_code != 200:
-        print(f"Error: {response.status_code}")
-        print(response.text)
-        return None
-
-    data = response.json()
-    entitlements = data.get('data', [])
-
-    print(f"Found {len(entitlements)} entitlements for this app\n")
+    snapshot = open_snapshot(snapshot_db)
 
-    results = []
-    search_lower = search_term.lower()
+    def fetch():
+        if snapshot:
+            return snapshot.entitlements_for_app(app_id)
+        entitlements = fetch_app_entitlements(app_id)
+        if entitlements is None:
+            sys.exit(1)
+        return entitlements
 
-    # Search through all entitlements and their values
-    for ent in entitlements:
-        ent_name = ent.get('name', '')
-        ent_id = ent.get('id', '')
+    # A snapshot is already local, so always refresh the index from it
+    index = load_or_build_index(app_id, fetch, index_dir, max_age, refresh or bool(snapshot))
 
-        for val in ent.get('values', []):
-            val_name = val.get('name', '')
-            val_id = val.get('id', '')
-            val_orn = val.get('orn', '')
-            val_external = val.get('externalValue', '')
+    print(f"Indexed {len(index)} entitlement values for this app\n")
 
-            # Check if search term matches
-            if (search_lower in val_name.lower() or
-                search_lower in val_external.lower() or
-                search_lower in val_id.lower()):
-
-                results.append({
-                    'entitlement_name': ent_name,
-                    'entitlement_id': ent_id,
-                    'value_name': val_name,
-                    'value_id': val_id,
-                    'value_external': val_external,
-                    'value_orn': val_orn
-                })
+    results = index.search(search_term, limit)
 
     if results:
         print(f"Found {len(results)} matching entitlement value(s):\n")
         for idx, result in enumerate(results, 1):
-            print(f"Result #{idx}:")
+            print(f"Result #{idx} (score {result['score']}):")
             print(f"  Entitlement: {result['entitlement_name']} (ID: {result['entitlement_id']})")
             print(f"  Value Name: {result['value_name']}")
             print(f"  Value ID: {result['value_id']}")
@@ -90,7 +80,7 @@ def find_entitlement_value(app_id, search_term):
             print(f"  Value ORN: {result['value_orn']}")
             print()
 
-        return results[0]['value_orn']  # Return first match
+        return results[0]['value_orn']  # Return best match
     else:
         print(f"No entitlement values found matching '{search_term}'")
         return None
@@ -109,10 +99,45 @@ def main():
         required=True,
         help='Search term (entitlement value name, ID, or external value)'
     )
+    parser.add_argument(
+        '--snapshot',
+        default=os.getenv('OKTA_SNAPSHOT_DB'),
+        help='Read entitlements from a local snapshot (see okta_snapshot.py) instead of the API'
+    )
+    parser.add_argument(
+        '--index-dir',
+        default=DEFAULT_INDEX_DIR,
+        help=f'Directory for the entitlement value index (default: {DEFAULT_INDEX_DIR})'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        default=86400,
+        help='Refresh the index when it is older than this many seconds (default: 86400)'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Force an index refresh from the API'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=10,
+        help='Maximum number of ranked matches to show (default: 10)'
+    )
 
     args = parser.parse_args()
 
-    orn = find_entitlement_value(args.app_id, args.search)
+    orn = find_entitlement_value(
+        args.app_id,
+        args.search,
+        args.snapshot,
+        index_dir=args.index_dir,
+        max_age=args.max_age,
+        refresh=args.refresh,
+        limit=args.limit
+    )
 
     if orn:
         print("=" * 80)
@@ -8,8 +8,12 @@ This script:
 3. For each entitlement, gets all values
 4. Exports to JSON for analysis and labeling
 
+Progress is journaled per app; after an interruption, run again with --resume
+to skip the apps that were already imported.
+
 Usage:
     python3 scripts/import_app_entitlements.py --output environments/lowerdecklabs/imports/all_entitlements.json
+    python3 scripts/import_app_entitlements.py --output environments/lowerdecklabs/imports/all_entitlements.json --resume
 """
 
 import argparse
@@ -18,54 +22,56 @@ import os
 import sys
 import requests
 from urllib.parse import quote
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def fetch_all_apps(org_name: str, base_url: str, token: str) -> List[Dict]:
-    """Fetch all applications from Okta."""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    url = f'https://{org_name}.{base_url}/api/v1/apps'
-    headers = {
-        'Authorization': f'SSWS {token}',
-        'Accept': 'application/json'
-    }
+from scripts.checkpoint import CheckpointJournal, add_checkpoint_arguments, open_checkpoint
+from scripts.okta_http import create_session
+
+def fetch_all_apps(session: requests.Session, org_url: str,
+                   checkpoint: Optional[CheckpointJournal] = None) -> List[Dict]:
+    """Fetch all applications from Okta, recording each page in the checkpoint journal."""
+
+    url = f'{org_url}/api/v1/apps'
 
     print("Fetching all applications...")
-    apps = []
 
-    while url:
-        response = requests.get(url, headers=headers)
+    def fetch_page(cursor: Optional[str]):
+        response = session.get(cursor or url)
         if response.status_code != 200:
             print(f"Error fetching apps: {response.status_code}")
             print(response.text)
-            break
-
-        apps.extend(response.json())
+            response.raise_for_status()
 
         # Check for pagination
         links = response.links
-        url = links.get('next', {}).get('url') if links else None
+        return response.json(), links.get('next', {}).get('url') if links else None
+
+    checkpoint = checkpoint or CheckpointJournal(None, "import_app_entitlements")
+    try:
+        apps = checkpoint.paginate("apps", fetch_page)
+    except requests.exceptions.HTTPError:
+        # Continue with the pages fetched so far; the listing is not marked
+        # finished, so a resumed import fetches the rest
+        apps, _, _ = checkpoint.pages("apps")
 
     print(f"  Found {len(apps)} applications")
     return apps
 
-def fetch_entitlements_for_app(app_id: str, org_name: str, base_url: str, token: str) -> List[Dict]:
-    """Fetch all entitlements for a specific app."""
+def fetch_entitlements_for_app(session: requests.Session, org_url: str, app_id: str) -> Optional[List[Dict]]:
+    """Fetch all entitlements for a specific app (None if the request failed)."""
 
     filter_query = f'parent.externalId eq "{app_id}" AND parent.type eq "APPLICATION"'
     encoded_filter = quote(filter_query)
 
-    url = f'https://{org_name}.{base_url}/governance/api/v1/entitlements?filter={encoded_filter}&limit=200'
-
-    headers = {
-        'Authorization': f'SSWS {token}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
+    url = f'{org_url}/governance/api/v1/entitlements?filter={encoded_filter}&limit=200'
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url)
 
     if response.status_code != 200:
-        return []
+        print(f"  Error fetching entitlements for {app_id}: {response.status_code}")
+        return None
 
     data = response.json()
     return data.get('data', [])
@@ -79,6 +85,7 @@ def main():
         required=True,
         help='Output JSON file path'
     )
+    add_checkpoint_arguments(parser)
 
     args = parser.parse_args()
 
@@ -91,22 +98,47 @@ def main():
         print("  OKTA_ORG_NAME, OKTA_BASE_URL, OKTA_API_TOKEN")
         sys.exit(1)
 
+    checkpoint = open_checkpoint(args, 'import_app_entitlements', org_name, {'base_url': base_url})
+
+    # One keep-alive session for the whole import: the per-app loop reuses
+    # its connection instead of reconnecting for every app
+    org_url = f'https://{org_name}.{base_url}'
+    session = create_session({
+        'Authorization': f'SSWS {token}',
+        'Accept': 'application/json',
+        'Content-Type': 'application/json'
+    })
+
     # Fetch all apps
-    apps = fetch_all_apps(org_name, base_url, token)
+    apps = fetch_all_apps(session, org_url, checkpoint)
 
     # For each app, fetch entitlements
     all_app_entitlements = []
+    resumed_apps = 0
 
     for app in apps:
         app_id = app.get('id')
         app_name = app.get('label')
         app_status = app.get('status')
 
+        if checkpoint.done(app_id):
+            entry = checkpoint.get(app_id)
+            if entry:
+                all_app_entitlements.append(entry)
+            resumed_apps += 1
+            continue
+
         print(f"\nProcessing: {app_name} ({app_id}) - Status: {app_status}")
 
-        entitlements = fetch_entitlements_for_app(app_id, org_name, base_url, token)
+        entitlements = fetch_entitlements_for_app(session, org_url, app_id)
 
-        if entitlements:
+        if entitlements is None:
+            # Not journaled, so a resumed import queries this app again
+            continue
+
+        if not entitlements:
+            checkpoint.record(app_id)
+        else:
             print(f"  Found {len(entitlements)} entitlements")
 
             total_values = 0
@@ -116,13 +148,15 @@ def main():
 
             print(f"  Total entitlement values: {total_values}")
 
-            all_app_entitlements.append({
+            entry = {
                 'app_id': app_id,
                 'app_name': app_name,
                 'app_label': app.get('label'),
                 'app_status': app_status,
                 'entitlements': entitlements
-            })
+            }
+            all_app_entitlements.append(entry)
+            checkpoint.record(app_id, entry)
 
     # Save to JSON
     output_data = {
@@ -137,10 +171,15 @@ def main():
     with open(args.output, 'w') as f:
         json.dump(output_data, f, indent=2)
 
+    checkpoint.complete()
+    checkpoint.close()
+
     print(f"\n{'='*80}")
     print(f"Export complete!")
     print(f"  Total apps: {len(apps)}")
     print(f"  Apps with entitlements: {len(all_app_entitlements)}")
+    if resumed_apps:
+        print(f"  Apps resumed from checkpoint: {resumed_apps}")
     print(f"  Output: {args.output}")
     print(f"{'='*80}")
 
@@ -11,6 +11,7 @@ This script:
 
 Usage:
     python3 scripts/import_oig_resources.py --output-dir imported_oig
+    python3 scripts/import_oig_resources.py --output-dir imported_oig --resume   # continue an interrupted import
 
 Environment variables required:
     OKTA_ORG_NAME - Your Okta org name
@@ -26,11 +27,19 @@ import requests
 from typing import List, Dict, Optional
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.checkpoint import CheckpointJournal, add_checkpoint_arguments, open_checkpoint
+from scripts.okta_http import create_session, decode_json
+from scripts.okta_models import Bundle
+
 
 class OIGImporter:
     """Import existing OIG resources from Okta"""
 
-    def __init__(self, org_name: str, base_url: str, api_token: str):
+    def __init__(self, org_name: str, base_url: str, api_token: str,
+                 checkpoint: Optional[CheckpointJournal] = None):
         self.org_name = org_name
         self.base_url = f"https://{org_name}.{base_url}"
         self.headers = {
@@ -38,8 +47,9 @@ class OIGImporter:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
+        self.checkpoint = checkpoint or CheckpointJournal(None, "import_oig_resources")
 
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make API request with error handling"""
@@ -66,7 +76,8 @@ class OIGImporter:
             sanitized = f"resource_{sanitized}"
         return sanitized or "unnamed"
 
-    def fetch_entitlements(self) -> List[Dict]:
+    @span("fetch_entitlements")
+    def fetch_entitlements(self) -> List[Bundle]:
         """Fetch all entitlement bundles from Okta"""
         print("Fetching entitlement bundles...")
         try:
@@ -76,16 +87,26 @@ class OIGImporter:
                 "limit": 200,
                 "include": "full_entitlements"  # Include entitlement details in response
             }
-            response = self._make_request("GET", url, params=params)
 
-            # Handle both dict and list responses
-            data = response.json()
-            if isinstance(data, list):
-                bundles = data
-            elif isinstance(data, dict):
-                bundles = data.get("data", data.get("entitlements", []))
-            else:
-                bundles = []
+            def fetch_page(cursor: Optional[str]):
+                response = self._make_request("GET", cursor or url, params=None if cursor else params)
+
+                # Handle both dict and list responses; full_entitlements pages
+                # are large, so they go through the fast decoder
+                data = decode_json(response)
+                if isinstance(data, list):
+                    return data, None
+                elif isinstance(data, dict):
+                    next_link = data.get("_links", {}).get("next", {}).get("href")
+                    return data.get("data", data.get("entitlements", [])), next_link
+                return [], None
+
+            # Each page is journaled, so a resumed import continues from the last cursor.
+            # Bundles keep their full JSON (compacted) for the entitlements.json export
+            bundles = self.checkpoint.paginate(
+                "entitlement_bundles", fetch_page,
+                lambda page: Bundle.from_page(page, keep_raw=True)
+            )
 
             print(f"  Found {len(bundles)} entitlement bundles")
             return bundles
@@ -95,14 +116,26 @@ class OIGImporter:
 
     def validate_bundle_readable(self, bundle_id: str) -> bool:
         """Test if a bundle can be individually retrieved (not all listed bundles are readable)"""
+        key = f"bundle_readable:{bundle_id}"
+        if self.checkpoint.done(key):
+            return self.checkpoint.get(key)
+
         try:
             # Correct endpoint: entitlement-bundles (not entitlements)
             url = f"{self.base_url}/governance/api/v1/entitlement-bundles/{bundle_id}"
             response = self._make_request("GET", url)
-            return response.status_code == 200
+            readable = response.status_code == 200
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in (403, 404):
+                # Not journaled, so a resumed import checks this bundle again
+                return False
+            readable = False
         except Exception:
             return False
 
+        self.checkpoint.record(key, readable)
+        return readable
+
     def fetch_entitlements_for_resource(self, resource_id: str, resource_type: str = "APPLICATION") -> List[Dict]:
         """Fetch individual entitlements for a specific resource (app/group/etc)"""
         try:
@@ -120,6 +153,7 @@ class OIGImporter:
             print(f"  ⚠️  Could not fetch entitlements for resource {resource_id}: {e}")
             return []
 
+    @span("fetch_reviews")
     def fetch_reviews(self) -> List[Dict]:
         """Fetch all access review campaigns"""
         print("Fetching access review campaigns...")
@@ -134,6 +168,7 @@ class OIGImporter:
             print(f"  ⚠️  Could not fetch reviews: {e}")
             return []
 
+    @span("fetch_request_sequences")
     def fetch_request_sequences(self) -> List[Dict]:
         """Fetch all approval workflows"""
         print("Fetching approval workflows...")
@@ -148,6 +183,7 @@ class OIGImporter:
             print(f"  ⚠️  Could not fetch request sequences: {e}")
             return []
 
+    @span("fetch_catalog_entries")
     def fetch_catalog_entries(self) -> List[Dict]:
         """Fetch all catalog entries"""
         print("Fetching catalog entries...")
@@ -162,6 +198,7 @@ class OIGImporter:
             print(f"  ⚠️  Could not fetch catalog entries: {e}")
             return []
 
+    @span("fetch_request_settings")
     def fetch_request_settings(self) -> Optional[Dict]:
         """Fetch global request settings"""
         print("Fetching request settings...")
@@ -175,8 +212,9 @@ class OIGImporter:
             print(f"  ⚠️  Could not fetch request settings: {e}")
             return None
 
-    def generate_entitlement_tf(self, bundles: List[Dict]) -> tuple[str, List[str]]:
-        """Generate Terraform config and import commands for entitlement bundles"""
+    @span("generate_entitlements")
+    def generate_entitlement_tf(self, bundles: List[Bundle]) -> tuple[str, List[str]]:
+        """Generate Terraform config and import commands for entitlement bundles (API dicts are accepted too)"""
         if not bundles:
             return "", []
 
@@ -200,11 +238,12 @@ class OIGImporter:
         tf_config.append("")
 
         for bundle in bundles:
-            bundle_id = bundle.get("id") or bundle.get("bundleId")
-            name = bundle.get("name", "unnamed")
-            description = bundle.get("description", "")
-            orn = bundle.get("orn", "")
-            bundle_type = bundle.get("bundleType", "MANUAL")
+            bundle = Bundle.coerce(bundle)
+            bundle_id = bundle.id
+            name = bundle.name or "unnamed"
+            description = bundle.description
+            orn = bundle.orn
+            bundle_type = bundle.bundle_type
 
             # Skip app-managed bundles if they shouldn't be in Terraform
             if ":apps:" in orn and bundle_type != "MANUAL":
@@ -220,12 +259,11 @@ class OIGImporter:
             safe_name = self._sanitize_name(name)
 
             # Extract bundle properties
-            target = bundle.get("target", {})
-            target_id = target.get("externalId", "")
-            target_type = target.get("type", "")
-            target_name = target.get("name", "")
-            status = bundle.get("status", "ACTIVE")
-            entitlements = bundle.get("entitlements", [])
+            target_id = bundle.target_id
+            target_type = bundle.target_type
+            target_name = bundle.target_name
+            status = bundle.status
+            entitlements = bundle.entitlements
 
             print(f"  Generating resource for bundle: {name}")
 
@@ -265,25 +303,18 @@ class OIGImporter:
                 tf_config.append(f'')
 
             # Add entitlements blocks
-            if entitlements:
-                for entitlement in entitlements:
-                    ent_id = entitlement.get("id") or entitlement.get("externalId")
-                    ent_values = entitlement.get("values", [])
-
-                    if ent_id:
-                        tf_config.append(f'  entitlements {{')
-                        tf_config.append(f'    id = "{ent_id}"')
-
-                        if ent_values:
-                            for value in ent_values:
-                                value_id = value.get("id") or value.get("externalId")
-                                if value_id:
-                                    tf_config.append(f'    values {{')
-                                    tf_config.append(f'      id = "{value_id}"')
-                                    tf_config.append(f'    }}')
-
-                        tf_config.append(f'  }}')
-                        tf_config.append(f'')
+            # Entitlements and values without an ID were dropped while parsing
+            for ent_id, value_ids in entitlements:
+                tf_config.append(f'  entitlements {{')
+                tf_config.append(f'    id = "{ent_id}"')
+
+                for value_id in value_ids:
+                    tf_config.append(f'    values {{')
+                    tf_config.append(f'      id = "{value_id}"')
+                    tf_config.append(f'    }}')
+
+                tf_config.append(f'  }}')
+                tf_config.append(f'')
 
             tf_config.append(f'  # Bundle Type: {bundle_type}')
             tf_config.append(f'  # ORN: {orn}')
@@ -423,6 +454,7 @@ class OIGImporter:
             json.dump(data, f, indent=2)
         print(f"  Exported JSON to: {output_file}")
 
+    @span("import_oig_resources")
     def generate_import_files(self, output_dir: str):
         """Generate all Terraform files and import commands"""
         print(f"\n{'='*60}")
@@ -461,7 +493,7 @@ class OIGImporter:
 
             # Export raw JSON for reference
             json_file = os.path.join(output_dir, "entitlements.json")
-            self.export_json(json_file, {"entitlements": entitlements})
+            self.export_json(json_file, {"entitlements": [bundle.raw for bundle in entitlements]})
 
         # Generate reviews
         if reviews:
@@ -534,6 +566,8 @@ class OIGImporter:
             os.chmod(import_script, 0o755)
             print(f"  Created: {import_script}")
 
+        self.checkpoint.complete()
+
         print(f"\n{'='*60}")
         print(f"Import Generation Complete!")
         print(f"{'='*60}\n")
@@ -573,8 +607,11 @@ def main():
         "--api-token",
         help="Okta API token (or set OKTA_API_TOKEN env var)"
     )
+    add_metrics_arguments(parser)
+    add_checkpoint_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     # Get credentials
     org_name = args.org_name or os.environ.get("OKTA_ORG_NAME")
@@ -587,8 +624,10 @@ def main():
         sys.exit(1)
 
     # Run import
-    importer = OIGImporter(org_name, base_url, api_token)
+    checkpoint = open_checkpoint(args, "import_oig_resources", org_name, {"base_url": base_url})
+    importer = OIGImporter(org_name, base_url, api_token, checkpoint=checkpoint)
     importer.generate_import_files(args.output_dir)
+    checkpoint.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+import_okta_resources.py
+
+Runs Terraformer imports for each Okta resource type concurrently and cleans
+the generated code as each type finishes.
+
+- Up to --workers `terraformer import okta --resources=<type>` processes run at once
+- Before each import, the Okta endpoint the type is listed from is probed; if
+  its rate limit is nearly used up, every import that uses the same endpoint
+  waits for the reset. A 429 in Terraformer's output pauses that endpoint for
+  all workers too.
+- Types that fail are retried one at a time once the concurrent pass is done
+- With --cleaned-dir, each imported type goes through TerraformCleaner's first
+  pass as soon as it finishes, while other types are still importing. References
+  are rewritten once every type is in (they can point across types).
+
+Run from a directory where `terraform init` has been run with the Okta provider
+(import_okta_resources.sh sets this up and calls this script).
+
+Usage:
+    python3 scripts/import_okta_resources.py
+    python3 scripts/import_okta_resources.py --workers 8 --cleaned-dir cleaned
+    python3 scripts/import_okta_resources.py --resources okta_user,okta_group --retries 3
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import METRICS, add_metrics_arguments, span, write_metrics_on_exit
+from scripts.cleanup_terraform import TerraformCleaner
+from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_http import size_pool
+
+
+RESOURCE_TYPES = [
+    ("okta_user", "Users"),
+    ("okta_group", "Groups"),
+    ("okta_group_rule", "Group Rules"),
+    ("okta_app_oauth", "OAuth/OIDC Applications"),
+    ("okta_app_saml", "SAML Applications"),
+    ("okta_auth_server", "Authorization Servers"),
+    ("okta_auth_server_policy", "Auth Server Policies"),
+    ("okta_auth_server_claim", "Auth Server Claims"),
+    ("okta_auth_server_scope", "Auth Server Scopes"),
+    ("okta_policy_mfa", "MFA Policies"),
+    ("okta_policy_password", "Password Policies"),
+    ("okta_policy_signon", "Sign-On Policies"),
+    ("okta_network_zone", "Network Zones"),
+    ("okta_trusted_origin", "Trusted Origins"),
+    ("okta_idp_saml", "SAML Identity Providers"),
+    ("okta_user_schema", "User Schema"),
+]
+
+# Endpoint each type is listed from (its rate limit bucket), with extra query parameters
+RATE_LIMIT_ENDPOINTS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "okta_user": ("/api/v1/users", {}),
+    "okta_group": ("/api/v1/groups", {}),
+    "okta_group_rule": ("/api/v1/groups/rules", {}),
+    "okta_app_oauth": ("/api/v1/apps", {}),
+    "okta_app_saml": ("/api/v1/apps", {}),
+    "okta_auth_server": ("/api/v1/authorizationServers", {}),
+    "okta_auth_server_policy": ("/api/v1/authorizationServers", {}),
+    "okta_auth_server_claim": ("/api/v1/authorizationServers", {}),
+    "okta_auth_server_scope": ("/api/v1/authorizationServers", {}),
+    "okta_policy_mfa": ("/api/v1/policies", {"type": "MFA_ENROLL"}),
+    "okta_policy_password": ("/api/v1/policies", {"type": "PASSWORD"}),
+    "okta_policy_signon": ("/api/v1/policies", {"type": "OKTA_SIGN_ON"}),
+    "okta_network_zone": ("/api/v1/zones", {}),
+    "okta_trusted_origin": ("/api/v1/trustedOrigins", {}),
+    "okta_idp_saml": ("/api/v1/idps", {}),
+    "okta_user_schema": ("/api/v1/meta/schemas/user/default", {}),
+}
+
+RATE_LIMITED_PATTERN = re.compile(r"\b429\b|too many requests|rate limit exceeded", re.IGNORECASE)
+
+
+class RateLimitGate:
+    """
+    Per-endpoint pause shared by all import workers.
+
+    An endpoint is paused when a probe shows its remaining requests below
+    min_remaining (a fraction of the limit), or when an import hits a 429.
+    Workers wait for the pause to end before starting an import that uses it.
+    """
+
+    def __init__(self, min_remaining: float = 0.2):
+        self.min_remaining = min_remaining
+        self._resume_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pause(self, bucket: str, seconds: float, reason: str):
+        resume_at = time.time() + seconds
+        with self._lock:
+            if resume_at <= self._resume_at.get(bucket, 0):
+                return
+            self._resume_at[bucket] = resume_at
+        print(f"  ⏳ Pausing imports that use {bucket} for {seconds:.0f}s ({reason})")
+
+    def wait(self, bucket: str):
+        while True:
+            with self._lock:
+                remaining = self._resume_at.get(bucket, 0) - time.time()
+            if remaining <= 0:
+                return
+            METRICS.sleep("import_rate_limit_gate", remaining)
+
+    def observe(self, bucket: str, response: requests.Response):
+        """Pause the endpoint if a probe response shows its limit is nearly used up"""
+        try:
+            limit = int(response.headers.get("X-Rate-Limit-Limit", 0))
+            remaining = int(response.headers.get("X-Rate-Limit-Remaining", 0))
+            reset = int(response.headers.get("X-Rate-Limit-Reset", 0))
+        except (TypeError, ValueError):
+            return
+        if not reset:
+            return
+        if response.status_code == 429 or (limit and remaining < limit * self.min_remaining):
+            self.pause(bucket, max(reset - time.time() + 1, 1), f"{remaining}/{limit} requests left")
+
+
+class TerraformerImporter:
+    """Runs per-type Terraformer imports concurrently, retries failures and feeds TerraformCleaner"""
+
+    def __init__(self, manager: Optional[OktaAPIManager] = None, output_dir: str = "generated",
+                 workers: int = 4, retries: int = 2, min_remaining: float = 0.2,
+                 rate_limit_pause: float = 60, log_file: Optional[str] = "import.log",
+                 terraformer: str = "terraformer"):
+        self.manager = manager
+        self.output_dir = output_dir
+        self.workers = workers
+        self.retries = retries
+        self.rate_limit_pause = rate_limit_pause
+        self.log_file = log_file
+        self.terraformer = terraformer
+        self.gate = RateLimitGate(min_remaining)
+        self._log_lock = threading.Lock()
+
+        # Workers probe rate limits through the shared session
+        if manager:
+            size_pool(manager.session, workers)
+
+    def type_dir(self, resource_type: str) -> Path:
+        """Where Terraformer writes a type (its default {output}/{provider}/{service} pattern)"""
+        return Path(self.output_dir) / "okta" / resource_type
+
+    def probe(self, resource_type: str):
+        """One-item list request against the type's endpoint to read its rate limit headers"""
+        if not self.manager:
+            return
+        path, params = RATE_LIMIT_ENDPOINTS.get(resource_type, (None, {}))
+        if not path:
+            return
+        try:
+            response = self.manager.session.get(f"{self.manager.base_url}{path}",
+                                                params=dict(params, limit=1), timeout=30)
+        except requests.exceptions.RequestException:
+            return
+        self.gate.observe(path, response)
+
+    def _log(self, resource_type: str, attempt: int, output: str):
+        if not self.log_file:
+            return
+        with self._log_lock, open(self.log_file, "a") as f:
+            f.write(f"\n===== {resource_type} (attempt {attempt}) =====\n{output}")
+
+    def import_type(self, resource_type: str, attempt: int = 1) -> Dict:
+        """
+        Import one resource type.
+
+        Returns:
+            Dictionary with status ("ok", "empty" or "failed"), seconds, files and detail
+        """
+        bucket = RATE_LIMIT_ENDPOINTS.get(resource_type, (resource_type, {}))[0]
+        self.gate.wait(bucket)
+        self.probe(resource_type)
+        self.gate.wait(bucket)
+
+        # Never mix output from an earlier, failed attempt into this one
+        shutil.rmtree(self.type_dir(resource_type), ignore_errors=True)
+
+        started = time.time()
+        try:
+            with span(f"import.{resource_type}"):
+                process = subprocess.run(
+                    [self.terraformer, "import", "okta", f"--resources={resource_type}",
+                     f"--path-output={self.output_dir}"],
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+                )
+            output, returncode = process.stdout, process.returncode
+        except OSError as e:
+            output, returncode = str(e), -1
+        seconds = time.time() - started
+        self._log(resource_type, attempt, output)
+
+        if RATE_LIMITED_PATTERN.search(output):
+            self.gate.pause(bucket, self.rate_limit_pause, f"rate limited while importing {resource_type}")
+
+        if returncode != 0:
+            last_line = output.strip().splitlines()[-1] if output.strip() else ""
+            return {"status": "failed", "seconds": seconds, "files": 0,
+                    "detail": f"exit code {returncode}" + (f": {last_line}" if last_line else "")}
+
+        files = len(list(self.type_dir(resource_type).glob("*.tf")))
+        if not files:
+            return {"status": "empty", "seconds": seconds, "files": 0, "detail": "no resources found"}
+        return {"status": "ok", "seconds": seconds, "files": files, "detail": ""}
+
+    def _finished(self, resource_type: str, result: Dict, cleaner: Optional[TerraformCleaner]):
+        icon = {"ok": "✅", "empty": "➖"}.get(result["status"], "❌")
+        description = dict(RESOURCE_TYPES).get(resource_type, resource_type)
+        print(f"{icon} [{resource_type}] {description}: {result['status']} in {result['seconds']:.1f}s"
+              + (f" ({result['files']} files)" if result["files"] else "")
+              + (f" - {result['detail']}" if result["detail"] else ""))
+        if cleaner and result["status"] == "ok":
+            started = time.time()
+            with span(f"clean.{resource_type}"):
+                cleaner.clean_resource_dir(self.type_dir(resource_type))
+            result["cleanup_seconds"] = time.time() - started
+
+    def run(self, resource_types: List[str], cleaner: Optional[TerraformCleaner] = None) -> Dict[str, Dict]:
+        """
+        Import every type, retry failures one at a time, and clean as types finish.
+
+        Returns:
+            Results by resource type (see import_type), plus attempts and cleanup_seconds
+        """
+        results: Dict[str, Dict] = {}
+
+        print(f"Importing {len(resource_types)} resource types with {self.workers} workers...\n")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.import_type, resource_type): resource_type
+                       for resource_type in resource_types}
+            for future in as_completed(futures):
+                resource_type = futures[future]
+                results[resource_type] = dict(future.result(), attempts=1)
+                self._finished(resource_type, results[resource_type], cleaner)
+
+        for attempt in range(2, self.retries + 2):
+            failed = [t for t in resource_types if results[t]["status"] == "failed"]
+            if not failed:
+                break
+            print(f"\nRetrying {len(failed)} failed type(s), attempt {attempt}...\n")
+            for resource_type in failed:
+                results[resource_type] = dict(self.import_type(resource_type, attempt), attempts=attempt)
+                self._finished(resource_type, results[resource_type], cleaner)
+
+        if cleaner:
+            print("\nUpdating resource references...")
+            with span("write_cleaned"):
+                for resource_type in resource_types:
+                    if results[resource_type]["status"] == "ok":
+                        cleaner.write_resource_dir(self.type_dir(resource_type))
+                cleaner.finish()
+
+        return results
+
+
+def print_import_report(results: Dict[str, Dict], elapsed: float):
+    """Per-type status and timing, and the time saved by running imports concurrently"""
+    print("\n" + "=" * 80)
+    print("IMPORT SUMMARY")
+    print("=" * 80)
+    print(f"{'Resource type':<26} {'Status':<8} {'Attempts':>8} {'Files':>6} {'Import':>9} {'Cleanup':>9}")
+    print("-" * 80)
+    for resource_type, result in results.items():
+        cleanup = f"{result['cleanup_seconds']:.2f}s" if "cleanup_seconds" in result else "-"
+        print(f"{resource_type:<26} {result['status']:<8} {result['attempts']:>8} {result['files']:>6} "
+              f"{result['seconds']:>8.1f}s {cleanup:>9}")
+    print("-" * 80)
+    serial = sum(result["seconds"] + result.get("cleanup_seconds", 0) for result in results.values())
+    print(f"Wall time: {elapsed:.1f}s (imports and cleanup took {serial:.1f}s in total)")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run Terraformer imports for Okta resource types concurrently"
+    )
+    parser.add_argument("--org-name", default=os.environ.get("OKTA_ORG_NAME"), help="Okta organization name")
+    parser.add_argument("--base-url", default=os.environ.get("OKTA_BASE_URL", "okta.com"), help="Okta base URL")
+    parser.add_argument("--api-token", default=os.environ.get("OKTA_API_TOKEN"), help="Okta API token")
+    parser.add_argument("--resources", help="Comma-separated resource types (default: all supported types)")
+    parser.add_argument("--workers", type=int, default=4, help="Imports running at once (default: 4)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Times a failed type is retried on its own (default: 2)")
+    parser.add_argument("--output-dir", default="generated", help="Terraformer output directory (default: generated)")
+    parser.add_argument("--cleaned-dir", help="Clean imported code into this directory as types finish")
+    parser.add_argument("--log-file", default="import.log", help="Append Terraformer output here (default: import.log)")
+    parser.add_argument("--min-remaining", type=float, default=0.2,
+                        help="Wait for the reset when less than this fraction of an endpoint's "
+                             "rate limit is left (default: 0.2)")
+    parser.add_argument("--rate-limit-pause", type=float, default=60,
+                        help="Seconds to pause an endpoint after a 429 (default: 60)")
+    parser.add_argument("--no-probe", action="store_true", help="Do not check rate limits before each import")
+    parser.add_argument("--terraformer", default="terraformer", help="Terraformer executable")
+    add_metrics_arguments(parser)
+
+    args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
+
+    if not args.org_name or not args.api_token:
+        print("❌ Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+        print("   Either set environment variables or use --org-name and --api-token")
+        sys.exit(1)
+
+    if not shutil.which(args.terraformer):
+        print(f"❌ Error: Terraformer not found ({args.terraformer}). Please install it first.")
+        sys.exit(1)
+
+    known = [resource_type for resource_type, _ in RESOURCE_TYPES]
+    resource_types = [t.strip() for t in args.resources.split(",") if t.strip()] if args.resources else known
+    unknown = [t for t in resource_types if t not in RATE_LIMIT_ENDPOINTS]
+    if unknown:
+        print(f"⚠️  No rate limit endpoint known for: {', '.join(unknown)} (imported without probing)")
+
+    # Terraformer's Okta provider reads its credentials from the environment
+    os.environ.update({"OKTA_ORG_NAME": args.org_name, "OKTA_BASE_URL": args.base_url,
+                       "OKTA_API_TOKEN": args.api_token})
+
+    manager = None if args.no_probe else OktaAPIManager(args.org_name, args.base_url, args.api_token)
+    importer = TerraformerImporter(manager, output_dir=args.output_dir, workers=args.workers,
+                                   retries=args.retries, min_remaining=args.min_remaining,
+                                   rate_limit_pause=args.rate_limit_pause, log_file=args.log_file,
+                                   terraformer=args.terraformer)
+    cleaner = None
+    if args.cleaned_dir:
+        cleaner = TerraformCleaner(str(Path(args.output_dir) / "okta"), args.cleaned_dir)
+        cleaner.output_dir.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 80)
+    print("OKTA TERRAFORMER IMPORT")
+    print("=" * 80)
+    print(f"Org: https://{args.org_name}.{args.base_url}\n")
+
+    started = time.time()
+    results = importer.run(resource_types, cleaner)
+    print_import_report(results, time.time() - started)
+
+    if cleaner:
+        print(f"\n🧹 Cleaned code written to: {args.cleaned_dir}")
+
+    failed = [t for t, result in results.items() if result["status"] == "failed"]
+    if failed:
+        print(f"\n❌ {len(failed)} type(s) failed to import: {', '.join(failed)} (see {args.log_file})")
+        sys.exit(1)
+
+    print("\n✅ Import complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/bin/bash
 # import_okta_resources.sh
-# Automated script to import existing Okta resources using Terraformer
+# Automated script to import existing Okta resources using Terraformer.
+# Imports run concurrently in import_okta_resources.py; arguments are passed through.
 
 set -e
 
@@ -61,22 +62,6 @@ backup_existing() {
     fi
 }
 
-# Import specific resource type
-import_resource() {
-    local resource_type=$1
-    local description=$2
-    
-    print_info "Importing $description..."
-    
-    if terraformer import okta --resources="$resource_type" 2>&1 | tee -a import.log; then
-        print_info "$description imported successfully ✓"
-        return 0
-    else
-        print_warn "$description import failed or no resources found"
-        return 1
-    fi
-}
-
 # Clean up generated files
 cleanup_generated() {
     print_info "Cleaning up generated files..."
@@ -215,22 +200,13 @@ EOF
     print_info "Starting resource import..."
     echo ""
     
-    import_resource "okta_user" "Users"
-    import_resource "okta_group" "Groups"
-    import_resource "okta_group_rule" "Group Rules"
-    import_resource "okta_app_oauth" "OAuth/OIDC Applications"
-    import_resource "okta_app_saml" "SAML Applications"
-    import_resource "okta_auth_server" "Authorization Servers"
-    import_resource "okta_auth_server_policy" "Auth Server Policies"
-    import_resource "okta_auth_server_claim" "Auth Server Claims"
-    import_resource "okta_auth_server_scope" "Auth Server Scopes"
-    import_resource "okta_policy_mfa" "MFA Policies"
-    import_resource "okta_policy_password" "Password Policies"
-    import_resource "okta_policy_signon" "Sign-On Policies"
-    import_resource "okta_network_zone" "Network Zones"
-    import_resource "okta_trusted_origin" "Trusted Origins"
-    import_resource "okta_idp_saml" "SAML Identity Providers"
-    import_resource "okta_user_schema" "User Schema"
+    # Resource types are imported concurrently and cleaned as each one finishes
+    # (see import_okta_resources.py; extra arguments such as --workers are passed through)
+    python3 "$(dirname "$0")/import_okta_resources.py" \
+        --output-dir "$GENERATED_DIR" \
+        --cleaned-dir "$IMPORT_DIR/cleaned" \
+        --log-file import.log \
+        "$@" || print_warn "Some resource types failed to import (see import.log)"
     
     echo ""
     cleanup_generated
@@ -19,6 +19,11 @@ import argparse
 from typing import Dict, List
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session
+
 
 class RiskRuleImporter:
     """Imports risk rules from Okta to local config"""
@@ -32,9 +37,10 @@ class RiskRuleImporter:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
 
+    @span("fetch")
     def get_all_risk_rules(self, filter_expr: str = None, limit: int = 200) -> List[Dict]:
         """
         Fetch all risk rules from Okta
@@ -107,6 +113,7 @@ class RiskRuleImporter:
             print(f"  ❌ Unexpected error: {e}")
             return []
 
+    @span("transform")
     def transform_risk_rules(self, raw_rules: List[Dict]) -> List[Dict]:
         """
         Transform raw API response to config file format
@@ -145,6 +152,7 @@ class RiskRuleImporter:
 
         return transformed_rules
 
+    @span("save")
     def save_to_file(self, rules: List[Dict], output_file: str):
         """Save risk rules to JSON config file"""
         print(f"\nSaving risk rules to {output_file}...")
@@ -186,6 +194,7 @@ class RiskRuleImporter:
         print(f"  ✅ Saved {len(rules)} risk rules")
         return config
 
+    @span("import_risk_rules")
     def import_rules(self, output_file: str, filter_expr: str = None) -> bool:
         """Run the complete import process"""
         # Fetch risk rules
@@ -248,8 +257,10 @@ def main():
         default=200,
         help="Results per page (default 200)"
     )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
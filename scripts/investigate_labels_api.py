@@ -12,9 +12,12 @@ Usage:
 import os
 import sys
 import json
-import requests
 from typing import Dict, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_http import create_session
+
 
 class LabelsAPIInvestigator:
     """Investigate Labels API endpoints and methods"""
@@ -28,8 +31,7 @@ class LabelsAPIInvestigator:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.session = create_session(self.headers)
 
     def print_section(self, title: str):
         """Print a formatted section header"""
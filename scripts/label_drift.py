@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+label_drift.py
+
+Structural drift detection for governance labels: compares a labels export
+(from okta_api_manager.py --action export) with the live org or a second export.
+
+Both sides are streamed into keyed, hashed records at three levels:
+  label       label name           -> hash(labelId, description)
+  value       labelValueId         -> hash(label, name, description, metadata)
+  assignment  ORN + labelValueId   -> presence
+
+Records are spilled into hash-partitioned bucket files and each bucket is then
+diffed in memory, so the comparison is linear in the number of records and
+memory is bounded by one bucket rather than the whole export. Export files are
+read with an incremental JSON reader and never loaded whole.
+
+The JSON report lists added, removed and changed records per level (details are
+capped by --max-details, counts are always complete) and sets "drift" so
+workflows can gate on it.
+
+Usage:
+  # Export vs live org (OKTA_ORG_NAME / OKTA_BASE_URL / OKTA_API_TOKEN)
+  python3 scripts/label_drift.py --export oig-exports/lowerdecklabs/latest.json --report drift.json
+
+  # Export vs export, failing the job when anything differs
+  python3 scripts/label_drift.py --export old.json --against new.json --fail-on-drift
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+RECORD_KINDS = ["label", "value", "assignment"]
+
+# Fields that change without a structural change
+VOLATILE_FIELDS = {"_links", "created", "lastUpdated", "createdBy", "lastUpdatedBy"}
+
+WHITESPACE = re.compile(r"\s*")
+
+# Fields of a resource-labels entry used by assignment_records()
+ASSIGNMENT_FIELDS = ["resource.orn", "resource.name", "labels.labelValueId", "labels.name"]
+
+# (kind, key, digest, detail, scope) where scope is the label a value belongs to
+Record = Tuple[str, str, str, Dict, Optional[str]]
+
+
+class JSONStream:
+    """
+    Incremental reader over a JSON document.
+
+    Containers are walked with iter_object()/iter_array() and leaf values are
+    decoded whole with read_value(), so memory holds one leaf value plus a
+    read-ahead chunk regardless of the document size.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of file"""
+        if self.eof:
+            return False
+        # Grow geometrically so a large value is not re-scanned once per chunk
+        chunk = self.fp.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode the next complete value"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the chunk boundary
+                if self._fill():
+                    continue
+                raise
+            # A number ending at the buffer edge may continue in the next chunk
+            if end == len(self.buffer) and self.buffer[self.pos] in "-0123456789" and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of an object; the caller must consume each value"""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._end_item("}") == "}":
+                return
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per array element; the caller must consume each element"""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self._end_item("]") == "]":
+                return
+
+    def _end_item(self, closing: str) -> str:
+        """Consume the separator after an item; returns ',' or the closing bracket"""
+        char = self._peek()
+        if char not in (",", closing):
+            raise ValueError(f"Expected ',' or '{closing}' but found '{char or 'end of file'}'")
+        self.pos += 1
+        return char
+
+    def peek_type(self) -> str:
+        return self._peek()
+
+    def skip_value(self):
+        char = self._peek()
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+
+def record_digest(data: Dict) -> str:
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _stable(data: Dict) -> Dict:
+    return {k: v for k, v in data.items() if k not in VOLATILE_FIELDS}
+
+
+def label_record(label: Dict) -> Record:
+    detail = {
+        "name": label.get("name"),
+        "labelId": label.get("labelId"),
+        "description": label.get("description", "")
+    }
+    return "label", label.get("name") or label.get("labelId"), record_digest(detail), detail, None
+
+
+def value_records(label: Dict, values: Iterable[Dict]) -> Iterator[Record]:
+    label_name = label.get("name") or label.get("labelId")
+    for value in values:
+        value_id = value.get("labelValueId")
+        if not value_id:
+            continue
+        detail = dict(_stable(value), label=label_name)
+        detail.pop("labelValueId", None)
+        yield "value", value_id, record_digest(detail), detail, label_name
+
+
+def assignment_records(entry: Dict, value_names: Optional[Dict[str, str]] = None) -> Iterator[Record]:
+    """One record per (resource, label value) pair in a resource-labels entry"""
+    resource = entry.get("resource", {})
+    orn = resource.get("orn")
+    if not orn:
+        return
+    for label_value in entry.get("labels", []):
+        value_id = label_value.get("labelValueId")
+        if not value_id:
+            continue
+        value_name = (value_names or {}).get(value_id) or label_value.get("name")
+        detail = {"resource": resource.get("name"), "orn": orn, "labelValueId": value_id, "value": value_name}
+        yield "assignment", f"{orn}|{value_id}", "", detail, None
+
+
+class ExportLabelRecords:
+    """
+    Records from an export file, streamed.
+
+    Labels exported before label values were included have no "values" key;
+    they are collected in labels_without_values and their values are not compared.
+    """
+
+    def __init__(self, export_file: str):
+        self.export_file = export_file
+        self.description = export_file
+        self.labels_without_values: Set[str] = set()
+        self.skipped_entries = 0
+
+    def __iter__(self) -> Iterator[Record]:
+        with open(self.export_file, "r") as f:
+            stream = JSONStream(f)
+            for key in stream.iter_object():
+                if key == "labels" and stream.peek_type() == "[":
+                    for _ in stream.iter_array():
+                        yield from self._label(stream)
+                else:
+                    stream.skip_value()
+
+    def _label(self, stream: JSONStream) -> Iterator[Record]:
+        label = {}
+        values = None
+        for key in stream.iter_object():
+            if key == "resources" and stream.peek_type() == "[":
+                for _ in stream.iter_array():
+                    entry = stream.read_value()
+                    if not entry.get("labels"):
+                        self.skipped_entries += 1
+                    yield from assignment_records(entry)
+            elif key == "values":
+                values = stream.read_value() or []
+            else:
+                label[key] = stream.read_value()
+
+        yield label_record(label)
+        if values is None:
+            self.labels_without_values.add(label.get("name") or label.get("labelId"))
+        else:
+            yield from value_records(label, values)
+
+
+class LiveLabelRecords:
+    """Records from the live org, fetched page by page through an OktaAPIManager"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.description = manager.base_url
+        self.labels_without_values: Set[str] = set()
+        self.skipped_entries = 0
+
+    def __iter__(self) -> Iterator[Record]:
+        governance = f"{self.manager.base_url}/governance/api/v1"
+        value_names = {}
+        for page in self.manager._iter_pages(f"{governance}/labels"):
+            for label in page:
+                yield label_record(label)
+                for value in label.get("values", []):
+                    value_names[value.get("labelValueId")] = value.get("name")
+                yield from value_records(label, label.get("values", []))
+
+        for page in self.manager._iter_pages(f"{governance}/resource-labels", {"limit": 200},
+                                             ASSIGNMENT_FIELDS):
+            for entry in page:
+                yield from assignment_records(entry, value_names)
+
+
+def _partition_path(workdir: str, side: str, index: int) -> str:
+    return os.path.join(workdir, f"{side}-{index:04d}.jsonl")
+
+
+def _spill(records: Iterable[Record], workdir: str, side: str, partitions: int) -> int:
+    """Write records into hash-partitioned bucket files; returns the record count"""
+    files = [open(_partition_path(workdir, side, index), "w") for index in range(partitions)]
+    count = 0
+    try:
+        for record in records:
+            index = zlib.crc32(record[1].encode("utf-8")) % partitions
+            files[index].write(json.dumps(record, separators=(",", ":")))
+            files[index].write("\n")
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+def _read_partition(workdir: str, side: str, index: int) -> Iterator[Record]:
+    with open(_partition_path(workdir, side, index), "r") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def empty_report() -> Dict:
+    return {
+        "drift": False,
+        "summary": {kind: {"added": 0, "removed": 0, "changed": 0, "unchanged": 0} for kind in RECORD_KINDS},
+        "changes": {kind: {"added": [], "removed": [], "changed": []} for kind in RECORD_KINDS},
+        "truncated": False
+    }
+
+
+def diff_label_records(baseline, current, partitions: int = 64, max_details: int = 1000,
+                       workdir: Optional[str] = None) -> Dict:
+    """
+    Full set difference between two record sources (ExportLabelRecords / LiveLabelRecords).
+
+    Each side is read once into partition files, then each partition's baseline
+    records are held in memory while the matching current records stream past.
+    Returns the report described in the module docstring.
+    """
+    report = empty_report()
+    report["baseline"] = baseline.description
+    report["current"] = current.description
+
+    def note(kind: str, change: str, entry: Dict):
+        report["summary"][kind][change] += 1
+        details = report["changes"][kind][change]
+        if len(details) < max_details:
+            details.append(entry)
+        else:
+            report["truncated"] = True
+
+    with tempfile.TemporaryDirectory(prefix="label-drift-", dir=workdir) as tmp:
+        report["records"] = {
+            "baseline": _spill(baseline, tmp, "baseline", partitions),
+            "current": _spill(current, tmp, "current", partitions)
+        }
+        # Values of labels exported without them cannot be compared
+        skipped_scopes = baseline.labels_without_values | current.labels_without_values
+
+        for index in range(partitions):
+            before: Dict[Tuple[str, str], Tuple[str, Dict]] = {}
+            for kind, key, digest, detail, scope in _read_partition(tmp, "baseline", index):
+                if scope in skipped_scopes:
+                    continue
+                before[(kind, key)] = (digest, detail)
+
+            seen = set()
+            for kind, key, digest, detail, scope in _read_partition(tmp, "current", index):
+                if scope in skipped_scopes or (kind, key) in seen:
+                    continue
+                seen.add((kind, key))
+                previous = before.pop((kind, key), None)
+                if previous is None:
+                    note(kind, "added", {"key": key, **detail})
+                elif previous[0] != digest:
+                    note(kind, "changed", {"key": key, "before": previous[1], "after": detail})
+                else:
+                    report["summary"][kind]["unchanged"] += 1
+
+            for (kind, key), (digest, detail) in before.items():
+                note(kind, "removed", {"key": key, **detail})
+
+    for kind in RECORD_KINDS:
+        for details in report["changes"][kind].values():
+            details.sort(key=lambda entry: entry["key"])
+    report["drift"] = any(
+        counts["added"] or counts["removed"] or counts["changed"] for counts in report["summary"].values()
+    )
+    report["values_not_compared"] = sorted(skipped_scopes)
+    report["skipped_entries"] = baseline.skipped_entries + current.skipped_entries
+    return report
+
+
+def print_drift_report(report: Dict):
+    print(f"Baseline: {report.get('baseline')} ({report['records']['baseline']:,} records)")
+    print(f"Current:  {report.get('current')} ({report['records']['current']:,} records)")
+    print()
+    for kind in RECORD_KINDS:
+        counts = report["summary"][kind]
+        emoji = "⚠️ " if counts["added"] or counts["removed"] or counts["changed"] else "✅"
+        print(f"  {emoji} {kind.capitalize()}s: +{counts['added']:,} -{counts['removed']:,} "
+              f"~{counts['changed']:,} ({counts['unchanged']:,} unchanged)")
+
+    for kind in RECORD_KINDS:
+        for change, symbol in [("added", "+"), ("removed", "-"), ("changed", "~")]:
+            details = report["changes"][kind][change]
+            for entry in details[:10]:
+                print(f"      {symbol} {kind} {entry['key']}")
+            if len(details) > 10:
+                print(f"      ... and {report['summary'][kind][change] - 10:,} more {change} {kind}s")
+
+    if report.get("values_not_compared"):
+        print(f"\n  ℹ️  Values not compared for {len(report['values_not_compared'])} label(s) "
+              f"exported without values: {', '.join(report['values_not_compared'][:5])}")
+    if report.get("skipped_entries"):
+        print(f"  ℹ️  {report['skipped_entries']} resource entries had no label values and were skipped")
+    print(f"\n{'⚠️  Drift detected' if report['drift'] else '✅ No drift'}")
+
+
+def write_drift_report(report: Dict, report_file: str):
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"📄 Drift report saved to: {report_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare a labels export with the live org or another export"
+    )
+    parser.add_argument("--export", required=True, help="Baseline export file")
+    parser.add_argument("--against", help="Second export file to compare with (default: the live org)")
+    parser.add_argument("--report", help="Write the machine-readable drift report to this file")
+    parser.add_argument("--fail-on-drift", action="store_true", help="Exit with status 1 when drift is found")
+    parser.add_argument("--partitions", type=int, default=64, help="Number of hash buckets (default: 64)")
+    parser.add_argument("--max-details", type=int, default=1000,
+                        help="Maximum listed records per level and change type (default: 1000)")
+    parser.add_argument("--org-name", default=os.environ.get("OKTA_ORG_NAME"), help="Okta organization name")
+    parser.add_argument("--base-url", default=os.environ.get("OKTA_BASE_URL", "okta.com"), help="Okta base URL")
+    parser.add_argument("--api-token", default=os.environ.get("OKTA_API_TOKEN"), help="Okta API token")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.export):
+        print(f"❌ Export file not found: {args.export}")
+        sys.exit(2)
+
+    if args.against:
+        current = ExportLabelRecords(args.against)
+    else:
+        if not args.org_name or not args.api_token:
+            print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set (or use --against)")
+            sys.exit(2)
+        from scripts.okta_api_manager import OktaAPIManager
+        current = LiveLabelRecords(OktaAPIManager(args.org_name, args.base_url, args.api_token))
+
+    print("\n" + "="*80)
+    print("LABEL DRIFT")
+    print("="*80)
+    report = diff_label_records(ExportLabelRecords(args.export), current,
+                                partitions=args.partitions, max_details=args.max_details)
+    print_drift_report(report)
+
+    if args.report:
+        write_drift_report(report, args.report)
+
+    if args.fail_on_drift and report["drift"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
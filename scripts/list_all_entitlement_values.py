@@ -4,16 +4,22 @@ List all entitlement values for a specific entitlement.
 
 Usage:
     python3 scripts/list_all_entitlement_values.py --entitlement-id esp12pvbc9GsRkvu31d7
+    python3 scripts/list_all_entitlement_values.py --entitlement-id esp12pvbc9GsRkvu31d7 \
+        --snapshot snapshots/lowerdecklabs.db
 """
 
 import os
 import sys
 import argparse
-import requests
 import json
 
-def list_entitlement_values(entitlement_id):
-    """List all values for a given entitlement."""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_http import create_session
+from scripts.okta_snapshot import open_snapshot
+
+def fetch_entitlement(entitlement_id):
+    """Fetch a single entitlement (with values) from the live API."""
 
     org_name = os.getenv('OKTA_ORG_NAME')
     base_url = os.getenv('OKTA_BASE_URL')
@@ -33,16 +39,30 @@ def list_entitlement_values(entitlement_id):
         'Content-Type': 'application/json'
     }
 
-    print(f"Fetching entitlement: {entitlement_id}\n")
-
-    response = requests.get(url, headers=headers)
+    response = create_session(headers).get(url)
 
     if response.status_code != 200:
         print(f"Error: {response.status_code}")
         print(response.text)
         return None
 
-    entitlement = response.json()
+    return response.json()
+
+def list_entitlement_values(entitlement_id, snapshot_db=None):
+    """List all values for a given entitlement."""
+
+    print(f"Fetching entitlement: {entitlement_id}\n")
+
+    snapshot = open_snapshot(snapshot_db)
+    if snapshot:
+        entitlement = snapshot.get_entitlement(entitlement_id)
+        if not entitlement:
+            print(f"Error: entitlement {entitlement_id} not found in snapshot")
+            return None
+    else:
+        entitlement = fetch_entitlement(entitlement_id)
+        if entitlement is None:
+            return None
 
     print(f"Entitlement Name: {entitlement.get('name')}")
     print(f"Entitlement ID: {entitlement.get('id')}")
@@ -82,10 +102,15 @@ def main():
         required=True,
         help='Entitlement ID (e.g., esp12pvbc9GsRkvu31d7 for ServiceNow Roles)'
     )
+    parser.add_argument(
+        '--snapshot',
+        default=os.getenv('OKTA_SNAPSHOT_DB'),
+        help='Read the entitlement from a local snapshot (see okta_snapshot.py) instead of the API'
+    )
 
     args = parser.parse_args()
 
-    values = list_entitlement_values(args.entitlement_id)
+    values = list_entitlement_values(args.entitlement_id, args.snapshot)
 
     if values:
         print(f"\nTotal values: {len(values)}")
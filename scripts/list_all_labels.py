@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 List all labels in Okta using the governance API.
+
+Set OKTA_SNAPSHOT_DB to read from a local snapshot (see okta_snapshot.py)
+instead of the live API.
 """
 
 import os
@@ -10,8 +13,16 @@ import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_snapshot import open_snapshot
+
+def fetch_labels() -> dict:
+    """Fetch labels from the snapshot if configured, otherwise from the API"""
+    snapshot = open_snapshot(os.environ.get("OKTA_SNAPSHOT_DB"))
+    if snapshot:
+        print(f"Reading labels from snapshot: {snapshot.db_path}")
+        print()
+        return {"data": snapshot.list_labels()}
 
-def main():
     # Get credentials from environment
     org_name = os.environ.get("OKTA_ORG_NAME")
     base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
@@ -32,10 +43,13 @@ def main():
     print(f"Fetching labels from: {url}")
     print()
 
+    response = manager.session.get(url)
+    response.raise_for_status()
+    return response.json()
+
+def main():
     try:
-        response = manager.session.get(url)
-        response.raise_for_status()
-        labels_data = response.json()
+        labels_data = fetch_labels()
 
         print(f"Raw API Response:")
         print(json.dumps(labels_data, indent=2))
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 List all applications in the Okta tenant.
+
+Set OKTA_SNAPSHOT_DB to read from a local snapshot (see okta_snapshot.py)
+instead of the live API.
 """
 
 import os
@@ -10,28 +13,35 @@ import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_snapshot import open_snapshot
 
 def main():
-    # Get credentials from environment
-    org_name = os.environ.get("OKTA_ORG_NAME")
-    base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
-    api_token = os.environ.get("OKTA_API_TOKEN")
-
-    if not org_name or not api_token:
-        print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
-        sys.exit(1)
-
-    manager = OktaAPIManager(
-        org_name=org_name,
-        base_url=base_url,
-        api_token=api_token
-    )
-
-    # Get all apps
-    url = f"{manager.base_url}/api/v1/apps"
-    response = manager.session.get(url)
-    response.raise_for_status()
-    apps = response.json()
+    snapshot = open_snapshot(os.environ.get("OKTA_SNAPSHOT_DB"))
+
+    if snapshot:
+        org_name = snapshot.get_meta("org_name")
+        apps = snapshot.list_apps()
+    else:
+        # Get credentials from environment
+        org_name = os.environ.get("OKTA_ORG_NAME")
+        base_url = os.environ.get("OKTA_BASE_URL", "okta.com")
+        api_token = os.environ.get("OKTA_API_TOKEN")
+
+        if not org_name or not api_token:
+            print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+            sys.exit(1)
+
+        manager = OktaAPIManager(
+            org_name=org_name,
+            base_url=base_url,
+            api_token=api_token
+        )
+
+        # Get all apps
+        url = f"{manager.base_url}/api/v1/apps"
+        response = manager.session.get(url)
+        response.raise_for_status()
+        apps = response.json()
 
     print(f"Found {len(apps)} applications in {org_name}:")
     print("=" * 100)
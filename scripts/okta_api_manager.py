@@ -20,6 +20,10 @@ Usage:
   python okta_api_manager.py --action export --output export.json \
     --export-labels --export-owners --resource-orns <orn1> <orn2>
 
+  # Incremental export: only re-fetch labels that changed since a previous export
+  python okta_api_manager.py --action export --output export.json \
+    --previous-export oig-exports/lowerdecklabs/latest.json
+
   # Apply labels and resource owners from config
   python okta_api_manager.py --action apply --config config.json
 
@@ -28,12 +32,21 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import sys
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Dict, Optional
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import METRICS, add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import compile_fields, create_session, decode_page, size_pool
+from scripts.okta_models import App, Bundle, Group, Label
+
 
 class OktaAPIManager:
     """Manages Okta OIG resources via REST API"""
@@ -46,13 +59,23 @@ class OktaAPIManager:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
 
         # Rate limit tracking
         self.rate_limit_remaining = None
         self.rate_limit_reset = None
         self.rate_limit_warning_threshold = 10  # Warn when fewer than this many requests remain
+
+        self._orn_resolver = None
+
+    @property
+    def orn_resolver(self):
+        """Shared OrnResolver for this org (org ID and app table are loaded once)"""
+        if self._orn_resolver is None:
+            from scripts.orn_resolver import OrnResolver, default_table_path
+            self._orn_resolver = OrnResolver(self, default_table_path(self.org_name))
+        return self._orn_resolver
     
     def _update_rate_limit_info(self, response: requests.Response):
         """Update rate limit tracking from response headers"""
@@ -72,7 +95,7 @@ class OktaAPIManager:
             if self.rate_limit_reset:
                 wait_time = max(self.rate_limit_reset - time.time() + 1, 1)  # Add 1 second buffer
                 print(f"  ⏳ Rate limit nearly exhausted. Waiting {wait_time:.0f} seconds for reset...")
-                time.sleep(wait_time)
+                METRICS.sleep("rate_limit_reset", wait_time)
 
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make API request with rate limit awareness and retry logic"""
@@ -96,7 +119,8 @@ class OktaAPIManager:
                     wait_time = max(reset_time - time.time() + 1, 1)  # Add 1 second buffer
 
                     print(f"  ⚠️  Rate limited (429). Waiting {wait_time:.0f} seconds until reset...")
-                    time.sleep(wait_time)
+                    METRICS.sleep("rate_limited", wait_time)
+                    METRICS.record_retry(method, url)
                     continue
 
                 response.raise_for_status()
@@ -114,7 +138,8 @@ class OktaAPIManager:
                 wait_time = base_retry_delay * (2 ** attempt)
                 print(f"  ⚠️  Request failed (attempt {attempt + 1}/{max_retries}): {e}")
                 print(f"     Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+                METRICS.sleep("retry_backoff", wait_time)
+                METRICS.record_retry(method, url)
 
             except requests.exceptions.RequestException as e:
                 if attempt == max_retries - 1:
@@ -124,9 +149,59 @@ class OktaAPIManager:
                 wait_time = base_retry_delay * (2 ** attempt)
                 print(f"  ⚠️  Request failed (attempt {attempt + 1}/{max_retries}): {e}")
                 print(f"     Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+                METRICS.sleep("retry_backoff", wait_time)
+                METRICS.record_retry(method, url)
 
         raise Exception("Max retries exceeded")
+
+    def _iter_pages(self, url: str, params: Optional[Dict] = None,
+                    fields: Optional[Iterable[str]] = None) -> Iterator[List[Dict]]:
+        """
+        Yield each page of a list endpoint, following pagination.
+
+        Handles both governance responses ({"data": [...], "_links": {"next": ...}})
+        and management API responses (JSON array with a Link: rel="next" header).
+        With `fields` (dotted paths such as "profile.name"), each item is
+        decoded into a lean dict holding only those fields.
+        """
+        compiled = compile_fields(fields) if fields is not None else None
+        while url:
+            response = self._make_request("GET", url, params=params)
+            items, url = decode_page(response, compiled)
+            yield items
+
+            # The next link already carries the query string
+            params = None
+
+    def _paginate(self, url: str, params: Optional[Dict] = None,
+                  fields: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Fetch all items from a paginated list endpoint"""
+        items = []
+        for page in self._iter_pages(url, params, fields):
+            items.extend(page)
+        return items
+
+    def _list_records(self, url: str, params: Optional[Dict], model) -> List:
+        """Fetch a paginated list as okta_models records, decoding only the fields they keep"""
+        records = []
+        for page in self._iter_pages(url, params, model.FIELDS or None):
+            records.extend(model.from_page(page))
+        return records
+
+    # ==================== Resources ====================
+
+    def list_apps(self) -> List[App]:
+        """List all applications"""
+        return self._list_records(f"{self.base_url}/api/v1/apps", {"limit": 200}, App)
+
+    def list_groups(self) -> List[Group]:
+        """List all groups"""
+        return self._list_records(f"{self.base_url}/api/v1/groups", {"limit": 200}, Group)
+
+    def list_entitlement_bundles(self) -> List[Bundle]:
+        """List all entitlement bundles"""
+        url = f"{self.base_url}/governance/api/v1/entitlement-bundles"
+        return self._list_records(url, {"limit": 200}, Bundle)
     
     # ==================== Resource Owners ====================
     
@@ -172,11 +247,18 @@ class OktaAPIManager:
     
     def remove_resource_owner(self, resource_orn: str, principal_orn: str) -> Dict:
         """Remove a specific owner from a resource"""
-        operations = [{
-            "op": "REMOVE",
-            "path": "/principalOrn",
-            "value": principal_orn
-        }]
+        return self.remove_resource_owners(resource_orn, [principal_orn])
+
+    def remove_resource_owners(self, resource_orn: str, principal_orns: List[str]) -> Dict:
+        """Remove several owners from a resource with a single PATCH request"""
+        operations = [
+            {
+                "op": "REMOVE",
+                "path": "/principalOrn",
+                "value": principal_orn
+            }
+            for principal_orn in principal_orns
+        ]
         return self.update_resource_owners(resource_orn, operations)
     
     def list_unassigned_resources(self, parent_resource_orn: str, resource_type: Optional[str] = None) -> Dict:
@@ -222,23 +304,28 @@ class OktaAPIManager:
         response = self._make_request("GET", url)
         return response.json()
 
+    def list_label_records(self) -> List[Label]:
+        """List all governance labels (every page) as Label records"""
+        return self._list_records(f"{self.base_url}/governance/api/v1/labels", None, Label)
+
+    def find_label(self, label_name: str) -> Optional[Label]:
+        """Label with the given name, or None"""
+        for label in self.list_label_records():
+            if label.name == label_name:
+                return label
+        return None
+
     def get_label_id_from_name(self, label_name: str) -> Optional[str]:
         """Get labelId from label name by listing all labels"""
-        labels_response = self.list_labels()
-        for label in labels_response.get("data", []):
-            if label.get("name") == label_name:
-                return label.get("labelId")
-        return None
+        label = self.find_label(label_name)
+        return label.id if label else None
 
     def get_label_value_id_from_name(self, label_name: str) -> Optional[str]:
         """Get labelValueId from label name by listing all labels"""
-        labels_response = self.list_labels()
-        for label in labels_response.get("data", []):
-            if label.get("name") == label_name:
-                # Get the first labelValueId from values array
-                values = label.get("values", [])
-                if values:
-                    return values[0].get("labelValueId")
+        label = self.find_label(label_name)
+        if label and label.values:
+            # Get the first labelValueId from values array
+            return label.values[0].id
         return None
 
     def get_label(self, label_name: str) -> Optional[Dict]:
@@ -297,6 +384,15 @@ class OktaAPIManager:
         response = self._make_request("GET", url, params=params)
         return response.json()
 
+    def list_resources_by_label_value(self, label_value_id: str) -> List[Dict]:
+        """List all resources assigned a specific label value (follows pagination)"""
+        url = f"{self.base_url}/governance/api/v1/resource-labels"
+        params = {
+            "filter": f'labelValueId eq "{label_value_id}"',
+            "limit": 200
+        }
+        return self._paginate(url, params)
+
     def remove_label_from_resources(self, label_name: str, resource_orns: List[str]) -> Dict:
         """Remove a label from resources (looks up labelId first)"""
         label_id = self.get_label_id_from_name(label_name)
@@ -368,14 +464,9 @@ class OktaAPIManager:
         Example:
             sox_value_id = manager.get_label_value_id("Compliance", "SOX")
         """
-        labels_response = self.list_labels()
-        for label in labels_response.get("data", []):
-            if label.get("name") == label_name:
-                values = label.get("values", [])
-                for value in values:
-                    if value.get("name") == value_name:
-                        return value.get("labelValueId")
-        return None
+        label = self.find_label(label_name)
+        value = label.value(value_name) if label else None
+        return value.id if value else None
 
     def assign_label_values_to_resources(self, label_value_ids: List[str], resource_orns: List[str]) -> Dict:
         """
@@ -432,19 +523,24 @@ class OktaAPIManager:
 
     def build_user_orn(self, user_id: str) -> str:
         """Build ORN for a user"""
-        return f"orn:okta:directory:{self.org_name}:users:{user_id}"
+        return self.orn_resolver.user_orn(user_id)
 
     def build_group_orn(self, group_id: str) -> str:
         """Build ORN for a group"""
-        return f"orn:okta:directory:{self.org_name}:groups:{group_id}"
+        return self.orn_resolver.group_orn(group_id)
+
+    def build_app_orn(self, app_id: str, app_type: str = None) -> str:
+        """
+        Build ORN for an application.
 
-    def build_app_orn(self, app_id: str, app_type: str = "oauth2") -> str:
-        """Build ORN for an application"""
-        return f"orn:okta:idp:{self.org_name}:apps:{app_type}:{app_id}"
+        The app segment comes from the app's catalog name via the ORN resolver;
+        app_type is accepted for backwards compatibility with existing configs.
+        """
+        return self.orn_resolver.app_orn(app_id)
 
     def build_entitlement_bundle_orn(self, bundle_id: str) -> str:
         """Build ORN for an entitlement bundle"""
-        return f"orn:okta:governance:{self.org_name}:entitlement-bundles:{bundle_id}"
+        return self.orn_resolver.bundle_orn(bundle_id)
 
 
 def load_config(config_file: str) -> Dict:
@@ -453,6 +549,7 @@ def load_config(config_file: str) -> Dict:
         return json.load(f)
 
 
+@span("apply")
 def apply_configuration(manager: OktaAPIManager, config: Dict):
     """Apply resource owners and labels from configuration"""
     print("\n=== Applying Resource Owners and Labels ===\n")
@@ -511,7 +608,34 @@ def apply_configuration(manager: OktaAPIManager, config: Dict):
     print("\n✅ Configuration applied successfully!")
 
 
-def destroy_configuration(manager: OktaAPIManager, config: Dict):
+def remove_owners_from_resource(manager: OktaAPIManager, resource_orn: str,
+                                principal_orns: List[str]) -> Dict[str, Exception]:
+    """
+    Remove owners from a resource, returning the failures by principal ORN.
+
+    All principals go in one PATCH. If Okta rejects it (4xx, e.g. because one
+    principal is no longer an owner), each principal is removed on its own so
+    the others are still removed and the failing principal can be reported.
+    """
+    try:
+        manager.remove_resource_owners(resource_orn, principal_orns)
+        return {}
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if len(principal_orns) == 1 or status is None or not 400 <= status < 500:
+            return {principal_orn: e for principal_orn in principal_orns}
+
+    failures = {}
+    for principal_orn in principal_orns:
+        try:
+            manager.remove_resource_owner(resource_orn, principal_orn)
+        except Exception as e:
+            failures[principal_orn] = e
+    return failures
+
+
+@span("destroy")
+def destroy_configuration(manager: OktaAPIManager, config: Dict, max_workers: int = 8):
     """Remove resource owners and labels"""
     print("\n=== Removing Resource Owners and Labels ===\n")
     
@@ -540,6 +664,9 @@ def destroy_configuration(manager: OktaAPIManager, config: Dict):
     # Remove resource owners
     if "resource_owners" in config:
         print("\nRemoving resource owners...")
+
+        # Group principals per resource so each resource gets a single PATCH
+        owners_by_resource = {}
         for assignment in config["resource_owners"]:
             principal_orns = [
                 manager.build_user_orn(uid) if assignment["principal_type"] == "user"
@@ -559,37 +686,159 @@ def destroy_configuration(manager: OktaAPIManager, config: Dict):
                 resource_orns = assignment["resource_orns"]
             
             for resource_orn in resource_orns:
-                for principal_orn in principal_orns:
-                    try:
-                        manager.remove_resource_owner(resource_orn, principal_orn)
-                    except Exception as e:
-                        print(f"Warning: Could not remove owner: {e}")
+                principals = owners_by_resource.setdefault(resource_orn, [])
+                principals.extend(p for p in principal_orns if p not in principals)
+
+        size_pool(manager.session, max_workers)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(remove_owners_from_resource, manager, resource_orn, principal_orns): resource_orn
+                for resource_orn, principal_orns in owners_by_resource.items()
+            }
+            for future in as_completed(futures):
+                resource_orn = futures[future]
+                try:
+                    failures = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not remove owners from {resource_orn}: {e}")
+                    continue
+
+                removed = len(owners_by_resource[resource_orn]) - len(failures)
+                if removed:
+                    print(f"  Removed {removed} owner(s) from {resource_orn}")
+                for principal_orn, e in failures.items():
+                    print(f"Warning: Could not remove owner {principal_orn} from {resource_orn}: {e}")
     
     print("\n✅ Configuration destroyed successfully!")
 
 
-def export_labels_only(manager: OktaAPIManager) -> Dict:
-    """Export only governance labels"""
+def label_fingerprint(label: Dict) -> str:
+    """Stable hash of a label's metadata (name, description, values, timestamps)"""
+    metadata = {k: v for k, v in label.items() if k != "_links"}
+    encoded = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _resource_sort_key(resource: Dict) -> str:
+    """Sort key for resource-label entries so exports diff cleanly"""
+    return resource.get("resource", {}).get("orn", "") or json.dumps(resource, sort_keys=True)
+
+
+def load_previous_export(export_file: str) -> Dict[str, Dict]:
+    """
+    Load labels from a previous export, keyed by labelId (or name for older exports).
+
+    Returns an empty dict if the file is missing or unreadable, which makes the
+    export fall back to a full re-fetch.
+    """
+    if not export_file or not os.path.exists(export_file):
+        if export_file:
+            print(f"  ℹ️  Previous export not found: {export_file} - running full export")
+        return {}
+
+    try:
+        with open(export_file, 'r') as f:
+            previous = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  Could not read previous export {export_file}: {e} - running full export")
+        return {}
+
+    previous_labels = {}
+    for label in previous.get("labels", []):
+        key = label.get("labelId") or label.get("name")
+        if key:
+            previous_labels[key] = label
+    return previous_labels
+
+
+def export_labels_only(manager: OktaAPIManager, previous_labels: Optional[Dict[str, Dict]] = None,
+                       max_workers: int = 8) -> Dict:
+    """
+    Export only governance labels.
+
+    The label catalog is listed once and resources for every label value are
+    enumerated concurrently (max_workers requests in flight, full pagination).
+
+    If previous_labels is given (see load_previous_export), labels whose metadata
+    fingerprint is unchanged are carried forward from the previous export instead
+    of re-fetching their resources. Assignment-only changes are not reflected in
+    label metadata, so run a full export periodically to pick those up.
+    """
     print("Exporting labels...")
     labels_data = []
+    previous_labels = previous_labels or {}
+    reused = 0
 
     try:
         labels_response = manager.list_labels()
+
+        # Carry forward unchanged labels, collect the rest for fetching
+        to_fetch = []
         for label in labels_response.get("data", []):
             label_name = label.get("name")
-            try:
-                # Get resources for this label
-                resources = manager.list_resources_by_label(label_name)
-                labels_data.append({
-                    "name": label_name,
-                    "description": label.get("description", ""),
-                    "resources": resources.get("data", [])
-                })
-                print(f"  ✅ {label_name}: {len(resources.get('data', []))} resources")
-            except Exception as e:
-                print(f"  ⚠️  Could not get resources for label '{label_name}': {e}")
+            fingerprint = label_fingerprint(label)
+
+            previous = previous_labels.get(label.get("labelId")) or previous_labels.get(label_name)
+            if previous and previous.get("fingerprint") == fingerprint:
+                labels_data.append(previous)
+                reused += 1
+                print(f"  ♻️  {label_name}: unchanged ({len(previous.get('resources', []))} resources)")
+            else:
+                to_fetch.append((label, fingerprint))
+
+        # Enumerate resources for all label values in parallel
+        value_resources = {}
+        value_errors = {}
+        value_ids = [
+            value.get("labelValueId")
+            for label, _ in to_fetch
+            for value in label.get("values", [])
+            if value.get("labelValueId")
+        ]
+        if value_ids:
+            size_pool(manager.session, max_workers)
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {
+                    executor.submit(manager.list_resources_by_label_value, value_id): value_id
+                    for value_id in value_ids
+                }
+                for future in as_completed(futures):
+                    value_id = futures[future]
+                    try:
+                        value_resources[value_id] = future.result()
+                    except Exception as e:
+                        value_errors[value_id] = e
 
-        print(f"✅ Exported {len(labels_data)} labels")
+        # Assemble per-label results, de-duplicating resources across values
+        for label, fingerprint in to_fetch:
+            label_name = label.get("name")
+            label_value_ids = [v.get("labelValueId") for v in label.get("values", []) if v.get("labelValueId")]
+
+            failed = [value_errors[v] for v in label_value_ids if v in value_errors]
+            if failed:
+                print(f"  ⚠️  Could not get resources for label '{label_name}': {failed[0]}")
+                continue
+
+            resources = {}
+            for value_id in label_value_ids:
+                for resource in value_resources.get(value_id, []):
+                    resources.setdefault(_resource_sort_key(resource), resource)
+
+            labels_data.append({
+                "labelId": label.get("labelId"),
+                "name": label_name,
+                "description": label.get("description", ""),
+                "fingerprint": fingerprint,
+                "resources": [resources[key] for key in sorted(resources)],
+                "values": label.get("values", [])
+            })
+            print(f"  ✅ {label_name}: {len(resources)} resources")
+
+        labels_data.sort(key=lambda l: (l.get("name") or "", l.get("labelId") or ""))
+        if previous_labels:
+            print(f"✅ Exported {len(labels_data)} labels ({reused} unchanged, {len(labels_data) - reused} re-fetched)")
+        else:
+            print(f"✅ Exported {len(labels_data)} labels")
         return {"labels": labels_data, "status": "success"}
 
     except requests.exceptions.HTTPError as e:
@@ -626,6 +875,7 @@ def export_resource_owners_only(manager: OktaAPIManager, resource_orns: List[str
             except Exception as e:
                 print(f"  ⚠️  Could not get owners for {resource_orn}: {e}")
 
+        resource_owners_data.sort(key=lambda r: r["resource_orn"])
         print(f"✅ Exported owners for {len(resource_owners_data)} resources")
         return {"resource_owners": resource_owners_data, "status": "success"}
 
@@ -634,11 +884,20 @@ def export_resource_owners_only(manager: OktaAPIManager, resource_orns: List[str
         return {"resource_owners": [], "status": "error", "reason": str(e)}
 
 
+@span("export")
 def export_all_oig_resources(manager: OktaAPIManager, output_file: str,
                             export_labels: bool = True,
                             export_owners: bool = False,
-                            resource_orns: List[str] = None):
-    """Export OIG API-only resources (Labels and Resource Owners) to a JSON file"""
+                            resource_orns: List[str] = None,
+                            previous_export: Optional[str] = None,
+                            max_workers: int = 8):
+    """
+    Export OIG API-only resources (Labels and Resource Owners) to a JSON file.
+
+    The output is written with sorted keys and sorted lists so that successive
+    exports diff cleanly. If previous_export is given, unchanged labels are
+    carried forward from it (see export_labels_only).
+    """
     print("\n=== Exporting OIG API-Only Resources ===\n")
 
     export_data = {
@@ -650,21 +909,25 @@ def export_all_oig_resources(manager: OktaAPIManager, output_file: str,
 
     # Export labels (optional)
     if export_labels:
-        labels_result = export_labels_only(manager)
+        previous_labels = load_previous_export(previous_export) if previous_export else None
+        with span("labels"):
+            labels_result = export_labels_only(manager, previous_labels, max_workers=max_workers)
         export_data["labels"] = labels_result.get("labels", [])
         export_data["export_status"]["labels"] = labels_result.get("status")
         print()
 
     # Export resource owners (optional)
     if export_owners:
-        owners_result = export_resource_owners_only(manager, resource_orns)
+        with span("resource_owners"):
+            owners_result = export_resource_owners_only(manager, resource_orns)
         export_data["resource_owners"] = owners_result.get("resource_owners", [])
         export_data["export_status"]["resource_owners"] = owners_result.get("status")
         print()
 
     # Write to file
     with open(output_file, 'w') as f:
-        json.dump(export_data, f, indent=2)
+        json.dump(export_data, f, indent=2, sort_keys=True)
+        f.write("\n")
 
     # Summary
     print(f"\n{'='*50}")
@@ -732,8 +995,20 @@ def main():
         nargs='+',
         help="List of resource ORNs to export owners for"
     )
+    parser.add_argument(
+        "--previous-export",
+        help="Previous export file for incremental export (only changed labels are re-fetched)"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent API requests (default: 8)"
+    )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     # Get credentials
     if args.config:
@@ -762,7 +1037,7 @@ def main():
         if not args.config:
             print("Error: --config required for destroy action")
             sys.exit(1)
-        destroy_configuration(manager, config)
+        destroy_configuration(manager, config, max_workers=args.max_workers)
     elif args.action == "export":
         output_file = args.output or f"oig_export_{manager.org_name}_{int(time.time())}.json"
         export_all_oig_resources(
@@ -770,7 +1045,9 @@ def main():
             output_file,
             export_labels=args.export_labels,
             export_owners=args.export_owners,
-            resource_orns=args.resource_orns
+            resource_orns=args.resource_orns,
+            previous_export=args.previous_export,
+            max_workers=args.max_workers
         )
     elif args.action == "query":
         # Query current state
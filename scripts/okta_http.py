@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+okta_http.py
+
+Shared HTTP layer for the Okta scripts: pooled keep-alive connections,
+optional HTTP/2, compressed transfer, fast JSON decoding and lean list pages.
+
+- Every session keeps its connections to the org open between requests and
+  holds up to OKTA_HTTP_POOL_SIZE of them per host (default 10), so only the
+  first request to the org pays for the TCP and TLS handshakes. Scripts that
+  call the API from a thread pool grow the pool to their worker count with
+  size_pool(), so no worker has to open (and then discard) a connection of
+  its own.
+- With OKTA_HTTP2=1 and `httpx[http2]` installed, requests are sent over
+  HTTP/2 instead, multiplexing every worker's requests over one connection.
+  Sessions and responses are still requests objects, so callers (and their
+  error handling) do not change.
+- Sessions advertise every content encoding the installed urllib3 can decode
+  (gzip and deflate always, br with `brotli`, zstd with `zstandard`), so
+  large list responses travel compressed and are decompressed transparently.
+- JSON is decoded with orjson when it is installed and with the standard
+  library otherwise. Both raise json.JSONDecodeError (a ValueError) on bad
+  input, like response.json().
+- List pages can be decoded into lean dicts that keep only the fields the
+  caller uses (see lean()), so a 100k-item crawl does not keep every
+  attribute, link and embedded object of every item in memory.
+
+Usage:
+    python3 scripts/okta_http.py          # show the connection settings, encodings and JSON backend
+"""
+
+import importlib.util
+import json
+import os
+import ssl
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+from urllib3.util import make_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import instrument_session
+
+
+# "gzip,deflate" plus "br" / "zstd" when their decoders are installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+# Connections kept open per host (requests' own default is 10)
+POOL_SIZE = int(os.getenv("OKTA_HTTP_POOL_SIZE", DEFAULT_POOLSIZE))
+
+# httpx only negotiates HTTP/2 when the h2 package (httpx[http2]) is installed
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec("h2") is not None
+HTTP2 = os.getenv("OKTA_HTTP2", "").lower() in ("1", "true", "yes")
+
+# HTTP/1.1 connection headers that HTTP/2 forbids (requests sends Connection: keep-alive)
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+# Fields is a field spec compiled by compile_fields()
+Fields = Dict[str, Optional[dict]]
+
+
+def loads(data):
+    """Decode JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encode JSON as compact UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(response: requests.Response):
+    """Decoded JSON body of a response (None for an empty body)"""
+    content = response.content
+    if not content:
+        return None
+    return loads(content)
+
+
+def configure_session(session: requests.Session) -> requests.Session:
+    """Ask for compressed responses on every request made through a session"""
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def create_session(headers: Optional[Dict[str, str]] = None, pool_size: int = POOL_SIZE,
+                   http2: Optional[bool] = None) -> requests.Session:
+    """
+    Instrumented session with pooled keep-alive connections, compression
+    negotiation and default headers.
+
+    http2 defaults to OKTA_HTTP2; it is ignored (with the HTTP/1.1 pool used
+    instead) when httpx[http2] is not installed.
+    """
+    session = configure_session(instrument_session(requests.Session()))
+    mount_pool(session, pool_size, HTTP2 if http2 is None else http2)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# ==================== Connection pools ====================
+
+def _caused_by(error: BaseException, error_type: type) -> bool:
+    """Whether an error or anything in its exception chain is of error_type"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, error_type):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends a session's requests through an httpx
+    HTTP/2 client.
+
+    All requests to a host share one multiplexed connection, so concurrent
+    workers do not each need a connection (and handshake) of their own.
+    Responses are converted to requests.Response, and httpx transport errors
+    to the matching requests exceptions.
+
+    requests passes TLS verification, client certificates and proxies with
+    every request, while httpx fixes them per client, so one client is kept
+    for each combination in use (normally just one). Responses are always
+    read in full; stream=True is not supported.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        super().__init__()
+        self.pool_size = pool_size
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+    @staticmethod
+    def _ssl_context(verify, cert) -> ssl.SSLContext:
+        """SSL context matching requests' verify and cert arguments"""
+        if verify is False:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif isinstance(verify, str) and os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(
+                cafile=verify if isinstance(verify, str) else DEFAULT_CA_BUNDLE_PATH
+            )
+
+        if cert:
+            if isinstance(cert, str):
+                context.load_cert_chain(cert)
+            else:
+                context.load_cert_chain(*cert)
+        return context
+
+    def _client(self, verify, cert, proxy):
+        key = (verify, tuple(cert) if isinstance(cert, list) else cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                # requests has already applied the environment (CA bundle and
+                # proxy variables) to verify and proxies
+                client = httpx.Client(
+                    http2=True,
+                    verify=self._ssl_context(verify, cert),
+                    proxy=proxy,
+                    trust_env=False,
+                    limits=httpx.Limits(max_connections=self.pool_size,
+                                        max_keepalive_connections=self.pool_size)
+                )
+                self._clients[key] = client
+        return client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if stream:
+            raise NotImplementedError("HTTP2Adapter reads whole responses; stream=True needs the HTTP/1.1 pool")
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        headers = {name: value for name, value in request.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS}
+        try:
+            client = self._client(verify, cert, select_proxy(request.url, proxies or {}))
+            result = client.request(request.method, request.url, headers=headers,
+                                    content=request.body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            if _caused_by(e, ssl.SSLError):
+                raise requests.exceptions.SSLError(e, request=request)
+            raise requests.exceptions.ConnectionError(e, request=request)
+        except OSError as e:
+            # Unreadable CA bundle or client certificate
+            raise requests.exceptions.SSLError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.reason = result.reason_phrase
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        # Already read and decompressed by httpx; marking the body consumed
+        # lets iter_content() and close() work without a raw stream
+        response._content = result.content
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        with self._clients_lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def mount_pool(session: requests.Session, pool_size: int = POOL_SIZE, http2: bool = False) -> requests.Session:
+    """
+    Mount a keep-alive connection pool of pool_size connections per host on
+    a session (HTTP/2 when requested and available).
+
+    Adapters mounted for a specific URL prefix (such as the simulator) are
+    left alone; they take precedence over the pool for their URLs.
+    """
+    pool_size = max(1, pool_size)
+    for prefix in ("https://", "http://"):
+        old = session.adapters.get(prefix)
+        if http2 and HTTP2_AVAILABLE:
+            adapter = HTTP2Adapter(pool_size)
+        else:
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+        session.mount(prefix, adapter)
+        if old is not None:
+            old.close()
+    return session
+
+
+def session_pool_size(session: requests.Session) -> int:
+    """Connections per host the session keeps open"""
+    adapter = session.get_adapter("https://")
+    if isinstance(adapter, HTTP2Adapter):
+        return adapter.pool_size
+    return getattr(adapter, "_pool_maxsize", DEFAULT_POOLSIZE)
+
+
+def size_pool(session: requests.Session, workers: int) -> requests.Session:
+    """
+    Grow the session's connection pool to at least `workers` connections per
+    host, before handing the session to that many threads.
+
+    urllib3 discards connections returned to a full pool, so a pool smaller
+    than the worker count makes the surplus workers reconnect (new TCP and
+    TLS handshakes) on every request.
+    """
+    adapter = session.get_adapter("https://")
+    if isinstance(adapter, (HTTPAdapter, HTTP2Adapter)) and session_pool_size(session) < workers:
+        mount_pool(session, workers, isinstance(adapter, HTTP2Adapter))
+    return session
+
+
+# ==================== Lean records ====================
+
+def compile_fields(fields: Iterable[str]) -> Fields:
+    """
+    Compile dotted field paths into a tree for lean().
+
+    compile_fields(["id", "profile.name", "labels.labelValueId"]) keeps
+    record["id"], record["profile"]["name"] and the labelValueId of every
+    item of record["labels"].
+    """
+    tree: Fields = {}
+    for path in fields:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                # The whole subtree is already kept
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def lean(record, fields: Fields):
+    """Copy of a decoded record with only the compiled fields (missing fields are left out)"""
+    if isinstance(record, list):
+        return [lean(item, fields) for item in record]
+    if not isinstance(record, dict):
+        return record
+
+    result = {}
+    for key, subtree in fields.items():
+        if key in record:
+            value = record[key]
+            result[key] = value if subtree is None else lean(value, subtree)
+    return result
+
+
+def decode_page(response: requests.Response, fields: Optional[Fields] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of a list response and the URL of the next page.
+
+    Handles governance responses ({"data": [...], "_links": {"next": ...}})
+    and management API responses (JSON array with a Link: rel="next" header).
+    """
+    body = decode_json(response)
+
+    if isinstance(body, list):
+        items = body
+        next_url = response.links.get("next", {}).get("url")
+    elif isinstance(body, dict):
+        items = body.get("data", [])
+        next_url = body.get("_links", {}).get("next", {}).get("href") if items else None
+    else:
+        items, next_url = [], None
+
+    if fields is not None:
+        items = [lean(item, fields) for item in items]
+    return items, next_url
+
+
+def iter_pages(session: requests.Session, url: str, params: Optional[Dict] = None,
+               fields: Optional[Fields] = None) -> Iterator[List[Dict]]:
+    """Yield each decoded page of a list endpoint, following pagination"""
+    while url:
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        items, url = decode_page(response, fields)
+        yield items
+
+        # The next link already carries the query string
+        params = None
+
+
+def main():
+    print("="*80)
+    print("OKTA HTTP CLIENT")
+    print("="*80)
+    print(f"Protocol: {'HTTP/2' if HTTP2 and HTTP2_AVAILABLE else 'HTTP/1.1'} (keep-alive)")
+    print(f"Pool size: {POOL_SIZE} connections per host")
+    print(f"Accept-Encoding: {ACCEPT_ENCODING}")
+    print(f"JSON backend: {JSON_BACKEND}")
+
+    if HTTP2 and not HTTP2_AVAILABLE:
+        print("\n⚠️  OKTA_HTTP2 is set but httpx[http2] is not installed; using HTTP/1.1")
+
+    missing = []
+    if "br" not in ACCEPT_ENCODING:
+        missing.append("brotli (br)")
+    if "zstd" not in ACCEPT_ENCODING:
+        missing.append("zstandard (zstd)")
+    if orjson is None:
+        missing.append("orjson (faster JSON decoding)")
+    if not HTTP2_AVAILABLE:
+        missing.append("httpx[http2] (HTTP/2)")
+    if missing:
+        print(f"\nℹ️  Optional packages not installed: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
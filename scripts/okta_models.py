@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+okta_models.py
+
+Compact in-memory records for the Okta resources the scripts keep in bulk:
+apps, groups, entitlement bundles, labels and resource-label assignments.
+
+API objects carry every attribute Okta returns (`_links`, `_embedded`,
+settings, credentials, metadata...), while a sync only reads a handful of
+them. Records are parsed once from an API page and keep just those fields in
+`__slots__`, with ORNs and IDs interned so the same string is stored once no
+matter how many assignments reference it. ID fallbacks such as
+`id` / `bundleId` are resolved while parsing, not on every access.
+
+    bundles = Bundle.from_page(page)                   # parse a decoded list page
+    bundles[0].id, bundles[0].orn, bundles[0].entitlements
+    bundles[0].get("bundleType")                       # dict-style access by API field name
+
+Records can keep the original object (`keep_raw=True`) for exports; it is
+stored as compact JSON bytes and only decoded when `.raw` is read.
+
+Usage:
+    python3 scripts/okta_models.py --sizes 1000,10000   # compare record and dict memory
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_http import dumps, loads
+
+
+def intern_orn(orn: Optional[str]) -> Optional[str]:
+    """Shared copy of an ORN (or ID) string; the same ORN appears in many records"""
+    return sys.intern(orn) if orn else orn
+
+
+class Record:
+    """
+    Base class for the slotted records.
+
+    Subclasses list their attributes in `__slots__` and map API field names
+    to attributes in `API_FIELDS`, which drives get() and to_dict().
+    `FIELDS` are the dotted API paths a record reads, for lean page decoding
+    (see okta_http.compile_fields).
+    """
+
+    __slots__ = ("_raw",)
+
+    API_FIELDS: Dict[str, str] = {}
+    FIELDS: List[str] = []
+
+    def _keep(self, raw: Optional[Dict]):
+        """Store the original object as compact JSON bytes"""
+        self._raw = dumps(raw) if raw is not None else None
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False):
+        raise NotImplementedError
+
+    @classmethod
+    def from_page(cls, items: Iterable[Dict], keep_raw: bool = False) -> List:
+        """Records for every item of a decoded list page"""
+        return [cls.from_api(item, keep_raw) for item in items]
+
+    @classmethod
+    def coerce(cls, item, keep_raw: bool = False):
+        """Record for an API dict; records are returned unchanged"""
+        return item if isinstance(item, cls) else cls.from_api(item, keep_raw)
+
+    @property
+    def raw(self) -> Optional[Dict]:
+        """The original API object (None unless parsed with keep_raw=True)"""
+        return loads(self._raw) if self._raw is not None else None
+
+    def get(self, key: str, default=None):
+        """Field by API name, like dict.get() on the original object"""
+        attr = self.API_FIELDS.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict:
+        """Flat dict of the kept fields, keyed by API field name"""
+        return {key: getattr(self, attr) for key, attr in self.API_FIELDS.items()}
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, attr) for attr in self.API_FIELDS.values())
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in self.API_FIELDS.values())
+        return f"{type(self).__name__}({fields})"
+
+
+class App(Record):
+    """Application from /api/v1/apps"""
+
+    __slots__ = ("id", "name", "label", "sign_on_mode")
+
+    API_FIELDS = {"id": "id", "name": "name", "label": "label", "signOnMode": "sign_on_mode"}
+    FIELDS = ["id", "name", "label", "signOnMode"]
+
+    def __init__(self, id: str, name: str = "", label: str = "", sign_on_mode: str = "",
+                 raw: Optional[Dict] = None):
+        self.id = intern_orn(id)
+        self.name = name
+        self.label = label
+        self.sign_on_mode = sign_on_mode
+        self._keep(raw)
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "App":
+        return cls(
+            data.get("id"),
+            data.get("name", ""),
+            data.get("label", ""),
+            data.get("signOnMode", ""),
+            raw=data if keep_raw else None
+        )
+
+    @property
+    def display_name(self) -> str:
+        return self.label or self.name or "Unknown"
+
+
+class Group(Record):
+    """Group from /api/v1/groups"""
+
+    __slots__ = ("id", "name", "type")
+
+    API_FIELDS = {"id": "id", "name": "name", "type": "type"}
+    FIELDS = ["id", "profile.name", "type"]
+
+    def __init__(self, id: str, name: str = "", type: str = "", raw: Optional[Dict] = None):
+        self.id = intern_orn(id)
+        self.name = name
+        self.type = type
+        self._keep(raw)
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "Group":
+        return cls(
+            data.get("id"),
+            (data.get("profile") or {}).get("name", ""),
+            data.get("type", ""),
+            raw=data if keep_raw else None
+        )
+
+
+class Bundle(Record):
+    """
+    Entitlement bundle from /governance/api/v1/entitlement-bundles.
+
+    `entitlements` is a tuple of (entitlement ID, tuple of value IDs), filled
+    when the bundle was listed with include=full_entitlements.
+    """
+
+    __slots__ = ("id", "name", "description", "orn", "bundle_type", "status",
+                 "target_id", "target_type", "target_name", "entitlements")
+
+    API_FIELDS = {
+        "id": "id", "name": "name", "description": "description", "orn": "orn",
+        "bundleType": "bundle_type", "status": "status", "entitlements": "entitlements"
+    }
+    FIELDS = ["id", "bundleId", "name", "description", "orn", "bundleType", "status",
+              "target", "entitlements.id", "entitlements.externalId",
+              "entitlements.values.id", "entitlements.values.externalId"]
+
+    def __init__(self, id: str, name: str = "", description: str = "", orn: str = "",
+                 bundle_type: str = "MANUAL", status: str = "ACTIVE", target_id: str = "",
+                 target_type: str = "", target_name: str = "",
+                 entitlements: Tuple[Tuple[str, Tuple[str, ...]], ...] = (),
+                 raw: Optional[Dict] = None):
+        self.id = intern_orn(id)
+        self.name = name
+        self.description = description
+        self.orn = intern_orn(orn)
+        self.bundle_type = bundle_type
+        self.status = status
+        self.target_id = intern_orn(target_id)
+        self.target_type = target_type
+        self.target_name = target_name
+        self.entitlements = entitlements
+        self._keep(raw)
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "Bundle":
+        target = data.get("target") or {}
+        entitlements = []
+        for entitlement in data.get("entitlements") or []:
+            entitlement_id = entitlement.get("id") or entitlement.get("externalId")
+            if not entitlement_id:
+                continue
+            value_ids = tuple(
+                intern_orn(value.get("id") or value.get("externalId"))
+                for value in entitlement.get("values") or []
+                if value.get("id") or value.get("externalId")
+            )
+            entitlements.append((intern_orn(entitlement_id), value_ids))
+
+        return cls(
+            data.get("id") or data.get("bundleId"),
+            data.get("name", ""),
+            data.get("description", ""),
+            data.get("orn", ""),
+            data.get("bundleType", "MANUAL"),
+            data.get("status", "ACTIVE"),
+            target.get("externalId", ""),
+            target.get("type", ""),
+            target.get("name", ""),
+            tuple(entitlements),
+            raw=data if keep_raw else None
+        )
+
+
+class LabelValue(Record):
+    """One value of a governance label"""
+
+    __slots__ = ("id", "name", "description", "background_color")
+
+    API_FIELDS = {"labelValueId": "id", "name": "name", "description": "description",
+                  "backgroundColor": "background_color"}
+
+    def __init__(self, id: str, name: str, description: Optional[str] = None,
+                 background_color: Optional[str] = None):
+        self.id = intern_orn(id)
+        self.name = name
+        self.description = description
+        self.background_color = background_color
+        self._raw = None
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "LabelValue":
+        metadata = data.get("metadata") or {}
+        return cls(
+            data.get("labelValueId"),
+            data.get("name"),
+            data.get("description"),
+            (metadata.get("additionalProperties") or {}).get("backgroundColor")
+        )
+
+
+class Label(Record):
+    """Governance label from /governance/api/v1/labels, with its values"""
+
+    __slots__ = ("id", "name", "description", "values")
+
+    API_FIELDS = {"labelId": "id", "name": "name", "description": "description", "values": "values"}
+
+    def __init__(self, id: str, name: str, description: Optional[str] = None,
+                 values: Tuple[LabelValue, ...] = (), raw: Optional[Dict] = None):
+        self.id = intern_orn(id)
+        self.name = name
+        self.description = description
+        self.values = values
+        self._keep(raw)
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "Label":
+        return cls(
+            data.get("labelId"),
+            data.get("name"),
+            data.get("description"),
+            tuple(LabelValue.from_api(value) for value in data.get("values") or []),
+            raw=data if keep_raw else None
+        )
+
+    @property
+    def is_single_value(self) -> bool:
+        """Single-value labels (Privileged, Crown Jewel) have one value named like the label"""
+        return len(self.values) == 1 and self.values[0].name == self.name
+
+    def value(self, name: str) -> Optional[LabelValue]:
+        for value in self.values:
+            if value.name == name:
+                return value
+        return None
+
+
+class ResourceLabels(Record):
+    """Label values assigned to one resource, from /governance/api/v1/resource-labels"""
+
+    __slots__ = ("orn", "name", "label_value_ids")
+
+    API_FIELDS = {"orn": "orn", "name": "name", "labelValueIds": "label_value_ids"}
+    FIELDS = ["resource.orn", "resource.name", "labels.labelValueId"]
+
+    def __init__(self, orn: str, name: Optional[str] = None, label_value_ids: Tuple[str, ...] = (),
+                 raw: Optional[Dict] = None):
+        self.orn = intern_orn(orn)
+        self.name = name
+        self.label_value_ids = label_value_ids
+        self._keep(raw)
+
+    @classmethod
+    def from_api(cls, data: Dict, keep_raw: bool = False) -> "ResourceLabels":
+        resource = data.get("resource") or {}
+        return cls(
+            resource.get("orn", ""),
+            resource.get("name"),
+            tuple(intern_orn(label.get("labelValueId")) for label in data.get("labels") or []),
+            raw=data if keep_raw else None
+        )
+
+
+# ==================== Memory comparison ====================
+
+def _synthetic_bundles(count: int) -> List[Dict]:
+    """Bundle objects shaped like an include=full_entitlements list page"""
+    bundles = []
+    for i in range(count):
+        app_id = f"0oa{i % 50:017d}"
+        bundles.append({
+            "id": f"enb{i:017d}",
+            "name": f"Bundle {i}",
+            "description": f"Access bundle number {i}",
+            "orn": f"orn:okta:governance:00o1234567890:entitlement-bundles:enb{i:017d}",
+            "bundleType": "MANUAL",
+            "status": "ACTIVE",
+            "target": {"externalId": app_id, "type": "APPLICATION", "name": f"App {i % 50}"},
+            "entitlements": [
+                {"id": f"esp{i % 50:04d}{e:013d}",
+                 "values": [{"id": f"ent{i % 50:04d}{e:04d}{v:09d}"} for v in range(3)]}
+                for e in range(2)
+            ],
+            "created": "2024-01-01T00:00:00.000Z",
+            "createdBy": "00u1234567890",
+            "lastUpdated": "2024-01-01T00:00:00.000Z",
+            "lastUpdatedBy": "00u1234567890",
+            "_links": {"self": {"href": f"https://example.okta.com/governance/api/v1/entitlement-bundles/enb{i:017d}"}}
+        })
+    return bundles
+
+
+def _synthetic_resource_labels(count: int) -> List[Dict]:
+    return [
+        {
+            "resource": {
+                "orn": f"orn:okta:directory:00o1234567890:groups:00g{i:017d}",
+                "name": f"Group {i}",
+                "type": "group",
+                "_links": {"self": {"href": f"https://example.okta.com/api/v1/groups/00g{i:017d}"}}
+            },
+            "labels": [
+                {"labelId": "lbc11111111111111111", "labelValueId": f"lbl1111111111111111{i % 3}",
+                 "name": "Compliance", "valueName": ["SOX", "GDPR", "PII"][i % 3]}
+            ]
+        }
+        for i in range(count)
+    ]
+
+
+def _measure(build) -> int:
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the memory held by raw API dicts and compact records"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated item counts (default: 1000,10000)"
+    )
+    args = parser.parse_args()
+
+    print("="*80)
+    print("RECORD MEMORY COMPARISON")
+    print("="*80)
+    print(f"  {'objects':<28} {'count':>8} {'dicts':>12} {'records':>12} {'saved':>8}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        for label, generate, model in [
+            ("entitlement bundles", _synthetic_bundles, Bundle),
+            ("resource-label assignments", _synthetic_resource_labels, ResourceLabels)
+        ]:
+            payload = dumps(generate(size))
+            as_dicts = _measure(lambda: loads(payload))
+            as_records = _measure(lambda: model.from_page(loads(payload)))
+            saved = 1 - as_records / as_dicts if as_dicts else 0
+            print(f"  {label:<28} {size:>8,} {as_dicts / 1e6:>10.1f}MB {as_records / 1e6:>10.1f}MB "
+                  f"{saved:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
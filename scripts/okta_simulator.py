@@ -0,0 +1,1367 @@
+#!/usr/bin/env python3
+"""
+okta_simulator.py
+
+Offline, in-process simulator of the Okta management and governance APIs used
+by these scripts, for load and performance testing without a real org.
+
+OktaSimulator is a requests transport adapter: mount it on a session (or let it
+intercept every new session) and requests to the simulated org are answered from
+an in-memory SyntheticOrg instead of the network. It reproduces the behaviour
+that matters for throughput work:
+
+- Pagination: management lists return JSON arrays with a Link rel="next" header,
+  governance lists return {"data": [...], "_links": {"next": {"href": ...}}}.
+  Both use `after` cursors, a default page size and a maximum `limit`.
+- Rate limits: every endpoint has its own per-window bucket and every response
+  carries X-Rate-Limit-Limit/Remaining/Reset. Exhausted buckets answer 429, and
+  a fraction of requests can be throttled at random (concurrent-limit 429s).
+- Latency: a fixed delay plus optional random jitter per request.
+- State: creates, assignments and deletes change the org, so apply/sync scripts
+  can run end to end.
+
+Simulated endpoints:
+  /api/v1: org, users, groups (+ members), apps (+ group assignments), zones,
+           iam/roles (+ role users), users/{id}/roles
+  /governance/api/v1: labels, resource-labels (+ assign/unassign),
+           resource-owners, entitlements, entitlement-bundles, risk-rules,
+           reviews, request-sequences, catalog/entries, request-settings
+
+Usage:
+  # Crawl a 100k-resource synthetic org through OktaAPIManager and report throughput
+  python3 scripts/okta_simulator.py --users 100000 --groups 5000 --apps 1000
+
+  # Add 20ms latency and a tight rate limit to see throttling behaviour
+  python3 scripts/okta_simulator.py --latency 0.02 --rate-limit 100 --rate-limit-window 5
+
+  # Run an unmodified script against the simulated org
+  python3 scripts/okta_simulator.py --users 5000 --run scripts/sync_label_mappings.py \\
+    --output /tmp/label_mappings.json
+
+  # In code
+  from scripts.okta_simulator import OktaSimulator, SyntheticOrg
+  simulator = OktaSimulator(SyntheticOrg.generate(users=100000), latency=0.02)
+  manager = simulator.manager()          # OktaAPIManager wired to the simulator
+  simulator.mount(syncer.session)        # or mount on any existing session
+  with simulator.installed():            # or intercept every new requests.Session
+      ...
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import runpy
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.client import responses
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.orn_resolver import normalize_app_name, okta_partition
+
+
+SIMULATED_ORG_NAME = "simulated"
+SIMULATED_BASE_URL = "okta.com"
+SIMULATED_API_TOKEN = "simulated-token"
+
+# (catalog name, label prefix, sign-on mode) for generated apps
+APP_CATALOG = [
+    ("salesforce", "Salesforce", "SAML_2_0"),
+    ("servicenow_ud", "ServiceNow", "SAML_2_0"),
+    ("slack", "Slack", "SAML_2_0"),
+    ("github_enterprise", "GitHub Enterprise", "SAML_2_0"),
+    ("workday", "Workday", "SAML_2_0"),
+    ("aws_account_federation", "AWS Account Federation", "SAML_2_0"),
+    ("zoomus", "Zoom", "SAML_2_0"),
+    ("box", "Box", "SAML_2_0"),
+    ("oidc_client", "Internal Portal", "OPENID_CONNECT"),
+    ("bookmark", "Wiki", "BOOKMARK"),
+]
+
+ENTITLEMENT_NAMES = ["Roles", "Permission Sets", "Licenses", "Profiles", "Groups", "Projects"]
+
+LABEL_COLORS = ["red", "orange", "yellow", "green", "blue", "purple"]
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Radia", "Linus"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Perlman", "Torvalds"]
+
+ROLES = [
+    {"id": "irosimsuperadmin00001", "type": "SUPER_ADMIN", "label": "Super Administrator"},
+    {"id": "irosimorgadmin0000001", "type": "ORG_ADMIN", "label": "Organization Administrator"},
+    {"id": "irosimappadmin0000001", "type": "APP_ADMIN", "label": "Application Administrator"},
+    {"id": "irosimreadonly0000001", "type": "READ_ONLY_ADMIN", "label": "Read-only Administrator"},
+]
+
+CREATED = "2024-01-01T00:00:00.000Z"
+
+FILTER_CLAUSE = re.compile(r'([\w.]+)\s+eq\s+"([^"]*)"', re.IGNORECASE)
+
+
+def okta_id(prefix: str, number: int) -> str:
+    """Deterministic 20-character Okta-style ID"""
+    return f"{prefix}{number:0{20 - len(prefix) - 3}x}1d7"
+
+
+def parse_filter(expression: Optional[str]) -> Dict[str, str]:
+    """Equality clauses of an Okta filter expression ('a eq "x" AND b eq "y"')"""
+    return dict(FILTER_CLAUSE.findall(expression or ""))
+
+
+def field_value(record: Dict, path: str):
+    """Value at a dotted attribute path (e.g. profile.login) or None"""
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class SimulatorError(Exception):
+    """An Okta-style error response raised by a route handler"""
+
+    ERROR_CODES = {400: "E0000001", 403: "E0000006", 404: "E0000007", 405: "E0000022", 409: "E0000001"}
+
+    def __init__(self, status: int, summary: str):
+        super().__init__(summary)
+        self.status = status
+        self.summary = summary
+
+    def body(self) -> Dict:
+        code = self.ERROR_CODES.get(self.status, "E0000009")
+        return {
+            "errorCode": code,
+            "errorSummary": self.summary,
+            "errorLink": code,
+            "errorId": f"oae{uuid.uuid4().hex[:19]}",
+            "errorCauses": []
+        }
+
+
+class Collection:
+    """Insertion-ordered records with O(1) lookup of an `after` cursor"""
+
+    def __init__(self):
+        self.items: Dict[str, Dict] = {}
+        self._ids: Optional[List[str]] = None
+        self._positions: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.items
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.items.get(key)
+
+    def values(self) -> Iterable[Dict]:
+        return self.items.values()
+
+    def add(self, key: str, record: Dict):
+        is_new = key not in self.items
+        self.items[key] = record
+        if is_new and self._ids is not None:
+            self._positions[key] = len(self._ids)
+            self._ids.append(key)
+
+    def remove(self, key: str) -> Optional[Dict]:
+        record = self.items.pop(key, None)
+        if record is not None:
+            self._ids = self._positions = None
+        return record
+
+    def ids(self) -> List[str]:
+        if self._ids is None:
+            self._ids = list(self.items)
+            self._positions = {key: position for position, key in enumerate(self._ids)}
+        return self._ids
+
+    def start_after(self, after: Optional[str]) -> int:
+        """List position following the `after` cursor (end of list for an unknown cursor)"""
+        ids = self.ids()
+        if not after:
+            return 0
+        position = self._positions.get(after)
+        return len(ids) if position is None else position + 1
+
+
+class SyntheticOrg:
+    """
+    In-memory state of a simulated org.
+
+    Build a populated org with SyntheticOrg.generate(); an org created directly is
+    empty apart from its admin roles. Records are stored in their API
+    representation, so list pages are served without per-request conversion.
+    """
+
+    def __init__(self, org_name: str = SIMULATED_ORG_NAME, base_url: str = SIMULATED_BASE_URL,
+                 org_id: str = "00osimulatedorg0001d7"):
+        self.org_name = org_name
+        self.base_url = base_url
+        self.url = f"https://{org_name}.{base_url}"
+        self.org_id = org_id
+        self.partition = okta_partition(self.url)
+
+        self.users = Collection()
+        self.groups = Collection()
+        self.apps = Collection()
+        self.zones = Collection()
+        self.labels = Collection()
+        self.entitlements = Collection()
+        self.bundles = Collection()
+        self.risk_rules = Collection()
+        self.resource_labels = Collection()   # resource ORN -> {"resource": ..., "labels": [...]}
+        self.resource_owners = Collection()   # resource ORN -> {"resource": ..., "principals": [...]}
+
+        self.group_members: Dict[str, Collection] = {}        # group ID -> user IDs
+        self.app_groups: Dict[str, Collection] = {}           # app ID -> group assignments
+        self.app_entitlements: Dict[str, Collection] = {}     # app ID -> entitlement IDs
+        self.label_value_resources: Dict[str, Collection] = {}  # labelValueId -> resource ORNs
+        self.label_values: Dict[str, Tuple[Dict, Dict]] = {}  # labelValueId -> (label, value)
+        self.role_users: Dict[str, Collection] = {role["id"]: Collection() for role in ROLES}
+
+        self._counters: Counter = Counter()
+
+    # ==================== IDs and ORNs ====================
+
+    def next_id(self, prefix: str) -> str:
+        self._counters[prefix] += 1
+        return okta_id(prefix, self._counters[prefix])
+
+    def app_orn(self, app: Dict) -> str:
+        return f"orn:{self.partition}:idp:{self.org_id}:apps:{normalize_app_name(app['name'])}:{app['id']}"
+
+    def group_orn(self, group_id: str) -> str:
+        return f"orn:{self.partition}:directory:{self.org_id}:groups:{group_id}"
+
+    def user_orn(self, user_id: str) -> str:
+        return f"orn:{self.partition}:directory:{self.org_id}:users:{user_id}"
+
+    def bundle_orn(self, bundle_id: str) -> str:
+        return f"orn:{self.partition}:governance:{self.org_id}:entitlement-bundles:{bundle_id}"
+
+    def entitlement_value_orn(self, value_id: str) -> str:
+        return f"orn:{self.partition}:governance:{self.org_id}:entitlement-values:{value_id}"
+
+    def describe_orn(self, orn: str) -> Optional[Dict]:
+        """The {"orn", "name", "type"} resource summary used in governance responses"""
+        parts = orn.split(":")
+        if len(parts) < 6:
+            return None
+        kind, resource_id = parts[4], parts[-1]
+        if kind == "apps":
+            record = self.apps.get(resource_id)
+            name = record and record["label"]
+        elif kind == "groups":
+            record = self.groups.get(resource_id)
+            name = record and record["profile"]["name"]
+        elif kind == "users":
+            record = self.users.get(resource_id)
+            name = record and record["profile"]["login"]
+        elif kind == "entitlement-bundles":
+            record = self.bundles.get(resource_id)
+            name = record and record["name"]
+        else:
+            return None
+        if record is None:
+            return None
+        return {"orn": orn, "name": name, "type": kind}
+
+    def describe_principal(self, orn: str) -> Optional[Dict]:
+        resource = self.describe_orn(orn)
+        if resource is None or resource["type"] not in ("users", "groups"):
+            return None
+        return {
+            "principalOrn": orn,
+            "principalType": "USER" if resource["type"] == "users" else "GROUP",
+            "principalName": resource["name"]
+        }
+
+    # ==================== Records ====================
+
+    def add_user(self, profile: Dict, status: str = "ACTIVE") -> Dict:
+        user_id = self.next_id("00u")
+        user = {
+            "id": user_id,
+            "status": status,
+            "created": CREATED,
+            "lastUpdated": CREATED,
+            "type": {"id": "otysimulateddefault1d7"},
+            "profile": profile
+        }
+        self.users.add(user_id, user)
+        return user
+
+    def add_group(self, profile: Dict) -> Dict:
+        group_id = self.next_id("00g")
+        group = {
+            "id": group_id,
+            "created": CREATED,
+            "lastUpdated": CREATED,
+            "objectClass": ["okta:user_group"],
+            "type": "OKTA_GROUP",
+            "profile": profile
+        }
+        self.groups.add(group_id, group)
+        self.group_members[group_id] = Collection()
+        return group
+
+    def add_app(self, name: str, label: str, sign_on_mode: str, status: str = "ACTIVE") -> Dict:
+        app_id = self.next_id("0oa")
+        app = {
+            "id": app_id,
+            "name": name,
+            "label": label,
+            "status": status,
+            "signOnMode": sign_on_mode,
+            "created": CREATED,
+            "lastUpdated": CREATED
+        }
+        self.apps.add(app_id, app)
+        self.app_groups[app_id] = Collection()
+        self.app_entitlements[app_id] = Collection()
+        return app
+
+    def add_zone(self, payload: Dict) -> Dict:
+        zone_id = self.next_id("nzo")
+        zone = dict(payload, id=zone_id, status="ACTIVE", created=CREATED, lastUpdated=CREATED)
+        self.zones.add(zone_id, zone)
+        return zone
+
+    def add_entitlement(self, app_id: str, name: str, value_names: List[str]) -> Dict:
+        entitlement_id = self.next_id("esp")
+        values = []
+        for value_name in value_names:
+            value_id = self.next_id("ent")
+            values.append({
+                "id": value_id,
+                "name": value_name,
+                "externalValue": json.dumps({"name": value_name}),
+                "externalId": hashlib.md5(value_id.encode()).hexdigest(),
+                "description": f"{value_name} access",
+                "orn": self.entitlement_value_orn(value_id)
+            })
+        entitlement = {
+            "id": entitlement_id,
+            "name": name,
+            "externalValue": normalize_app_name(name),
+            "description": name,
+            "multiValue": True,
+            "required": False,
+            "dataType": "array",
+            "parent": {"externalId": app_id, "type": "APPLICATION"},
+            "values": values
+        }
+        self.entitlements.add(entitlement_id, entitlement)
+        self.app_entitlements[app_id].add(entitlement_id, entitlement)
+        return entitlement
+
+    def add_bundle(self, name: str, app: Dict, entitlement: Dict) -> Dict:
+        bundle_id = self.next_id("enb")
+        bundle = {
+            "id": bundle_id,
+            "name": name,
+            "description": f"{name} access bundle",
+            "status": "ACTIVE",
+            "target": {"externalId": app["id"], "type": "APPLICATION"},
+            "targetResourceOrn": self.app_orn(app),
+            "entitlements": [{
+                "id": entitlement["id"],
+                "values": [{"id": value["id"]} for value in entitlement["values"][:2]]
+            }],
+            "orn": self.bundle_orn(bundle_id)
+        }
+        self.bundles.add(bundle_id, bundle)
+        return bundle
+
+    def add_label(self, name: str, description: str = "", values: Optional[List[Dict]] = None) -> Dict:
+        label_id = self.next_id("lbc")
+        label = {
+            "labelId": label_id,
+            "name": name,
+            "description": description or f"Governance label: {name}",
+            "values": []
+        }
+        for value in values or [{"name": name}]:
+            value_id = self.next_id("lbl")
+            label_value = {
+                "labelValueId": value_id,
+                "name": value.get("name", name),
+                "description": value.get("description", f"{value.get('name', name)} label value"),
+                "metadata": value.get("metadata", {})
+            }
+            label["values"].append(label_value)
+            self.label_values[value_id] = (label, label_value)
+            self.label_value_resources[value_id] = Collection()
+        self.labels.add(label_id, label)
+        return label
+
+    def remove_label(self, label_id: str) -> Optional[Dict]:
+        label = self.labels.remove(label_id)
+        if label is None:
+            return None
+        for value in label["values"]:
+            self.unassign_label_values([value["labelValueId"]], list(self.label_value_resources[value["labelValueId"]].ids()))
+            del self.label_value_resources[value["labelValueId"]]
+            del self.label_values[value["labelValueId"]]
+        return label
+
+    def assign_label_values(self, value_ids: List[str], orns: List[str]):
+        for value_id in value_ids:
+            if value_id not in self.label_values:
+                raise SimulatorError(400, f"Api validation failed: labelValueId {value_id} does not exist")
+        for orn in orns:
+            resource = self.describe_orn(orn)
+            if resource is None:
+                raise SimulatorError(400, f"Api validation failed: resource {orn} does not exist")
+            entry = self.resource_labels.get(orn)
+            if entry is None:
+                entry = {"resource": resource, "labels": []}
+                self.resource_labels.add(orn, entry)
+            assigned = {label["labelValueId"] for label in entry["labels"]}
+            for value_id in value_ids:
+                if value_id in assigned:
+                    continue
+                label, value = self.label_values[value_id]
+                entry["labels"].append({
+                    "labelId": label["labelId"],
+                    "labelName": label["name"],
+                    "labelValueId": value_id,
+                    "name": value["name"]
+                })
+                self.label_value_resources[value_id].add(orn, entry)
+
+    def unassign_label_values(self, value_ids: List[str], orns: List[str]):
+        removed = set(value_ids)
+        for orn in orns:
+            entry = self.resource_labels.get(orn)
+            if entry is None:
+                continue
+            entry["labels"] = [label for label in entry["labels"] if label["labelValueId"] not in removed]
+            for value_id in removed:
+                if value_id in self.label_value_resources:
+                    self.label_value_resources[value_id].remove(orn)
+            if not entry["labels"]:
+                self.resource_labels.remove(orn)
+
+    def assign_owners(self, principal_orns: List[str], orns: List[str]) -> List[Dict]:
+        principals = []
+        for principal_orn in principal_orns:
+            principal = self.describe_principal(principal_orn)
+            if principal is None:
+                raise SimulatorError(400, f"Api validation failed: principal {principal_orn} does not exist")
+            principals.append(principal)
+
+        entries = []
+        for orn in orns:
+            resource = self.describe_orn(orn)
+            if resource is None:
+                raise SimulatorError(400, f"Api validation failed: resource {orn} does not exist")
+            entry = self.resource_owners.get(orn)
+            if entry is None:
+                entry = {"resource": resource, "principals": []}
+                self.resource_owners.add(orn, entry)
+            # PUT replaces the owner list
+            entry["principals"] = [dict(principal) for principal in principals]
+            entries.append(entry)
+        return entries
+
+    def add_risk_rule(self, payload: Dict) -> Dict:
+        rule_id = self.next_id("rul")
+        rule = dict(payload, id=rule_id, status=payload.get("status", "ACTIVE"),
+                    created=CREATED, lastUpdated=CREATED)
+        self.risk_rules.add(rule_id, rule)
+        return rule
+
+    # ==================== Generation ====================
+
+    @classmethod
+    def generate(cls, users: int = 1000, groups: int = 100, apps: int = 50,
+                 entitlements_per_app: int = 3, values_per_entitlement: int = 10,
+                 bundles: int = 20, labels: int = 5, values_per_label: int = 3,
+                 labeled_fraction: float = 0.3, owned_fraction: float = 0.3,
+                 group_size: int = 20, groups_per_app: int = 3, risk_rules: int = 10,
+                 super_admins: int = 3, seed: int = 0, **org_kwargs) -> "SyntheticOrg":
+        """
+        Build a populated org. Generation is deterministic for a given seed.
+
+        Entitlement values count towards the size of the org, so
+        users=50000, apps=1000, entitlements_per_app=5, values_per_entitlement=10
+        is a 100k+ resource org.
+        """
+        rng = random.Random(seed)
+        org = cls(**org_kwargs)
+
+        for number in range(users):
+            first = FIRST_NAMES[number % len(FIRST_NAMES)]
+            last = LAST_NAMES[(number // len(FIRST_NAMES)) % len(LAST_NAMES)]
+            login = f"{first.lower()}.{last.lower()}{number}@example.com"
+            org.add_user({"firstName": first, "lastName": last, "login": login, "email": login,
+                          "department": ["Engineering", "Finance", "Sales", "IT"][number % 4]})
+
+        user_ids = org.users.ids()
+        for role in ROLES[:1]:
+            for user_id in user_ids[:super_admins]:
+                org.role_users[role["id"]].add(user_id, org.users.get(user_id))
+
+        for number in range(groups):
+            group = org.add_group({"name": f"Group {number:05d}", "description": f"Synthetic group {number}"})
+            if user_ids:
+                for user_id in rng.sample(user_ids, min(group_size, len(user_ids))):
+                    org.group_members[group["id"]].add(user_id, org.users.get(user_id))
+
+        group_ids = org.groups.ids()
+        for number in range(apps):
+            name, label, sign_on_mode = APP_CATALOG[number % len(APP_CATALOG)]
+            app = org.add_app(name, f"{label} {number:04d}", sign_on_mode)
+            for group_id in rng.sample(group_ids, min(groups_per_app, len(group_ids))):
+                org.app_groups[app["id"]].add(group_id, {"id": group_id, "priority": 0})
+            for index in range(entitlements_per_app):
+                entitlement_name = ENTITLEMENT_NAMES[index % len(ENTITLEMENT_NAMES)]
+                org.add_entitlement(app["id"], entitlement_name, [
+                    f"{normalize_app_name(entitlement_name)}_{value}" for value in range(values_per_entitlement)
+                ])
+
+        app_list = list(org.apps.values())
+        for number in range(bundles):
+            if not app_list:
+                break
+            app = app_list[number % len(app_list)]
+            entitlement_ids = org.app_entitlements[app["id"]].ids()
+            if entitlement_ids:
+                org.add_bundle(f"{app['label']} Bundle {number:04d}", app,
+                               org.entitlements.get(entitlement_ids[number % len(entitlement_ids)]))
+
+        for number in range(labels):
+            color = LABEL_COLORS[number % len(LABEL_COLORS)]
+            if values_per_label <= 1:
+                org.add_label(f"Label{number:03d}")
+            else:
+                org.add_label(f"Label{number:03d}", values=[
+                    {"name": f"Value{value}", "metadata": {"additionalProperties": {"backgroundColor": color}}}
+                    for value in range(values_per_label)
+                ])
+
+        resource_orns = (
+            [org.app_orn(app) for app in app_list]
+            + [org.group_orn(group_id) for group_id in group_ids]
+            + [org.bundle_orn(bundle_id) for bundle_id in org.bundles.ids()]
+        )
+        value_ids = list(org.label_values)
+        if value_ids:
+            for orn in resource_orns:
+                if rng.random() < labeled_fraction:
+                    org.assign_label_values([rng.choice(value_ids)], [orn])
+
+        if user_ids:
+            for orn in resource_orns:
+                if rng.random() < owned_fraction:
+                    owners = rng.sample(user_ids, min(2, len(user_ids)))
+                    org.assign_owners([org.user_orn(user_id) for user_id in owners], [orn])
+
+        for number in range(risk_rules):
+            if not app_list:
+                break
+            app = app_list[number % len(app_list)]
+            entitlement_ids = org.app_entitlements[app["id"]].ids()
+            if not entitlement_ids:
+                continue
+            # Later passes over the app list use the app's other entitlements
+            rounds = number // len(app_list)
+            entitlement = org.entitlements.get(entitlement_ids[rounds % len(entitlement_ids)])
+            values = entitlement["values"]
+            org.add_risk_rule({
+                "name": f"SoD Rule {number:04d}",
+                "description": f"Synthetic separation of duties rule for {app['label']}",
+                "type": "SEPARATION_OF_DUTIES",
+                "resources": [{"resourceOrn": org.app_orn(app)}],
+                "conflictCriteria": {"and": [
+                    {
+                        "name": f"List {side + 1}",
+                        "attribute": "principal.effective_grants",
+                        "operation": "CONTAINS_ONE" if (number + side) % 2 else "CONTAINS_ALL",
+                        "value": {"type": "ENTITLEMENTS", "value": [{
+                            "id": entitlement["id"],
+                            "name": entitlement["name"],
+                            "values": values[side::2][:2]
+                        }]}
+                    }
+                    for side in range(2)
+                ]}
+            })
+
+        return org
+
+    def resource_count(self) -> int:
+        """Total number of simulated resources, including entitlement values and assignments"""
+        return (
+            len(self.users) + len(self.groups) + len(self.apps) + len(self.zones)
+            + len(self.entitlements) + sum(len(ent["values"]) for ent in self.entitlements.values())
+            + len(self.bundles) + len(self.labels) + len(self.label_values) + len(self.risk_rules)
+            + len(self.resource_labels) + len(self.resource_owners)
+            + sum(len(members) for members in self.group_members.values())
+        )
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "users": len(self.users),
+            "groups": len(self.groups),
+            "apps": len(self.apps),
+            "entitlements": len(self.entitlements),
+            "entitlement_values": sum(len(ent["values"]) for ent in self.entitlements.values()),
+            "bundles": len(self.bundles),
+            "labels": len(self.labels),
+            "labeled_resources": len(self.resource_labels),
+            "owned_resources": len(self.resource_owners),
+            "risk_rules": len(self.risk_rules),
+            "group_memberships": sum(len(members) for members in self.group_members.values()),
+            "total": self.resource_count()
+        }
+
+
+class RateLimiter:
+    """Fixed-window request counters per endpoint bucket, reset at whole seconds like Okta"""
+
+    def __init__(self, limit: int = 600, window: float = 60.0, limits: Optional[Dict[str, int]] = None):
+        self.limit = limit
+        self.window = window
+        self.limits = limits or {}
+        self._buckets: Dict[str, List[float]] = {}   # bucket -> [reset_at, used]
+        self._lock = threading.Lock()
+
+    def hit(self, bucket: str, now: float) -> Tuple[bool, int, int, int]:
+        """Count a request; returns (allowed, limit, remaining, reset epoch seconds)"""
+        limit = self.limits.get(bucket, self.limit)
+        with self._lock:
+            state = self._buckets.get(bucket)
+            if state is None or now >= state[0]:
+                state = self._buckets[bucket] = [float(int(now + self.window + 0.999)), 0]
+            allowed = state[1] < limit
+            if allowed:
+                state[1] += 1
+            return allowed, limit, max(limit - state[1], 0), int(state[0])
+
+
+# (method, path template, handler name). The template doubles as the rate limit bucket.
+ROUTES = [
+    ("GET", "/api/v1/org", "get_org"),
+    ("GET", "/api/v1/users", "list_users"),
+    ("POST", "/api/v1/users", "create_user"),
+    ("GET", "/api/v1/users/{user_id}", "get_user"),
+    ("DELETE", "/api/v1/users/{user_id}", "delete_user"),
+    ("POST", "/api/v1/users/{user_id}/lifecycle/deactivate", "deactivate_user"),
+    ("GET", "/api/v1/users/{user_id}/roles", "list_user_roles"),
+    ("GET", "/api/v1/groups", "list_groups"),
+    ("POST", "/api/v1/groups", "create_group"),
+    ("GET", "/api/v1/groups/{group_id}", "get_group"),
+    ("DELETE", "/api/v1/groups/{group_id}", "delete_group"),
+    ("GET", "/api/v1/groups/{group_id}/users", "list_group_users"),
+    ("PUT", "/api/v1/groups/{group_id}/users/{user_id}", "add_group_user"),
+    ("DELETE", "/api/v1/groups/{group_id}/users/{user_id}", "remove_group_user"),
+    ("GET", "/api/v1/apps", "list_apps"),
+    ("POST", "/api/v1/apps", "create_app"),
+    ("GET", "/api/v1/apps/{app_id}", "get_app"),
+    ("DELETE", "/api/v1/apps/{app_id}", "delete_app"),
+    ("POST", "/api/v1/apps/{app_id}/lifecycle/deactivate", "deactivate_app"),
+    ("GET", "/api/v1/apps/{app_id}/groups", "list_app_groups"),
+    ("PUT", "/api/v1/apps/{app_id}/groups/{group_id}", "assign_app_group"),
+    ("DELETE", "/api/v1/apps/{app_id}/groups/{group_id}", "unassign_app_group"),
+    ("GET", "/api/v1/zones", "list_zones"),
+    ("POST", "/api/v1/zones", "create_zone"),
+    ("DELETE", "/api/v1/zones/{zone_id}", "delete_zone"),
+    ("POST", "/api/v1/zones/{zone_id}/lifecycle/deactivate", "deactivate_zone"),
+    ("GET", "/api/v1/iam/roles", "list_roles"),
+    ("GET", "/api/v1/iam/roles/{role_id}/users", "list_role_users"),
+    ("GET", "/governance/api/v1/labels", "list_labels"),
+    ("POST", "/governance/api/v1/labels", "create_label"),
+    ("GET", "/governance/api/v1/labels/{label_id}", "get_label"),
+    ("DELETE", "/governance/api/v1/labels/{label_id}", "delete_label"),
+    ("PUT", "/governance/api/v1/labels/{label_id}/resources", "put_label_resources"),
+    ("DELETE", "/governance/api/v1/labels/{label_id}/resources", "delete_label_resources"),
+    ("GET", "/governance/api/v1/resource-labels", "list_resource_labels"),
+    ("POST", "/governance/api/v1/resource-labels/assign", "assign_resource_labels"),
+    ("POST", "/governance/api/v1/resource-labels/unassign", "unassign_resource_labels"),
+    ("GET", "/governance/api/v1/resource-owners", "list_resource_owners"),
+    ("PUT", "/governance/api/v1/resource-owners", "put_resource_owners"),
+    ("PATCH", "/governance/api/v1/resource-owners", "patch_resource_owners"),
+    ("GET", "/governance/api/v1/entitlements", "list_entitlements"),
+    ("GET", "/governance/api/v1/entitlements/{entitlement_id}", "get_entitlement"),
+    ("GET", "/governance/api/v1/entitlement-bundles", "list_bundles"),
+    ("GET", "/governance/api/v1/entitlement-bundles/{bundle_id}", "get_bundle"),
+    ("GET", "/governance/api/v1/risk-rules", "list_risk_rules"),
+    ("POST", "/governance/api/v1/risk-rules", "create_risk_rule"),
+    ("GET", "/governance/api/v1/risk-rules/{rule_id}", "get_risk_rule"),
+    ("PUT", "/governance/api/v1/risk-rules/{rule_id}", "update_risk_rule"),
+    ("DELETE", "/governance/api/v1/risk-rules/{rule_id}", "delete_risk_rule"),
+    ("GET", "/governance/api/v1/reviews", "list_empty"),
+    ("GET", "/governance/api/v1/request-sequences", "list_empty"),
+    ("GET", "/governance/api/v1/catalog/entries", "list_empty"),
+    ("GET", "/governance/api/v1/request-settings", "get_request_settings"),
+]
+
+
+def _compile_template(template: str) -> re.Pattern:
+    return re.compile(re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template) + "/?")
+
+
+class OktaSimulator(BaseAdapter):
+    """
+    requests transport adapter that answers Okta API calls from a SyntheticOrg.
+
+    Args:
+        org: Simulated org state (SyntheticOrg.generate() for a populated org)
+        latency: Seconds added to every request
+        jitter: Extra random latency, uniform between 0 and this many seconds
+        rate_limit: Requests per window for each endpoint bucket (use a large
+            value to never throttle)
+        rate_limit_window: Rate limit window in seconds (Okta uses 60)
+        rate_limits: Per-bucket overrides, keyed by path template
+            (e.g. {"/api/v1/users": 50})
+        throttle_rate: Fraction of requests answered 429 regardless of the
+            bucket, like Okta's concurrent rate limit
+        management_page_size: Default page size of /api/v1 lists
+        governance_page_size: Default page size of governance lists
+        max_page_size: Largest `limit` honoured on any list
+        compress: gzip JSON responses for clients that send
+            Accept-Encoding: gzip, as Okta does
+        seed: Seed for jitter and random throttling
+    """
+
+    def __init__(self, org: Optional[SyntheticOrg] = None, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: int = 600, rate_limit_window: float = 60.0,
+                 rate_limits: Optional[Dict[str, int]] = None, throttle_rate: float = 0.0,
+                 management_page_size: int = 200, governance_page_size: int = 20,
+                 max_page_size: int = 200, compress: bool = False, seed: Optional[int] = None):
+        super().__init__()
+        self.org = org or SyntheticOrg()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limiter = RateLimiter(rate_limit, rate_limit_window, rate_limits)
+        self.throttle_rate = throttle_rate
+        self.management_page_size = management_page_size
+        self.governance_page_size = governance_page_size
+        self.max_page_size = max_page_size
+        self.compress = compress
+        self.routes = [(method, _compile_template(template), template, getattr(self, name))
+                       for method, template, name in ROUTES]
+
+        self.stats: Counter = Counter()   # requests, throttled, errors, "<METHOD> <template>"
+        self._random = random.Random(seed)
+        self._state_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+
+    # ==================== Wiring ====================
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route a session's requests for the simulated org to this adapter"""
+        session.mount(self.org.url, self)
+        return session
+
+    def manager(self, api_token: str = SIMULATED_API_TOKEN):
+        """OktaAPIManager for the simulated org, with an in-memory ORN table"""
+        from scripts.okta_api_manager import OktaAPIManager
+        from scripts.orn_resolver import OrnResolver
+
+        manager = OktaAPIManager(self.org.org_name, self.org.base_url, api_token)
+        self.mount(manager.session)
+        manager._orn_resolver = OrnResolver(manager)
+        return manager
+
+    @contextmanager
+    def installed(self):
+        """Mount this adapter on every requests.Session created inside the block"""
+        original_init = requests.Session.__init__
+        simulator = self
+
+        def init(session, *args, **kwargs):
+            original_init(session, *args, **kwargs)
+            simulator.mount(session)
+
+        requests.Session.__init__ = init
+        try:
+            yield self
+        finally:
+            requests.Session.__init__ = original_init
+
+    def close(self):
+        pass
+
+    # ==================== Transport ====================
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        split = urlsplit(request.url)
+        query = dict(parse_qsl(split.query, keep_blank_values=True))
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        handler, params, bucket = self._route(request.method, split.path)
+        now = time.time()
+        allowed, limit, remaining, reset = self.rate_limiter.hit(bucket, now)
+        headers = {
+            "X-Rate-Limit-Limit": str(limit),
+            "X-Rate-Limit-Remaining": str(remaining),
+            "X-Rate-Limit-Reset": str(reset),
+            "X-Okta-Request-Id": uuid.uuid4().hex[:20]
+        }
+
+        if not allowed or (self.throttle_rate and self._random.random() < self.throttle_rate):
+            if allowed:
+                # Concurrent-limit style 429: retry after the next second
+                headers["X-Rate-Limit-Reset"] = str(int(now) + 1)
+            self._count("throttled", f"{request.method} {bucket}")
+            error = SimulatorError(429, "API call exceeded rate limit due to too many requests.")
+            body = dict(error.body(), errorCode="E0000047", errorLink="E0000047")
+            return self._response(request, 429, body, headers)
+
+        try:
+            if handler is None:
+                raise params
+            payload = json.loads(request.body) if request.body else None
+            with self._state_lock:
+                status, body, next_query = handler(query, payload, **params)
+        except SimulatorError as e:
+            self._count("errors", f"{request.method} {bucket}")
+            return self._response(request, e.status, e.body(), headers)
+        except (ValueError, TypeError) as e:
+            self._count("errors", f"{request.method} {bucket}")
+            return self._response(request, 400, SimulatorError(400, f"Bad request: {e}").body(), headers)
+
+        if next_query is not None:
+            next_url = f"{self.org.url}{split.path}?{urlencode(next_query)}"
+            if isinstance(body, dict):
+                body["_links"]["next"] = {"href": next_url}
+            else:
+                headers["Link"] = f'<{request.url}>; rel="self", <{next_url}>; rel="next"'
+        self._count(None, f"{request.method} {bucket}")
+        return self._response(request, status, body, headers)
+
+    def _route(self, method: str, path: str):
+        """(handler, path params, bucket), or (None, SimulatorError, bucket) when unmatched"""
+        path_matched = None
+        for route_method, pattern, template, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return handler, match.groupdict(), template
+            path_matched = template
+        if path_matched:
+            return None, SimulatorError(405, "The endpoint does not support the provided HTTP method"), path_matched
+        return None, SimulatorError(404, f"Not found: Resource not found: {path} (URL)"), path
+
+    def _count(self, outcome: Optional[str], route: str):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats[route] += 1
+            if outcome:
+                self.stats[outcome] += 1
+
+    def _response(self, request, status: int, body, headers: Dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = responses.get(status, "")
+        response.headers = CaseInsensitiveDict(headers)
+        if body is not None:
+            content = json.dumps(body).encode("utf-8")
+            response.headers["Content-Type"] = "application/json"
+            if self.compress and "gzip" in request.headers.get("Accept-Encoding", ""):
+                # Served like a real connection: the body is decompressed by
+                # urllib3 when the client first reads response.content
+                content = gzip.compress(content, compresslevel=6)
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers["Content-Length"] = str(len(content))
+                response.raw = HTTPResponse(body=io.BytesIO(content), headers=dict(response.headers),
+                                            status=status, preload_content=False, decode_content=True)
+                response._content = False
+            else:
+                response._content = content
+        else:
+            response._content = b""
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    # ==================== Pagination ====================
+
+    def _page(self, collection: Collection, query: Dict, default_size: int,
+              predicate: Optional[Callable[[Dict], bool]] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """One page of a collection and the query for the next page (None on the last page)"""
+        limit = min(int(query.get("limit") or default_size), self.max_page_size)
+        if limit < 1:
+            raise SimulatorError(400, "Api validation failed: limit")
+        ids = collection.ids()
+        position = collection.start_after(query.get("after"))
+
+        if predicate is None:
+            page_ids = ids[position:position + limit]
+            page = [collection.items[key] for key in page_ids]
+            position += len(page_ids)
+        else:
+            page_ids, page = [], []
+            while position < len(ids) and len(page) < limit:
+                record = collection.items[ids[position]]
+                if predicate(record):
+                    page_ids.append(ids[position])
+                    page.append(record)
+                position += 1
+
+        if not page or position >= len(ids):
+            return page, None
+        return page, dict(query, after=page_ids[-1], limit=limit)
+
+    def _management_list(self, collection: Collection, query: Dict,
+                         predicate: Optional[Callable[[Dict], bool]] = None):
+        page, next_query = self._page(collection, query, self.management_page_size, predicate)
+        return 200, page, next_query
+
+    def _governance_list(self, collection: Collection, query: Dict,
+                         predicate: Optional[Callable[[Dict], bool]] = None):
+        page, next_query = self._page(collection, query, self.governance_page_size, predicate)
+        return 200, {"data": page, "_links": {"self": {"href": self.org.url}}}, next_query
+
+    @staticmethod
+    def _search_predicate(query: Dict, search_fields: List[str]) -> Optional[Callable[[Dict], bool]]:
+        """Predicate for the q (prefix) and filter/search (eq clauses) query parameters"""
+        prefix = (query.get("q") or "").lower()
+        clauses = parse_filter(query.get("filter") or query.get("search"))
+        if not prefix and not clauses:
+            return None
+
+        def matches(record: Dict) -> bool:
+            if prefix and not any(str(field_value(record, name) or "").lower().startswith(prefix)
+                                  for name in search_fields):
+                return False
+            return all(str(field_value(record, name)) == value for name, value in clauses.items())
+
+        return matches
+
+    def _require(self, collection: Collection, key: str, kind: str) -> Dict:
+        record = collection.get(key)
+        if record is None:
+            raise SimulatorError(404, f"Not found: Resource not found: {key} ({kind})")
+        return record
+
+    # ==================== Management API ====================
+
+    def get_org(self, query, payload):
+        return 200, {"id": self.org.org_id, "subdomain": self.org.org_name,
+                     "companyName": "Simulated Org", "status": "ACTIVE"}, None
+
+    def list_users(self, query, payload):
+        predicate = self._search_predicate(query, ["profile.login", "profile.email",
+                                                   "profile.firstName", "profile.lastName"])
+        return self._management_list(self.org.users, query, predicate)
+
+    def create_user(self, query, payload):
+        profile = (payload or {}).get("profile") or {}
+        login = profile.get("login")
+        if not login:
+            raise SimulatorError(400, "Api validation failed: login")
+        if any(user["profile"].get("login") == login for user in self.org.users.values()):
+            raise SimulatorError(400, "Api validation failed: login: An object with this field already exists")
+        status = "ACTIVE" if query.get("activate", "true") != "false" else "STAGED"
+        return 200, self.org.add_user(profile, status), None
+
+    def get_user(self, query, payload, user_id):
+        return 200, self._require(self.org.users, user_id, "User"), None
+
+    def deactivate_user(self, query, payload, user_id):
+        self._require(self.org.users, user_id, "User")["status"] = "DEPROVISIONED"
+        return 200, {}, None
+
+    def delete_user(self, query, payload, user_id):
+        user = self._require(self.org.users, user_id, "User")
+        # Like Okta, the first delete deactivates and the second deletes
+        if user["status"] != "DEPROVISIONED":
+            user["status"] = "DEPROVISIONED"
+            return 204, None, None
+        self.org.users.remove(user_id)
+        for members in self.org.group_members.values():
+            members.remove(user_id)
+        for users in self.org.role_users.values():
+            users.remove(user_id)
+        return 204, None, None
+
+    def list_user_roles(self, query, payload, user_id):
+        self._require(self.org.users, user_id, "User")
+        roles = [dict(role, assignmentType="USER", status="ACTIVE")
+                 for role in ROLES if user_id in self.org.role_users[role["id"]]]
+        return 200, roles, None
+
+    def list_groups(self, query, payload):
+        predicate = self._search_predicate(query, ["profile.name"])
+        return self._management_list(self.org.groups, query, predicate)
+
+    def create_group(self, query, payload):
+        profile = (payload or {}).get("profile") or {}
+        if not profile.get("name"):
+            raise SimulatorError(400, "Api validation failed: name")
+        return 200, self.org.add_group(profile), None
+
+    def get_group(self, query, payload, group_id):
+        return 200, self._require(self.org.groups, group_id, "Group"), None
+
+    def delete_group(self, query, payload, group_id):
+        self._require(self.org.groups, group_id, "Group")
+        self.org.groups.remove(group_id)
+        del self.org.group_members[group_id]
+        for assignments in self.org.app_groups.values():
+            assignments.remove(group_id)
+        return 204, None, None
+
+    def list_group_users(self, query, payload, group_id):
+        self._require(self.org.groups, group_id, "Group")
+        return self._management_list(self.org.group_members[group_id], query)
+
+    def add_group_user(self, query, payload, group_id, user_id):
+        self._require(self.org.groups, group_id, "Group")
+        user = self._require(self.org.users, user_id, "User")
+        self.org.group_members[group_id].add(user_id, user)
+        return 204, None, None
+
+    def remove_group_user(self, query, payload, group_id, user_id):
+        self._require(self.org.groups, group_id, "Group")
+        self.org.group_members[group_id].remove(user_id)
+        return 204, None, None
+
+    def list_apps(self, query, payload):
+        predicate = self._search_predicate(query, ["label", "name"])
+        return self._management_list(self.org.apps, query, predicate)
+
+    def create_app(self, query, payload):
+        payload = payload or {}
+        if not payload.get("label"):
+            raise SimulatorError(400, "Api validation failed: label")
+        app = self.org.add_app(payload.get("name", "oidc_client"), payload["label"],
+                               payload.get("signOnMode", "OPENID_CONNECT"))
+        return 200, app, None
+
+    def get_app(self, query, payload, app_id):
+        return 200, self._require(self.org.apps, app_id, "AppInstance"), None
+
+    def deactivate_app(self, query, payload, app_id):
+        self._require(self.org.apps, app_id, "AppInstance")["status"] = "INACTIVE"
+        return 200, {}, None
+
+    def delete_app(self, query, payload, app_id):
+        app = self._require(self.org.apps, app_id, "AppInstance")
+        if app["status"] == "ACTIVE":
+            raise SimulatorError(403, "Delete application forbidden.")
+        self.org.apps.remove(app_id)
+        del self.org.app_groups[app_id]
+        for entitlement_id in self.org.app_entitlements.pop(app_id).ids():
+            self.org.entitlements.remove(entitlement_id)
+        return 204, None, None
+
+    def list_app_groups(self, query, payload, app_id):
+        self._require(self.org.apps, app_id, "AppInstance")
+        return self._management_list(self.org.app_groups[app_id], query)
+
+    def assign_app_group(self, query, payload, app_id, group_id):
+        self._require(self.org.apps, app_id, "AppInstance")
+        self._require(self.org.groups, group_id, "Group")
+        assignment = dict(payload or {}, id=group_id, priority=(payload or {}).get("priority", 0))
+        self.org.app_groups[app_id].add(group_id, assignment)
+        return 200, assignment, None
+
+    def unassign_app_group(self, query, payload, app_id, group_id):
+        self._require(self.org.apps, app_id, "AppInstance")
+        self.org.app_groups[app_id].remove(group_id)
+        return 204, None, None
+
+    def list_zones(self, query, payload):
+        return self._management_list(self.org.zones, query, self._search_predicate(query, ["name"]))
+
+    def create_zone(self, query, payload):
+        if not (payload or {}).get("name"):
+            raise SimulatorError(400, "Api validation failed: name")
+        return 200, self.org.add_zone(payload), None
+
+    def deactivate_zone(self, query, payload, zone_id):
+        zone = self._require(self.org.zones, zone_id, "Zone")
+        zone["status"] = "INACTIVE"
+        return 200, zone, None
+
+    def delete_zone(self, query, payload, zone_id):
+        self._require(self.org.zones, zone_id, "Zone")
+        self.org.zones.remove(zone_id)
+        return 204, None, None
+
+    def list_roles(self, query, payload):
+        return 200, {"roles": ROLES, "_links": {}}, None
+
+    def list_role_users(self, query, payload, role_id):
+        if role_id not in self.org.role_users:
+            raise SimulatorError(404, f"Not found: Resource not found: {role_id} (Role)")
+        return self._management_list(self.org.role_users[role_id], query)
+
+    # ==================== Governance API ====================
+
+    def list_labels(self, query, payload):
+        return self._governance_list(self.org.labels, query)
+
+    def create_label(self, query, payload):
+        payload = payload or {}
+        name = payload.get("name")
+        if not name:
+            raise SimulatorError(400, "Api validation failed: name")
+        if any(label["name"] == name for label in self.org.labels.values()):
+            raise SimulatorError(409, f"A label with name {name} already exists")
+        return 200, self.org.add_label(name, payload.get("description", ""), payload.get("values")), None
+
+    def get_label(self, query, payload, label_id):
+        return 200, self._require(self.org.labels, label_id, "Label"), None
+
+    def delete_label(self, query, payload, label_id):
+        self._require(self.org.labels, label_id, "Label")
+        self.org.remove_label(label_id)
+        return 204, None, None
+
+    def put_label_resources(self, query, payload, label_id):
+        label = self._require(self.org.labels, label_id, "Label")
+        orns = (payload or {}).get("resourceOrns", [])
+        self.org.assign_label_values([label["values"][0]["labelValueId"]], orns)
+        return 200, {"labelId": label_id, "resourceOrns": orns}, None
+
+    def delete_label_resources(self, query, payload, label_id):
+        label = self._require(self.org.labels, label_id, "Label")
+        orns = (payload or {}).get("resourceOrns", [])
+        self.org.unassign_label_values([value["labelValueId"] for value in label["values"]], orns)
+        return 200, {"labelId": label_id, "resourceOrns": orns}, None
+
+    def list_resource_labels(self, query, payload):
+        clauses = parse_filter(query.get("filter"))
+        value_id = clauses.get("labelValueId")
+        if value_id is not None:
+            return self._governance_list(self.org.label_value_resources.get(value_id, Collection()), query)
+        return self._governance_list(self.org.resource_labels, query)
+
+    def assign_resource_labels(self, query, payload):
+        payload = payload or {}
+        value_ids = payload.get("labelValueIds", [])
+        orns = payload.get("resourceOrns", [])
+        if not value_ids or not orns:
+            raise SimulatorError(400, "Api validation failed: labelValueIds and resourceOrns are required")
+        self.org.assign_label_values(value_ids, orns)
+        return 200, {"labelValueIds": value_ids, "resourceOrns": orns}, None
+
+    def unassign_resource_labels(self, query, payload):
+        payload = payload or {}
+        value_ids = payload.get("labelValueIds", [])
+        orns = payload.get("resourceOrns", [])
+        self.org.unassign_label_values(value_ids, orns)
+        return 200, {"labelValueIds": value_ids, "resourceOrns": orns}, None
+
+    def list_resource_owners(self, query, payload):
+        parent_orn = parse_filter(query.get("filter")).get("parentResourceOrn")
+        if not parent_orn:
+            raise SimulatorError(400, "Api validation failed: filter parentResourceOrn is required")
+        owners = Collection()
+        entry = self.org.resource_owners.get(parent_orn)
+        if entry is not None:
+            owners.add(parent_orn, entry)
+        return self._governance_list(owners, query)
+
+    def put_resource_owners(self, query, payload):
+        payload = payload or {}
+        entries = self.org.assign_owners(payload.get("principalOrns", []), payload.get("resourceOrns", []))
+        return 200, {"data": entries}, None
+
+    def patch_resource_owners(self, query, payload):
+        payload = payload or {}
+        orn = payload.get("resourceOrn", "")
+        entry = self.org.resource_owners.get(orn)
+        if entry is None:
+            raise SimulatorError(404, f"Not found: Resource not found: {orn} (ResourceOwner)")
+        for operation in payload.get("data", []):
+            principal_orn = operation.get("value")
+            if operation.get("op") == "REMOVE":
+                entry["principals"] = [p for p in entry["principals"] if p["principalOrn"] != principal_orn]
+            elif operation.get("op") == "ADD":
+                principal = self.org.describe_principal(principal_orn)
+                if principal is None:
+                    raise SimulatorError(400, f"Api validation failed: principal {principal_orn} does not exist")
+                if all(p["principalOrn"] != principal_orn for p in entry["principals"]):
+                    entry["principals"].append(principal)
+            else:
+                raise SimulatorError(400, f"Api validation failed: op {operation.get('op')}")
+        if not entry["principals"]:
+            self.org.resource_owners.remove(orn)
+        return 200, entry, None
+
+    def list_entitlements(self, query, payload):
+        clauses = parse_filter(query.get("filter"))
+        app_id = clauses.get("parent.externalId")
+        if app_id is not None:
+            if clauses.get("parent.type", "APPLICATION") != "APPLICATION":
+                return self._governance_list(Collection(), query)
+            return self._governance_list(self.org.app_entitlements.get(app_id, Collection()), query)
+        return self._governance_list(self.org.entitlements, query)
+
+    def get_entitlement(self, query, payload, entitlement_id):
+        return 200, self._require(self.org.entitlements, entitlement_id, "Entitlement"), None
+
+    def list_bundles(self, query, payload):
+        return self._governance_list(self.org.bundles, query)
+
+    def get_bundle(self, query, payload, bundle_id):
+        return 200, self._require(self.org.bundles, bundle_id, "EntitlementBundle"), None
+
+    def list_risk_rules(self, query, payload):
+        return self._governance_list(self.org.risk_rules, query)
+
+    def create_risk_rule(self, query, payload):
+        if not (payload or {}).get("name"):
+            raise SimulatorError(400, "Api validation failed: name")
+        return 200, self.org.add_risk_rule(payload), None
+
+    def get_risk_rule(self, query, payload, rule_id):
+        return 200, self._require(self.org.risk_rules, rule_id, "RiskRule"), None
+
+    def update_risk_rule(self, query, payload, rule_id):
+        rule = self._require(self.org.risk_rules, rule_id, "RiskRule")
+        updated = dict(payload or {}, id=rule_id, created=rule["created"], lastUpdated=CREATED)
+        updated.setdefault("status", rule.get("status", "ACTIVE"))
+        self.org.risk_rules.add(rule_id, updated)
+        return 200, updated, None
+
+    def delete_risk_rule(self, query, payload, rule_id):
+        self._require(self.org.risk_rules, rule_id, "RiskRule")
+        self.org.risk_rules.remove(rule_id)
+        return 204, None, None
+
+    def list_empty(self, query, payload):
+        return self._governance_list(Collection(), query)
+
+    def get_request_settings(self, query, payload):
+        return 200, {"subprocessorsAcknowledged": True, "validAccessDurationSettings": {}}, None
+
+
+# ==================== Throughput demo ====================
+
+def crawl(manager, max_workers: int = 8) -> Dict[str, int]:
+    """Fetch every list the export and sync scripts read; returns item counts"""
+    base = manager.base_url
+    counts = {
+        "users": len(manager._paginate(f"{base}/api/v1/users", {"limit": 200})),
+        "groups": len(manager._paginate(f"{base}/api/v1/groups", {"limit": 200})),
+    }
+    apps = manager._paginate(f"{base}/api/v1/apps", {"limit": 200})
+    counts["apps"] = len(apps)
+    for name, path in [("labels", "labels"), ("resource_labels", "resource-labels"),
+                       ("bundles", "entitlement-bundles"), ("risk_rules", "risk-rules")]:
+        counts[name] = len(manager._paginate(f"{base}/governance/api/v1/{path}", {"limit": 200}))
+
+    def fetch_entitlements(app):
+        return manager._paginate(f"{base}/governance/api/v1/entitlements", {
+            "filter": f'parent.externalId eq "{app["id"]}" AND parent.type eq "APPLICATION"',
+            "limit": 200
+        })
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        entitlements = [ent for page in executor.map(fetch_entitlements, apps) for ent in page]
+    counts["entitlements"] = len(entitlements)
+    counts["entitlement_values"] = sum(len(ent.get("values", [])) for ent in entitlements)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline Okta API simulator: throughput demo or run a script against a synthetic org",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:")[1]
+    )
+    parser.add_argument("--users", type=int, default=10000, help="Number of users (default: 10000)")
+    parser.add_argument("--groups", type=int, default=1000, help="Number of groups (default: 1000)")
+    parser.add_argument("--apps", type=int, default=200, help="Number of apps (default: 200)")
+    parser.add_argument("--entitlements-per-app", type=int, default=3)
+    parser.add_argument("--values-per-entitlement", type=int, default=10)
+    parser.add_argument("--bundles", type=int, default=100)
+    parser.add_argument("--labels", type=int, default=10)
+    parser.add_argument("--risk-rules", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic org (default: 0)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--rate-limit", type=int, default=600, help="Requests per window per endpoint (default: 600)")
+    parser.add_argument("--rate-limit-window", type=float, default=60.0, help="Rate limit window in seconds (default: 60)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with a random 429")
+    parser.add_argument("--compress", action="store_true", help="gzip responses for clients that accept it")
+    parser.add_argument("--max-workers", type=int, default=8, help="Parallel entitlement fetches in the demo crawl")
+    parser.add_argument("--run", metavar="SCRIPT", help="Run a script against the simulated org; arguments after SCRIPT are passed to it")
+
+    # Everything after --run SCRIPT belongs to the script
+    argv = sys.argv[1:]
+    script_args = []
+    if "--run" in argv:
+        split_at = argv.index("--run") + 2
+        argv, script_args = argv[:split_at], argv[split_at:]
+    args = parser.parse_args(argv)
+
+    print("🏗️  Generating synthetic org...")
+    start = time.time()
+    org = SyntheticOrg.generate(
+        users=args.users, groups=args.groups, apps=args.apps,
+        entitlements_per_app=args.entitlements_per_app, values_per_entitlement=args.values_per_entitlement,
+        bundles=args.bundles, labels=args.labels, risk_rules=args.risk_rules, seed=args.seed
+    )
+    print(f"  ✅ {org.resource_count():,} resources in {time.time() - start:.1f}s")
+    for name, count in org.summary().items():
+        print(f"     {name}: {count:,}")
+
+    simulator = OktaSimulator(
+        org, latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window, throttle_rate=args.throttle_rate,
+        compress=args.compress, seed=args.seed
+    )
+
+    start = time.time()
+    if args.run:
+        os.environ.update({
+            "OKTA_ORG_NAME": org.org_name,
+            "OKTA_BASE_URL": org.base_url,
+            "OKTA_API_TOKEN": SIMULATED_API_TOKEN
+        })
+        print(f"\n▶️  Running {args.run} against {org.url}\n")
+        sys.argv = [args.run] + script_args
+        with simulator.installed():
+            try:
+                runpy.run_path(args.run, run_name="__main__")
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    print(f"\n⚠️  {args.run} exited with {e.code}")
+    else:
+        print(f"\n🔎 Crawling {org.url}...")
+        counts = crawl(simulator.manager(), args.max_workers)
+        for name, count in counts.items():
+            print(f"     {name}: {count:,}")
+
+    elapsed = time.time() - start
+    requests_made = simulator.stats["requests"]
+    print(f"\n📊 {requests_made:,} requests in {elapsed:.2f}s "
+          f"({requests_made / elapsed if elapsed else 0:,.0f} req/s), "
+          f"{simulator.stats['throttled']} throttled, {simulator.stats['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+okta_snapshot.py
+
+Crawls an Okta org once into a local SQLite snapshot so that query scripts can
+answer from disk in milliseconds instead of re-querying the live API.
+
+Captured collections:
+- Applications, groups
+- Entitlements and entitlement values (per application)
+- Entitlement bundles
+- Labels, label values and resource-label assignments
+- Resource owners (apps, groups, bundles) - optional, one request per resource
+- Risk rules
+
+Independent collections are fetched concurrently. The crawl is written to a
+temporary database and moved into place when complete, so readers never see a
+half-written snapshot.
+
+Usage:
+    python3 scripts/okta_snapshot.py --action crawl --db snapshots/lowerdecklabs.db
+    python3 scripts/okta_snapshot.py --action crawl --db snapshots/lowerdecklabs.db --include-owners
+    python3 scripts/okta_snapshot.py --action info --db snapshots/lowerdecklabs.db
+    python3 scripts/okta_snapshot.py --action query --db snapshots/lowerdecklabs.db \
+        --sql "SELECT label, sign_on_mode FROM apps ORDER BY label"
+
+Query scripts read a snapshot when OKTA_SNAPSHOT_DB is set (or --snapshot is
+passed, where the script takes arguments):
+    OKTA_SNAPSHOT_DB=snapshots/lowerdecklabs.db python3 scripts/list_apps.py
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_http import size_pool
+from scripts.orn_resolver import OrnResolver
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS apps (
+    id           TEXT PRIMARY KEY,
+    name         TEXT,
+    label        TEXT,
+    sign_on_mode TEXT,
+    status       TEXT,
+    orn          TEXT,
+    data         TEXT
+);
+CREATE TABLE IF NOT EXISTS groups (
+    id   TEXT PRIMARY KEY,
+    name TEXT,
+    orn  TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS entitlements (
+    id             TEXT PRIMARY KEY,
+    app_id         TEXT,
+    name           TEXT,
+    external_value TEXT,
+    data           TEXT
+);
+CREATE TABLE IF NOT EXISTS entitlement_values (
+    id             TEXT PRIMARY KEY,
+    entitlement_id TEXT,
+    app_id         TEXT,
+    name           TEXT,
+    external_value TEXT,
+    orn            TEXT,
+    data           TEXT
+);
+CREATE TABLE IF NOT EXISTS bundles (
+    id     TEXT PRIMARY KEY,
+    name   TEXT,
+    status TEXT,
+    orn    TEXT,
+    data   TEXT
+);
+CREATE TABLE IF NOT EXISTS labels (
+    label_id    TEXT PRIMARY KEY,
+    name        TEXT,
+    description TEXT,
+    data        TEXT
+);
+CREATE TABLE IF NOT EXISTS label_values (
+    label_value_id TEXT PRIMARY KEY,
+    label_id       TEXT,
+    name           TEXT,
+    data           TEXT
+);
+CREATE TABLE IF NOT EXISTS resource_labels (
+    resource_orn   TEXT,
+    label_value_id TEXT,
+    resource_name  TEXT,
+    resource_type  TEXT,
+    data           TEXT,
+    PRIMARY KEY (resource_orn, label_value_id)
+);
+CREATE TABLE IF NOT EXISTS resource_owners (
+    resource_orn   TEXT,
+    principal_orn  TEXT,
+    principal_type TEXT,
+    principal_name TEXT,
+    PRIMARY KEY (resource_orn, principal_orn)
+);
+CREATE TABLE IF NOT EXISTS risk_rules (
+    id   TEXT PRIMARY KEY,
+    name TEXT,
+    data TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_apps_name ON apps (name);
+CREATE INDEX IF NOT EXISTS idx_apps_orn ON apps (orn);
+CREATE INDEX IF NOT EXISTS idx_groups_name ON groups (name);
+CREATE INDEX IF NOT EXISTS idx_entitlements_app ON entitlements (app_id);
+CREATE INDEX IF NOT EXISTS idx_ent_values_entitlement ON entitlement_values (entitlement_id);
+CREATE INDEX IF NOT EXISTS idx_ent_values_app ON entitlement_values (app_id);
+CREATE INDEX IF NOT EXISTS idx_ent_values_name ON entitlement_values (name);
+CREATE INDEX IF NOT EXISTS idx_ent_values_orn ON entitlement_values (orn);
+CREATE INDEX IF NOT EXISTS idx_bundles_name ON bundles (name);
+CREATE INDEX IF NOT EXISTS idx_labels_name ON labels (name);
+CREATE INDEX IF NOT EXISTS idx_label_values_label ON label_values (label_id);
+CREATE INDEX IF NOT EXISTS idx_resource_labels_value ON resource_labels (label_value_id);
+CREATE INDEX IF NOT EXISTS idx_resource_owners_principal ON resource_owners (principal_orn);
+CREATE INDEX IF NOT EXISTS idx_risk_rules_name ON risk_rules (name);
+"""
+
+
+class OrgSnapshot:
+    """Read/write access to a local SQLite snapshot of an Okta org"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ==================== Writing ====================
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def store_apps(self, apps: List[Dict], orn_for: Callable[[Dict], str]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO apps VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (app.get("id"), app.get("name"), app.get("label"), app.get("signOnMode"),
+                 app.get("status"), orn_for(app), json.dumps(app))
+                for app in apps
+            ]
+        )
+
+    def store_groups(self, groups: List[Dict], orn_for: Callable[[Dict], str]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?)",
+            [
+                (group.get("id"), group.get("profile", {}).get("name"), orn_for(group), json.dumps(group))
+                for group in groups
+            ]
+        )
+
+    def store_entitlements(self, app_id: str, entitlements: List[Dict]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entitlements VALUES (?, ?, ?, ?, ?)",
+            [
+                (ent.get("id"), app_id, ent.get("name"), ent.get("externalValue"), json.dumps(ent))
+                for ent in entitlements
+            ]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entitlement_values VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (value.get("id"), ent.get("id"), app_id, value.get("name"),
+                 value.get("externalValue"), value.get("orn"), json.dumps(value))
+                for ent in entitlements
+                for value in ent.get("values", [])
+            ]
+        )
+
+    def store_bundles(self, bundles: List[Dict], orn_for: Callable[[Dict], str]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO bundles VALUES (?, ?, ?, ?, ?)",
+            [
+                (bundle.get("id") or bundle.get("bundleId"), bundle.get("name"), bundle.get("status"),
+                 orn_for(bundle), json.dumps(bundle))
+                for bundle in bundles
+            ]
+        )
+
+    def store_labels(self, labels: List[Dict]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?)",
+            [
+                (label.get("labelId"), label.get("name"), label.get("description"), json.dumps(label))
+                for label in labels
+            ]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO label_values VALUES (?, ?, ?, ?)",
+            [
+                (value.get("labelValueId"), label.get("labelId"), value.get("name"), json.dumps(value))
+                for label in labels
+                for value in label.get("values", [])
+            ]
+        )
+
+    def store_resource_labels(self, assignments: List[Dict]):
+        rows = []
+        for assignment in assignments:
+            resource = assignment.get("resource", {})
+            for label_value in assignment.get("labels", []):
+                rows.append((
+                    resource.get("orn"), label_value.get("labelValueId"), resource.get("name"),
+                    resource.get("type"), json.dumps(resource)
+                ))
+        self.conn.executemany("INSERT OR REPLACE INTO resource_labels VALUES (?, ?, ?, ?, ?)", rows)
+
+    def store_resource_owners(self, resource_orn: str, owners_data: List[Dict]):
+        rows = []
+        for owner_data in owners_data:
+            for principal in owner_data.get("principals", []):
+                rows.append((
+                    resource_orn, principal.get("principalOrn"),
+                    (principal.get("principalType") or "user").lower(), principal.get("principalName", "")
+                ))
+        self.conn.executemany("INSERT OR REPLACE INTO resource_owners VALUES (?, ?, ?, ?)", rows)
+
+    def store_risk_rules(self, rules: List[Dict]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO risk_rules VALUES (?, ?, ?)",
+            [(rule.get("id"), rule.get("name"), json.dumps(rule)) for rule in rules]
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    # ==================== Queries ====================
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def list_apps(self) -> List[Dict]:
+        """All applications in API response shape"""
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM apps ORDER BY rowid")]
+
+    def get_app(self, app_id: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM apps WHERE id = ?", (app_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_app_orn(self, app_id: str) -> Optional[str]:
+        row = self.conn.execute("SELECT orn FROM apps WHERE id = ?", (app_id,)).fetchone()
+        return row["orn"] if row else None
+
+    def list_groups(self) -> List[Dict]:
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM groups ORDER BY rowid")]
+
+    def list_bundles(self) -> List[Dict]:
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM bundles ORDER BY rowid")]
+
+    def list_labels(self) -> List[Dict]:
+        """All labels (with their values) in API response shape"""
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM labels ORDER BY rowid")]
+
+    def get_entitlement(self, entitlement_id: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM entitlements WHERE id = ?", (entitlement_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def entitlements_for_app(self, app_id: str) -> List[Dict]:
+        return [
+            json.loads(row["data"])
+            for row in self.conn.execute("SELECT data FROM entitlements WHERE app_id = ? ORDER BY rowid", (app_id,))
+        ]
+
+    def labels_for_resource(self, resource_orn: str) -> List[Dict]:
+        """Label values assigned to a resource, as {"label": {...}, "value": {...}} entries"""
+        rows = self.conn.execute(
+            """
+            SELECT l.label_id, l.name AS label_name, v.label_value_id, v.name AS value_name
+            FROM resource_labels rl
+            JOIN label_values v ON v.label_value_id = rl.label_value_id
+            JOIN labels l ON l.label_id = v.label_id
+            WHERE rl.resource_orn = ?
+            ORDER BY l.name, v.name
+            """,
+            (resource_orn,)
+        )
+        return [
+            {
+                "label": {"labelId": row["label_id"], "name": row["label_name"]},
+                "value": {"labelValueId": row["label_value_id"], "name": row["value_name"]}
+            }
+            for row in rows
+        ]
+
+    def owners_for_resource(self, resource_orn: str) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT principal_orn, principal_type, principal_name FROM resource_owners WHERE resource_orn = ?",
+            (resource_orn,)
+        )
+        return [dict(row) for row in rows]
+
+    def list_risk_rules(self) -> List[Dict]:
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM risk_rules ORDER BY name")]
+
+    def counts(self) -> Dict[str, int]:
+        tables = ["apps", "groups", "entitlements", "entitlement_values", "bundles", "labels",
+                  "label_values", "resource_labels", "resource_owners", "risk_rules"]
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in tables
+        }
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Dict]:
+        """Run an ad-hoc read query against the snapshot"""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+
+class SnapshotCrawler:
+    """Crawls an Okta org concurrently into an OrgSnapshot"""
+
+    def __init__(self, manager: OktaAPIManager, max_workers: int = 8, include_owners: bool = False):
+        self.manager = manager
+        self.max_workers = max(1, max_workers)
+        self.include_owners = include_owners
+        self.resolver = OrnResolver(manager)
+        size_pool(manager.session, self.max_workers)
+
+    # ==================== Fetching ====================
+
+    def fetch_org(self) -> Dict:
+        response = self.manager._make_request("GET", f"{self.manager.base_url}/api/v1/org")
+        return response.json()
+
+    def fetch_apps(self) -> List[Dict]:
+        return self.manager._paginate(f"{self.manager.base_url}/api/v1/apps", {"limit": 200})
+
+    def fetch_groups(self) -> List[Dict]:
+        return self.manager._paginate(f"{self.manager.base_url}/api/v1/groups", {"limit": 200})
+
+    def fetch_bundles(self) -> List[Dict]:
+        return self.manager._paginate(
+            f"{self.manager.base_url}/governance/api/v1/entitlement-bundles", {"limit": 200}
+        )
+
+    def fetch_labels(self) -> List[Dict]:
+        return self.manager._paginate(f"{self.manager.base_url}/governance/api/v1/labels")
+
+    def fetch_resource_labels(self) -> List[Dict]:
+        return self.manager._paginate(
+            f"{self.manager.base_url}/governance/api/v1/resource-labels", {"limit": 200}
+        )
+
+    def fetch_risk_rules(self) -> List[Dict]:
+        return self.manager._paginate(f"{self.manager.base_url}/governance/api/v1/risk-rules", {"limit": 200})
+
+    def fetch_entitlements(self, app_id: str) -> List[Dict]:
+        params = {
+            "filter": f'parent.externalId eq "{app_id}" AND parent.type eq "APPLICATION"',
+            "limit": 200
+        }
+        return self.manager._paginate(f"{self.manager.base_url}/governance/api/v1/entitlements", params)
+
+    def fetch_owners(self, resource_orn: str) -> List[Dict]:
+        return self.manager.list_resource_owners(resource_orn).get("data", [])
+
+    # ==================== ORNs ====================
+
+    def app_orn(self, app: Dict) -> str:
+        return self.resolver.app_orn(app.get("id"))
+
+    def group_orn(self, group: Dict) -> str:
+        return self.resolver.group_orn(group.get("id"))
+
+    def bundle_orn(self, bundle: Dict) -> str:
+        return self.resolver.bundle_orn(bundle.get("id") or bundle.get("bundleId"))
+
+    # ==================== Crawl ====================
+
+    def _run_parallel(self, tasks: Dict[str, Callable[[], object]]) -> Tuple[Dict[str, object], Dict[str, str]]:
+        """Run named tasks concurrently, returning (results, errors)"""
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(task): name for name, task in tasks.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+        return results, errors
+
+    def crawl(self, snapshot: OrgSnapshot) -> Dict[str, str]:
+        """Crawl the org into the snapshot; returns per-collection status"""
+        started = time.time()
+        status = {}
+
+        print("Crawling org-level collections...")
+        results, errors = self._run_parallel({
+            "org": self.fetch_org,
+            "apps": self.fetch_apps,
+            "groups": self.fetch_groups,
+            "bundles": self.fetch_bundles,
+            "labels": self.fetch_labels,
+            "resource_labels": self.fetch_resource_labels,
+            "risk_rules": self.fetch_risk_rules,
+        })
+
+        self.resolver.set_org(results.get("org", {}))
+
+        apps = results.get("apps", [])
+        groups = results.get("groups", [])
+        bundles = results.get("bundles", [])
+        self.resolver.register_apps(apps)
+
+        snapshot.store_apps(apps, self.app_orn)
+        snapshot.store_groups(groups, self.group_orn)
+        snapshot.store_bundles(bundles, self.bundle_orn)
+        snapshot.store_labels(results.get("labels", []))
+        snapshot.store_resource_labels(results.get("resource_labels", []))
+        snapshot.store_risk_rules(results.get("risk_rules", []))
+
+        for name in ["org", "apps", "groups", "bundles", "labels", "resource_labels", "risk_rules"]:
+            if name in errors:
+                status[name] = f"error: {errors[name]}"
+                print(f"  ⚠️  {name}: {errors[name]}")
+            else:
+                status[name] = "success"
+                if name != "org":
+                    print(f"  ✅ {name}: {len(results[name])}")
+
+        print(f"\nCrawling entitlements for {len(apps)} apps...")
+        results, errors = self._run_parallel({
+            app.get("id"): (lambda app_id=app.get("id"): self.fetch_entitlements(app_id))
+            for app in apps
+        })
+        for app_id, entitlements in results.items():
+            snapshot.store_entitlements(app_id, entitlements)
+        status["entitlements"] = "success" if not errors else f"partial: {len(errors)} apps failed"
+        print(f"  ✅ entitlements: {sum(len(e) for e in results.values())} across {len(results)} apps")
+        for app_id, error in errors.items():
+            print(f"  ⚠️  entitlements for {app_id}: {error}")
+
+        if self.include_owners:
+            resource_orns = (
+                [self.app_orn(app) for app in apps]
+                + [self.group_orn(group) for group in groups]
+                + [self.bundle_orn(bundle) for bundle in bundles]
+            )
+            print(f"\nCrawling owners for {len(resource_orns)} resources...")
+            results, errors = self._run_parallel({
+                orn: (lambda orn=orn: self.fetch_owners(orn)) for orn in resource_orns
+            })
+            for orn, owners_data in results.items():
+                snapshot.store_resource_owners(orn, owners_data)
+            status["resource_owners"] = "success" if not errors else f"partial: {len(errors)} resources failed"
+            print(f"  ✅ resource_owners: {len(results)} resources queried")
+        else:
+            status["resource_owners"] = "skipped"
+
+        snapshot.set_meta("org_name", self.manager.org_name)
+        snapshot.set_meta("base_url", self.manager.base_url)
+        snapshot.set_meta("org_id", self.resolver.org_id)
+        snapshot.set_meta("partition", self.resolver.partition)
+        snapshot.set_meta("crawled_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        snapshot.set_meta("crawl_seconds", f"{time.time() - started:.1f}")
+        snapshot.set_meta("status", json.dumps(status, sort_keys=True))
+        snapshot.commit()
+
+        return status
+
+
+def crawl_failed(status: Dict[str, str]) -> List[str]:
+    """Collections whose crawl failed outright or for some of their items"""
+    return sorted(name for name, result in status.items()
+                  if result.startswith(("error", "partial")))
+
+
+def crawl_snapshot(manager: OktaAPIManager, db_path: str, max_workers: int = 8,
+                   include_owners: bool = False, allow_partial: bool = False) -> Dict[str, str]:
+    """
+    Crawl into a temporary database and atomically replace db_path when done.
+
+    If a collection failed in whole or in part (expired token, 5xx, rate
+    limiting), the previous snapshot is kept and the incomplete crawl is left at db_path + ".tmp" for
+    inspection, unless allow_partial is set.
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+
+    snapshot = OrgSnapshot(tmp_path)
+    try:
+        status = SnapshotCrawler(manager, max_workers, include_owners).crawl(snapshot)
+    finally:
+        snapshot.close()
+
+    if crawl_failed(status) and not allow_partial:
+        return status
+
+    os.replace(tmp_path, db_path)
+    return status
+
+
+def open_snapshot(db_path: Optional[str]) -> Optional[OrgSnapshot]:
+    """Open an existing snapshot, or return None if no path was given"""
+    if not db_path:
+        return None
+    if not os.path.exists(db_path):
+        print(f"Error: snapshot not found: {db_path}")
+        print(f"Create one with: python3 scripts/okta_snapshot.py --action crawl --db {db_path}")
+        sys.exit(1)
+    return OrgSnapshot(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Crawl an Okta org into a local SQLite snapshot and query it"
+    )
+    parser.add_argument(
+        "--action",
+        choices=["crawl", "info", "query"],
+        required=True,
+        help="Action to perform"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("OKTA_SNAPSHOT_DB"),
+        help="Snapshot database path (or set OKTA_SNAPSHOT_DB)"
+    )
+    parser.add_argument(
+        "--org-name",
+        default=os.environ.get("OKTA_ORG_NAME"),
+        help="Okta organization name"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("OKTA_BASE_URL", "okta.com"),
+        help="Okta base URL"
+    )
+    parser.add_argument(
+        "--api-token",
+        default=os.environ.get("OKTA_API_TOKEN"),
+        help="Okta API token"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent API requests (default: 8)"
+    )
+    parser.add_argument(
+        "--include-owners",
+        action="store_true",
+        help="Also crawl resource owners (one request per app, group and bundle)"
+    )
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="Replace the snapshot even if some collections failed to crawl"
+    )
+    parser.add_argument(
+        "--sql",
+        help="SQL statement for --action query"
+    )
+
+    args = parser.parse_args()
+
+    if not args.db:
+        print("Error: --db or OKTA_SNAPSHOT_DB must be set")
+        sys.exit(1)
+
+    if args.action == "crawl":
+        if not args.org_name or not args.api_token:
+            print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+            sys.exit(1)
+
+        print("=" * 80)
+        print(f"CRAWLING {args.org_name} INTO {args.db}")
+        print("=" * 80)
+
+        manager = OktaAPIManager(args.org_name, args.base_url, args.api_token)
+        started = time.time()
+        status = crawl_snapshot(manager, args.db, args.max_workers, args.include_owners,
+                                args.allow_partial)
+        failed = crawl_failed(status)
+
+        print("\n" + "=" * 80)
+        if failed and not args.allow_partial:
+            print(f"❌ Crawl failed for: {', '.join(failed)}")
+            print(f"   {args.db} was not replaced; the incomplete crawl is in {args.db}.tmp")
+            print("   Re-run the crawl, or pass --allow-partial to keep it anyway")
+        else:
+            print(f"Snapshot saved to {args.db} in {time.time() - started:.1f}s")
+        for name, result in sorted(status.items()):
+            print(f"  {name}: {result}")
+        print("=" * 80)
+        sys.exit(1 if failed else 0)
+
+    snapshot = open_snapshot(args.db)
+
+    if args.action == "info":
+        print(f"Snapshot: {args.db}")
+        print(f"  Org: {snapshot.get_meta('org_name')} ({snapshot.get_meta('org_id')})")
+        print(f"  Crawled at: {snapshot.get_meta('crawled_at')} ({snapshot.get_meta('crawl_seconds')}s)")
+        for table, count in snapshot.counts().items():
+            print(f"  {table}: {count}")
+    elif args.action == "query":
+        if not args.sql:
+            print("Error: --sql required for query action")
+            sys.exit(1)
+        print(json.dumps(snapshot.query(args.sql), indent=2))
+
+
+if __name__ == "__main__":
+    main()
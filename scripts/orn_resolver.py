@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+orn_resolver.py
+
+Central Okta Resource Name (ORN) resolution.
+
+ORNs depend on the org's numeric ID, the cell partition (okta, oktapreview,
+okta-emea, ...) and, for apps, the app's catalog name:
+
+    Apps:                orn:{partition}:idp:{orgId}:apps:{appName}:{appId}
+    Groups:              orn:{partition}:directory:{orgId}:groups:{groupId}
+    Users:               orn:{partition}:directory:{orgId}:users:{userId}
+    Entitlement bundles: orn:{partition}:governance:{orgId}:entitlement-bundles:{bundleId}
+
+OrnResolver fetches the org ID once per process and bulk-loads app metadata
+from the paginated apps list, so thousands of ORNs resolve from an in-memory
+table. The table is persisted so later runs can skip the bulk load while it
+is fresh.
+
+Usage:
+    python3 scripts/orn_resolver.py --app-ids 0oamxiwg4zsrWaeJF1d7 0oaq4iodcifSLp30Q1d7
+    python3 scripts/orn_resolver.py --group-ids 00g1abcd --refresh
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.okta_models import App
+
+
+DEFAULT_TABLE_DIR = os.path.join(".okta_cache", "orn_tables")
+
+# App fields kept in the table; the rest of each app object is not decoded into memory
+APP_FIELDS = App.FIELDS
+
+
+def okta_partition(base_url: str) -> str:
+    """ORN partition for an org URL (okta.com -> okta, oktapreview.com -> oktapreview)"""
+    if "oktapreview.com" in base_url:
+        return "oktapreview"
+    if "okta-emea.com" in base_url:
+        return "okta-emea"
+    if "trexcloud.com" in base_url:
+        return "trexcloud"
+    return "okta"
+
+
+def normalize_app_name(app_name: str) -> str:
+    """App catalog name as it appears in ORNs: lowercase, separators replaced by underscores"""
+    return (app_name or "").lower().replace(" ", "_").replace(".", "_").replace("-", "_")
+
+
+def format_orn(partition: str, org_id: str, category: str, resource_id: str, app_name: str = "") -> str:
+    """
+    ORN for a resource whose org ID (and, for apps, catalog name) is known.
+
+    `category` is "apps", "groups", "users" or "entitlement_bundles".
+    """
+    if category == "apps":
+        return f"orn:{partition}:idp:{org_id}:apps:{normalize_app_name(app_name)}:{resource_id}"
+    if category == "groups":
+        return f"orn:{partition}:directory:{org_id}:groups:{resource_id}"
+    if category == "users":
+        return f"orn:{partition}:directory:{org_id}:users:{resource_id}"
+    if category == "entitlement_bundles":
+        return f"orn:{partition}:governance:{org_id}:entitlement-bundles:{resource_id}"
+    raise ValueError(f"No ORN format for {category}")
+
+
+class OrnResolver:
+    """
+    Resolves ORNs for apps, groups, users and entitlement bundles.
+
+    `manager` is an OktaAPIManager (anything providing base_url, org_name,
+    _make_request and _paginate). Safe to share across threads.
+    """
+
+    def __init__(self, manager, table_path: Optional[str] = None, max_age: float = 86400):
+        self.manager = manager
+        self.partition = okta_partition(manager.base_url)
+        self.table_path = table_path
+        self.max_age = max_age
+        self.apps: Dict[str, App] = {}
+        self.apps_loaded_at = None
+        self._org_id = None
+        self._lock = threading.RLock()
+
+        if table_path:
+            self._load_table()
+
+    # ==================== Org ====================
+
+    @property
+    def org_id(self) -> str:
+        """Numeric org ID, fetched from /api/v1/org on first use"""
+        if self._org_id is None:
+            with self._lock:
+                if self._org_id is None:
+                    response = self.manager._make_request("GET", f"{self.manager.base_url}/api/v1/org")
+                    self._org_id = response.json().get("id") or self.manager.org_name
+                    self.save()
+        return self._org_id
+
+    def set_org(self, org: Dict):
+        """Seed the org ID from an already-fetched /api/v1/org response"""
+        if org.get("id"):
+            self._org_id = org["id"]
+
+    # ==================== Apps ====================
+
+    def register_apps(self, apps: Iterable):
+        """Add apps (App records or objects as returned by /api/v1/apps) to the table"""
+        with self._lock:
+            for app in apps:
+                app = App.coerce(app)
+                if app.id:
+                    self.apps[app.id] = App(app.id, app.name, app.label, app.sign_on_mode)
+
+    def load_apps(self, refresh: bool = False):
+        """Bulk-load every app from the paginated apps list unless the table is fresh"""
+        with self._lock:
+            is_fresh = self.apps_loaded_at and (time.time() - self.apps_loaded_at) <= self.max_age
+            if is_fresh and not refresh:
+                return
+
+            apps = self.manager._paginate(f"{self.manager.base_url}/api/v1/apps", {"limit": 200}, APP_FIELDS)
+            self.apps = {}
+            self.register_apps(apps)
+            self.apps_loaded_at = time.time()
+            self.save()
+
+    def get_app(self, app_id: str) -> Optional[App]:
+        """App metadata (name, label, signOnMode), loading the app table if needed"""
+        if app_id not in self.apps:
+            self.load_apps()
+        if app_id not in self.apps:
+            # Created after the table was loaded
+            response = self.manager._make_request("GET", f"{self.manager.base_url}/api/v1/apps/{app_id}")
+            self.register_apps([response.json()])
+            self.save()
+        return self.apps.get(app_id)
+
+    # ==================== ORNs ====================
+
+    def app_orn(self, app_id: str) -> str:
+        app = self.get_app(app_id)
+        return format_orn(self.partition, self.org_id, "apps", app_id, app.name)
+
+    def app_orns(self, app_ids: Iterable[str]) -> Dict[str, str]:
+        """ORNs for many apps at once (one bulk load instead of a request per app)"""
+        self.load_apps()
+        return {app_id: self.app_orn(app_id) for app_id in app_ids}
+
+    def group_orn(self, group_id: str) -> str:
+        return format_orn(self.partition, self.org_id, "groups", group_id)
+
+    def user_orn(self, user_id: str) -> str:
+        return format_orn(self.partition, self.org_id, "users", user_id)
+
+    def bundle_orn(self, bundle_id: str) -> str:
+        return format_orn(self.partition, self.org_id, "entitlement_bundles", bundle_id)
+
+    # ==================== Persistence ====================
+
+    def _load_table(self):
+        if not os.path.exists(self.table_path):
+            return
+        try:
+            with open(self.table_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not load ORN table {self.table_path}: {e}")
+            return
+
+        if data.get("base_url") != self.manager.base_url:
+            return
+
+        self._org_id = data.get("org_id")
+        self.apps = {
+            app_id: App(app_id, entry.get("name", ""), entry.get("label", ""), entry.get("signOnMode", ""))
+            for app_id, entry in data.get("apps", {}).items()
+        }
+        self.apps_loaded_at = data.get("apps_loaded_at")
+
+    def save(self):
+        """Persist the resolved table (no-op when no table_path is configured)"""
+        if not self.table_path:
+            return
+        with self._lock:
+            data = {
+                "base_url": self.manager.base_url,
+                "org_id": self._org_id,
+                "partition": self.partition,
+                "apps_loaded_at": self.apps_loaded_at,
+                "apps": {
+                    app_id: {"name": app.name, "label": app.label, "signOnMode": app.sign_on_mode}
+                    for app_id, app in self.apps.items()
+                }
+            }
+            os.makedirs(os.path.dirname(self.table_path) or ".", exist_ok=True)
+            tmp_path = f"{self.table_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.table_path)
+
+
+def default_table_path(org_name: str, table_dir: str = DEFAULT_TABLE_DIR) -> str:
+    return os.path.join(table_dir, f"{org_name}.json")
+
+
+def main():
+    from scripts.okta_api_manager import OktaAPIManager
+
+    parser = argparse.ArgumentParser(
+        description="Resolve ORNs for apps, groups and entitlement bundles"
+    )
+    parser.add_argument("--org-name", default=os.environ.get("OKTA_ORG_NAME"), help="Okta organization name")
+    parser.add_argument("--base-url", default=os.environ.get("OKTA_BASE_URL", "okta.com"), help="Okta base URL")
+    parser.add_argument("--api-token", default=os.environ.get("OKTA_API_TOKEN"), help="Okta API token")
+    parser.add_argument("--app-ids", nargs="*", default=[], help="Application IDs")
+    parser.add_argument("--group-ids", nargs="*", default=[], help="Group IDs")
+    parser.add_argument("--bundle-ids", nargs="*", default=[], help="Entitlement bundle IDs")
+    parser.add_argument("--all-apps", action="store_true", help="Resolve every app in the org")
+    parser.add_argument("--table-dir", default=DEFAULT_TABLE_DIR,
+                        help=f"Directory for the persisted ORN table (default: {DEFAULT_TABLE_DIR})")
+    parser.add_argument("--refresh", action="store_true", help="Reload the app table from the API")
+
+    args = parser.parse_args()
+
+    if not args.org_name or not args.api_token:
+        print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
+        sys.exit(1)
+
+    manager = OktaAPIManager(args.org_name, args.base_url, args.api_token)
+    resolver = OrnResolver(manager, default_table_path(args.org_name, args.table_dir))
+    resolver.load_apps(refresh=args.refresh)
+
+    app_ids: List[str] = list(resolver.apps) if args.all_apps else args.app_ids
+    orns = {
+        "apps": resolver.app_orns(app_ids),
+        "groups": {group_id: resolver.group_orn(group_id) for group_id in args.group_ids},
+        "entitlement_bundles": {bundle_id: resolver.bundle_orn(bundle_id) for bundle_id in args.bundle_ids}
+    }
+    print(json.dumps(orns, indent=2))
+
+
+if __name__ == "__main__":
+    main()
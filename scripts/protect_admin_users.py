@@ -14,9 +14,13 @@ import json
 import os
 import re
 import sys
-import requests
 from typing import List, Dict, Set
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session
+
 
 class OktaAdminProtector:
     """Protect super admin users from Terraform management"""
@@ -29,9 +33,10 @@ class OktaAdminProtector:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
 
+    @span("fetch_super_admins")
     def get_super_admins(self) -> Set[str]:
         """Get all users with super admin role"""
         print("🔍 Querying Okta for super admin users...")
@@ -100,6 +105,7 @@ class OktaAdminProtector:
 
         return admin_logins
 
+    @span("parse_terraform")
     def parse_terraform_users(self, tf_file: str) -> List[Dict]:
         """Parse Terraform user resources from file"""
         with open(tf_file, 'r') as f:
@@ -264,8 +270,10 @@ def main():
     parser.add_argument('--output', help='Output filtered/protected file')
     parser.add_argument('--mode', choices=['check', 'filter', 'protect'], default='check',
                       help='check: analyze only, filter: remove admins, protect: add prevent_destroy')
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     # Get credentials from environment
     api_token = os.getenv('OKTA_API_TOKEN')
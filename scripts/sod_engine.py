@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+sod_engine.py
+
+Local separation-of-duties evaluation: predicts which principals the risk rules
+in a risk_rules.json file flag, given a snapshot of principal -> entitlement grants.
+
+Rules are compiled once into trees of CONTAINS_ONE / CONTAINS_ALL leaves. The
+grants snapshot is held as a sparse principal x grant matrix, and each grant a
+rule refers to becomes a bitset over all principals (one Python int, bit i =
+principal i). A rule is then evaluated for every principal at once with a few
+bitwise OR/AND operations, so 50k principals x 500 rules takes well under a
+second. Results are cached per rule hash and snapshot digest, so unchanged
+rules are not re-evaluated.
+
+Grants snapshot formats:
+  JSON lines   {"id": "00u...", "name": "jane@example.com", "grants": ["ent...", ...]}
+  JSON         {"principals": [<same objects>]}
+  CSV          principal_id,principal_name,entitlement_id,value_id (one grant per row)
+
+A grant is an entitlement value ID, or {"entitlementId": ..., "valueId": ...}.
+Criteria that name an entitlement without values match any value of it, which
+needs the entitlementId form (or the CSV entitlement_id column).
+
+Usage:
+  python3 scripts/sod_engine.py --rules environments/myorg/config/risk_rules.json \\
+    --grants grants.jsonl --output violations.json
+
+  # Only some rules
+  python3 scripts/sod_engine.py --rules risk_rules.json --grants grants.csv --rule "Change Management Conflct"
+
+  # Benchmark on a synthetic org (50k users x 500 rules)
+  python3 scripts/sod_engine.py --synthetic --users 50000 --rule-count 500
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DEFAULT_CACHE_DIR = os.path.join(".okta_cache", "sod_results")
+
+# Bump when evaluation semantics change so cached results are not reused
+ENGINE_VERSION = "1"
+
+OPERATIONS = {"CONTAINS_ONE": "one", "CONTAINS_ALL": "all"}
+
+
+class UnsupportedRule(ValueError):
+    """A rule uses criteria the engine cannot evaluate"""
+
+
+# ==================== Grants ====================
+
+class GrantMatrix:
+    """
+    Sparse principal x grant incidence matrix.
+
+    Columns (grant -> principal indices) are stored as compact arrays; bitsets
+    are built only for grants that rules actually refer to.
+    """
+
+    def __init__(self):
+        self.principal_ids: List[str] = []
+        self.principal_names: List[str] = []
+        self.columns: Dict[str, array] = {}
+        self._bitsets: Dict[str, int] = {}
+        self._hash = hashlib.sha256()
+        self.grant_count = 0
+
+    def __len__(self) -> int:
+        return len(self.principal_ids)
+
+    def add_principal(self, principal_id: str, name: str, grants: Iterable) -> int:
+        index = len(self.principal_ids)
+        self.principal_ids.append(principal_id)
+        self.principal_names.append(name or principal_id)
+
+        tokens = set()
+        for grant in grants:
+            if isinstance(grant, dict):
+                tokens.update(t for t in (grant.get("valueId"), grant.get("entitlementId")) if t)
+            elif grant:
+                tokens.add(grant)
+        for token in tokens:
+            column = self.columns.get(token)
+            if column is None:
+                column = self.columns[token] = array("I")
+            column.append(index)
+        self.grant_count += len(tokens)
+
+        self._hash.update(json.dumps([principal_id, sorted(tokens)]).encode("utf-8"))
+        self._bitsets.clear()
+        return index
+
+    @property
+    def digest(self) -> str:
+        """Identifies the snapshot contents, for result caching"""
+        return self._hash.hexdigest()[:32]
+
+    def bitset(self, token: str) -> int:
+        """Principals holding a grant, as an int with bit i set for principal i"""
+        bits = self._bitsets.get(token)
+        if bits is None:
+            column = self.columns.get(token)
+            if not column:
+                bits = 0
+            else:
+                buffer = bytearray((len(self.principal_ids) + 7) // 8)
+                for index in column:
+                    buffer[index >> 3] |= 1 << (index & 7)
+                bits = int.from_bytes(buffer, "little")
+            self._bitsets[token] = bits
+        return bits
+
+    def all_principals(self) -> int:
+        return (1 << len(self.principal_ids)) - 1
+
+
+def _iter_grant_records(grants_file: str) -> Iterator[Tuple[str, str, List]]:
+    """(principal id, name, grants) from any supported snapshot format"""
+    if grants_file.endswith(".csv"):
+        principals: Dict[str, Tuple[str, List]] = {}
+        with open(grants_file, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                principal_id = row.get("principal_id")
+                if not principal_id:
+                    continue
+                name, grants = principals.setdefault(principal_id, (row.get("principal_name", ""), []))
+                grants.append({"entitlementId": row.get("entitlement_id"), "valueId": row.get("value_id")})
+        for principal_id, (name, grants) in principals.items():
+            yield principal_id, name, grants
+        return
+
+    with open(grants_file, "r") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "{" and not grants_file.endswith(".jsonl"):
+            records = json.load(f).get("principals", [])
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            yield record.get("id"), record.get("name", ""), record.get("grants", [])
+
+
+def load_grants(grants_file: str) -> GrantMatrix:
+    matrix = GrantMatrix()
+    for principal_id, name, grants in _iter_grant_records(grants_file):
+        if principal_id:
+            matrix.add_principal(principal_id, name, grants)
+    return matrix
+
+
+# ==================== Rules ====================
+
+def rule_hash(rule: Dict) -> str:
+    """Hash of the parts of a rule that affect evaluation"""
+    encoded = json.dumps([ENGINE_VERSION, rule.get("conflictCriteria", {})], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def _criterion_tokens(criterion: Dict) -> List[str]:
+    """Grant tokens named by a criterion: value IDs, or the entitlement ID when no values are listed"""
+    value = criterion.get("value", {})
+    entries = value.get("value", []) if isinstance(value, dict) else value
+    tokens = []
+    for entry in entries or []:
+        values = entry.get("values") or []
+        if values:
+            tokens.extend(v.get("id") for v in values if v.get("id"))
+        elif entry.get("id"):
+            tokens.append(entry["id"])
+    return tokens
+
+
+def compile_criteria(node: Dict):
+    """
+    Compile conflictCriteria into ("and"|"or", [children]) and ("one"|"all", [tokens]) nodes.
+
+    Raises:
+        UnsupportedRule: Unknown operation, or a criterion without entitlements
+    """
+    for combinator in ("and", "or"):
+        if combinator in node:
+            children = [compile_criteria(child) for child in node[combinator]]
+            if not children:
+                raise UnsupportedRule(f"empty '{combinator}' criteria")
+            return combinator, children
+
+    operation = OPERATIONS.get(node.get("operation"))
+    if operation is None:
+        raise UnsupportedRule(f"unsupported operation {node.get('operation')!r}")
+    tokens = _criterion_tokens(node)
+    if not tokens:
+        raise UnsupportedRule(f"criterion {node.get('name', '')!r} lists no entitlements")
+    return operation, tokens
+
+
+def evaluate_compiled(compiled, matrix: GrantMatrix) -> int:
+    """Bitset of principals matching a compiled criteria tree"""
+    kind, items = compiled
+    if kind == "one":
+        bits = 0
+        for token in items:
+            bits |= matrix.bitset(token)
+        return bits
+    if kind == "all":
+        bits = matrix.all_principals()
+        for token in items:
+            bits &= matrix.bitset(token)
+            if not bits:
+                break
+        return bits
+    if kind == "and":
+        bits = matrix.all_principals()
+        for child in items:
+            bits &= evaluate_compiled(child, matrix)
+            if not bits:
+                break
+        return bits
+    bits = 0
+    for child in items:
+        bits |= evaluate_compiled(child, matrix)
+    return bits
+
+
+def bit_indices(bits: int) -> List[int]:
+    """Positions of the set bits, lowest first"""
+    text = bin(bits)[:1:-1]   # text[i] is bit i
+    indices = []
+    position = text.find("1")
+    while position != -1:
+        indices.append(position)
+        position = text.find("1", position + 1)
+    return indices
+
+
+# ==================== Evaluation ====================
+
+class SodEngine:
+    """
+    Evaluates risk rules against a grants snapshot.
+
+    Results are cached in memory and, when cache_dir is set, in
+    <cache_dir>/<snapshot digest>.json keyed by rule hash.
+    """
+
+    def __init__(self, matrix: GrantMatrix, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.matrix = matrix
+        self.cache_dir = cache_dir
+        self.cache: Dict[str, List[str]] = {}
+        self.cache_hits = 0
+        self._cache_dirty = False
+        self._load_cache()
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{self.matrix.digest}.json")
+
+    def _load_cache(self):
+        path = self.cache_path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not load SoD result cache {path}: {e}")
+            return
+        if data.get("engine") == ENGINE_VERSION:
+            self.cache = data.get("results", {})
+
+    def save_cache(self):
+        """Persist cached results (no-op when nothing new was evaluated or no cache_dir)"""
+        path = self.cache_path
+        if not path or not self._cache_dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"engine": ENGINE_VERSION, "snapshot": self.matrix.digest, "results": self.cache}, f)
+        os.replace(tmp_path, path)
+        self._cache_dirty = False
+
+    def evaluate_rule(self, rule: Dict) -> List[str]:
+        """Principal IDs the rule flags"""
+        key = rule_hash(rule)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        compiled = compile_criteria(rule.get("conflictCriteria", {}))
+        ids = self.matrix.principal_ids
+        violators = [ids[index] for index in bit_indices(evaluate_compiled(compiled, self.matrix))]
+        self.cache[key] = violators
+        self._cache_dirty = True
+        return violators
+
+    def evaluate(self, rules: List[Dict]) -> Dict:
+        """
+        Evaluate every rule against every principal.
+
+        Returns:
+            {"rules": {name: {"hash", "violations": [principal ids]}},
+             "principals": {principal id: {"name", "rules": [rule names]}},
+             "unsupported": {name: reason}, "summary": {...}}
+        """
+        start = time.time()
+        result = {"rules": {}, "principals": {}, "unsupported": {}}
+        names = dict(zip(self.matrix.principal_ids, self.matrix.principal_names))
+
+        for rule in rules:
+            rule_name = rule.get("name", "Unnamed")
+            try:
+                violators = self.evaluate_rule(rule)
+            except UnsupportedRule as e:
+                result["unsupported"][rule_name] = str(e)
+                continue
+            result["rules"][rule_name] = {"hash": rule_hash(rule), "violations": violators}
+            for principal_id in violators:
+                entry = result["principals"].setdefault(principal_id, {"name": names.get(principal_id), "rules": []})
+                entry["rules"].append(rule_name)
+
+        self.save_cache()
+        result["summary"] = {
+            "principals": len(self.matrix),
+            "grants": self.matrix.grant_count,
+            "rules": len(rules),
+            "evaluated": len(result["rules"]),
+            "unsupported": len(result["unsupported"]),
+            "violations": sum(len(r["violations"]) for r in result["rules"].values()),
+            "principals_in_violation": len(result["principals"]),
+            "cache_hits": self.cache_hits,
+            "seconds": round(time.time() - start, 3)
+        }
+        return result
+
+
+def print_evaluation(result: Dict, max_principals: int = 5):
+    summary = result["summary"]
+    print(f"Evaluated {summary['evaluated']} rules against {summary['principals']:,} principals "
+          f"in {summary['seconds']:.2f}s ({summary['cache_hits']} cached)")
+    print()
+    for rule_name, rule_result in sorted(result["rules"].items()):
+        violators = rule_result["violations"]
+        emoji = "⚠️ " if violators else "✅"
+        print(f"  {emoji} {rule_name}: {len(violators)} principal(s)")
+        for principal_id in violators[:max_principals]:
+            name = result["principals"][principal_id]["name"]
+            print(f"      - {name} ({principal_id})")
+        if len(violators) > max_principals:
+            print(f"      ... and {len(violators) - max_principals} more")
+    for rule_name, reason in sorted(result["unsupported"].items()):
+        print(f"  ❓ {rule_name}: not evaluated ({reason})")
+    print(f"\nTotal: {summary['violations']:,} violations across "
+          f"{summary['principals_in_violation']:,} principals")
+
+
+def load_rules(rules_file: str) -> List[Dict]:
+    with open(rules_file, "r") as f:
+        return json.load(f).get("rules", [])
+
+
+# ==================== Synthetic benchmark ====================
+
+def synthetic_inputs(users: int, rule_count: int, grants_per_user: int = 12,
+                     seed: int = 0) -> Tuple[GrantMatrix, List[Dict]]:
+    """
+    Grants and rules from a SyntheticOrg (see okta_simulator.py).
+
+    Grants are skewed towards a tenth of the apps so rules actually fire.
+    """
+    from scripts.okta_simulator import SyntheticOrg
+
+    apps = max(10, rule_count // 2)
+    org = SyntheticOrg.generate(users=users, groups=0, apps=apps, bundles=0, labels=0,
+                                risk_rules=rule_count, entitlements_per_app=2,
+                                values_per_entitlement=6, seed=seed)
+    rng = random.Random(seed)
+    app_ids = org.apps.ids()
+    popular = app_ids[:max(1, len(app_ids) // 10)]
+
+    matrix = GrantMatrix()
+    for user in org.users.values():
+        grants = []
+        for _ in range(grants_per_user):
+            app_id = rng.choice(popular) if rng.random() < 0.7 else rng.choice(app_ids)
+            entitlement = org.entitlements.get(rng.choice(org.app_entitlements[app_id].ids()))
+            value = rng.choice(entitlement["values"])
+            grants.append({"entitlementId": entitlement["id"], "valueId": value["id"]})
+        matrix.add_principal(user["id"], user["profile"]["login"], grants)
+    return matrix, list(org.risk_rules.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate risk rules (SoD) against a principal grants snapshot"
+    )
+    parser.add_argument("--rules", help="Risk rules config file (risk_rules.json)")
+    parser.add_argument("--grants", help="Grants snapshot (.jsonl, .json or .csv)")
+    parser.add_argument("--rule", action="append", help="Only evaluate this rule (repeatable)")
+    parser.add_argument("--output", help="Write the evaluation result as JSON")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Result cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write cached results")
+    parser.add_argument("--synthetic", action="store_true", help="Benchmark on a synthetic org instead of files")
+    parser.add_argument("--users", type=int, default=50000, help="Synthetic principals (default: 50000)")
+    parser.add_argument("--rule-count", type=int, default=500, help="Synthetic rules (default: 500)")
+
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache or args.synthetic else args.cache_dir
+
+    print("="*80)
+    print("SOD RULE EVALUATION")
+    print("="*80)
+
+    start = time.time()
+    if args.synthetic:
+        matrix, rules = synthetic_inputs(args.users, args.rule_count)
+    else:
+        if not args.rules or not args.grants:
+            parser.error("--rules and --grants are required (or use --synthetic)")
+        rules = load_rules(args.rules)
+        matrix = load_grants(args.grants)
+    print(f"Loaded {len(rules)} rules and {len(matrix):,} principals "
+          f"({matrix.grant_count:,} grants) in {time.time() - start:.2f}s\n")
+
+    if args.rule:
+        wanted = set(args.rule)
+        rules = [rule for rule in rules if rule.get("name") in wanted]
+        missing = wanted - {rule.get("name") for rule in rules}
+        if missing:
+            print(f"⚠️  Rules not found in config: {', '.join(sorted(missing))}\n")
+
+    engine = SodEngine(matrix, cache_dir=cache_dir)
+    result = engine.evaluate(rules)
+    print_evaluation(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"\n📄 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,11 +18,16 @@ Usage:
 import os
 import sys
 import json
-import requests
 import argparse
 from typing import Dict, List
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.okta_http import create_session, iter_pages
+from scripts.okta_models import Label, ResourceLabels
+
 
 class LabelMappingSync:
     """Syncs label mappings from Okta to local config"""
@@ -36,44 +41,50 @@ class LabelMappingSync:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
 
-    def get_all_labels(self) -> List[Dict]:
+    def _get_all_pages(self, url: str, params: Dict = None, model=None) -> List:
+        """GET a governance list, following `_links.next` until the last page"""
+        items = []
+        for page in iter_pages(self.session, url, params):
+            items.extend(model.from_page(page) if model else page)
+        return items
+
+    @span("fetch_labels")
+    def get_all_labels(self) -> List[Label]:
         """Query all labels from Okta"""
         print("Querying labels from Okta...")
         url = f"{self.governance_base}/labels"
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            labels = data.get("data", [])
+            labels = self._get_all_pages(url, model=Label)
             print(f"  ✅ Found {len(labels)} labels")
             return labels
         except Exception as e:
             print(f"  ❌ Error: {e}")
             return []
 
-    def get_all_resource_labels(self) -> List[Dict]:
+    @span("fetch_assignments")
+    def get_all_resource_labels(self) -> List[ResourceLabels]:
         """Query all resource-label assignments from Okta"""
         print("Querying resource-label assignments...")
         url = f"{self.governance_base}/resource-labels"
         params = {"limit": 200}
 
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            assignments = data.get("data", [])
+            # Large orgs have one entry per labeled resource; each page is
+            # parsed into compact records as it arrives
+            assignments = self._get_all_pages(url, params, ResourceLabels)
             print(f"  ✅ Found {len(assignments)} assignments")
             return assignments
         except Exception as e:
             print(f"  ❌ Error: {e}")
             return []
 
-    def build_mappings(self, labels: List[Dict], assignments: List[Dict]) -> Dict:
-        """Build the hierarchical label mappings structure"""
+    @span("build_mappings")
+    def build_mappings(self, labels: List[Label], assignments: List[ResourceLabels]) -> Dict:
+        """Build the hierarchical label mappings structure (API dicts are accepted too)"""
         print("\nBuilding label mappings...")
 
         # Build hierarchical label metadata
@@ -81,29 +92,25 @@ class LabelMappingSync:
         label_value_to_label = {}  # Map labelValueId -> (labelName, valueName)
 
         for label in labels:
-            name = label.get("name")
-            label_id = label.get("labelId")
-            values = label.get("values", [])
+            label = Label.coerce(label)
+            name = label.name
+            label_id = label.id
 
             # Determine if this is a single-value or multi-value label
-            label_type = "single_value" if len(values) == 1 and values[0].get("name") == name else "multi_value"
+            label_type = "single_value" if label.is_single_value else "multi_value"
 
             # Build values structure
             values_dict = {}
-            for value in values:
-                value_name = value.get("name")
-                value_id = value.get("labelValueId")
-                description = value.get("description", f"{value_name} label value")
+            for value in label.values:
+                value_name = value.name
+                value_id = value.id
+                description = value.description if value.description is not None else f"{value_name} label value"
 
                 # Store mapping for later assignment processing
                 label_value_to_label[value_id] = (name, value_name)
 
                 # Extract color from metadata
-                color = None
-                bg_color = None
-                metadata = value.get("metadata", {})
-                additional_props = metadata.get("additionalProperties", {})
-                bg_color = additional_props.get("backgroundColor")
+                bg_color = value.background_color
 
                 # Map background color to simple color name
                 color_map = {
@@ -127,7 +134,7 @@ class LabelMappingSync:
 
             label_metadata[name] = {
                 "labelId": label_id,
-                "description": label.get("description", f"{name} label"),
+                "description": label.description if label.description is not None else f"{name} label",
                 "type": label_type,
                 "values": values_dict
             }
@@ -146,8 +153,8 @@ class LabelMappingSync:
         }
 
         for assignment in assignments:
-            resource = assignment.get("resource", {})
-            resource_orn = resource.get("orn", "")
+            assignment = ResourceLabels.coerce(assignment)
+            resource_orn = assignment.orn
 
             # Determine resource category
             if "entitlement-bundles" in resource_orn:
@@ -160,9 +167,7 @@ class LabelMappingSync:
                 category = "other"
 
             # Get label values for this resource
-            for label_value in assignment.get("labels", []):
-                label_value_id = label_value.get("labelValueId")
-
+            for label_value_id in assignment.label_value_ids:
                 # Look up which label and value this belongs to
                 if label_value_id in label_value_to_label:
                     label_name, value_name = label_value_to_label[label_value_id]
@@ -230,6 +235,7 @@ class LabelMappingSync:
 
         return mappings
 
+    @span("save")
     def save_mappings(self, mappings: Dict, output_file: str):
         """Save mappings to file"""
         print(f"\nSaving mappings to {output_file}...")
@@ -237,6 +243,7 @@ class LabelMappingSync:
             json.dump(mappings, f, indent=2)
         print(f"  ✅ Saved successfully")
 
+    @span("sync_label_mappings")
     def sync(self, output_file: str) -> bool:
         """Run the complete sync process"""
         print("="*80)
@@ -307,8 +314,10 @@ def main():
         default="config/label_mappings.json",
         help="Output file path"
     )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
@@ -9,6 +9,7 @@ Usage:
     python3 scripts/sync_owner_mappings.py
     python3 scripts/sync_owner_mappings.py --output config/owner_mappings.json
     python3 scripts/sync_owner_mappings.py --resource-orns <orn1> <orn2> <orn3>
+    python3 scripts/sync_owner_mappings.py --resume    # continue an interrupted sync
 """
 
 import os
@@ -16,14 +17,28 @@ import sys
 import json
 import requests
 import argparse
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.checkpoint import CheckpointJournal, add_checkpoint_arguments, open_checkpoint
+from scripts.okta_api_manager import OktaAPIManager
+from scripts.okta_http import compile_fields, create_session, decode_page
+from scripts.okta_models import App, Bundle, Group
+
+# Record type of each listed resource; only the fields it reads are decoded,
+# which also keeps the checkpoint journal small
+LIST_MODELS = {"apps": App, "groups": Group, "entitlement_bundles": Bundle}
+LIST_FIELDS = {stream: compile_fields(model.FIELDS) for stream, model in LIST_MODELS.items()}
+
 
 class OwnerMappingSync:
     """Syncs resource owner mappings from Okta to local config"""
 
-    def __init__(self, org_name: str, base_url: str, api_token: str):
+    def __init__(self, org_name: str, base_url: str, api_token: str,
+                 checkpoint: Optional[CheckpointJournal] = None):
         self.org_name = org_name
         self.base_url = f"https://{org_name}.{base_url}"
         self.governance_base = f"{self.base_url}/governance/api/v1"
@@ -33,11 +48,25 @@ class OwnerMappingSync:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update(self.headers)
+        self.orn_resolver = OktaAPIManager(org_name, base_url, api_token).orn_resolver
+        self.checkpoint = checkpoint or CheckpointJournal(None, "sync_owner_mappings")
+
+    def _list_pages(self, stream: str, url: str, params: Dict) -> List:
+        """
+        GET every page of a list as records, recording each page in the checkpoint
+        journal so an interrupted sync continues from the last page it fetched
+        """
+        def fetch_page(cursor: Optional[str]):
+            response = self.session.get(cursor or url, params=None if cursor else params)
+            response.raise_for_status()
+            return decode_page(response, LIST_FIELDS[stream])
+
+        return self.checkpoint.paginate(stream, fetch_page, LIST_MODELS[stream].from_page)
 
-    def get_resource_owners(self, resource_orn: str) -> List[Dict]:
-        """Query owners for a specific resource"""
+    def get_resource_owners(self, resource_orn: str) -> Optional[List[Dict]]:
+        """Query owners for a specific resource (None if the query failed)"""
         url = f"{self.governance_base}/resource-owners"
         filter_expr = f'parentResourceOrn eq "{resource_orn}"'
         params = {
@@ -55,58 +84,50 @@ class OwnerMappingSync:
                 # Resource owners not available or resource not found
                 return []
             print(f"  ⚠️  Error querying owners for {resource_orn}: {e}")
-            return []
+            return None
         except Exception as e:
             print(f"  ⚠️  Error: {e}")
-            return []
+            return None
 
-    def get_all_apps(self) -> List[Dict]:
+    @span("fetch_apps")
+    def get_all_apps(self) -> List[App]:
         """Query all applications from Okta"""
         print("Querying applications...")
         url = f"{self.api_base}/apps"
         params = {"limit": 200}
 
-        all_apps = []
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            apps = response.json()
-            all_apps.extend(apps)
+            apps = self._list_pages("apps", url, params)
             print(f"  ✅ Found {len(apps)} apps")
-            return all_apps
+            return apps
         except Exception as e:
             print(f"  ⚠️  Error querying apps: {e}")
             return []
 
-    def get_all_groups(self) -> List[Dict]:
+    @span("fetch_groups")
+    def get_all_groups(self) -> List[Group]:
         """Query all groups from Okta"""
         print("Querying groups...")
         url = f"{self.api_base}/groups"
         params = {"limit": 200}
 
-        all_groups = []
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            groups = response.json()
-            all_groups.extend(groups)
+            groups = self._list_pages("groups", url, params)
             print(f"  ✅ Found {len(groups)} groups")
-            return all_groups
+            return groups
         except Exception as e:
             print(f"  ⚠️  Error querying groups: {e}")
             return []
 
-    def get_all_entitlement_bundles(self) -> List[Dict]:
+    @span("fetch_bundles")
+    def get_all_entitlement_bundles(self) -> List[Bundle]:
         """Query all entitlement bundles from Okta"""
         print("Querying entitlement bundles...")
         url = f"{self.governance_base}/entitlement-bundles"
         params = {"limit": 200}
 
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            bundles = data.get("data", [])
+            bundles = self._list_pages("entitlement_bundles", url, params)
             print(f"  ✅ Found {len(bundles)} entitlement bundles")
             return bundles
         except requests.exceptions.HTTPError as e:
@@ -120,20 +141,19 @@ class OwnerMappingSync:
             return []
 
     def build_orn(self, resource_id: str, resource_type: str, app_type: str = None) -> str:
-        """Build Okta Resource Name (ORN)"""
+        """Build Okta Resource Name (ORN) via the shared ORN resolver"""
         if resource_type == "app":
-            if not app_type:
-                app_type = "oauth2"  # default
-            return f"orn:okta:idp:{self.org_name}:apps:{app_type}:{resource_id}"
+            return self.orn_resolver.app_orn(resource_id)
         elif resource_type == "group":
-            return f"orn:okta:directory:{self.org_name}:groups:{resource_id}"
+            return self.orn_resolver.group_orn(resource_id)
         elif resource_type == "entitlement_bundle":
-            return f"orn:okta:governance:{self.org_name}:entitlement-bundles:{resource_id}"
+            return self.orn_resolver.bundle_orn(resource_id)
         elif resource_type == "user":
-            return f"orn:okta:directory:{self.org_name}:users:{resource_id}"
+            return self.orn_resolver.user_orn(resource_id)
         else:
             return resource_id
 
+    @span("fetch_owners")
     def sync_resource_owners(self, resource_orns: List[str] = None) -> Dict:
         """Sync resource owners from Okta"""
         print("="*80)
@@ -158,10 +178,11 @@ class OwnerMappingSync:
 
             # Sync apps
             apps = self.get_all_apps()
+            self.orn_resolver.register_apps(apps)
             for app in apps:
-                app_id = app.get("id")
-                app_name = app.get("label", app.get("name", "Unknown"))
-                app_sign_on_mode = app.get("signOnMode", "oauth2")
+                app_id = app.id
+                app_name = app.display_name
+                app_sign_on_mode = app.sign_on_mode
 
                 # Map signOnMode to app type for ORN
                 app_type_map = {
@@ -178,16 +199,16 @@ class OwnerMappingSync:
             # Sync groups
             groups = self.get_all_groups()
             for group in groups:
-                group_id = group.get("id")
-                group_name = group.get("profile", {}).get("name", "Unknown")
+                group_id = group.id
+                group_name = group.name or "Unknown"
                 orn = self.build_orn(group_id, "group")
                 self._sync_single_resource(orn, assignments, resource_name=group_name, resource_type_override="groups")
 
             # Sync entitlement bundles
             bundles = self.get_all_entitlement_bundles()
             for bundle in bundles:
-                bundle_id = bundle.get("bundleId")
-                bundle_name = bundle.get("name", "Unknown")
+                bundle_id = bundle.id
+                bundle_name = bundle.name or "Unknown"
                 orn = self.build_orn(bundle_id, "entitlement_bundle")
                 self._sync_single_resource(orn, assignments, resource_name=bundle_name, resource_type_override="entitlement_bundles")
 
@@ -195,9 +216,19 @@ class OwnerMappingSync:
 
     def _sync_single_resource(self, resource_orn: str, assignments: Dict, resource_name: str = None, resource_type_override: str = None, app_type: str = None):
         """Sync owners for a single resource"""
+        if self.checkpoint.done(resource_orn):
+            resource_type, resource_entry = self.checkpoint.get(resource_orn) or (None, None)
+            if resource_entry:
+                assignments[resource_type].append(resource_entry)
+            return
+
         owners_data = self.get_resource_owners(resource_orn)
 
+        if owners_data is None:
+            # Not recorded, so a resumed sync queries this resource again
+            return
         if not owners_data:
+            self.checkpoint.record(resource_orn)
             return
 
         # Determine resource type from ORN
@@ -210,6 +241,7 @@ class OwnerMappingSync:
         elif ":entitlement-bundles:" in resource_orn:
             resource_type = "entitlement_bundles"
         else:
+            self.checkpoint.record(resource_orn)
             return
 
         # Extract owner information
@@ -248,6 +280,9 @@ class OwnerMappingSync:
             assignments[resource_type].append(resource_entry)
             print(f"  ✅ {resource_name or resource_orn}: {len(owners)} owner(s)")
 
+        self.checkpoint.record(resource_orn, [resource_type, resource_entry] if owners else None)
+
+    @span("save")
     def save_mappings(self, assignments: Dict, output_file: str):
         """Save owner mappings to file"""
         print(f"\nSaving owner mappings to {output_file}...")
@@ -278,6 +313,7 @@ class OwnerMappingSync:
 
         return mappings
 
+    @span("sync_owner_mappings")
     def sync(self, output_file: str, resource_orns: List[str] = None) -> bool:
         """Run the complete sync process"""
         # Sync owners
@@ -285,6 +321,7 @@ class OwnerMappingSync:
 
         # Save to file
         mappings = self.save_mappings(assignments, output_file)
+        self.checkpoint.complete()
 
         # Summary
         total_apps = len(assignments["apps"])
@@ -300,6 +337,8 @@ class OwnerMappingSync:
         print(f"  Entitlement bundles with owners: {total_bundles}")
         print(f"  Total resources with owners: {total_resources}")
         print(f"  Output file: {output_file}")
+        if self.checkpoint.replayed:
+            print(f"  Replayed from checkpoint: {self.checkpoint.replayed}")
         print("="*80)
 
         return True
@@ -334,15 +373,21 @@ def main():
         nargs="+",
         help="Specific resource ORNs to sync (optional, syncs all if not provided)"
     )
+    add_metrics_arguments(parser)
+    add_checkpoint_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
         sys.exit(1)
 
-    syncer = OwnerMappingSync(args.org_name, args.base_url, args.api_token)
+    checkpoint = open_checkpoint(args, "sync_owner_mappings", args.org_name,
+                                 {"resource_orns": args.resource_orns})
+    syncer = OwnerMappingSync(args.org_name, args.base_url, args.api_token, checkpoint=checkpoint)
     success = syncer.sync(args.output, args.resource_orns)
+    checkpoint.close()
 
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+terraform_scanner.py
+
+Rule-based scanner for Terraform trees. Finds the resources that match a rule
+set (admin resources by default) across every environment of a monorepo in a
+single pass and turns the findings into label configs in the
+label_mappings.json schema.
+
+- The whole tree is walked (.terraform, .git and similar directories are
+  skipped) and files are scanned in batches by worker processes; each file
+  is read and parsed once.
+- Each resource block is parsed once into its type, name and top-level
+  attributes, and every rule is evaluated against it. All rule patterns are
+  compiled into one prefilter regex, so blocks that match no rule (nearly
+  all of them) cost a single search.
+- Resource IDs are collected in the same pass from `id` attributes,
+  `import {}` blocks, `terraform import` lines in shell scripts and
+  terraform.tfstate files, so findings can be turned into ORNs.
+
+Rule file (--rules):
+    {
+      "rules": [
+        {
+          "name": "super-admin",
+          "patterns": ["super[\\\\s_-]*admin"],
+          "fields": ["resource_name", "name", "label"],
+          "resource_types": ["okta_group", "okta_app_*"],
+          "where": {"status": {"in": ["ACTIVE"]}},
+          "severity": "CRITICAL",
+          "labels": ["Privileged", "Compliance:SOX"]
+        }
+      ]
+    }
+
+    patterns        Python regexes, searched case-insensitively
+    fields          "resource_name" (the Terraform name) or top-level attribute
+                    names (default: resource_name, name, label)
+    resource_types  fnmatch patterns (default: every resource type)
+    where           attribute predicates that must all hold: a string for
+                    case-insensitive equality, or {"matches": regex},
+                    {"in": [...]}, {"exists": true|false}
+    labels          "Label" for single-value labels, "Label:Value" for
+                    multi-value labels, as in label_mappings.json
+
+Usage (normally via find_admin_resources.py):
+    python3 scripts/terraform_scanner.py environments --rules rules.json --workers 8
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.orn_resolver import format_orn
+
+
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+
+DEFAULT_FIELDS = ["resource_name", "name", "label"]
+
+DEFAULT_RULES = [
+    {
+        "name": "super-admin",
+        "patterns": [r"super.*admin"],
+        "severity": "CRITICAL",
+        "labels": ["Privileged", "Compliance-Required"]
+    },
+    {
+        "name": "admin",
+        "patterns": [r"admin"],
+        "severity": "HIGH",
+        "labels": ["Privileged"]
+    }
+]
+
+SKIP_DIRS = {".git", ".terraform", ".okta_cache", "__pycache__", "node_modules"}
+
+# Resource types that are applications (okta_app_group_assignment,
+# okta_app_user, okta_app_saml_app_settings... are not)
+APP_RESOURCE = re.compile(
+    r"okta_app_(oauth|saml|basic_auth|bookmark|secure_password_store|three_field|"
+    r"auto_login|swa|shared_credentials|ws_federation)$"
+)
+
+# Files per worker task
+BATCH_SIZE = 64
+
+
+# ==================== Parsing ====================
+
+# A top-level block header: `resource "type" "name" {`, `import {`, `locals {`...
+BLOCK_HEADER = re.compile(r'^[ \t]*([A-Za-z_][\w-]*)((?:[ \t]+"[^"\n]*")*)[ \t]*\{', re.M)
+BLOCK_LABEL = re.compile(r'"([^"\n]*)"')
+
+# Tokens that matter for brace matching; strings, comments and heredocs are
+# skipped as a whole so braces inside them are not counted
+TOKEN = re.compile(r'"(?:[^"\\\n]|\\.)*"|<<-?[ \t]*"?(\w+)"?[^\n]*\n|#[^\n]*|//[^\n]*|/\*.*?\*/|[{}]', re.S)
+
+ATTRIBUTE = re.compile(r'^[ \t]*([A-Za-z_][\w-]*)[ \t]*=(?!=)[ \t]*([^\n]*?)[ \t]*$', re.M)
+STRING_VALUE = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+ADDRESS = re.compile(r'^[A-Za-z_][\w-]*\.[A-Za-z_][\w-]*$')
+
+IMPORT_COMMAND = re.compile(
+    r'^[ \t]*terraform[ \t]+import[ \t]+(?:-\S+[ \t]+)*[\'"]?([A-Za-z_][\w-]*\.[A-Za-z_][\w-]*)[\'"]?'
+    r'[ \t]+[\'"]?([^\s\'"]+)',
+    re.M
+)
+
+
+class TerraformResource:
+    """A parsed resource block: type, name, top-level attributes and line number"""
+
+    __slots__ = ("resource_type", "name", "attributes", "line")
+
+    def __init__(self, resource_type: str, name: str, attributes: Dict[str, str], line: int):
+        self.resource_type = resource_type
+        self.name = name
+        self.attributes = attributes
+        self.line = line
+
+    @property
+    def address(self) -> str:
+        return f"{self.resource_type}.{self.name}"
+
+    def field(self, field: str) -> Optional[str]:
+        """Value of a rule field: the Terraform name or a top-level attribute"""
+        if field == "resource_name":
+            return self.name
+        return self.attributes.get(field)
+
+
+def _block_end(content: str, pos: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    End of the block whose opening brace ends just before `pos`, and the spans
+    of its nested blocks and heredocs (excluded when reading attributes).
+    """
+    depth = 1
+    nested = []
+    nested_start = pos
+    while True:
+        token = TOKEN.search(content, pos)
+        if token is None:
+            return len(content), nested
+        text = token.group()
+        pos = token.end()
+
+        if text == "{":
+            depth += 1
+            if depth == 2:
+                nested_start = token.start()
+        elif text == "}":
+            depth -= 1
+            if depth == 0:
+                return pos, nested
+            if depth == 1:
+                nested.append((nested_start, pos))
+        elif token.group(1):
+            # Heredoc: skip to the line holding only its terminator
+            terminator = re.compile(rf'^[ \t]*{re.escape(token.group(1))}[ \t]*$', re.M).search(content, pos)
+            end = terminator.end() if terminator else len(content)
+            if depth == 1:
+                nested.append((pos, end))
+            pos = end
+
+
+def _attribute_value(raw: str) -> str:
+    """Attribute value with quotes removed; expressions are kept as written"""
+    string = STRING_VALUE.match(raw)
+    if string:
+        return string.group(1).replace('\\"', '"').replace("\\\\", "\\")
+    return raw
+
+
+def _top_level_attributes(content: str, start: int, end: int, nested: List[Tuple[int, int]]) -> Dict[str, str]:
+    parts = []
+    for nested_start, nested_end in nested:
+        parts.append(content[start:nested_start])
+        start = nested_end
+    parts.append(content[start:end])
+    return {match.group(1): _attribute_value(match.group(2)) for match in ATTRIBUTE.finditer("".join(parts))}
+
+
+def iter_blocks(content: str) -> Iterator[Tuple[str, List[str], Dict[str, str], int]]:
+    """Yield (block type, labels, top-level attributes, line) for each top-level block"""
+    pos = 0
+    line = 1
+    counted = 0
+    while True:
+        header = BLOCK_HEADER.search(content, pos)
+        if header is None:
+            return
+
+        # A /* comment */ between blocks may contain text that looks like a block
+        comment = content.find("/*", pos, header.start())
+        if comment != -1:
+            line_start = content.rfind("\n", 0, comment) + 1
+            prefix = content[line_start:comment]
+            if "#" in prefix or "//" in prefix:
+                pos = comment + 2
+            else:
+                close = content.find("*/", comment + 2)
+                if close == -1:
+                    return
+                pos = close + 2
+            continue
+
+        line += content.count("\n", counted, header.start())
+        counted = header.start()
+        end, nested = _block_end(content, header.end())
+        attributes = _top_level_attributes(content, header.end(), end - 1, nested)
+        yield header.group(1), BLOCK_LABEL.findall(header.group(2)), attributes, line
+        pos = end
+
+
+def parse_resources(content: str) -> Tuple[List[TerraformResource], Dict[str, str]]:
+    """Resource blocks of a .tf file and the resource IDs declared in it (address -> ID)"""
+    resources = []
+    ids = {}
+    for block_type, labels, attributes, line in iter_blocks(content):
+        if block_type == "resource" and len(labels) == 2:
+            resource = TerraformResource(labels[0], labels[1], attributes, line)
+            resources.append(resource)
+            if attributes.get("id") and not attributes["id"].startswith(("var.", "local.")):
+                ids[resource.address] = attributes["id"]
+        elif block_type == "import" and not labels:
+            target = attributes.get("to", "")
+            if ADDRESS.match(target) and attributes.get("id"):
+                ids[target] = attributes["id"]
+    return resources, ids
+
+
+def parse_import_commands(content: str) -> Dict[str, str]:
+    """Resource IDs from `terraform import <address> <id>` lines of a shell script"""
+    return {match.group(1): match.group(2) for match in IMPORT_COMMAND.finditer(content)}
+
+
+def parse_state(content: str) -> Dict[str, str]:
+    """Resource IDs from a terraform.tfstate file (single-instance resources)"""
+    try:
+        state = json.loads(content)
+    except ValueError:
+        return {}
+    ids = {}
+    for resource in state.get("resources", []):
+        if resource.get("mode", "managed") != "managed" or resource.get("module"):
+            continue
+        instances = resource.get("instances", [])
+        if len(instances) == 1:
+            resource_id = instances[0].get("attributes", {}).get("id")
+            if resource_id:
+                ids[f"{resource.get('type')}.{resource.get('name')}"] = resource_id
+    return ids
+
+
+# ==================== Rules ====================
+
+class ScanRule:
+    """One compiled rule of a rule set (see the module docstring for the format)"""
+
+    __slots__ = ("name", "patterns", "fields", "resource_types", "where", "severity", "labels")
+
+    def __init__(self, spec: Dict):
+        self.name = spec.get("name") or "unnamed"
+        patterns = spec.get("patterns") or ([spec["pattern"]] if spec.get("pattern") else [])
+        if not patterns:
+            raise ValueError(f"Rule '{self.name}' has no patterns")
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        self.fields = spec.get("fields") or DEFAULT_FIELDS
+        self.resource_types = spec.get("resource_types") or []
+        self.severity = (spec.get("severity") or "HIGH").upper()
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Rule '{self.name}' has unknown severity {self.severity} (use {', '.join(SEVERITIES)})")
+        self.labels = spec.get("labels") or []
+        self.where = [self._predicate(attribute, condition) for attribute, condition in (spec.get("where") or {}).items()]
+
+    def _predicate(self, attribute: str, condition):
+        if isinstance(condition, dict):
+            if "matches" in condition:
+                pattern = re.compile(condition["matches"], re.IGNORECASE)
+                return lambda resource: pattern.search(resource.field(attribute) or "") is not None
+            if "in" in condition:
+                allowed = {str(value).lower() for value in condition["in"]}
+                return lambda resource: (resource.field(attribute) or "").lower() in allowed
+            if "exists" in condition:
+                wanted = bool(condition["exists"])
+                return lambda resource: (resource.field(attribute) is not None) == wanted
+            raise ValueError(f"Rule '{self.name}': unsupported condition for {attribute}: {condition}")
+        expected = str(condition).lower()
+        return lambda resource: (resource.field(attribute) or "").lower() == expected
+
+    def evaluate(self, resource: TerraformResource) -> Optional[Tuple[str, str]]:
+        """(field, value) that matched, or None"""
+        if self.resource_types and not any(fnmatch.fnmatchcase(resource.resource_type, pattern)
+                                           for pattern in self.resource_types):
+            return None
+        if not all(predicate(resource) for predicate in self.where):
+            return None
+        for field in self.fields:
+            value = resource.field(field)
+            if value and any(pattern.search(value) for pattern in self.patterns):
+                return field, value
+        return None
+
+
+class RuleSet:
+    """Compiled rules plus a combined prefilter over every rule pattern"""
+
+    def __init__(self, specs: Optional[List[Dict]] = None):
+        self.specs = specs if specs is not None else DEFAULT_RULES
+        self.rules = [ScanRule(spec) for spec in self.specs]
+
+        self.fields = []
+        for rule in self.rules:
+            self.fields.extend(field for field in rule.fields if field not in self.fields)
+
+        try:
+            self.prefilter = re.compile(
+                "|".join(f"(?:{pattern.pattern})" for rule in self.rules for pattern in rule.patterns),
+                re.IGNORECASE
+            )
+        except re.error:
+            # Patterns that cannot be combined (named groups, backreferences)
+            self.prefilter = None
+
+    def match(self, resource: TerraformResource) -> Optional[Dict]:
+        """Severity, labels and matched rules for a resource, or None if no rule matches"""
+        if self.prefilter is not None:
+            for field in self.fields:
+                value = resource.field(field)
+                if value and self.prefilter.search(value):
+                    break
+            else:
+                return None
+
+        matches = []
+        for rule in self.rules:
+            matched = rule.evaluate(resource)
+            if matched:
+                matches.append((rule, matched))
+        if not matches:
+            return None
+
+        labels = []
+        for rule, _ in matches:
+            labels.extend(label for label in rule.labels if label not in labels)
+        return {
+            "severity": min((rule.severity for rule, _ in matches), key=SEVERITIES.index),
+            "recommended_labels": labels,
+            "matches": [{"rule": rule.name, "field": field, "value": value} for rule, (field, value) in matches]
+        }
+
+
+def load_rules(rules_file: str) -> List[Dict]:
+    with open(rules_file, 'r') as f:
+        data = json.load(f)
+    return data["rules"] if isinstance(data, dict) else data
+
+
+# ==================== Scanning ====================
+
+def environment_of(path: str, root: str) -> str:
+    """Environment a file belongs to: the directory under environments/, else the scanned root's name"""
+    parts = os.path.normpath(os.path.abspath(path)).split(os.sep)
+    for index in range(len(parts) - 3, -1, -1):
+        if parts[index] == "environments":
+            return parts[index + 1]
+    return os.path.basename(os.path.normpath(os.path.abspath(root))) or "default"
+
+
+def scan_file(path: str, root: str, rules: RuleSet) -> Tuple[List[Dict], Dict[str, str]]:
+    """Findings and resource IDs of one file (.tf, shell script or tfstate)"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    except OSError as e:
+        print(f"  ⚠️  Could not read {path}: {e}")
+        return [], {}
+
+    if path.endswith(".sh"):
+        return [], parse_import_commands(content)
+    if path.endswith(".tfstate"):
+        return [], parse_state(content)
+
+    resources, ids = parse_resources(content)
+    relative = os.path.relpath(path, root)
+    findings = []
+    for resource in resources:
+        result = rules.match(resource)
+        if result is None:
+            continue
+        finding = {
+            "file": relative,
+            "line": resource.line,
+            "resource_type": resource.resource_type,
+            "resource_name": resource.name,
+            "terraform_address": resource.address,
+        }
+        finding.update(result)
+        # Attributes needed to build the resource's ORN
+        finding["attributes"] = {key: resource.attributes[key] for key in ("id", "name", "label", "preconfigured_app")
+                                 if key in resource.attributes}
+        findings.append(finding)
+    return findings, ids
+
+
+def find_files(root: str) -> List[str]:
+    """Terraform files, shell scripts and state files under a directory"""
+    if os.path.isfile(root):
+        return [root]
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith((".tf", ".sh", ".tfstate")):
+                files.append(os.path.join(directory, filename))
+    return files
+
+
+_worker_rules: Optional[RuleSet] = None
+
+
+def _init_worker(rule_specs: List[Dict]):
+    global _worker_rules
+    _worker_rules = RuleSet(rule_specs)
+
+
+def _scan_batch(batch: List[Tuple[str, str]], rules: Optional[RuleSet] = None):
+    rules = rules or _worker_rules
+    results = []
+    for path, root in batch:
+        findings, ids = scan_file(path, root, rules)
+        results.append((environment_of(path, root), findings, ids))
+    return results
+
+
+class ScanResult:
+    """Findings of a scan and the resource IDs found per environment"""
+
+    def __init__(self):
+        self.findings: List[Dict] = []
+        self.ids: Dict[str, Dict[str, str]] = {}
+        self.files_scanned = 0
+        self.elapsed = 0.0
+
+    def resource_id(self, finding: Dict) -> Optional[str]:
+        return (self.ids.get(finding["environment"], {}).get(finding["terraform_address"])
+                or finding.get("attributes", {}).get("id"))
+
+    def environments(self) -> List[str]:
+        return sorted({finding["environment"] for finding in self.findings})
+
+
+def scan_tree(roots: List[str], rule_specs: Optional[List[Dict]] = None,
+              workers: Optional[int] = None) -> ScanResult:
+    """
+    Scan every Terraform file under `roots` with a rule set (DEFAULT_RULES by default).
+
+    With more than one worker and more than one batch of files, batches are
+    scanned in a process pool.
+    """
+    started = time.time()
+    rules = RuleSet(rule_specs)
+    workers = workers or os.cpu_count() or 1
+
+    files = [(path, root) for root in roots for path in find_files(root)]
+    batches = [files[i:i + BATCH_SIZE] for i in range(0, len(files), BATCH_SIZE)]
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)),
+                                 initializer=_init_worker, initargs=(rules.specs,)) as executor:
+            batch_results = list(executor.map(_scan_batch, batches))
+    else:
+        batch_results = [_scan_batch(batch, rules) for batch in batches]
+
+    result = ScanResult()
+    for batch_result in batch_results:
+        for environment, findings, ids in batch_result:
+            for finding in findings:
+                finding["environment"] = environment
+            result.findings.extend(findings)
+            result.ids.setdefault(environment, {}).update(ids)
+
+    result.findings.sort(key=lambda f: (SEVERITIES.index(f["severity"]), f["environment"], f["file"], f["line"]))
+    result.files_scanned = len(files)
+    result.elapsed = time.time() - started
+    return result
+
+
+# ==================== Label configs ====================
+
+def resource_category(resource_type: str) -> str:
+    """label_mappings.json assignment category of a Terraform resource type"""
+    if APP_RESOURCE.match(resource_type):
+        return "apps"
+    if resource_type == "okta_group":
+        return "groups"
+    if resource_type == "okta_entitlement_bundle":
+        return "entitlement_bundles"
+    return "other"
+
+
+def resolve_orns(result: ScanResult, environment: str, org_id: Optional[str] = None,
+                 partition: str = "okta", resolver=None) -> Tuple[Dict[str, str], List[Dict]]:
+    """
+    ORNs of an environment's findings (address -> ORN) and the findings that
+    could not be resolved, with the reason.
+
+    With an OrnResolver, the org ID and app catalog names come from the API;
+    otherwise `org_id` is required and apps resolve only when their Terraform
+    config sets `preconfigured_app`.
+    """
+    orns = {}
+    unresolved = []
+
+    def skip(finding: Dict, reason: str):
+        unresolved.append({"terraform_address": finding["terraform_address"],
+                           "file": finding["file"], "reason": reason})
+
+    findings = [f for f in result.findings if f["environment"] == environment]
+    if resolver is not None:
+        app_ids = [result.resource_id(f) for f in findings
+                   if resource_category(f["resource_type"]) == "apps" and result.resource_id(f)]
+        app_orns = resolver.app_orns(app_ids) if app_ids else {}
+        org_id, partition = resolver.org_id, resolver.partition
+    else:
+        app_orns = {}
+
+    for finding in findings:
+        category = resource_category(finding["resource_type"])
+        resource_id = result.resource_id(finding)
+        if category == "other":
+            skip(finding, f"no ORN for {finding['resource_type']}")
+        elif not resource_id:
+            skip(finding, "resource ID unknown (no id attribute, import block, import script or state)")
+        elif not org_id:
+            skip(finding, "org ID unknown (pass --org-id or --resolve-orns)")
+        elif category == "apps":
+            app_name = finding["attributes"].get("preconfigured_app")
+            if resource_id in app_orns:
+                orns[finding["terraform_address"]] = app_orns[resource_id]
+            elif app_name:
+                orns[finding["terraform_address"]] = format_orn(partition, org_id, "apps", resource_id, app_name)
+            else:
+                skip(finding, "app catalog name unknown (pass --resolve-orns)")
+        else:
+            orns[finding["terraform_address"]] = format_orn(partition, org_id, category, resource_id)
+
+    return orns, unresolved
+
+
+def build_label_mappings(result: ScanResult, environment: str, orns: Dict[str, str],
+                         unresolved: List[Dict]) -> Dict:
+    """label_mappings.json-style config assigning the recommended labels of an environment's findings"""
+    labels = {}
+    assignments = {"apps": {}, "groups": {}, "entitlement_bundles": {}, "other": {}}
+
+    for finding in result.findings:
+        if finding["environment"] != environment:
+            continue
+        for assignment_key in finding["recommended_labels"]:
+            label_name, _, value_name = assignment_key.partition(":")
+            label = labels.setdefault(label_name, {
+                "labelId": "",
+                "description": f"{label_name} label",
+                "type": "multi_value" if value_name else "single_value",
+                "values": {}
+            })
+            label["values"].setdefault(value_name or label_name, {
+                "labelValueId": "",
+                "description": f"{value_name or label_name} label value",
+                "color": None,
+                "metadata": {}
+            })
+
+            orn = orns.get(finding["terraform_address"])
+            if orn:
+                category = assignments[resource_category(finding["resource_type"])]
+                category.setdefault(assignment_key, [])
+                if orn not in category[assignment_key]:
+                    category[assignment_key].append(orn)
+
+    return {
+        "description": f"Label recommendations from a Terraform scan of {environment}",
+        "last_synced": None,
+        "labels": labels,
+        "assignments": {
+            category: {key: sorted(orns) for key, orns in entries.items()}
+            for category, entries in assignments.items()
+        },
+        "unresolved": unresolved,
+        "notes": [
+            "Generated by scripts/find_admin_resources.py from Terraform resources matching the scan rules",
+            "labelId/labelValueId are empty - labels are created or looked up by name during apply",
+            "Resources listed under 'unresolved' matched a rule but their ORN could not be determined",
+            "Review, then apply with: python3 scripts/apply_labels_from_config.py --config <file> --dry-run"
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scan Terraform trees with a rule set and list matching resources"
+    )
+    parser.add_argument("roots", nargs="+", help="Directories (or files) to scan")
+    parser.add_argument("--rules", help="Rule file (default: built-in admin rules)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--output", help="Write the findings as JSON to this file")
+
+    args = parser.parse_args()
+    rule_specs = load_rules(args.rules) if args.rules else None
+    result = scan_tree(args.roots, rule_specs, args.workers)
+
+    print("="*80)
+    print("TERRAFORM SCAN")
+    print("="*80)
+    print(f"  Files scanned: {result.files_scanned}")
+    print(f"  Findings: {len(result.findings)}")
+    for severity in SEVERITIES:
+        count = sum(1 for finding in result.findings if finding["severity"] == severity)
+        if count:
+            print(f"    - {severity}: {count}")
+    print(f"  Resource IDs found: {sum(len(ids) for ids in result.ids.values())}")
+    print(f"  Elapsed: {result.elapsed:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result.findings, f, indent=2)
+        print(f"  Output file: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ Based on Okta IGA Labels API:
 Usage:
     python3 scripts/validate_labels_api.py
     python3 scripts/validate_labels_api.py --validate-imports
+
+    # Gate on drift between the last export and the live org
+    python3 scripts/validate_labels_api.py --validate-imports --drift-report drift.json --fail-on-drift
 """
 
 import os
@@ -24,6 +27,16 @@ import requests
 import argparse
 from typing import Dict, List, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.api_metrics import add_metrics_arguments, span, write_metrics_on_exit
+from scripts.label_drift import (
+    ExportLabelRecords, LiveLabelRecords, diff_label_records, print_drift_report, write_drift_report
+)
+from scripts.okta_api_manager import OktaAPIManager
+
+DEFAULT_EXPORT_FILE = "oig-exports/lowerdecklabs/latest.json"
+
 
 class LabelsAPIValidator:
     """Validates Labels API endpoints and data structures"""
@@ -37,8 +50,9 @@ class LabelsAPIValidator:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # Shares the manager's session so the drift comparison gets its pagination and rate limiting
+        self.manager = OktaAPIManager(org_name, base_url, api_token)
+        self.session = self.manager.session
 
     def test_api_connection(self) -> bool:
         """Test basic API connectivity"""
@@ -260,8 +274,15 @@ class LabelsAPIValidator:
 
         return validation_results
 
-    def compare_with_export(self, export_file: str) -> Dict:
-        """Compare API response with previous export file"""
+    @span("drift_check")
+    def compare_with_export(self, export_file: str, report_file: Optional[str] = None) -> Dict:
+        """
+        Compare the live org with a previous export at label, value and assignment level.
+
+        Both sides are streamed through the label_drift engine, so exports with
+        millions of assignments are compared in bounded memory. The full report
+        is written to report_file when given.
+        """
         print("\n" + "="*80)
         print(f"COMPARING WITH EXPORT FILE: {export_file}")
         print("="*80)
@@ -270,35 +291,32 @@ class LabelsAPIValidator:
             print(f"⚠️  Export file not found: {export_file}")
             return {"success": False, "reason": "file_not_found"}
 
-        with open(export_file, 'r') as f:
-            export_data = json.load(f)
-
-        print(f"Export Date: {export_data.get('export_date', 'N/A')}")
-        print(f"Export Status: {export_data.get('export_status', {}).get('labels', 'N/A')}")
-        print(f"Exported Labels: {len(export_data.get('labels', []))}")
-
-        # Get current labels
-        current_result = self.list_labels()
-        current_labels = current_result.get("labels", [])
-
-        print(f"\nCurrent Labels: {len(current_labels)}")
-
-        # Compare
-        if len(current_labels) != len(export_data.get('labels', [])):
-            print(f"⚠️  Label count mismatch!")
-            print(f"   Export: {len(export_data.get('labels', []))} labels")
-            print(f"   Current: {len(current_labels)} labels")
-        else:
-            print(f"✅ Label count matches: {len(current_labels)}")
-
+        try:
+            report = diff_label_records(ExportLabelRecords(export_file), LiveLabelRecords(self.manager))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Could not read current labels: {e}")
+            return {"success": False, "reason": str(e)}
+        except ValueError as e:
+            print(f"❌ Could not read export file: {e}")
+            return {"success": False, "reason": str(e)}
+
+        print_drift_report(report)
+        if report_file:
+            write_drift_report(report, report_file)
+
+        label_counts = report["summary"]["label"]
         return {
             "success": True,
-            "export_count": len(export_data.get('labels', [])),
-            "current_count": len(current_labels),
-            "matches": len(current_labels) == len(export_data.get('labels', []))
+            "export_count": label_counts["removed"] + label_counts["changed"] + label_counts["unchanged"],
+            "current_count": label_counts["added"] + label_counts["changed"] + label_counts["unchanged"],
+            "matches": not report["drift"],
+            "drift": report["drift"],
+            "summary": report["summary"]
         }
 
-    def run_full_validation(self, validate_imports: bool = False) -> Dict:
+    @span("validate_labels")
+    def run_full_validation(self, validate_imports: bool = False, export_file: str = DEFAULT_EXPORT_FILE,
+                            drift_report: Optional[str] = None) -> Dict:
         """Run complete validation suite"""
         print("\n" + "="*80)
         print("OKTA IGA LABELS API VALIDATION")
@@ -335,6 +353,8 @@ class LabelsAPIValidator:
         if len(labels) == 0:
             print("\n⚠️  No labels found in environment")
             print("   Expected: 2 labels with no resources assigned")
+            if validate_imports:
+                results["import_comparison"] = self.compare_with_export(export_file, drift_report)
             return results
 
         print(f"\n✅ Found {len(labels)} label(s) - validating each...")
@@ -387,8 +407,7 @@ class LabelsAPIValidator:
 
         # Test 4: Compare with previous export (if requested)
         if validate_imports:
-            export_file = "oig-exports/lowerdecklabs/latest.json"
-            self.compare_with_export(export_file)
+            results["import_comparison"] = self.compare_with_export(export_file, drift_report)
 
         # Summary
         print("\n" + "="*80)
@@ -428,15 +447,32 @@ def main():
         action="store_true",
         help="Compare with previous export file"
     )
+    parser.add_argument(
+        "--export-file",
+        default=DEFAULT_EXPORT_FILE,
+        help=f"Export file for --validate-imports (default: {DEFAULT_EXPORT_FILE})"
+    )
+    parser.add_argument(
+        "--drift-report",
+        help="Write the machine-readable drift report to this file (implies --validate-imports)"
+    )
+    parser.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Exit with status 1 if the live org drifted from the export (implies --validate-imports)"
+    )
+    add_metrics_arguments(parser)
 
     args = parser.parse_args()
+    write_metrics_on_exit(args.metrics_file, args.openmetrics_file)
+    validate_imports = args.validate_imports or args.fail_on_drift or bool(args.drift_report)
 
     if not args.org_name or not args.api_token:
         print("Error: OKTA_ORG_NAME and OKTA_API_TOKEN must be set")
         sys.exit(1)
 
     validator = LabelsAPIValidator(args.org_name, args.base_url, args.api_token)
-    results = validator.run_full_validation(args.validate_imports)
+    results = validator.run_full_validation(validate_imports, args.export_file, args.drift_report)
 
     # Save results
     output_file = "labels_validation_results.json"
@@ -444,6 +480,15 @@ def main():
         json.dump(results, f, indent=2)
     print(f"\n📄 Validation results saved to: {output_file}\n")
 
+    if args.fail_on_drift:
+        comparison = results.get("import_comparison", {})
+        if not comparison.get("success"):
+            print("❌ Drift check could not run")
+            sys.exit(1)
+        if comparison.get("drift"):
+            print("❌ Labels drifted from the export")
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()